@@ -14,6 +14,7 @@ import pypandoc
 from docx import Document
 from docpack_file import DocpackHandler
 from dotenv import load_dotenv
+from recipe_executor.metrics import start_metrics_server, track_sessions
 
 from .executor.runner import generate_docpack_from_prompt, generate_document
 from .models.outline import Outline, Resource, Section
@@ -2156,6 +2157,8 @@ def create_app():
     custom_js = f"<script>{js_content}</script>"
 
     with gr.Blocks(title="Document Generator", css=custom_css, head=custom_js) as app:
+        track_sessions(app, "document-generator")
+
         # Needed to declare up front, so elements will appear in deployed DOM
         gr.DownloadButton(visible=True, elem_classes="hidden-component")
         gr.File(visible=True, elem_classes="hidden-component")
@@ -3834,6 +3837,12 @@ def main():
 
     print(f"Server: {server_name}:{server_port}")
 
+    # Optional Prometheus metrics endpoint
+    metrics_port = os.getenv("METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(int(metrics_port))
+        print(f"Metrics: http://127.0.0.1:{metrics_port}/metrics")
+
     app = create_app()
 
     import logging
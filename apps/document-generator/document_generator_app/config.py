@@ -22,6 +22,10 @@ class Settings:
     llm_provider: str = os.getenv("LLM_PROVIDER", "openai")  # "openai" or "azure"
     default_model: str = os.getenv("DEFAULT_MODEL", "gpt-4o")
 
+    # Recipe runs: worker processes (0 runs recipes in the request handler) and queue size
+    workers: int = int(os.getenv("WORKERS", "2"))
+    max_queued_jobs: int = int(os.getenv("MAX_QUEUED_JOBS", "16"))
+
     @property
     def model_id(self) -> str:
         """Get the full model ID for recipe-executor."""
@@ -7,12 +7,13 @@ import logging
 import os
 import traceback
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from recipe_executor.config import load_configuration
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
-from recipe_executor.logger import init_logger
+from recipe_executor.job_pool import get_job_pool
+from recipe_executor.logger import close_job_logger, init_job_logger
 
 from ..config import settings
 from ..models.outline import Outline, Resource
@@ -24,6 +25,34 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def run_recipe(
+    recipe_path: Path, artifacts: Dict[str, Any], session_id: Optional[str], log_dir: str
+) -> Dict[str, Any]:
+    """
+    Run a recipe on the shared worker pool (inline when workers is 0) and return its final artifacts.
+    Recipe logs go to log_dir only, so concurrent sessions keep their logs apart.
+    """
+    # Load configuration from environment variables
+    config = load_configuration()
+    logger.info("Context artifacts: %s", json.dumps(artifacts))
+    logger.info(f"Executing recipe: {recipe_path}")
+
+    if settings.workers <= 0:
+        recipe_logger = init_job_logger(f"document_generator.recipe.{session_id or 'default'}", log_dir)
+        try:
+            context = Context(artifacts=artifacts, config=config)
+            await Executor(recipe_logger).execute(str(recipe_path), context)
+            return context.dict()
+        finally:
+            close_job_logger(recipe_logger)
+
+    pool = get_job_pool(workers=settings.workers, max_queued=settings.max_queued_jobs)
+    job = await pool.run(str(recipe_path), artifacts, config, session=session_id, log_dir=log_dir)
+    if job.status != "succeeded" or job.result is None:
+        raise RuntimeError(f"Recipe job {job.id} {job.status}: {job.error or 'no result'}")
+    return job.result
+
+
 async def generate_document(
     outline: Optional[Outline], session_id: Optional[str] = None, dev_mode: bool = False
 ) -> str:
@@ -134,25 +163,17 @@ async def generate_document(
         outline_path.write_text(outline_json)
         logger.info(f"Created outline file for recipe execution: {outline_path}")
 
-        recipe_logger = init_logger(log_dir=tmpdir)
-
-        # Load configuration from environment variables
-        config = load_configuration()
-
-        context = Context(
-            artifacts={
+        context = await run_recipe(
+            RECIPE_PATH,
+            {
                 "outline_file": str(outline_path),
                 "recipe_root": str(RECIPE_ROOT),
                 "output_root": str(session_dir),  # Use session directory for output
                 "model": settings.model_id,  # Use configured model
             },
-            config=config,  # Pass configuration to context
+            session_id,
+            tmpdir,
         )
-        logger.info(f"Context artifacts: {context.dict()}")
-
-        executor = Executor(recipe_logger)
-        logger.info(f"Executing recipe: {RECIPE_PATH}")
-        await executor.execute(str(RECIPE_PATH), context)
         logger.info("Recipe execution completed")
 
         output_root = Path(context.get("output_root", tmpdir))
@@ -269,21 +290,16 @@ async def generate_docpack_from_prompt(
 
         logger.info(f"Resource paths: {resource_paths}")
 
-        # Initialize recipe logger
-        recipe_logger = init_logger(log_dir=tmpdir)
-
-        # Load configuration
-        config = load_configuration()
-
         # Create timestamp-based docpack name
         from datetime import datetime
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         docpack_name = f"{timestamp}.docpack"
 
-        # Create context for the recipe
-        context = Context(
-            artifacts={
+        # Execute the generate_docpack recipe
+        context = await run_recipe(
+            RECIPE_PATH,
+            {
                 "model": settings.model_id,
                 "output_root": str(session_dir),
                 "document_description": prompt,
@@ -291,14 +307,9 @@ async def generate_docpack_from_prompt(
                 "docpack_name": docpack_name,
                 "recipe_root": str(RECIPE_ROOT),
             },
-            config=config,
+            session_id,
+            tmpdir,
         )
-        logger.info(f"Context artifacts: {context.dict()}")
-
-        # Execute the generate_docpack recipe
-        executor = Executor(recipe_logger)
-        logger.info(f"Executing recipe: {RECIPE_PATH}")
-        await executor.execute(str(RECIPE_PATH), context)
         logger.info("Recipe execution completed")
 
         # Get the generated files
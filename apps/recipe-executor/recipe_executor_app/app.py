@@ -1,11 +1,14 @@
 """Recipe Executor Gradio app."""
 
 import argparse
+import os
 from typing import Any, Dict, Optional
 
 import gradio as gr
 import gradio.themes
+from recipe_executor.job_pool import JobPool, get_job_pool
 from recipe_executor.logger import init_logger
+from recipe_executor.metrics import start_metrics_server, track_sessions
 
 from recipe_executor_app.config import settings
 from recipe_executor_app.core import RecipeExecutorCore
@@ -17,12 +20,23 @@ logger = init_logger(settings.log_dir)
 logger.setLevel(settings.log_level.upper())
 
 
+def get_app_job_pool() -> Optional[JobPool]:
+    """Get the shared worker pool for recipe runs, or None to run recipes in the request handler."""
+    if settings.workers <= 0:
+        return None
+    return get_job_pool(
+        workers=settings.workers,
+        max_queued=settings.max_queued_jobs,
+        log_root=os.path.join(settings.log_dir, "jobs"),
+    )
+
+
 def create_executor_block(
     core: Optional[RecipeExecutorCore] = None, include_header: bool = True, include_settings: bool = True
 ) -> gr.Blocks:
     """Create a reusable Recipe Executor block."""
     if core is None:
-        core = RecipeExecutorCore()
+        core = RecipeExecutorCore(job_pool=get_app_job_pool())
 
     theme = gradio.themes.Soft() if settings.theme == "soft" else None
 
@@ -53,10 +67,11 @@ def create_executor_block(
 
 def create_app() -> gr.Blocks:
     """Create the full Gradio app."""
-    core = RecipeExecutorCore()
+    core = RecipeExecutorCore(job_pool=get_app_job_pool())
 
     with gr.Blocks(title=settings.app_title) as app:
         create_executor_block(core)
+        track_sessions(app, "recipe-executor")
 
     return app
 
@@ -64,7 +79,7 @@ def create_app() -> gr.Blocks:
 def get_components(core: Optional[RecipeExecutorCore] = None) -> Dict[str, Any]:
     """Get reusable components for embedding."""
     if core is None:
-        core = RecipeExecutorCore()
+        core = RecipeExecutorCore(job_pool=get_app_job_pool())
 
     return {
         "create_executor_block": create_executor_block,
@@ -81,6 +96,10 @@ def main() -> None:
     parser.add_argument("--port", type=int, help="Port")
     parser.add_argument("--no-mcp", action="store_true", help="Disable MCP")
     parser.add_argument("--debug", action="store_true", help="Debug mode")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes for recipe runs (0 runs them in the request handler)"
+    )
 
     args = parser.parse_args()
 
@@ -93,6 +112,14 @@ def main() -> None:
         settings.mcp_server = False
     if args.debug:
         settings.debug = True
+    if args.metrics_port:
+        settings.metrics_port = args.metrics_port
+    if args.workers is not None:
+        settings.workers = args.workers
+
+    if settings.metrics_port:
+        start_metrics_server(settings.metrics_port)
+        logger.info(f"Metrics available at http://127.0.0.1:{settings.metrics_port}/metrics")
 
     # Launch app
     app = create_app()
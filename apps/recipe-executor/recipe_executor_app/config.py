@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     # Server settings
     host: str = "0.0.0.0"
     port: Optional[int] = None  # Let Gradio find an available port
+    metrics_port: Optional[int] = None  # Serve Prometheus metrics on 127.0.0.1:<port>/metrics when set
 
     # MCP settings
     mcp_server: bool = True
@@ -33,6 +34,11 @@ class Settings(BaseSettings):
     log_dir: str = "logs"
     log_level: str = "DEBUG"  # Use DEBUG, INFO, WARNING, ERROR, or CRITICAL
 
+    # Recipe jobs run in worker processes; 0 runs them in the request handler
+    workers: int = 2
+    max_queued_jobs: int = 16  # Jobs waiting for a worker before new ones are refused
+    job_poll_interval: float = 0.5  # Seconds between UI status updates while a job runs
+
     # Example recipes with context
     example_recipes: List[ExampleRecipe] = [
         ExampleRecipe(
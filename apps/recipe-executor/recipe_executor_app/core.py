@@ -3,19 +3,21 @@
 import json
 import logging
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
+from recipe_executor.job_pool import JobPool, JobQueueFullError
+from recipe_executor.utils import serialization
 
 from recipe_executor_app.utils import (
     create_temp_file,
+    describe_job,
     format_results,
     get_main_repo_root,
     get_repo_root,
     parse_context_vars,
     read_file,
-    safe_json_dumps,
 )
 from recipe_executor_app.settings_sidebar import get_model_string, get_setting
 
@@ -25,51 +27,79 @@ logger = logging.getLogger(__name__)
 class RecipeExecutorCore:
     """Core functionality for Recipe Executor operations."""
 
-    def __init__(self, executor: Optional[Executor] = None):
-        """Initialize with the executor."""
+    def __init__(self, executor: Optional[Executor] = None, job_pool: Optional[JobPool] = None):
+        """Initialize with the executor, and optionally a job pool to run recipes in worker processes."""
         self.executor = executor if executor is not None else Executor(logger)
+        self.job_pool = job_pool
         self.current_settings = {}
 
+    def _prepare_context(self, context_vars: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the context artifacts and configuration for a run."""
+        # Parse context
+        context_dict = parse_context_vars(context_vars)
+
+        # Add default paths if not provided by user
+        repo_root = get_repo_root()
+        main_repo_root = get_main_repo_root()
+
+        # Only set defaults if they weren't provided
+        if "recipe_root" not in context_dict and main_repo_root:
+            context_dict["recipe_root"] = os.path.join(main_repo_root, "recipes")
+
+        if "output_root" not in context_dict:
+            context_dict["output_root"] = os.path.join(repo_root, "output")
+
+        # Ensure output directory exists
+        if "output_root" in context_dict:
+            os.makedirs(context_dict["output_root"], exist_ok=True)
+
+        # Add model configuration from config/environment
+        model_str = get_model_string()
+        context_dict["model"] = model_str
+
+        # Add max_tokens if set in config/environment
+        max_tokens = get_setting("MAX_TOKENS")
+        if max_tokens:
+            try:
+                context_dict["max_tokens"] = int(max_tokens)
+            except ValueError:
+                pass
+
+        # Load configuration from environment
+        from recipe_executor.config import load_configuration
+
+        config = load_configuration()
+        return context_dict, config
+
+    def _format_run(self, all_artifacts: Dict[str, Any], execution_time: float) -> Dict[str, Any]:
+        """Format the final artifacts of a run."""
+        # Extract string results
+        results = {}
+        for key, value in all_artifacts.items():
+            if isinstance(value, str) and (key.startswith("output") or key.startswith("result")):
+                results[key] = value
+
+        return {
+            "formatted_results": format_results(results, execution_time),
+            "raw_json": serialization.dumps(all_artifacts, indent=True).decode("utf-8"),
+            "debug_context": all_artifacts,
+        }
+
+    def _error_result(self, error_msg: str) -> Dict[str, Any]:
+        """Create a standard error result."""
+        return {
+            "formatted_results": f"### Error\n\n```\n{error_msg}\n```",
+            "raw_json": "{}",
+            "debug_context": {"error": error_msg},
+        }
+
     async def execute_recipe(
         self, recipe_file: Optional[str], recipe_text: Optional[str], context_vars: Optional[str]
     ) -> Dict[str, Any]:
         """Execute a recipe from file or text input."""
         cleanup = None
         try:
-            # Parse context
-            context_dict = parse_context_vars(context_vars)
-
-            # Add default paths if not provided by user
-            repo_root = get_repo_root()
-            main_repo_root = get_main_repo_root()
-
-            # Only set defaults if they weren't provided
-            if "recipe_root" not in context_dict and main_repo_root:
-                context_dict["recipe_root"] = os.path.join(main_repo_root, "recipes")
-
-            if "output_root" not in context_dict:
-                context_dict["output_root"] = os.path.join(repo_root, "output")
-
-            # Ensure output directory exists
-            if "output_root" in context_dict:
-                os.makedirs(context_dict["output_root"], exist_ok=True)
-
-            # Add model configuration from config/environment
-            model_str = get_model_string()
-            context_dict["model"] = model_str
-
-            # Add max_tokens if set in config/environment
-            max_tokens = get_setting("MAX_TOKENS")
-            if max_tokens:
-                try:
-                    context_dict["max_tokens"] = int(max_tokens)
-                except ValueError:
-                    pass
-
-            # Load configuration from environment
-            from recipe_executor.config import load_configuration
-
-            config = load_configuration()
+            context_dict, config = self._prepare_context(context_vars)
 
             # Create context with both artifacts and config
             context = Context(artifacts=context_dict, config=config)
@@ -92,33 +122,68 @@ class RecipeExecutorCore:
             await self.executor.execute(recipe_source, context)
             execution_time = os.times().elapsed - start_time
 
-            # Get results
-            all_artifacts = context.dict()
-
-            # Extract string results
-            results = {}
-            for key, value in all_artifacts.items():
-                if isinstance(value, str) and (key.startswith("output") or key.startswith("result")):
-                    results[key] = value
-
-            return {
-                "formatted_results": format_results(results, execution_time),
-                "raw_json": safe_json_dumps(all_artifacts),
-                "debug_context": all_artifacts,
-            }
+            # Get results as plain JSON data (no deep copy; models such as FileSpec become dicts)
+            all_artifacts = serialization.loads(context.serialize())
+            return self._format_run(all_artifacts, execution_time)
 
         except Exception as e:
             logger.error(f"Error executing recipe: {e}", exc_info=True)
-            return {
-                "formatted_results": f"### Error\n\n```\n{str(e)}\n```",
-                "raw_json": "{}",
-                "debug_context": {"error": str(e)},
-            }
+            return self._error_result(str(e))
         finally:
             # Clean up temp file if created
             if cleanup:
                 cleanup()
 
+    def submit_recipe(
+        self,
+        recipe_file: Optional[str],
+        recipe_text: Optional[str],
+        context_vars: Optional[str],
+        session: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Queue a recipe run on the job pool; returns {"job_id": ...} or an error result."""
+        if self.job_pool is None:
+            return self._error_result("No job pool configured")
+        if not recipe_file and not recipe_text:
+            return {
+                "formatted_results": "### Error\nNo recipe provided.",
+                "raw_json": "{}",
+                "debug_context": {},
+            }
+        try:
+            context_dict, config = self._prepare_context(context_vars)
+            # Recipe text is sent as is; the executor parses JSON strings
+            recipe_source = recipe_file or recipe_text
+            job = self.job_pool.submit(recipe_source, context_dict, config, session=session)
+        except JobQueueFullError as e:
+            return self._error_result(str(e))
+        except Exception as e:
+            logger.error(f"Error submitting recipe: {e}", exc_info=True)
+            return self._error_result(str(e))
+        return {"job_id": job.id}
+
+    def job_status(self, job_id: str) -> Dict[str, Any]:
+        """Report a job's status, progress and logs, with its results once it has finished."""
+        job = self.job_pool.get(job_id) if self.job_pool is not None and job_id else None
+        if job is None:
+            return {"status": "unknown", **self._error_result(f"Unknown job: {job_id}")}
+
+        position = self.job_pool.position(job) if self.job_pool is not None else None
+        status = describe_job(job, position)
+        status["formatted_results"] = status["message"]
+        if job.status == "succeeded":
+            execution_time = (job.finished or 0.0) - (job.started or job.created)
+            status.update(self._format_run(serialization.to_jsonable(job.result or {}), execution_time))
+        elif job.status == "failed":
+            status.update(self._error_result(job.error or "Job failed"))
+        return status
+
+    def cancel_job(self, job_id: Optional[str]) -> bool:
+        """Cancel a queued or running job."""
+        if self.job_pool is None or not job_id:
+            return False
+        return self.job_pool.cancel(job_id)
+
     async def load_recipe(self, recipe_path: str) -> Dict[str, str]:
         """Load a recipe file and return content with preview."""
         try:
@@ -1,8 +1,10 @@
 """UI components for the Recipe Executor app."""
 
+import asyncio
 import io
 import json
 import logging
+from typing import Optional
 
 import gradio as gr
 
@@ -43,6 +45,8 @@ def create_ui(core: RecipeExecutorCore, include_header: bool = True):
                 )
 
             execute_btn = gr.Button("Execute Recipe", variant="primary", interactive=False)
+            cancel_btn = gr.Button("Cancel", variant="stop", visible=core.job_pool is not None)
+            job_id = gr.State(None)
 
         with gr.Column(scale=1):
             gr.Markdown("### Output")
@@ -55,8 +59,8 @@ def create_ui(core: RecipeExecutorCore, include_header: bool = True):
                     logs_output = gr.Textbox(label="Logs", lines=20, max_lines=30, interactive=False)
 
     # Set up event handlers
-    async def execute_with_logs(file, text, ctx, progress=gr.Progress()):
-        """Execute recipe with log capture."""
+    async def run_inline(file, text, ctx, progress):
+        """Execute recipe in the request handler with log capture."""
         # Capture logs
         log_capture = io.StringIO()
         handler = logging.StreamHandler(log_capture)
@@ -86,14 +90,52 @@ def create_ui(core: RecipeExecutorCore, include_header: bool = True):
             root_logger.removeHandler(handler)
             log_capture.close()
 
+    async def execute_with_logs(file, text, ctx, request: gr.Request, progress=gr.Progress()):
+        """Execute recipe, on the job pool when configured, streaming its status and logs."""
+        if core.job_pool is None:
+            yield (*await run_inline(file, text, ctx, progress), None)
+            return
+
+        # Jobs are queued per browser session, so sessions take turns on the workers
+        session = getattr(request, "session_hash", None) if request is not None else None
+        submitted = core.submit_recipe(file, text, ctx, session=session)
+        current: Optional[str] = submitted.get("job_id")
+        if current is None:
+            yield (submitted.get("formatted_results", ""), "", submitted.get("debug_context", {}), None)
+            return
+
+        try:
+            while True:
+                status = core.job_status(current)
+                progress(status.get("progress", 0.0), desc=status.get("progress_desc") or status["status"])
+                if status["status"] not in ("queued", "running"):
+                    context = safe_json_dumps(status.get("debug_context", {}))
+                    logs = status.get("logs", "")
+                    if status.get("log_dir"):
+                        logs += f"\n\nFull logs: {status['log_dir']}"
+                    yield (status.get("formatted_results", ""), logs, json.loads(context), None)
+                    return
+                yield (status.get("formatted_results", ""), status.get("logs", ""), gr.update(), current)
+                await asyncio.sleep(settings.job_poll_interval)
+        except asyncio.CancelledError:
+            # The page was closed or the event cancelled: do not leave the job running
+            core.cancel_job(current)
+            raise
+
     execute_btn.click(
         fn=execute_with_logs,
         inputs=[recipe_file, recipe_text, context_vars],
-        outputs=[result_output, logs_output, context_json],
+        outputs=[result_output, logs_output, context_json, job_id],
         api_name="execute_recipe",
         show_progress="full",
     )
 
+    def cancel_job(current):
+        """Cancel the running job; the execute handler reports it as cancelled."""
+        core.cancel_job(current)
+
+    cancel_btn.click(fn=cancel_job, inputs=[job_id], outputs=[])
+
     # Enable button when recipe is loaded
     recipe_text.change(fn=lambda x: gr.update(interactive=bool(x)), inputs=[recipe_text], outputs=[execute_btn])
 
@@ -5,6 +5,8 @@ import os
 import tempfile
 from typing import Any, Callable, Dict, Optional, Tuple
 
+from recipe_executor.job_pool import PoolJob
+
 
 def get_repo_root() -> str:
     """Get the repository root directory."""
@@ -81,6 +83,27 @@ def format_results(results: Dict[str, str], execution_time: float = 0.0) -> str:
     return "\n".join(md)
 
 
+def describe_job(job: PoolJob, position: Optional[int] = None) -> Dict[str, Any]:
+    """Describe a pool job for the UI: status, progress, logs and a markdown status message."""
+    message = ""
+    if job.status == "queued":
+        message = f"### Queued\n\n{position or 0} job(s) ahead of this one."
+    elif job.status == "running":
+        message = f"### Running\n\n{job.progress_desc or 'Starting...'}"
+    elif job.status == "cancelled":
+        message = "### Cancelled"
+    elif job.status == "failed":
+        message = f"### Error\n\n```\n{job.error or 'Job failed'}\n```"
+    return {
+        "status": job.status,
+        "progress": job.progress,
+        "progress_desc": job.progress_desc,
+        "logs": job.log_text(),
+        "log_dir": job.log_dir,
+        "message": message,
+    }
+
+
 def safe_json_dumps(obj: Any) -> str:
     """Safely convert object to JSON string."""
     try:
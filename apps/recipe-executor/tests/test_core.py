@@ -1,9 +1,12 @@
 """Tests for the RecipeExecutorCore class."""
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from recipe_executor.job_pool import JobPool, JobQueueFullError, PoolJob
 
+from recipe_executor_app.config import Settings
 from recipe_executor_app.core import RecipeExecutorCore
 
 
@@ -24,6 +27,39 @@ def recipe_core():
         yield core, mock_executor
 
 
+@pytest.fixture
+def job_pool():
+    """Create a fake JobPool; tests set what its methods return."""
+    return MagicMock(spec=JobPool)
+
+
+@pytest.fixture
+def pool_core(job_pool):
+    """Create a RecipeExecutorCore that runs recipes on the fake job pool."""
+    core = RecipeExecutorCore(executor=MagicMock(), job_pool=job_pool)
+    with patch.object(core, "_prepare_context", return_value=({"key1": "value1"}, {"openai_api_key": "test"})):
+        yield core
+
+
+def make_job(status, **fields):
+    """Create a pool job in the given status, as the pool would report it."""
+    job = PoolJob(
+        "/path/to/recipe.json",
+        {},
+        {},
+        session="session-1",
+        log_dir="logs/jobs/job-1",
+        log_level="INFO",
+        timeout=None,
+        max_log_lines=100,
+        job_id="job-1",
+    )
+    job.status = status
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return job
+
+
 class TestRecipeExecutorCore:
     """Tests for the RecipeExecutorCore class."""
 
@@ -35,12 +71,12 @@ class TestRecipeExecutorCore:
         recipe_file = "/path/to/recipe.json"
         context_vars = "key1=value1,key2=value2"
 
-        # Mock context.dict() to return a dictionary
+        # Mock context.serialize() to return the artifacts as JSON
         mock_executor.execute.return_value = None
         mock_context_dict = {"key1": "value1", "key2": "value2", "output": "Test output"}
         with patch("recipe_executor_app.core.Context") as mock_context_class:
             mock_context = MagicMock()
-            mock_context.dict.return_value = mock_context_dict
+            mock_context.serialize.return_value = json.dumps(mock_context_dict).encode()
             mock_context_class.return_value = mock_context
 
             # Execute
@@ -66,12 +102,12 @@ class TestRecipeExecutorCore:
         with patch("recipe_executor_app.core.create_temp_file") as mock_create_temp:
             mock_create_temp.return_value = (mock_temp_path, lambda: None)
 
-            # Mock context.dict() to return a dictionary
+            # Mock context.serialize() to return the artifacts as JSON
             mock_executor.execute.return_value = None
             mock_context_dict = {"key1": "value1", "result": "Test result"}
             with patch("recipe_executor_app.core.Context") as mock_context_class:
                 mock_context = MagicMock()
-                mock_context.dict.return_value = mock_context_dict
+                mock_context.serialize.return_value = json.dumps(mock_context_dict).encode()
                 mock_context_class.return_value = mock_context
 
                 # Execute
@@ -145,3 +181,127 @@ class TestRecipeExecutorCore:
 
     # Test removed - find_examples method no longer exists in RecipeExecutorCore
     # Examples are now configured through settings.example_recipes
+
+
+class TestRecipeExecutorCoreJobs:
+    """Tests for running recipes on a job pool."""
+
+    def test_submit_recipe(self, pool_core, job_pool):
+        """Test that a recipe is queued with the prepared context and session."""
+        job_pool.submit.return_value = make_job("queued")
+
+        result = pool_core.submit_recipe("/path/to/recipe.json", None, "key1=value1", session="session-1")
+
+        assert result == {"job_id": "job-1"}
+        job_pool.submit.assert_called_once_with(
+            "/path/to/recipe.json", {"key1": "value1"}, {"openai_api_key": "test"}, session="session-1"
+        )
+
+    def test_submit_recipe_queue_full(self, pool_core, job_pool):
+        """Test that a full queue is reported as an error instead of a job."""
+        job_pool.submit.side_effect = JobQueueFullError("Job queue is full (16 jobs waiting)")
+
+        result = pool_core.submit_recipe(None, '{"steps": []}', None)
+
+        assert "job_id" not in result
+        assert "### Error" in result["formatted_results"]
+        assert "Job queue is full (16 jobs waiting)" in result["formatted_results"]
+
+    def test_submit_recipe_no_input(self, pool_core, job_pool):
+        """Test submitting without a recipe file or text."""
+        result = pool_core.submit_recipe(None, None, None)
+
+        assert "No recipe provided" in result["formatted_results"]
+        job_pool.submit.assert_not_called()
+
+    def test_job_status_unknown_job(self, pool_core, job_pool):
+        """Test the status of a job the pool does not know."""
+        job_pool.get.return_value = None
+
+        status = pool_core.job_status("missing")
+
+        assert status["status"] == "unknown"
+        assert "Unknown job: missing" in status["formatted_results"]
+        job_pool.get.assert_called_once_with("missing")
+
+    def test_job_status_queued(self, pool_core, job_pool):
+        """Test that a queued job reports its place in the queue."""
+        job_pool.get.return_value = make_job("queued")
+        job_pool.position.return_value = 2
+
+        status = pool_core.job_status("job-1")
+
+        assert status["status"] == "queued"
+        assert status["formatted_results"] == "### Queued\n\n2 job(s) ahead of this one."
+        assert status["log_dir"] == "logs/jobs/job-1"
+
+    def test_job_status_succeeded(self, pool_core, job_pool):
+        """Test that a succeeded job reports its results and run time."""
+        result = {"output": "Test output", "count": 3}
+        job_pool.get.return_value = make_job(
+            "succeeded", result=result, progress=1.0, created=100.0, started=101.0, finished=103.5
+        )
+        job_pool.position.return_value = None
+
+        status = pool_core.job_status("job-1")
+
+        assert status["status"] == "succeeded"
+        assert status["progress"] == 1.0
+        assert "**Execution Time**: 2.50s" in status["formatted_results"]
+        assert "Test output" in status["formatted_results"]
+        assert status["debug_context"] == result
+        assert json.loads(status["raw_json"]) == result
+
+    def test_job_status_failed(self, pool_core, job_pool):
+        """Test that a failed job reports its error."""
+        job_pool.get.return_value = make_job("failed", error="ValueError: Test error")
+        job_pool.position.return_value = None
+
+        status = pool_core.job_status("job-1")
+
+        assert status["status"] == "failed"
+        assert status["formatted_results"] == "### Error\n\n```\nValueError: Test error\n```"
+        assert status["debug_context"] == {"error": "ValueError: Test error"}
+
+    def test_job_status_cancelled(self, pool_core, job_pool):
+        """Test that a cancelled job is reported as cancelled, without results."""
+        job_pool.get.return_value = make_job("cancelled")
+        job_pool.position.return_value = None
+
+        status = pool_core.job_status("job-1")
+
+        assert status["status"] == "cancelled"
+        assert status["formatted_results"] == "### Cancelled"
+        assert "debug_context" not in status
+
+    def test_cancel_job(self, pool_core, job_pool):
+        """Test cancelling a job through the pool."""
+        job_pool.cancel.return_value = True
+
+        assert pool_core.cancel_job("job-1") is True
+        assert pool_core.cancel_job(None) is False
+        job_pool.cancel.assert_called_once_with("job-1")
+
+    def test_without_job_pool(self, recipe_core):
+        """Test that job methods report errors when no pool is configured."""
+        core, _ = recipe_core
+
+        assert "No job pool configured" in core.submit_recipe("/path/to/recipe.json", None, None)["formatted_results"]
+        assert core.job_status("job-1")["status"] == "unknown"
+        assert core.cancel_job("job-1") is False
+
+
+def test_app_job_pool_defaults_to_two_workers():
+    """Test that the app runs recipes on two worker processes unless configured otherwise."""
+    from recipe_executor_app.app import get_app_job_pool
+
+    assert Settings().workers == 2
+    with (
+        patch("recipe_executor_app.app.settings", Settings()),
+        patch("recipe_executor_app.app.get_job_pool") as mock_get_job_pool,
+    ):
+        assert get_app_job_pool() is mock_get_job_pool.return_value
+        assert mock_get_job_pool.call_args.kwargs["workers"] == 2
+
+    with patch("recipe_executor_app.app.settings", Settings(workers=0)):
+        assert get_app_job_pool() is None
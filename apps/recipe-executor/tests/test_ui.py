@@ -1,5 +1,6 @@
 """Tests for the UI module."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -88,3 +89,85 @@ class TestCreateUI:
         mock_markdown.assert_called()
         mock_dropdown.assert_called_once()  # New: Examples dropdown
         mock_json.assert_called_once()
+
+
+@pytest.fixture
+def mock_gradio():
+    """Patch the Gradio components used by create_ui; yields the Button mock and the settings."""
+    names = ["Row", "Column", "Markdown", "File", "Code", "Accordion", "Textbox", "Tabs", "TabItem", "JSON", "Dropdown"]
+    with (
+        patch.multiple("gradio", **{name: MagicMock() for name in names}),
+        patch("gradio.Button") as mock_button,
+        patch("recipe_executor_app.config.settings") as mock_settings,
+    ):
+        mock_settings.example_recipes = []
+        mock_settings.job_poll_interval = 60.0
+        yield mock_button, mock_settings
+
+
+def registered_handler(mock_button, name):
+    """Find the event handler registered on a button by its function name."""
+    handlers = [call.kwargs["fn"] for call in mock_button.return_value.click.call_args_list]
+    return next(fn for fn in handlers if fn.__name__ == name)
+
+
+class TestJobPoolHandlers:
+    """Tests for the UI handlers when recipes run on a job pool."""
+
+    @pytest.mark.asyncio
+    async def test_closing_the_page_cancels_the_running_job(self, mock_gradio, mock_recipe_core):
+        """Test that cancelling the execute handler while it polls a job cancels the job."""
+        mock_button, _ = mock_gradio
+        mock_recipe_core.submit_recipe.return_value = {"job_id": "job-1"}
+        mock_recipe_core.job_status.return_value = {
+            "status": "running",
+            "progress": 0.5,
+            "progress_desc": "Step 2/4",
+            "formatted_results": "### Running\n\nStep 2/4",
+            "logs": "started",
+        }
+        create_ui(mock_recipe_core)
+        execute = registered_handler(mock_button, "execute_with_logs")
+
+        request = MagicMock(session_hash="session-1")
+        updates = execute(None, '{"steps": []}', "", request, progress=MagicMock())
+        first = await updates.__anext__()
+        assert first[0] == "### Running\n\nStep 2/4"
+        assert first[3] == "job-1"
+        mock_recipe_core.submit_recipe.assert_called_once_with(None, '{"steps": []}', "", session="session-1")
+
+        # The next update waits for the poll interval; Gradio cancels the handler when the page closes
+        polling = asyncio.ensure_future(updates.__anext__())
+        await asyncio.sleep(0)
+        polling.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await polling
+        mock_recipe_core.cancel_job.assert_called_once_with("job-1")
+
+    @pytest.mark.asyncio
+    async def test_finished_job_reports_results_and_logs(self, mock_gradio, mock_recipe_core):
+        """Test that the execute handler stops polling once the job has finished."""
+        mock_button, _ = mock_gradio
+        mock_recipe_core.submit_recipe.return_value = {"job_id": "job-1"}
+        mock_recipe_core.job_status.return_value = {
+            "status": "cancelled",
+            "formatted_results": "### Cancelled",
+            "logs": "started",
+            "log_dir": "logs/jobs/job-1",
+        }
+        create_ui(mock_recipe_core)
+        execute = registered_handler(mock_button, "execute_with_logs")
+
+        updates = [update async for update in execute(None, '{"steps": []}', "", None, progress=MagicMock())]
+
+        assert updates == [("### Cancelled", "started\n\nFull logs: logs/jobs/job-1", {}, None)]
+        mock_recipe_core.cancel_job.assert_not_called()
+
+    def test_cancel_button_cancels_the_current_job(self, mock_gradio, mock_recipe_core):
+        """Test that the Cancel button cancels the job the execute handler is polling."""
+        mock_button, _ = mock_gradio
+        create_ui(mock_recipe_core)
+
+        registered_handler(mock_button, "cancel_job")("job-1")
+
+        mock_recipe_core.cancel_job.assert_called_once_with("job-1")
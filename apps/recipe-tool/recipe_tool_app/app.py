@@ -1,11 +1,14 @@
 """Recipe Tool Gradio app."""
 
 import argparse
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Optional
 
 import gradio as gr
 import gradio.themes
+from recipe_executor.job_pool import JobPool, get_job_pool
 from recipe_executor.logger import init_logger
+from recipe_executor.metrics import start_metrics_server, track_sessions
 from recipe_executor_app.app import create_executor_block
 from recipe_executor_app.core import RecipeExecutorCore
 
@@ -19,12 +22,26 @@ logger = init_logger(settings.log_dir)
 logger.setLevel(settings.log_level.upper())
 
 
+def get_app_job_pool() -> Optional[JobPool]:
+    """Get the shared worker pool for recipe runs, or None to run recipes in the request handler."""
+    if settings.workers <= 0:
+        return None
+    return get_job_pool(
+        workers=settings.workers,
+        max_queued=settings.max_queued_jobs,
+        log_root=os.path.join(settings.log_dir, "jobs"),
+    )
+
+
 def create_app() -> gr.Blocks:
     """Create the Recipe Tool app."""
-    recipe_core = RecipeToolCore()
+    job_pool = get_app_job_pool()
+    recipe_core = RecipeToolCore(job_pool=job_pool)
     theme = gradio.themes.Soft() if settings.theme == "soft" else None  # type: ignore
 
     with gr.Blocks(title=settings.app_title, theme=theme) as app:
+        track_sessions(app, "recipe-tool")
+
         gr.Markdown("# Recipe Tool")
         gr.Markdown("A web interface for executing and creating recipes.")
 
@@ -47,7 +64,7 @@ def create_app() -> gr.Blocks:
 
             # Execute Recipe Tab (reuse from recipe-executor)
             with gr.TabItem("Execute Recipe"):
-                executor_core = RecipeExecutorCore()
+                executor_core = RecipeExecutorCore(job_pool=job_pool)
                 create_executor_block(executor_core, include_header=False, include_settings=False)
 
     return app
@@ -60,6 +77,10 @@ def main() -> None:
     parser.add_argument("--port", type=int, help="Port")
     parser.add_argument("--no-mcp", action="store_true", help="Disable MCP")
     parser.add_argument("--debug", action="store_true", help="Debug mode")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes for recipe runs (0 runs them in the request handler)"
+    )
 
     args = parser.parse_args()
 
@@ -72,6 +93,14 @@ def main() -> None:
         settings.mcp_server = False
     if args.debug:
         settings.debug = True
+    if args.metrics_port:
+        settings.metrics_port = args.metrics_port
+    if args.workers is not None:
+        settings.workers = args.workers
+
+    if settings.metrics_port:
+        start_metrics_server(settings.metrics_port)
+        logger.info(f"Metrics available at http://127.0.0.1:{settings.metrics_port}/metrics")
 
     # Launch app
     app = create_app()
@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     # Server settings
     host: str = "0.0.0.0"
     port: Optional[int] = None  # Let Gradio find an available port
+    metrics_port: Optional[int] = None  # Serve Prometheus metrics on 127.0.0.1:<port>/metrics when set
     # Queue is enabled by default in Gradio
 
     # MCP settings
@@ -36,6 +37,11 @@ class Settings(BaseSettings):
         "DEBUG"  # Use DEBUG, INFO, WARNING, ERROR, or CRITICAL - Set to DEBUG for detailed path information
     )
 
+    # Recipe jobs run in worker processes; 0 runs them in the request handler
+    workers: int = 2
+    max_queued_jobs: int = 16  # Jobs waiting for a worker before new ones are refused
+    job_poll_interval: float = 0.5  # Seconds between UI status updates while a job runs
+
     # Example ideas (for recipe creator)
     example_ideas: List[ExampleIdea] = [
         ExampleIdea(
@@ -2,12 +2,15 @@
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
+from recipe_executor.job_pool import JobPool
+from recipe_executor.utils import serialization
 from recipe_executor_app.utils import (
     create_temp_file,
+    describe_job,
     parse_context_vars,
 )
 
@@ -24,9 +27,59 @@ logger = logging.getLogger(__name__)
 class RecipeToolCore:
     """Core functionality for Recipe Tool operations."""
 
-    def __init__(self, executor: Optional[Executor] = None):
-        """Initialize with the executor."""
+    def __init__(self, executor: Optional[Executor] = None, job_pool: Optional[JobPool] = None):
+        """Initialize with the executor, and optionally a job pool to run recipes in worker processes."""
         self.executor = executor if executor is not None else Executor(logger)
+        self.job_pool = job_pool
+
+    def _prepare_context(
+        self, idea_source: str, reference_files: Optional[List[str]], context_vars: Optional[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the context artifacts and configuration for a recipe creator run."""
+        # Prepare context
+        context_dict = parse_context_vars(context_vars)
+        context_dict = prepare_context_paths(context_dict)
+
+        # Add reference files
+        if reference_files:
+            context_dict["files"] = ",".join(reference_files)
+
+        # Add input
+        context_dict["input"] = idea_source
+
+        # Add model configuration from config/environment
+        model_str = get_model_string()
+        context_dict["model"] = model_str
+
+        # Add max_tokens if set in config/environment
+        from recipe_tool_app.settings_sidebar import get_setting
+
+        max_tokens = get_setting("MAX_TOKENS")
+        if max_tokens:
+            try:
+                context_dict["max_tokens"] = str(int(max_tokens))
+            except ValueError:
+                pass
+
+        # Load configuration from environment
+        from recipe_executor.config import load_configuration
+
+        config = load_configuration()
+        return context_dict, config
+
+    def _process_run(self, final_context: Dict[str, Any], execution_time: float) -> Dict[str, Any]:
+        """Find the generated recipe in the final context and build the result."""
+        output_recipe = find_recipe_output(final_context)
+
+        if not output_recipe:
+            return {
+                "recipe_json": "",
+                "structure_preview": "### Recipe created\nBut no output found. Check output directory.",
+                "debug_context": serialization.to_jsonable(final_context),
+            }
+
+        # Process and return results
+        return process_recipe_output(output_recipe, execution_time, serialization.to_jsonable(final_context))
 
     async def create_recipe(
         self,
@@ -57,35 +110,7 @@ class RecipeToolCore:
             return self._error_result("No idea provided")
 
         try:
-            # Prepare context
-            context_dict = parse_context_vars(context_vars)
-            context_dict = prepare_context_paths(context_dict)
-
-            # Add reference files
-            if reference_files:
-                context_dict["files"] = ",".join(reference_files)
-
-            # Add input
-            context_dict["input"] = idea_source
-
-            # Add model configuration from config/environment
-            model_str = get_model_string()
-            context_dict["model"] = model_str
-
-            # Add max_tokens if set in config/environment
-            from recipe_tool_app.settings_sidebar import get_setting
-
-            max_tokens = get_setting("MAX_TOKENS")
-            if max_tokens:
-                try:
-                    context_dict["max_tokens"] = str(int(max_tokens))
-                except ValueError:
-                    pass
-
-            # Load configuration from environment
-            from recipe_executor.config import load_configuration
-
-            config = load_configuration()
+            context_dict, config = self._prepare_context(idea_source, reference_files, context_vars)
 
             # Create context with both artifacts and config
             context = Context(artifacts=context_dict, config=config)
@@ -100,21 +125,8 @@ class RecipeToolCore:
             await self.executor.execute(creator_path, context)
             execution_time = os.times().elapsed - start_time
 
-            # Get results
-            final_context = context.dict()
-
-            # Find generated recipe
-            output_recipe = find_recipe_output(final_context)
-
-            if not output_recipe:
-                return {
-                    "recipe_json": "",
-                    "structure_preview": "### Recipe created\nBut no output found. Check output directory.",
-                    "debug_context": final_context,
-                }
-
-            # Process and return results
-            return process_recipe_output(output_recipe, execution_time, final_context)
+            # Get results and find the generated recipe
+            return self._process_run(context.dict(), execution_time)
 
         except Exception as e:
             logger.error(f"Error creating recipe: {e}", exc_info=True)
@@ -123,6 +135,90 @@ class RecipeToolCore:
             if cleanup_fn:
                 cleanup_fn()
 
+    def submit_create_recipe(
+        self,
+        idea_text: str,
+        idea_file: Optional[str],
+        reference_files: Optional[List[str]],
+        context_vars: Optional[str],
+        session: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Queue a recipe creator run on the job pool.
+
+        Args:
+            idea_text: Recipe idea as text
+            idea_file: Path to file containing recipe idea
+            reference_files: List of reference file paths
+            context_vars: Context variables as key=value pairs
+            session: Session the job belongs to (sessions take turns on the workers)
+
+        Returns:
+            {"job_id": ...}, or an error result
+        """
+        if self.job_pool is None:
+            return self._error_result("No job pool configured")
+
+        cleanup_fn = None
+        if idea_file:
+            idea_source = idea_file
+        elif idea_text:
+            idea_source, cleanup_fn = create_temp_file(idea_text, suffix=".md")
+        else:
+            return self._error_result("No idea provided")
+
+        try:
+            context_dict, config = self._prepare_context(idea_source, reference_files, context_vars)
+
+            creator_path = find_recipe_creator()
+            if not creator_path:
+                raise ValueError("Recipe creator not found")
+
+            job = self.job_pool.submit(creator_path, context_dict, config, session=session)
+        except Exception as e:
+            logger.error(f"Error submitting recipe creation: {e}", exc_info=True)
+            if cleanup_fn:
+                cleanup_fn()
+            return self._error_result(str(e))
+
+        if cleanup_fn:
+            # The worker reads the idea file; remove it once the job is over
+            remove_idea = cleanup_fn
+            job.add_done_callback(lambda _: remove_idea())
+        return {"job_id": job.id}
+
+    def create_recipe_status(self, job_id: str) -> Dict[str, Any]:
+        """Report a recipe creator job's status, progress and logs, with its results once it has finished.
+
+        Args:
+            job_id: Job ID returned by submit_create_recipe
+
+        Returns:
+            Status dictionary with recipe_json, structure_preview and debug_context
+        """
+        job = self.job_pool.get(job_id) if self.job_pool is not None and job_id else None
+        if job is None:
+            return {"status": "unknown", **self._error_result(f"Unknown job: {job_id}")}
+
+        position = self.job_pool.position(job) if self.job_pool is not None else None
+        status = describe_job(job, position)
+        status.update({"recipe_json": "", "structure_preview": status["message"], "debug_context": {}})
+        if job.status == "succeeded":
+            execution_time = (job.finished or 0.0) - (job.started or job.created)
+            try:
+                status.update(self._process_run(job.result or {}, execution_time))
+            except Exception as e:
+                logger.error(f"Error processing recipe creation result: {e}", exc_info=True)
+                status.update(self._error_result(str(e)))
+        elif job.status == "failed":
+            status.update(self._error_result(job.error or "Job failed"))
+        return status
+
+    def cancel_job(self, job_id: Optional[str]) -> bool:
+        """Cancel a queued or running job."""
+        if self.job_pool is None or not job_id:
+            return False
+        return self.job_pool.cancel(job_id)
+
     def _error_result(self, error_msg: str) -> Dict[str, Any]:
         """Create a standard error result.
 
@@ -36,13 +36,15 @@ def find_recipe_output(context_dict: Dict[str, Any]) -> Optional[str]:
     # Get the first generated recipe file (FileSpec object)
     first_recipe = generated_recipe[0]
 
-    # Extract path from FileSpec object
-    if not hasattr(first_recipe, "path"):
+    # Extract path from FileSpec object (a plain dict in results from job pool workers)
+    if isinstance(first_recipe, dict):
+        recipe_filename = first_recipe.get("path")
+    else:
+        recipe_filename = getattr(first_recipe, "path", None)
+    if not recipe_filename:
         logger.error(f"Recipe item doesn't have path attribute: {type(first_recipe)}")
         return None
 
-    recipe_filename = first_recipe.path
-
     # Build the full path
     output_root = context_dict.get("output_root", "output")
     file_path = os.path.join(output_root, recipe_filename)
@@ -48,6 +48,8 @@ def create_recipe_ui(core: RecipeToolCore) -> Tuple:
                 )
 
             create_btn = gr.Button("Create Recipe", variant="primary")
+            cancel_btn = gr.Button("Cancel", variant="stop", visible=core.job_pool is not None)
+            job_id = gr.State(None)
 
         with gr.Column(scale=1):
             gr.Markdown("### Output")
@@ -61,34 +63,66 @@ def create_recipe_ui(core: RecipeToolCore) -> Tuple:
 
     # Set up event handler
     import asyncio
+    import time
 
-    def create_recipe_handler(text: str, file, refs, ctx: Optional[str]):
-        """Wrapper to handle async function in Gradio."""
+    def create_recipe_handler(text: str, file, refs, ctx: Optional[str], request: gr.Request, progress=gr.Progress()):
+        """Create a recipe, on the job pool when configured, streaming its status."""
         try:
             # Handle Gradio file input
             file_path = file.name if file else None
             ref_paths = [f.name for f in refs] if refs else None
 
-            # Use asyncio.run() which properly manages the event loop
-            result = asyncio.run(core.create_recipe(text, file_path, ref_paths, ctx))
-            return (
-                result.get("recipe_json", ""),
-                result.get("structure_preview", ""),
-                result.get("debug_context", {}),
-            )
+            if core.job_pool is None:
+                # Use asyncio.run() which properly manages the event loop
+                result = asyncio.run(core.create_recipe(text, file_path, ref_paths, ctx))
+                yield (
+                    result.get("recipe_json", ""),
+                    result.get("structure_preview", ""),
+                    result.get("debug_context", {}),
+                    None,
+                )
+                return
+
+            # Jobs are queued per browser session, so sessions take turns on the workers
+            session = getattr(request, "session_hash", None) if request is not None else None
+            submitted = core.submit_create_recipe(text, file_path, ref_paths, ctx, session=session)
+            current = submitted.get("job_id")
+            if current is None:
+                yield ("", submitted.get("structure_preview", ""), submitted.get("debug_context", {}), None)
+                return
+
+            while True:
+                status = core.create_recipe_status(current)
+                progress(status.get("progress", 0.0), desc=status.get("progress_desc") or status["status"])
+                if status["status"] not in ("queued", "running"):
+                    yield (
+                        status.get("recipe_json", ""),
+                        status.get("structure_preview", ""),
+                        status.get("debug_context", {}),
+                        None,
+                    )
+                    return
+                yield (gr.update(), status.get("structure_preview", ""), gr.update(), current)
+                time.sleep(settings.job_poll_interval)
         except Exception as e:
             import traceback
 
             error_msg = f"Error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-            return ("", f"### Error\n```\n{error_msg}\n```", {"error": str(e)})
+            yield ("", f"### Error\n```\n{error_msg}\n```", {"error": str(e)}, None)
 
     create_btn.click(
         fn=create_recipe_handler,
         inputs=[idea_text, idea_file, reference_files, context_vars],
-        outputs=[recipe_output, preview_md, debug_context],
+        outputs=[recipe_output, preview_md, debug_context, job_id],
         api_name="create_recipe",
     )
 
+    def cancel_job(current):
+        """Cancel the running job; the create handler reports it as cancelled."""
+        core.cancel_job(current)
+
+    cancel_btn.click(fn=cancel_job, inputs=[job_id], outputs=[])
+
     # Set up example loading
     def load_example(example_idx):
         if example_idx is None:
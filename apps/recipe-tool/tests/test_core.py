@@ -3,7 +3,10 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from recipe_executor.job_pool import JobPool, JobQueueFullError, PoolJob
+from recipe_executor.models import FileSpec
 
+from recipe_tool_app.config import Settings
 from recipe_tool_app.core import RecipeToolCore
 
 
@@ -21,6 +24,42 @@ def core_instance(mock_executor):
     return RecipeToolCore(executor=mock_executor)
 
 
+@pytest.fixture
+def job_pool():
+    """Create a fake JobPool; tests set what its methods return."""
+    return MagicMock(spec=JobPool)
+
+
+@pytest.fixture
+def pool_core(mock_executor, job_pool):
+    """Create a RecipeToolCore that runs the recipe creator on the fake job pool."""
+    core = RecipeToolCore(executor=mock_executor, job_pool=job_pool)
+    with (
+        patch.object(core, "_prepare_context", return_value=({"input": "/path/to/idea.md"}, {})),
+        patch("recipe_tool_app.core.find_recipe_creator", return_value="/path/to/create.json"),
+    ):
+        yield core
+
+
+def make_job(status, **fields):
+    """Create a pool job in the given status, as the pool would report it."""
+    job = PoolJob(
+        "/path/to/create.json",
+        {},
+        {},
+        session="session-1",
+        log_dir="logs/jobs/job-1",
+        log_level="INFO",
+        timeout=None,
+        max_log_lines=100,
+        job_id="job-1",
+    )
+    job.status = status
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return job
+
+
 @pytest.mark.asyncio
 async def test_create_recipe_from_text(core_instance, mock_executor):
     """Test creating a recipe from text."""
@@ -39,11 +78,10 @@ async def test_create_recipe_from_text(core_instance, mock_executor):
             # Mock Context
             with patch("recipe_tool_app.core.Context") as mock_context_class:
                 mock_context = MagicMock()
-                # Create a mock FileSpec object
-                mock_filespec = MagicMock()
-                mock_filespec.path = "test_recipe.json"
+                # The generated recipe FileSpec, which the result's debug context serializes
+                filespec = FileSpec(path="test_recipe.json", content="")
                 mock_context.dict.return_value = {
-                    "generated_recipe": [mock_filespec],
+                    "generated_recipe": [filespec],
                     "output_root": "output",
                 }
                 mock_context_class.return_value = mock_context
@@ -78,11 +116,10 @@ async def test_create_recipe_from_file(core_instance, mock_executor):
         # Mock Context
         with patch("recipe_tool_app.core.Context") as mock_context_class:
             mock_context = MagicMock()
-            # Create a mock FileSpec object
-            mock_filespec = MagicMock()
-            mock_filespec.path = "test_recipe.json"
+            # The generated recipe FileSpec, which the result's debug context serializes
+            filespec = FileSpec(path="test_recipe.json", content="")
             mock_context.dict.return_value = {
-                "generated_recipe": [mock_filespec],
+                "generated_recipe": [filespec],
                 "output_root": "output",
             }
             mock_context_class.return_value = mock_context
@@ -208,3 +245,108 @@ def test_generate_preview():
     assert "write" in preview
     assert "Read files" in preview
     assert "Write output" in preview
+
+
+def test_submit_create_recipe(pool_core, job_pool):
+    """Test that the recipe creator is queued with the prepared context and session."""
+    job_pool.submit.return_value = make_job("queued")
+
+    result = pool_core.submit_create_recipe("", "/path/to/idea.md", None, None, session="session-1")
+
+    assert result == {"job_id": "job-1"}
+    job_pool.submit.assert_called_once_with(
+        "/path/to/create.json", {"input": "/path/to/idea.md"}, {}, session="session-1"
+    )
+
+
+def test_submit_create_recipe_queue_full(pool_core, job_pool):
+    """Test that a full queue is reported as an error and the idea file is removed."""
+    job_pool.submit.side_effect = JobQueueFullError("Job queue is full (16 jobs waiting)")
+    cleanup = MagicMock()
+
+    with patch("recipe_tool_app.core.create_temp_file", return_value=("/tmp/idea.md", cleanup)):
+        result = pool_core.submit_create_recipe("Test idea", None, None, None)
+
+    assert "job_id" not in result
+    assert result["structure_preview"] == "### Error\nJob queue is full (16 jobs waiting)"
+    cleanup.assert_called_once()
+
+
+def test_create_recipe_status_unknown_job(pool_core, job_pool):
+    """Test the status of a job the pool does not know."""
+    job_pool.get.return_value = None
+
+    status = pool_core.create_recipe_status("missing")
+
+    assert status["status"] == "unknown"
+    assert "Unknown job: missing" in status["structure_preview"]
+
+
+def test_create_recipe_status_succeeded(pool_core, job_pool):
+    """Test that a succeeded job reports the generated recipe from its results."""
+    # Worker processes return plain JSON data, so FileSpec objects arrive as dicts
+    result = {"generated_recipe": [{"path": "test_recipe.json", "content": "..."}], "output_root": "output"}
+    job_pool.get.return_value = make_job("succeeded", result=result, created=100.0, started=101.0, finished=103.5)
+    job_pool.position.return_value = None
+
+    with patch(
+        "recipe_tool_app.recipe_processor.read_file", return_value='{"name": "Test Recipe", "steps": []}'
+    ) as mock_read:
+        status = pool_core.create_recipe_status("job-1")
+
+    mock_read.assert_called_once_with("output/test_recipe.json")
+    assert status["status"] == "succeeded"
+    assert status["recipe_json"] == '{"name": "Test Recipe", "steps": []}'
+    assert "**Execution Time**: 2.50 seconds" in status["structure_preview"]
+    assert "**Name**: Test Recipe" in status["structure_preview"]
+    assert status["debug_context"] == result
+
+
+def test_create_recipe_status_failed(pool_core, job_pool):
+    """Test that a failed job reports its error."""
+    job_pool.get.return_value = make_job("failed", error="ValueError: Test error")
+    job_pool.position.return_value = None
+
+    status = pool_core.create_recipe_status("job-1")
+
+    assert status["status"] == "failed"
+    assert status["recipe_json"] == ""
+    assert status["structure_preview"] == "### Error\nValueError: Test error"
+    assert status["debug_context"] == {"error": "ValueError: Test error"}
+
+
+def test_create_recipe_status_cancelled(pool_core, job_pool):
+    """Test that a cancelled job is reported as cancelled, without a recipe."""
+    job_pool.get.return_value = make_job("cancelled")
+    job_pool.position.return_value = None
+
+    status = pool_core.create_recipe_status("job-1")
+
+    assert status["status"] == "cancelled"
+    assert status["structure_preview"] == "### Cancelled"
+    assert (status["recipe_json"], status["debug_context"]) == ("", {})
+
+
+def test_cancel_job(pool_core, job_pool):
+    """Test cancelling a job through the pool."""
+    job_pool.cancel.return_value = True
+
+    assert pool_core.cancel_job("job-1") is True
+    assert pool_core.cancel_job(None) is False
+    job_pool.cancel.assert_called_once_with("job-1")
+
+
+def test_app_job_pool_defaults_to_two_workers():
+    """Test that the app runs recipes on two worker processes unless configured otherwise."""
+    from recipe_tool_app.app import get_app_job_pool
+
+    assert Settings().workers == 2
+    with (
+        patch("recipe_tool_app.app.settings", Settings()),
+        patch("recipe_tool_app.app.get_job_pool") as mock_get_job_pool,
+    ):
+        assert get_app_job_pool() is mock_get_job_pool.return_value
+        assert mock_get_job_pool.call_args.kwargs["workers"] == 2
+
+    with patch("recipe_tool_app.app.settings", Settings(workers=0)):
+        assert get_app_job_pool() is None
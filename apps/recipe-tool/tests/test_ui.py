@@ -80,9 +80,9 @@ class TestCreateRecipeUI:
         assert mock_code.call_count == 2  # idea_text and recipe_output
         assert mock_file.call_count == 2  # idea_file and reference_files
         mock_textbox.assert_called_once()  # context_vars
-        assert mock_button.call_count == 2  # create_btn + load_example_btn
+        assert mock_button.call_count == 3  # create_btn + cancel_btn + load_example_btn
         mock_dropdown.assert_called_once()  # example_dropdown
         mock_json.assert_called_once()  # debug_context
 
         # Verify click events were set up
-        assert mock_button.return_value.click.call_count == 2
+        assert mock_button.return_value.click.call_count == 3
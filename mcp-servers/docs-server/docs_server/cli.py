@@ -9,6 +9,7 @@ from typing import List, Optional
 from dotenv import load_dotenv
 
 from .config import DocsServerSettings
+from .metrics import serve_metrics
 from .server import create_docs_server
 
 # Load environment variables from .env if present
@@ -95,6 +96,12 @@ Examples:
         help="Port for SSE server (default: 3003)",
     )
 
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: disabled)",
+    )
+
     parser.add_argument(
         "--no-cache",
         action="store_true",
@@ -138,6 +145,9 @@ Examples:
         # Create and run the server
         mcp = create_docs_server(settings)
 
+        if args.metrics_port is not None:
+            print(f"Metrics URL: {serve_metrics(args.metrics_port)}", file=sys.stderr)
+
         print(f"Starting Documentation MCP server with {args.transport} transport")
         print(f"Documentation paths: {', '.join(str(p) for p in settings.doc_paths)}")
         print(f"Include patterns: {', '.join(settings.include_patterns)}")
@@ -0,0 +1,30 @@
+"""Optional Prometheus metrics, provided by recipe-executor (install the "metrics" extra)."""
+
+from typing import Any, Callable
+
+try:
+    from recipe_executor.metrics import instrument_tool, start_metrics_server
+except ImportError:  # Metrics are optional
+    start_metrics_server = None
+
+    def instrument_tool(server: str) -> Callable[[Any], Any]:  # type: ignore[misc]
+        """Leave tools uninstrumented when metrics are not installed."""
+        return lambda fn: fn
+
+
+def serve_metrics(port: int) -> str:
+    """Serve metrics on a local /metrics endpoint.
+
+    Args:
+        port: The port for the metrics endpoint
+
+    Returns:
+        The metrics URL
+
+    Raises:
+        RuntimeError: If the metrics extra is not installed
+    """
+    if start_metrics_server is None:
+        raise RuntimeError("Metrics require the 'metrics' extra (pip install 'docs-mcp-server[metrics]')")
+    start_metrics_server(port)
+    return f"http://127.0.0.1:{port}/metrics"
@@ -7,6 +7,7 @@ from mcp.server.fastmcp import FastMCP
 
 from .config import DocsServerSettings
 from .loader import DocumentLoader
+from .metrics import instrument_tool
 
 
 def create_docs_server(settings: DocsServerSettings) -> FastMCP:
@@ -15,6 +16,7 @@ def create_docs_server(settings: DocsServerSettings) -> FastMCP:
     loader = DocumentLoader(settings)
 
     @mcp.tool()
+    @instrument_tool("docs-server")
     async def list_docs() -> List[str]:
         """
         List all available documentation files.
@@ -65,6 +67,7 @@ def create_docs_server(settings: DocsServerSettings) -> FastMCP:
         return result
 
     @mcp.tool()
+    @instrument_tool("docs-server")
     async def read_doc(file_path: str) -> str:
         """
         Read the contents of a documentation file.
@@ -151,6 +154,7 @@ def create_docs_server(settings: DocsServerSettings) -> FastMCP:
         return content
 
     @mcp.tool()
+    @instrument_tool("docs-server")
     async def search_docs(query: str, max_results: int = 10) -> List[dict]:
         """
         Search for documentation files containing the specified query.
@@ -198,6 +202,7 @@ def create_docs_server(settings: DocsServerSettings) -> FastMCP:
         return formatted_results
 
     @mcp.tool()
+    @instrument_tool("docs-server")
     async def get_doc_stats() -> dict:
         """
         Get statistics about the documentation.
@@ -244,6 +249,7 @@ def create_docs_server(settings: DocsServerSettings) -> FastMCP:
         }
 
     @mcp.tool()
+    @instrument_tool("docs-server")
     async def clear_cache() -> str:
         """
         Clear the documentation cache and force a refresh.
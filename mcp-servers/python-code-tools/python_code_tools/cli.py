@@ -5,6 +5,7 @@ import sys
 from typing import List, Optional
 
 from python_code_tools.server import create_mcp_server
+from python_code_tools.utils.metrics import serve_metrics
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -33,6 +34,11 @@ def main(argv: Optional[List[str]] = None) -> int:
         default=3001,
         help="Port for SSE server (default: 3001)",
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: disabled)",
+    )
 
     args = parser.parse_args(argv)
 
@@ -40,6 +46,9 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Create the MCP server with the specified settings
         mcp = create_mcp_server(host=args.host, port=args.port)
 
+        if args.metrics_port is not None:
+            print(f"Metrics URL: {serve_metrics(args.metrics_port)}", file=sys.stderr)
+
         # Run the server with the appropriate transport
         print(f"Starting Python Code Tools MCP server with {args.transport} transport")
         if args.transport == "sse":
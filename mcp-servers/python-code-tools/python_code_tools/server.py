@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
 
 from python_code_tools.linters import RuffLinter, RuffProjectLinter
+from python_code_tools.utils.metrics import instrument_tool
 
 
 def create_mcp_server(host: str = "localhost", port: int = 3001) -> FastMCP:
@@ -27,6 +28,7 @@ def create_mcp_server(host: str = "localhost", port: int = 3001) -> FastMCP:
     project_linter = RuffProjectLinter()
 
     @mcp.tool()
+    @instrument_tool("python-code-tools")
     async def lint_code(code: str, fix: bool = True, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Lint Python code and optionally fix issues.
 
@@ -42,6 +44,7 @@ def create_mcp_server(host: str = "localhost", port: int = 3001) -> FastMCP:
         return result.model_dump()
 
     @mcp.tool()
+    @instrument_tool("python-code-tools")
     async def lint_project(
         project_path: str,
         file_patterns: Optional[List[str]] = None,
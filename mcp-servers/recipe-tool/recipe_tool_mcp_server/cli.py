@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from recipe_executor.metrics import instrument_tool, start_metrics_server
 
 from recipe_tool import create_recipe as cli_create
 from recipe_tool import execute_recipe as cli_execute
@@ -19,6 +20,7 @@ def create_mcp_server(host: str = "localhost", port: int = 3002) -> FastMCP:
     mcp = FastMCP("Recipe Tool Server")
 
     @mcp.tool()
+    @instrument_tool("recipe-tool")
     async def execute_recipe(recipe_path: str, context: dict[str, str] | None = None, log_dir: str = "logs") -> str:
         """
         Execute a recipe JSON file.
@@ -30,6 +32,7 @@ def create_mcp_server(host: str = "localhost", port: int = 3002) -> FastMCP:
         return f"Recipe executed successfully (logs in {log_dir})"
 
     @mcp.tool()
+    @instrument_tool("recipe-tool")
     async def create_recipe(idea_path: str, context: dict[str, str] | None = None, log_dir: str = "logs") -> str:
         """
         Create a recipe from an idea file.
@@ -69,6 +72,11 @@ def main(argv: Optional[List[str]] = None) -> int:
         default=3002,
         help="Port for SSE server (default: 3002)",
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: disabled)",
+    )
 
     args = parser.parse_args(argv)
 
@@ -76,6 +84,10 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Create the MCP server with the specified settings
         mcp = create_mcp_server(host=args.host, port=args.port)
 
+        if args.metrics_port is not None:
+            start_metrics_server(args.metrics_port)
+            print(f"Metrics URL: http://127.0.0.1:{args.metrics_port}/metrics", file=sys.stderr)
+
         # Run the server with the appropriate transport
         print(f"Starting Recipe Tool MCP server with {args.transport} transport")
         if args.transport == "sse":
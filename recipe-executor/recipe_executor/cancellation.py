@@ -0,0 +1,112 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Deadlines and cancellation scopes for recipe execution.
+
+`CancelScope` runs a block under an optional timeout that is tightened by any enclosing
+scope's deadline. The active deadline lives in a context variable, so it propagates to
+nested executors (execute_recipe, conditional) and to tasks spawned by loop and parallel
+steps, which then time out by themselves even if their parent is not awaiting them.
+"""
+
+import asyncio
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Iterable, Optional, Type
+
+__all__ = ["CancelScope", "cancel_and_wait", "current_deadline", "remaining_time"]
+
+# Event-loop time (`loop.time()`) by which the current work must finish, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("recipe_executor_deadline", default=None)
+
+
+def current_deadline() -> Optional[float]:
+    """
+    Return the active deadline in event-loop time, or None if there is none.
+    """
+    return _deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Return the seconds left before the active deadline (never negative), or None if there is none.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+class CancelScope:
+    """
+    Async context manager that cancels its block when `timeout` seconds pass or an enclosing
+    deadline is reached, raising TimeoutError from the outermost scope whose deadline expired.
+
+    Usage:
+        scope = CancelScope(30)
+        try:
+            async with scope:
+                await step.execute(context)
+        except TimeoutError:
+            if scope.own_deadline_expired():
+                ...
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"Timeout must not be negative, got {timeout}")
+        self.timeout = timeout
+        self.deadline: Optional[float] = None
+        self._own = False
+        self._timeout: Optional[asyncio.Timeout] = None
+        self._token: Optional[Token] = None
+
+    async def __aenter__(self) -> "CancelScope":
+        loop = asyncio.get_running_loop()
+        outer = _deadline.get()
+        own = None if self.timeout is None else loop.time() + self.timeout
+        if own is not None and (outer is None or own < outer):
+            self.deadline, self._own = own, True
+        else:
+            self.deadline = outer
+        self._token = _deadline.set(self.deadline)
+        self._timeout = asyncio.timeout_at(self.deadline)
+        await self._timeout.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> Optional[bool]:
+        if self._token is not None:
+            _deadline.reset(self._token)
+            self._token = None
+        assert self._timeout is not None
+        return await self._timeout.__aexit__(exc_type, exc, tb)
+
+    def expired(self) -> bool:
+        """
+        Return True if this scope's deadline (its own or an inherited one) cancelled the block.
+        """
+        return self._timeout is not None and self._timeout.expired()
+
+    def own_deadline_expired(self) -> bool:
+        """
+        Return True if the block was cancelled by this scope's own timeout rather than an enclosing deadline.
+        """
+        return self._own and self.expired()
+
+
+async def cancel_and_wait(tasks: Iterable["asyncio.Future[object]"]) -> None:
+    """
+    Cancel unfinished tasks and wait until they have finished, so their `finally` blocks,
+    semaphores, subprocesses and connections are released before returning. Exceptions of
+    failed tasks are retrieved (and dropped) so they are not reported as unhandled.
+    """
+    tasks = list(tasks)
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,252 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Record/replay cassettes for LLM and MCP interactions.
+
+In record mode every `LLM.generate` request and response (with token usage and timing) and
+every MCP tool call is appended to a cassette file, one JSON line per interaction. In replay
+mode the same requests are served back from the cassette, through a stub model and an
+in-memory MCP transport, without contacting any provider or server. Recipes such as the
+document and codebase generators can then be benchmarked and profiled offline, repeatably,
+optionally with the original latencies.
+
+The active cassette is held in a ContextVar, so it applies to the runs started inside
+`use_cassette` (including the tasks they create).
+"""
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from recipe_executor.utils import serialization
+from recipe_executor.utils.singleflight import request_key
+
+__all__ = [
+    "Cassette",
+    "CassetteMissError",
+    "current_cassette",
+    "replay_model",
+    "replay_transport",
+    "use_cassette",
+]
+
+MODES = ("record", "replay")
+KINDS = ("llm", "mcp")
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode for a request that the cassette does not contain.
+    """
+
+
+class Cassette:
+    """
+    A file of recorded LLM and MCP interactions.
+
+    Each line is one interaction:
+        {"kind": "llm" | "mcp", "key": ..., "request": {...}, "response": {...}, "duration": seconds}
+
+    Requests are matched by key, a hash of their inputs. A request issued several times is
+    served its recorded responses in order, and the last one again once they run out.
+
+    Usage:
+        with Cassette("logs/run.cassette.jsonl", "record") as cassette, use_cassette(cassette):
+            await Executor(logger).execute(recipe, context)
+    """
+
+    def __init__(self, path: str, mode: str, latency: bool = False) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Invalid cassette mode '{mode}', expected one of {', '.join(MODES)}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.recorded = 0
+        self.replayed = 0
+        self._interactions: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file: Optional[IO[bytes]] = None
+        if mode == "record":
+            self._file = open(path, "wb")
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    interaction = serialization.loads(line)
+                    key = interaction["key"]
+                except (ValueError, KeyError, TypeError) as exc:
+                    raise ValueError(f"Invalid cassette '{self.path}' line {number}: {exc}") from exc
+                self._interactions.setdefault(key, deque()).append(interaction)
+
+    @staticmethod
+    def key(kind: str, request: Dict[str, Any]) -> str:
+        if kind not in KINDS:
+            raise ValueError(f"Invalid interaction kind '{kind}', expected one of {', '.join(KINDS)}")
+        return request_key(kind, request)
+
+    def record(self, kind: str, request: Dict[str, Any], response: Any, duration: float) -> None:
+        """
+        Append an interaction to the cassette file.
+        """
+        if self._file is None:
+            raise RuntimeError(f"Cassette '{self.path}' is not open for recording")
+        interaction = {
+            "kind": kind,
+            "key": self.key(kind, request),
+            "request": request,
+            "response": response,
+            "duration": round(duration, 3),
+        }
+        line = serialization.dumps(interaction) + b"\n"
+        with self._lock:
+            if self._file.closed:
+                raise RuntimeError(f"Cassette '{self.path}' is closed")
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+
+    def replay(self, kind: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the next recorded interaction for a request.
+
+        Raises:
+            CassetteMissError: If the cassette has no interaction for the request.
+        """
+        key = self.key(kind, request)
+        with self._lock:
+            pending = self._interactions.get(key)
+            if pending:
+                interaction = pending.popleft()
+                self._last[key] = interaction
+            elif key in self._last:
+                interaction = self._last[key]
+            else:
+                summary = serialization.dumps(request).decode("utf-8")
+                if len(summary) > 300:
+                    summary = summary[:300] + "..."
+                raise CassetteMissError(f"No recorded {kind} interaction in cassette '{self.path}' for {summary}")
+            self.replayed += 1
+        return interaction
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+current_cassette: ContextVar[Optional[Cassette]] = ContextVar("recipe_executor_cassette", default=None)
+
+
+@contextmanager
+def use_cassette(cassette: Optional[Cassette]) -> Iterator[Optional[Cassette]]:
+    """
+    Record or replay the LLM and MCP interactions of the runs started inside this block.
+    """
+    token = current_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        current_cassette.reset(token)
+
+
+def replay_model(interaction: Dict[str, Any], latency: bool = False) -> Any:
+    """
+    Build a stub pydantic-ai model answering with a recorded LLM response: the recorded text,
+    or a final-result tool call with the recorded structured output, and the recorded usage.
+    With `latency`, the response is delayed by the original call duration.
+    """
+    # Imported on first use so that importing this module does not load pydantic-ai
+    from pydantic_ai.messages import ModelMessage, ModelResponse, ModelResponsePart, TextPart, ToolCallPart
+    from pydantic_ai.models.function import AgentInfo, FunctionModel
+    from pydantic_ai.usage import Usage
+
+    response = interaction.get("response") or {}
+    output = response.get("output")
+    usage = response.get("usage") or {}
+    details = {
+        "cached_tokens": usage.get("cache_read", 0),
+        "cache_creation_input_tokens": usage.get("cache_write", 0),
+    }
+
+    async def respond(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if latency:
+            await asyncio.sleep(interaction.get("duration") or 0)
+        parts: List[ModelResponsePart]
+        if isinstance(output, str) or not info.output_tools:
+            parts = [TextPart(output if isinstance(output, str) else serialization.dumps(output).decode("utf-8"))]
+        else:
+            parts = [ToolCallPart(info.output_tools[0].name, output)]
+        return ModelResponse(
+            parts=parts,
+            usage=Usage(
+                requests=usage.get("requests", 1),
+                request_tokens=usage.get("request_tokens"),
+                response_tokens=usage.get("response_tokens"),
+                total_tokens=usage.get("total_tokens"),
+                details={key: value for key, value in details.items() if value},
+            ),
+        )
+
+    return FunctionModel(respond, model_name=interaction.get("request", {}).get("model"))
+
+
+@asynccontextmanager
+async def replay_transport(interaction: Dict[str, Any], latency: bool = False) -> AsyncIterator[Any]:
+    """
+    In-memory MCP transport whose server answers tool calls with a recorded result. Yields
+    `(read_stream, write_stream)` like the stdio and SSE clients, for a `ClientSession`.
+    """
+    # Imported on first use so that importing this module does not load the MCP SDK
+    import anyio
+    from mcp import types
+    from mcp.server.lowlevel import Server
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    recorded = types.CallToolResult.model_validate(interaction.get("response") or {"content": []})
+    tool = interaction.get("request", {}).get("tool", "")
+    server: Server = Server("cassette-replay")
+
+    @server.list_tools()
+    async def list_tools() -> List[types.Tool]:
+        return [types.Tool(name=tool, inputSchema={"type": "object"})]
+
+    @server.call_tool()
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> List[Any]:
+        if latency:
+            await asyncio.sleep(interaction.get("duration") or 0)
+        if recorded.isError:
+            # The low-level server reports a raised error as an isError result
+            raise RuntimeError(" ".join(getattr(item, "text", "") for item in recorded.content))
+        return list(recorded.content)
+
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                lambda: server.run(
+                    server_streams[0],
+                    server_streams[1],
+                    server.create_initialization_options(),
+                )
+            )
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
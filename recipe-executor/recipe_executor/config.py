@@ -62,6 +62,11 @@ class RecipeExecutorConfig(BaseSettings):
         alias="AZURE_CLIENT_ID",
         description="Client ID for Azure managed identity",
     )
+    azure_token_cache_path: Optional[str] = Field(
+        default=None,
+        alias="AZURE_TOKEN_CACHE_PATH",
+        description="File caching Azure AD tokens for reuse by other processes and runs",
+    )
 
     # Ollama Settings
     ollama_base_url: str = Field(
@@ -69,6 +74,77 @@ class RecipeExecutorConfig(BaseSettings):
         alias="OLLAMA_BASE_URL",
         description="Base URL for Ollama API",
     )
+    ollama_keep_alive: Optional[str] = Field(
+        default=None,
+        alias="OLLAMA_KEEP_ALIVE",
+        description="How long Ollama keeps a model loaded after a request (e.g. '30m', '-1' for always)",
+    )
+    ollama_num_parallel: Optional[int] = Field(
+        default=None,
+        alias="OLLAMA_NUM_PARALLEL",
+        description="Parallel request slots per model of the Ollama server; requests beyond them wait client-side",
+    )
+    ollama_prewarm: bool = Field(
+        default=False,
+        alias="OLLAMA_PREWARM",
+        description="Load each Ollama model once before its first request",
+    )
+
+    # Model Pools: logical model name -> backends, used with model ids like "pool/<name>"
+    model_pools: Optional[Dict[str, Any]] = Field(
+        default=None,
+        alias="MODEL_POOLS",
+        description="JSON mapping of model pool names to their backends and routing strategy",
+    )
+
+    # LLM Retry Settings
+    llm_max_attempts: int = Field(
+        default=3,
+        alias="LLM_MAX_ATTEMPTS",
+        description="Maximum attempts per LLM call for transient errors (1 disables retries)",
+    )
+    llm_retry_initial_delay: float = Field(
+        default=1.0,
+        alias="LLM_RETRY_INITIAL_DELAY",
+        description="Initial backoff in seconds between LLM call retries",
+    )
+    llm_retry_max_delay: float = Field(
+        default=30.0,
+        alias="LLM_RETRY_MAX_DELAY",
+        description="Maximum backoff in seconds between LLM call retries",
+    )
+    llm_deadline: Optional[float] = Field(
+        default=None,
+        alias="LLM_DEADLINE",
+        description="Overall time budget in seconds for an LLM call, across retries",
+    )
+    llm_hedge: bool = Field(
+        default=False,
+        alias="LLM_HEDGE",
+        description="Send a duplicate request when an LLM call exceeds the recent p95 latency",
+    )
+    request_coalescing: bool = Field(
+        default=True,
+        alias="REQUEST_COALESCING",
+        description="Share one call among identical concurrent LLM requests and MCP tool calls",
+    )
+
+    # Artifact Spilling
+    artifact_spill_threshold: Optional[int] = Field(
+        default=None,
+        alias="ARTIFACT_SPILL_THRESHOLD",
+        description="Store context artifacts larger than this many bytes on disk instead of in memory",
+    )
+    artifact_memory_cap: Optional[int] = Field(
+        default=None,
+        alias="ARTIFACT_MEMORY_CAP",
+        description="Spill the largest context artifacts to disk when those in memory exceed this many bytes",
+    )
+    artifact_store_dir: Optional[str] = Field(
+        default=None,
+        alias="ARTIFACT_STORE_DIR",
+        description="Directory for spilled artifacts (defaults to a temporary directory removed at exit)",
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="RECIPE_EXECUTOR_",
@@ -1,18 +1,33 @@
 # This file was generated by Codebase-Generator, do not edit directly
-from typing import Any, Dict, Iterator, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional
 import copy
-import json
+import weakref
 
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils import serialization
+from recipe_executor.utils.artifacts import ArtifactStore, SpilledArtifact, estimate_size, get_artifact_store
 
 __all__ = ["Context"]
 
 
+def _release_memory(store: ArtifactStore, usage: List[int]) -> None:
+    # Return a discarded context's in-memory bytes to its store's shared total
+    store.adjust(-usage[0])
+    usage[0] = 0
+
+
 class Context(ContextProtocol):
     """
     Context is a shared state container for the Recipe Executor system.
     It provides a dictionary-like interface for runtime artifacts and
     holds a separate configuration store.
+
+    When the configuration sets `artifact_spill_threshold` or `artifact_memory_cap`, large
+    artifact values are kept on disk and loaded transparently when read. Reading a spilled
+    string or bytes value returns a copy; a spilled list, dict or other mutable value is
+    brought back into memory when read, so in-place changes to it are kept like for any
+    other artifact (until a later write spills it again to respect the memory cap).
+    The memory cap applies to all contexts sharing the artifact store, clones included.
     """
 
     def __init__(
@@ -23,27 +38,101 @@ class Context(ContextProtocol):
         # Deep copy initial data to avoid side effects from external modifications
         self._artifacts: Dict[str, Any] = copy.deepcopy(artifacts) if artifacts is not None else {}
         self._config: Dict[str, Any] = copy.deepcopy(config) if config is not None else {}
+        self._init_store()
+
+    def _init_store(self, sizes: Optional[Dict[str, int]] = None) -> None:
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer is not None:
+            finalizer()
+        self._store: Optional[ArtifactStore] = get_artifact_store(self._config)
+        # Estimated sizes of the artifacts held in memory, tracked only when spilling is enabled;
+        # their sum is also counted in the store's shared total until this context is discarded
+        self._sizes: Dict[str, int] = {}
+        self._usage: List[int] = [0]
+        self._finalizer: Optional[weakref.finalize] = None
+        if self._store is not None:
+            self._finalizer = weakref.finalize(self, _release_memory, self._store, self._usage)
+            if sizes is not None:
+                for key, size in sizes.items():
+                    self._set_size(key, size)
+            else:
+                for key, value in self._artifacts.items():
+                    self._track(key, value)
+            self._enforce_cap()
+
+    def _set_size(self, key: str, size: Optional[int]) -> None:
+        assert self._store is not None
+        delta = (size or 0) - self._sizes.pop(key, 0)
+        if size is not None:
+            self._sizes[key] = size
+        if delta:
+            self._usage[0] += delta
+            self._store.adjust(delta)
+
+    def _track(self, key: str, value: Any) -> Any:
+        """
+        Record a stored value's size, spilling it when it exceeds the threshold.
+        """
+        assert self._store is not None
+        if isinstance(value, SpilledArtifact):
+            self._set_size(key, None)
+            return value
+        size = estimate_size(value)
+        if self._store.should_spill(size):
+            handle = self._store.spill(value)
+            if handle is not None:
+                self._artifacts[key] = handle
+                self._set_size(key, None)
+                return handle
+        self._set_size(key, size)
+        return value
+
+    def _enforce_cap(self) -> None:
+        # Spill this context's largest in-memory artifacts while the store is over its cap
+        assert self._store is not None
+        for key in sorted(self._sizes, key=self._sizes.__getitem__, reverse=True):
+            if not self._store.over_cap():
+                break
+            handle = self._store.spill(self._artifacts[key])
+            if handle is not None:
+                self._artifacts[key] = handle
+                self._set_size(key, None)
+
+    def _load(self, key: str, handle: SpilledArtifact) -> Any:
+        value = handle.load()
+        if not isinstance(value, (str, bytes)):
+            # Keep mutable values in memory so in-place changes are not lost
+            self._artifacts[key] = value
+            if self._store is not None:
+                self._set_size(key, estimate_size(value))
+        return value
 
     def __getitem__(self, key: str) -> Any:
         """
         Retrieve an artifact by key. Raises KeyError if not found.
         """
         try:
-            return self._artifacts[key]
+            value = self._artifacts[key]
         except KeyError:
             raise KeyError(f"Key '{key}' not found in Context.")
+        return self._load(key, value) if isinstance(value, SpilledArtifact) else value
 
     def __setitem__(self, key: str, value: Any) -> None:
         """
         Store or overwrite an artifact value by key.
         """
         self._artifacts[key] = value
+        if self._store is not None:
+            self._track(key, value)
+            self._enforce_cap()
 
     def __delitem__(self, key: str) -> None:
         """
         Remove an artifact by key. KeyError propagates if key is missing.
         """
         del self._artifacts[key]
+        if self._store is not None:
+            self._set_size(key, None)
 
     def __contains__(self, key: object) -> bool:
         """
@@ -73,26 +162,53 @@ class Context(ContextProtocol):
         """
         Get the value for key if present, otherwise return default.
         """
-        return self._artifacts.get(key, default)
+        if key not in self._artifacts:
+            return default
+        value = self._artifacts[key]
+        return self._load(key, value) if isinstance(value, SpilledArtifact) else value
 
     def clone(self) -> ContextProtocol:
         """
         Create a deep copy of this Context, including artifacts and config.
         """
-        # __init__ deep-copies provided dicts
-        return Context(artifacts=self._artifacts, config=self._config)
+        # Spilled artifacts are shared by handle rather than copied
+        clone = Context.__new__(Context)
+        clone._artifacts = copy.deepcopy(self._artifacts)
+        clone._config = copy.deepcopy(self._config)
+        # The copies count against the shared memory cap too
+        clone._init_store(self._sizes)
+        return clone
 
     def dict(self) -> Dict[str, Any]:  # noqa: A003
         """
-        Return a deep copy of the artifacts as a standard dict.
+        Return a deep copy of the artifacts as a standard dict, with spilled artifacts loaded.
         """
-        return copy.deepcopy(self._artifacts)
+        artifacts = copy.deepcopy(self._artifacts)
+        for key, value in artifacts.items():
+            if isinstance(value, SpilledArtifact):
+                artifacts[key] = value.load()
+        return artifacts
 
     def json(self) -> str:
         """
         Return a JSON string representation of the artifacts.
         """
-        return json.dumps(self.dict())
+        return self.serialize().decode("utf-8")
+
+    def serialize(self, format: str = "json", lossless: bool = False, indent: bool = False) -> bytes:
+        """
+        Serialize the artifacts to JSON or MessagePack without copying them.
+
+        Pydantic models and bytes are supported; with `lossless=True` they are restored by
+        `serialization.loads`, e.g. `Context(artifacts=serialization.loads(data, format, lossless=True))`.
+        """
+        return serialization.dumps(self._artifacts, format, lossless, indent)
+
+    def dump(self, fp: IO[bytes], format: str = "json", lossless: bool = False) -> None:
+        """
+        Stream the artifacts to a binary file object, one artifact at a time.
+        """
+        serialization.dump(self._artifacts, fp, format, lossless)
 
     def get_config(self) -> Dict[str, Any]:
         """
@@ -105,3 +221,4 @@ class Context(ContextProtocol):
         Replace the configuration store with a deep copy of the provided dict.
         """
         self._config = copy.deepcopy(config)
+        self._init_store()
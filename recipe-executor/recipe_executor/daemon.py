@@ -0,0 +1,652 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Daemon component for the Recipe Executor.
+
+Runs a long-lived process that keeps imports, model pools and the recipe/template caches
+warm, and accepts recipe jobs over a small local HTTP API. Jobs run concurrently, each with
+its own context and logger, and their logs and status can be streamed back as
+newline-delimited JSON.
+
+Jobs can run arbitrary commands (e.g. MCP stdio servers), so the API is only for the user who
+started the daemon: by default it listens on a Unix socket readable by its owner only; on TCP,
+every request needs the daemon's bearer token. Requests with a foreign Host or Origin header
+(DNS rebinding, browser pages) and POSTs that are not `application/json` are rejected, and
+inline recipes and config overrides are refused unless enabled.
+
+API:
+    GET    /health            Daemon status and job counts
+    GET    /metrics           Runtime metrics in the Prometheus text format
+    GET    /jobs              List jobs
+    POST   /jobs              Submit a job: {"recipe", "cwd", "context", "config", "outputs", "log_level", "timeout"}
+    GET    /jobs/{id}         Job status (with the requested outputs once finished)
+    GET    /jobs/{id}/events  Stream job events (logs, status changes and lifecycle events) until the job finishes
+    DELETE /jobs/{id}         Cancel a job
+"""
+
+import argparse
+import asyncio
+import hmac
+import importlib
+import json
+import logging
+import os
+import secrets
+import stat
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+from recipe_executor.config import load_configuration
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.logger import init_logger
+from recipe_executor.metrics import CONTENT_TYPE, QUEUE_WAIT, REGISTRY, enable_metrics
+from recipe_executor.models import Recipe
+from recipe_executor.utils.memory import RssMonitor
+from recipe_executor.utils.singleflight import get_coalesce_stats
+from recipe_executor.utils import serialization
+
+from recipe_executor.steps.registry import STEP_REGISTRY
+
+__all__ = ["DEFAULT_SOCKET", "DEFAULT_TOKEN_FILE", "MAX_BODY_BYTES", "Job", "RecipeDaemon", "load_token", "main"]
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+# Per-user locations shared with the client (daemon_client.py keeps its own copy)
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".recipe-executor")
+DEFAULT_SOCKET = os.path.join(DEFAULT_STATE_DIR, "daemon.sock")
+DEFAULT_TOKEN_FILE = os.path.join(DEFAULT_STATE_DIR, "daemon.token")
+TOKEN_ENV = "RECIPE_EXECUTOR_DAEMON_TOKEN"
+# Largest request body the daemon reads (job submissions are small JSON documents)
+MAX_BODY_BYTES = 1024 * 1024
+# Provider modules preloaded at start-up (steps are preloaded from the registry)
+_WARM_MODULES = (
+    "recipe_executor.llm_utils.llm",
+    "recipe_executor.llm_utils.azure_openai",
+    "recipe_executor.llm_utils.mcp",
+    "pydantic_ai.models.anthropic",
+    "pydantic_ai.models.openai",
+)
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Error",
+}
+
+
+class Job:
+    """
+    A recipe job submitted to the daemon.
+    """
+
+    def __init__(
+        self,
+        recipe: Union[str, Dict[str, Any]],
+        artifacts: Dict[str, Any],
+        config: Dict[str, Any],
+        outputs: List[str],
+        log_level: str,
+        timeout: Optional[float] = None,
+        max_events: int = 10000,
+    ) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.recipe = recipe
+        self.artifacts = artifacts
+        self.config = config
+        self.outputs = outputs
+        self.log_level = log_level
+        self.timeout = timeout
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.result: Dict[str, Any] = {}
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # Peak process RSS while the job ran (shared by jobs running at the same time)
+        self.peak_rss: Optional[int] = None
+        # The most recent events; `event_count` counts all events, including those dropped
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.event_count = 0
+        self.task: Optional[asyncio.Task] = None
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """
+        Append an event and wake up event streams (safe to call from other threads).
+        """
+        self.events.append(event)
+        self.event_count += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._notify()
+        else:
+            self._loop.call_soon_threadsafe(self._notify)
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.add_event({"type": "status", "time": time.time(), **self.summary()})
+
+    def summary(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "status": self.status,
+            "recipe": self.recipe if isinstance(self.recipe, str) else "<inline>",
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "peak_rss": self.peak_rss,
+            "error": self.error,
+        }
+        if self.done and self.outputs:
+            data["outputs"] = self.result
+        return data
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class _JobLogHandler(logging.Handler):
+    """
+    Logging handler that records log lines as job events.
+    """
+
+    def __init__(self, job: Job) -> None:
+        super().__init__()
+        self.job = job
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = str(record.msg)
+        self.job.add_event({"type": "log", "time": record.created, "level": record.levelname, "message": message})
+
+
+class RecipeDaemon:
+    """
+    Keeps a warm process and runs recipe jobs concurrently.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        max_jobs: int = 4,
+        keep_jobs: int = 100,
+        token: Optional[str] = None,
+        allow_inline_recipes: bool = False,
+        allow_config_overrides: bool = False,
+        max_events: int = 10000,
+    ) -> None:
+        """
+        Args:
+            logger: Daemon logger; job loggers propagate to it.
+            max_jobs: Maximum number of jobs running at once (0 for no limit).
+            keep_jobs: Number of finished jobs kept for status queries.
+            token: Bearer token required on every request (required to serve on TCP).
+            allow_inline_recipes: Accept recipe objects in job requests, not only recipe files.
+            allow_config_overrides: Accept `config` overrides in job requests.
+            max_events: Events kept per job for event streams (older events are dropped).
+        """
+        self.logger = logger
+        self.keep_jobs = keep_jobs
+        self.token = token
+        self.allow_inline_recipes = allow_inline_recipes
+        self.allow_config_overrides = allow_config_overrides
+        self.max_events = max_events
+        # Accepted Host header values, set when the server starts
+        self.allowed_hosts: Set[str] = {"localhost"}
+        self.jobs: Dict[str, Job] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_jobs) if max_jobs > 0 else None
+        self._recipes: Dict[str, Tuple[float, Recipe]] = {}
+
+    def warm_up(self) -> None:
+        """
+        Import every registered step and the LLM provider modules so that jobs do not pay for them.
+        """
+        start = time.time()
+        for step_type in list(STEP_REGISTRY):
+            try:
+                STEP_REGISTRY[step_type]
+            except Exception as exc:
+                self.logger.warning("Could not preload step '%s': %s", step_type, exc)
+        for module_name in _WARM_MODULES:
+            try:
+                importlib.import_module(module_name)
+            except Exception as exc:
+                self.logger.warning("Could not preload module '%s': %s", module_name, exc)
+        self.logger.info("Preloaded steps and LLM providers in %.2f seconds", time.time() - start)
+
+    def load_recipe(self, recipe: Union[str, Dict[str, Any]]) -> Recipe:
+        """
+        Load a recipe from a file path (cached until the file changes) or an inline dict.
+        """
+        if isinstance(recipe, dict):
+            return Recipe.model_validate(recipe)
+        path = os.path.abspath(recipe)
+        mtime = os.path.getmtime(path)
+        cached = self._recipes.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        model = Recipe.model_validate_json(Path(path).read_text(encoding="utf-8"))
+        self._recipes[path] = (mtime, model)
+        return model
+
+    def submit(self, request: Dict[str, Any]) -> Job:
+        """
+        Validate a job request and start running it.
+
+        Raises:
+            ValueError: If the request is invalid.
+        """
+        recipe = request.get("recipe")
+        if not isinstance(recipe, (str, dict)) or not recipe:
+            raise ValueError("Job request requires 'recipe' (a file path or a recipe object)")
+        if isinstance(recipe, dict) and not self.allow_inline_recipes:
+            raise ValueError("Inline recipes are disabled; start the daemon with --allow-inline-recipes")
+        cwd = request.get("cwd")
+        if cwd is not None and (not isinstance(cwd, str) or not os.path.isabs(cwd)):
+            raise ValueError("'cwd' must be an absolute path")
+        if isinstance(recipe, str):
+            # Relative recipe paths are relative to the client's working directory
+            recipe = os.path.normpath(os.path.join(cwd or os.getcwd(), recipe))
+            if not os.path.isfile(recipe):
+                raise ValueError(f"Recipe file not found: {recipe}")
+        artifacts = request.get("context") or {}
+        config = request.get("config") or {}
+        outputs = request.get("outputs") or []
+        if not isinstance(artifacts, dict) or not isinstance(config, dict) or not isinstance(outputs, list):
+            raise ValueError("'context' and 'config' must be objects and 'outputs' a list")
+        if config and not self.allow_config_overrides:
+            raise ValueError("Config overrides are disabled; start the daemon with --allow-config-overrides")
+        timeout = request.get("timeout")
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("'timeout' must be a positive number of seconds")
+
+        job = Job(
+            recipe,
+            artifacts,
+            config,
+            [str(key) for key in outputs],
+            str(request.get("log_level", "INFO")),
+            timeout,
+            self.max_events,
+        )
+        self.jobs[job.id] = job
+        job.add_event({"type": "status", "time": job.created, **job.summary()})
+        if cwd is not None and os.path.realpath(cwd) != os.path.realpath(os.getcwd()):
+            # Jobs share the daemon process, so they cannot each have their own working directory
+            job.add_event({
+                "type": "log",
+                "time": job.created,
+                "level": "WARNING",
+                "message": f"Relative paths inside the recipe resolve against the daemon's directory {os.getcwd()}",
+            })
+        job.task = asyncio.create_task(self._run(job))
+        self._prune()
+        self.logger.info("Job %s submitted: %s", job.id, job.summary()["recipe"])
+        return job
+
+    def cancel(self, job: Job) -> None:
+        if job.task is not None and not job.done:
+            job.task.cancel()
+
+    async def _run(self, job: Job) -> None:
+        # A standalone logger per job: records go to the job's event stream and propagate to the daemon logger
+        level = getattr(logging, job.log_level.upper(), logging.INFO)
+        job_logger = logging.Logger(f"recipe_executor.job.{job.id}", level if isinstance(level, int) else logging.INFO)
+        job_logger.parent = self.logger
+        job_logger.addHandler(_JobLogHandler(job))
+
+        try:
+            if self._semaphore is not None:
+                async with self._semaphore:
+                    await self._execute(job, job_logger)
+            else:
+                await self._execute(job, job_logger)
+        except asyncio.CancelledError:
+            job.finished = time.time()
+            job.set_status("cancelled")
+            self.logger.info("Job %s cancelled", job.id)
+        except Exception as exc:
+            job.finished = time.time()
+            job.set_status("failed", str(exc))
+            self.logger.error("Job %s failed: %s", job.id, exc)
+        else:
+            job.finished = time.time()
+            job.set_status("succeeded")
+            self.logger.info("Job %s succeeded in %.2f seconds", job.id, job.finished - (job.started or job.created))
+
+    async def _execute(self, job: Job, job_logger: logging.Logger) -> None:
+        job.started = time.time()
+        job.set_status("running")
+        QUEUE_WAIT.observe(job.started - job.created, queue="daemon")
+
+        recipe = self.load_recipe(job.recipe)
+        config: Dict[str, Any] = {**load_configuration(getattr(recipe, "env_vars", None)), **job.config}
+        context = Context(artifacts=dict(job.artifacts), config=config)
+        monitor = RssMonitor()
+        try:
+            with monitor:
+                # Lifecycle events (steps, loop items, LLM calls) are streamed alongside the job's logs
+                executor = Executor(job_logger, subscribers=[lambda event: job.add_event(event.to_dict())])
+                await executor.execute(recipe, context, timeout=job.timeout)
+        finally:
+            job.peak_rss = monitor.peak
+
+        # Outputs are returned as plain JSON (models as dicts, bytes as base64); anything else is stringified
+        job.result = serialization.to_jsonable({key: context.get(key) for key in job.outputs})
+
+    def _prune(self) -> None:
+        finished = [job for job in self.jobs.values() if job.done]
+        for job in finished[: max(0, len(finished) - self.keep_jobs)]:
+            del self.jobs[job.id]
+
+    # HTTP handling
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            # Check access before reading the body, so unauthorized clients cannot make the daemon buffer it
+            rejection = self._check_request(method.upper(), headers) or self._check_length(headers)
+            if rejection is not None:
+                self.logger.warning("Rejected daemon request %s %s: %s", method, target, rejection[1])
+                await self._respond(writer, rejection[0], {"error": rejection[1]})
+                return
+            body = await reader.readexactly(int(headers.get("content-length") or 0))
+            await self._route(method.upper(), target.split("?", 1)[0], body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as exc:
+            self.logger.error("Daemon request failed: %s", exc, exc_info=True)
+            try:
+                await self._respond(writer, 500, {"error": str(exc)})
+            except Exception:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    def _check_request(self, method: str, headers: Dict[str, str]) -> Optional[Tuple[int, str]]:
+        """
+        Return (status, error) for a request that must be rejected, or None.
+        """
+        if headers.get("host", "").lower() not in self.allowed_hosts:
+            # Guards against DNS rebinding: browsers send the attacker's host name
+            return 403, "Host not allowed"
+        origin = headers.get("origin")
+        if origin is not None and urlparse(origin).netloc.lower() not in self.allowed_hosts:
+            return 403, "Cross-origin requests are not allowed"
+        if self.token is not None:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), self.token.encode()):
+                return 401, "Missing or invalid bearer token"
+        if method == "POST" and headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+            # Browsers can send text/plain and form posts without a CORS preflight
+            return 415, "Content-Type must be application/json"
+        return None
+
+    @staticmethod
+    def _check_length(headers: Dict[str, str]) -> Optional[Tuple[int, str]]:
+        """
+        Return (status, error) for an invalid or oversized Content-Length, or None.
+        """
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            return 400, "Invalid Content-Length"
+        if length < 0:
+            return 400, "Invalid Content-Length"
+        if length > MAX_BODY_BYTES:
+            return 413, f"Request body exceeds {MAX_BODY_BYTES} bytes"
+        return None
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["health"] and method == "GET":
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            await self._respond(
+                writer,
+                200,
+                {
+                    "status": "ok",
+                    "pid": os.getpid(),
+                    "cwd": os.getcwd(),
+                    "jobs": counts,
+                    "coalesced_requests": get_coalesce_stats(),
+                },
+            )
+            return
+
+        if parts == ["metrics"] and method == "GET":
+            await self._write_response(writer, 200, REGISTRY.render().encode("utf-8"), CONTENT_TYPE)
+            return
+
+        if parts == ["jobs"]:
+            if method == "GET":
+                await self._respond(writer, 200, {"jobs": [job.summary() for job in self.jobs.values()]})
+            elif method == "POST":
+                try:
+                    request = json.loads(body or b"{}")
+                    if not isinstance(request, dict):
+                        raise ValueError("Job request must be a JSON object")
+                    job = self.submit(request)
+                except ValueError as exc:
+                    await self._respond(writer, 400, {"error": str(exc)})
+                    return
+                await self._respond(writer, 202, job.summary())
+            else:
+                await self._respond(writer, 405, {"error": f"Method {method} not allowed"})
+            return
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._respond(writer, 404, {"error": f"Job '{parts[1]}' not found"})
+            elif len(parts) == 3 and parts[2] == "events" and method == "GET":
+                await self._stream_events(job, writer)
+            elif len(parts) == 2 and method == "GET":
+                await self._respond(writer, 200, job.summary())
+            elif len(parts) == 2 and method == "DELETE":
+                self.cancel(job)
+                await self._respond(writer, 202, job.summary())
+            else:
+                await self._respond(writer, 405, {"error": f"Method {method} not allowed"})
+            return
+
+        await self._respond(writer, 404, {"error": f"Not found: {path}"})
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+        await self._write_response(writer, status, serialization.dumps(payload), "application/json")
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int, data: bytes, content_type: str) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def _stream_events(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        index = 0
+        while True:
+            changed = job._changed
+            # Events dropped from the job's bounded history are skipped
+            first = job.event_count - len(job.events)
+            index = max(index, first)
+            while index < job.event_count:
+                writer.write(serialization.dumps(job.events[index - first]) + b"\n")
+                index += 1
+            await writer.drain()
+            if job.done:
+                return
+            await changed.wait()
+
+    async def start(
+        self, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Start serving the job API on TCP host:port if `port` is given (port 0 picks a free port),
+        else on a Unix socket (default `DEFAULT_SOCKET`) that only the current user can access.
+
+        Raises:
+            ValueError: If serving on TCP without a token.
+        """
+        if port is not None:
+            if not self.token:
+                raise ValueError("Serving the daemon on TCP requires a bearer token")
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+            port = server.sockets[0].getsockname()[1]
+            names = {"localhost", "127.0.0.1", "[::1]", host.lower() if ":" not in host else f"[{host.lower()}]"}
+            self.allowed_hosts = names | {f"{name}:{port}" for name in names}
+            self.logger.info("Recipe Executor daemon listening on http://%s:%d", host, port)
+            return server
+
+        socket_path = socket_path or DEFAULT_SOCKET
+        directory = os.path.dirname(os.path.abspath(socket_path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise ValueError(f"Refusing to replace {socket_path}: not a socket")
+            os.unlink(socket_path)
+        # Created readable and writable by the owner only (no window with looser permissions)
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        finally:
+            os.umask(umask)
+        os.chmod(socket_path, 0o600)
+        self.allowed_hosts = {"localhost"}
+        self.logger.info("Recipe Executor daemon listening on unix socket %s", socket_path)
+        return server
+
+    async def serve(
+        self, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None
+    ) -> None:
+        """
+        Serve the job API until cancelled (see `start`).
+        """
+        self.warm_up()
+        enable_metrics()
+        server = await self.start(socket_path, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if port is None:
+                path = socket_path or DEFAULT_SOCKET
+                if os.path.exists(path):
+                    os.unlink(path)
+
+
+def load_token(token_file: str = DEFAULT_TOKEN_FILE, create: bool = False) -> Optional[str]:
+    """
+    Return the daemon token from `RECIPE_EXECUTOR_DAEMON_TOKEN` or `token_file`. With `create`,
+    a missing token file is created with a new random token, readable by the owner only.
+    """
+    token = os.environ.get(TOKEN_ENV)
+    if token:
+        return token
+    try:
+        with open(token_file, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        if not create:
+            return None
+    os.makedirs(os.path.dirname(os.path.abspath(token_file)), mode=0o700, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+async def main_async() -> None:
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Recipe Executor daemon: run recipe jobs in a warm process")
+    parser.add_argument("--socket", type=str, default=None, help=f"Unix socket path (default {DEFAULT_SOCKET})")
+    parser.add_argument("--port", type=int, default=None, help="Serve on this TCP port instead (requires the token)")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the TCP port to")
+    parser.add_argument(
+        "--token-file",
+        type=str,
+        default=DEFAULT_TOKEN_FILE,
+        help=f"Bearer token for TCP, created if missing (or set {TOKEN_ENV})",
+    )
+    parser.add_argument("--allow-inline-recipes", action="store_true", help="Accept recipe objects in job requests")
+    parser.add_argument("--allow-config-overrides", action="store_true", help="Accept config overrides in job requests")
+    parser.add_argument("--max-jobs", type=int, default=4, help="Maximum concurrent jobs (0 for no limit)")
+    parser.add_argument("--max-events", type=int, default=10000, help="Events kept per job for event streams")
+    parser.add_argument("--log-dir", type=str, default="logs", help="Directory for log files")
+    args = parser.parse_args()
+
+    try:
+        logger = init_logger(args.log_dir)
+    except Exception as exc:
+        sys.stderr.write(f"Logger Initialization Error: {exc}\n")
+        raise SystemExit(1)
+
+    daemon = RecipeDaemon(
+        logger,
+        max_jobs=args.max_jobs,
+        token=load_token(args.token_file, create=True) if args.port is not None else None,
+        allow_inline_recipes=args.allow_inline_recipes,
+        allow_config_overrides=args.allow_config_overrides,
+        max_events=args.max_events,
+    )
+    await daemon.serve(socket_path=args.socket, host=args.host, port=args.port)
+
+
+def main() -> None:
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        pass
+    except SystemExit as se:
+        sys.exit(se.code)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,187 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Thin CLI client for the Recipe Executor daemon.
+
+Submits a recipe job to a running daemon (see `recipe_executor.daemon`), streams its logs
+and waits for it to finish. Uses only the standard library so that it starts quickly.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+__all__ = ["DaemonClient", "main"]
+
+# Same defaults as recipe_executor.daemon (not imported, to keep start-up fast)
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".recipe-executor")
+DEFAULT_SOCKET = os.path.join(DEFAULT_STATE_DIR, "daemon.sock")
+DEFAULT_TOKEN_FILE = os.path.join(DEFAULT_STATE_DIR, "daemon.token")
+TOKEN_ENV = "RECIPE_EXECUTOR_DAEMON_TOKEN"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DaemonClient:
+    """
+    Minimal client for the daemon's job API: on the daemon's Unix socket by default, or on
+    TCP with `url` and the daemon's bearer token.
+    """
+
+    def __init__(
+        self, url: Optional[str] = None, socket_path: Optional[str] = None, token: Optional[str] = None
+    ) -> None:
+        self.url = urlparse(url) if url else None
+        self.socket_path = socket_path or (None if url else DEFAULT_SOCKET)
+        self.token = token
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.socket_path:
+            return _UnixHTTPConnection(self.socket_path)
+        assert self.url is not None
+        return http.client.HTTPConnection(self.url.hostname or "127.0.0.1", self.url.port or 8765)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        conn = self._connection()
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            conn.request(method, path, body=body, headers=self._headers())
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+        finally:
+            conn.close()
+        if response.status >= 400:
+            raise RuntimeError(data.get("error") or f"HTTP {response.status}")
+        return data
+
+    def submit(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request("POST", "/jobs", job)
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield job events until the job finishes.
+        """
+        conn = self._connection()
+        try:
+            conn.request("GET", f"/jobs/{job_id}/events", headers=self._headers())
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}: {response.read().decode('utf-8', 'replace')}")
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+
+def _load_token(token_file: str) -> Optional[str]:
+    token = os.environ.get(TOKEN_ENV)
+    if token:
+        return token
+    try:
+        with open(token_file, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _parse_pairs(pairs: List[str]) -> Dict[str, str]:
+    # Same key=value format as the recipe-executor CLI (kept here to avoid importing it)
+    result: Dict[str, str] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Invalid key=value format '{pair}'")
+        result[key] = value
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Submit a recipe to a running Recipe Executor daemon")
+    parser.add_argument("recipe_path", type=str, help="Path to the recipe file to execute")
+    parser.add_argument("--context", action="append", default=[], help="Context artifact values as key=value pairs")
+    parser.add_argument("--config", action="append", default=[], help="Static configuration values as key=value pairs")
+    parser.add_argument("--output", action="append", default=[], help="Context key to return when the job finishes")
+    parser.add_argument("--socket", type=str, default=None, help=f"Daemon Unix socket path (default {DEFAULT_SOCKET})")
+    parser.add_argument("--url", type=str, default=None, help="Daemon URL, for a daemon serving on TCP")
+    parser.add_argument(
+        "--token-file", type=str, default=DEFAULT_TOKEN_FILE, help=f"Daemon token for --url (or set {TOKEN_ENV})"
+    )
+    parser.add_argument("--log-level", type=str, default="INFO", help="Job log level to stream")
+    parser.add_argument("--timeout", type=float, default=None, help="Cancel the job after this many seconds")
+    parser.add_argument("--no-wait", action="store_true", help="Print the job id and exit without waiting")
+    args = parser.parse_args()
+
+    try:
+        job_request: Dict[str, Any] = {
+            "recipe": os.path.abspath(args.recipe_path),
+            "cwd": os.getcwd(),
+            "context": _parse_pairs(args.context),
+            "config": _parse_pairs(args.config),
+            "outputs": args.output,
+            "log_level": args.log_level,
+            "timeout": args.timeout,
+        }
+    except ValueError as ve:
+        sys.stderr.write(f"Context Error: {ve}\n")
+        sys.exit(1)
+
+    client = DaemonClient(args.url, args.socket, _load_token(args.token_file) if args.url else None)
+    try:
+        job = client.submit(job_request)
+    except (OSError, RuntimeError) as exc:
+        sys.stderr.write(f"Failed to submit job: {exc}\n")
+        sys.exit(1)
+
+    if args.no_wait:
+        print(job["id"])
+        sys.exit(0)
+
+    final: Dict[str, Any] = job
+    try:
+        for event in client.events(job["id"]):
+            if event.get("type") == "log":
+                print(f"[{event.get('level')}] {event.get('message')}", flush=True)
+            elif event.get("type") == "status":
+                final = event
+    except KeyboardInterrupt:
+        client.request("DELETE", f"/jobs/{job['id']}")
+        sys.stderr.write(f"Cancelled job {job['id']}\n")
+        sys.exit(130)
+    except (OSError, RuntimeError) as exc:
+        sys.stderr.write(f"Lost connection to daemon: {exc}\n")
+        sys.exit(1)
+
+    if final.get("outputs") is not None:
+        print(json.dumps(final["outputs"], indent=2))
+    if final.get("status") != "succeeded":
+        sys.stderr.write(f"Job {job['id']} {final.get('status')}: {final.get('error')}\n")
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
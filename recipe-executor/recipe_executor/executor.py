@@ -4,31 +4,53 @@ import json
 import logging
 import inspect
 from pathlib import Path
-from typing import Union, Dict, Any
+from contextlib import nullcontext
+from typing import Union, Dict, Any, List, Optional
 
+from recipe_executor.cancellation import CancelScope
+from recipe_executor.hooks import Subscriber, event_scope, subscribed
 from recipe_executor.protocols import ExecutorProtocol, ContextProtocol
 from recipe_executor.models import Recipe
 from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.utils.memory import profile_step
 
 
 class Executor(ExecutorProtocol):
     """
     Concrete implementation of ExecutorProtocol. Loads, validates, and executes
     recipes step by step using a shared context. Stateless between runs.
+
+    Lifecycle events (see `recipe_executor.hooks`) of runs started by this executor, including
+    nested sub-recipes and loop items, are delivered to `subscribers`.
     """
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self, logger: logging.Logger, subscribers: Optional[List[Subscriber]] = None) -> None:
         self.logger = logger
+        self.subscribers = list(subscribers or [])
 
     async def execute(
         self,
         recipe: Union[str, Path, Dict[str, Any], Recipe],
         context: ContextProtocol,
+        timeout: Optional[float] = None,
     ) -> None:
         """
         Load a recipe (from file path, JSON string, dict, or Recipe model),
         validate it, and execute its steps sequentially using the provided context.
+
+        The run is cancelled with a TimeoutError after `timeout` seconds or the recipe's own
+        `timeout`, whichever is shorter, and never outlives an enclosing deadline (e.g. when
+        run by an execute_recipe or loop step). Steps with a `timeout` are cancelled when it passes.
         """
+        with subscribed(*self.subscribers) if self.subscribers else nullcontext():
+            await self._execute(recipe, context, timeout)
+
+    async def _execute(
+        self,
+        recipe: Union[str, Path, Dict[str, Any], Recipe],
+        context: ContextProtocol,
+        timeout: Optional[float],
+    ) -> None:
         # Load or validate the recipe into a Recipe model
         if isinstance(recipe, Recipe):
             self.logger.debug("Using provided Recipe model instance.")
@@ -76,6 +98,24 @@ class Executor(ExecutorProtocol):
         step_count = len(recipe_model.steps or [])  # type: ignore
         self.logger.debug(f"Recipe loaded: {{'steps': {step_count}}}. Full recipe: {summary}")
 
+        limits = [t for t in (timeout, recipe_model.timeout) if t is not None]
+        recipe_timeout = min(limits) if limits else None
+        scope = CancelScope(recipe_timeout)
+        recipe_name = (
+            str(recipe) if isinstance(recipe, Path) or (isinstance(recipe, str) and os.path.isfile(recipe)) else None
+        )
+        try:
+            with event_scope(None, "recipe", recipe=recipe_name, steps=step_count):
+                async with scope:
+                    await self._execute_steps(recipe_model, context)
+        except TimeoutError as e:
+            if scope.own_deadline_expired():
+                raise TimeoutError(f"Recipe execution timed out after {recipe_timeout} seconds") from e
+            raise
+
+        self.logger.debug("All recipe steps completed successfully.")
+
+    async def _execute_steps(self, recipe_model: Recipe, context: ContextProtocol) -> None:
         # Execute steps sequentially
         for idx, step in enumerate(recipe_model.steps or []):  # type: ignore
             step_type = step.type
@@ -88,14 +128,26 @@ class Executor(ExecutorProtocol):
             step_cls = STEP_REGISTRY[step_type]
             step_instance = step_cls(self.logger, config)
 
+            scope = CancelScope(step.timeout)
             try:
-                result = step_instance.execute(context)
-                if inspect.isawaitable(result):  # type: ignore
-                    await result
+                with (
+                    profile_step(f"{idx}:{step_type}", step_type),
+                    event_scope(f"{idx}:{step_type}", "step", index=idx, step_type=step_type),
+                ):
+                    async with scope:
+                        result = step_instance.execute(context)
+                        if inspect.isawaitable(result):  # type: ignore
+                            await result
+            except TimeoutError as e:
+                if scope.own_deadline_expired():
+                    self.logger.error(f"Step {idx} ('{step_type}') timed out after {step.timeout} seconds")
+                    raise TimeoutError(f"Step {idx} ('{step_type}') timed out after {step.timeout} seconds") from e
+                if scope.expired():
+                    # An enclosing deadline passed; the scope that owns it reports the timeout
+                    raise
+                raise ValueError(f"Error executing step {idx} ('{step_type}'): {e}") from e
             except Exception as e:
                 msg = f"Error executing step {idx} ('{step_type}'): {e}"
                 raise ValueError(msg) from e
 
             self.logger.debug(f"Step {idx} ('{step_type}') completed successfully.")
-
-        self.logger.debug("All recipe steps completed successfully.")
@@ -0,0 +1,282 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Execution lifecycle hooks for instrumentation and progress reporting.
+
+The Executor, the Loop step and the LLM component emit `ExecutionEvent`s as a run progresses:
+recipe, step and loop item start/end, LLM call start/end with usage, and errors. Subscribers
+are plain callables receiving each event. They are registered process-wide with `subscribe`,
+or for the runs started inside a block with `subscribed` (or `Executor(logger, subscribers=...)`),
+which uses a ContextVar so concurrent runs (e.g. daemon jobs) each see only their own events.
+
+When no subscriber is registered, emitting an event is a single check and nothing is built.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import IO, Any, Callable, ContextManager, Dict, Iterator, Optional, Tuple
+
+from recipe_executor.utils import serialization
+
+__all__ = [
+    "EVENT_TYPES",
+    "ExecutionEvent",
+    "JsonlEventLog",
+    "ProgressBar",
+    "Subscriber",
+    "emit",
+    "event_scope",
+    "has_subscribers",
+    "subscribe",
+    "subscribed",
+]
+
+EVENT_TYPES = (
+    "recipe_start",
+    "recipe_end",
+    "step_start",
+    "step_end",
+    "loop_item_scheduled",
+    "loop_item_start",
+    "loop_item_end",
+    "llm_start",
+    "llm_end",
+    "error",
+)
+
+
+@dataclass(frozen=True)
+class ExecutionEvent:
+    """
+    One lifecycle event.
+
+    Fields:
+        type: One of EVENT_TYPES.
+        time: Wall-clock time of the event (seconds since the epoch).
+        path: Steps enclosing the event, e.g. "1:loop > item 3 > 0:llm_generate" ("" at the top level).
+        data: Event details, e.g. step index and type, duration, status, error or LLM usage.
+    """
+
+    type: str
+    time: float
+    path: str
+    data: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "time": self.time, "path": self.path, **self.data}
+
+
+Subscriber = Callable[[ExecutionEvent], None]
+
+_logger = logging.getLogger("recipe_executor.hooks")
+
+# Copy-on-write tuples, so emitting never races with (un)subscribing from other tasks or threads
+_global_subscribers: Tuple[Subscriber, ...] = ()
+_global_lock = threading.Lock()
+_scoped_subscribers: ContextVar[Tuple[Subscriber, ...]] = ContextVar("recipe_executor_subscribers", default=())
+_event_path: ContextVar[Tuple[str, ...]] = ContextVar("recipe_executor_event_path", default=())
+
+
+def subscribe(subscriber: Subscriber) -> Callable[[], None]:
+    """
+    Register a subscriber for the events of all runs in this process. Returns a function that
+    unregisters it.
+    """
+    global _global_subscribers
+    with _global_lock:
+        _global_subscribers = _global_subscribers + (subscriber,)
+
+    def unsubscribe() -> None:
+        global _global_subscribers
+        with _global_lock:
+            subscribers = list(_global_subscribers)
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            _global_subscribers = tuple(subscribers)
+
+    return unsubscribe
+
+
+@contextmanager
+def subscribed(*subscribers: Subscriber) -> Iterator[None]:
+    """
+    Deliver the events of runs started inside this block (including tasks they create) to the
+    given subscribers.
+    """
+    token = _scoped_subscribers.set(_scoped_subscribers.get() + subscribers)
+    try:
+        yield
+    finally:
+        _scoped_subscribers.reset(token)
+
+
+def has_subscribers() -> bool:
+    return bool(_global_subscribers) or bool(_scoped_subscribers.get())
+
+
+def emit(event_type: str, **data: Any) -> None:
+    """
+    Deliver an event to the current subscribers. Subscriber errors are logged and ignored, so
+    instrumentation never fails a run.
+    """
+    scoped = _scoped_subscribers.get()
+    if not _global_subscribers and not scoped:
+        return
+    event = ExecutionEvent(event_type, time.time(), " > ".join(_event_path.get()), data)
+    for subscriber in _global_subscribers + scoped:
+        try:
+            subscriber(event)
+        except Exception as exc:
+            _logger.warning("Event subscriber %r failed on %s: %s", subscriber, event_type, exc)
+
+
+def _first_report(exc: BaseException) -> bool:
+    # Errors are re-raised, wrapped, by every enclosing step; only the innermost one reports them
+    cause: Optional[BaseException] = exc
+    while cause is not None:
+        if getattr(cause, "_recipe_event_reported", False):
+            return False
+        cause = cause.__cause__ or cause.__context__
+    try:
+        setattr(exc, "_recipe_event_reported", True)
+    except AttributeError:
+        pass
+    return True
+
+
+@contextmanager
+def _scope(label: Optional[str], kind: str, data: Dict[str, Any]) -> Iterator[None]:
+    token = _event_path.set(_event_path.get() + (label,)) if label else None
+    emit(f"{kind}_start", **data)
+    started = time.monotonic()
+    try:
+        yield
+    except BaseException as exc:
+        duration = round(time.monotonic() - started, 3)
+        if isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+            emit(f"{kind}_end", **data, duration=duration, status="cancelled")
+        else:
+            emit(f"{kind}_end", **data, duration=duration, status="error", error=str(exc))
+            if _first_report(exc):
+                emit("error", **data, error=str(exc), error_type=type(exc).__name__)
+        raise
+    else:
+        emit(f"{kind}_end", **data, duration=round(time.monotonic() - started, 3), status="ok")
+    finally:
+        if token is not None:
+            _event_path.reset(token)
+
+
+def event_scope(label: Optional[str], kind: str, **data: Any) -> ContextManager[Any]:
+    """
+    Emit `<kind>_start` and `<kind>_end` (with duration and status) around a block, adding `label`
+    to the path of the events inside it. Does nothing when there are no subscribers.
+    """
+    if not _global_subscribers and not _scoped_subscribers.get():
+        return nullcontext()
+    return _scope(label, kind, data)
+
+
+class JsonlEventLog:
+    """
+    Subscriber writing every event as one JSON line.
+
+    Usage:
+        with JsonlEventLog("logs/events.jsonl") as log:
+            await Executor(logger, subscribers=[log]).execute(recipe, context)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: IO[bytes] = open(path, "ab")
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        line = serialization.dumps(event.to_dict()) + b"\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "JsonlEventLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ProgressBar:
+    """
+    Subscriber rendering a one-line progress display: loop items finished out of scheduled,
+    steps completed, LLM calls and tokens, and the step currently running.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, width: int = 24, interval: float = 0.1) -> None:
+        self.stream = stream or sys.stderr
+        self.width = width
+        self.interval = interval
+        self.items_scheduled = 0
+        self.items_done = 0
+        self.items_failed = 0
+        self.steps_done = 0
+        self.llm_calls = 0
+        self.llm_tokens = 0
+        self.current = ""
+        self._last_render = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        with self._lock:
+            if event.type == "loop_item_scheduled":
+                self.items_scheduled += 1
+            elif event.type == "loop_item_end":
+                self.items_done += 1
+                if event.data.get("status") != "ok":
+                    self.items_failed += 1
+            elif event.type == "step_start":
+                self.current = event.path
+            elif event.type == "step_end":
+                self.steps_done += 1
+            elif event.type == "llm_end":
+                self.llm_calls += 1
+                self.llm_tokens += (event.data.get("usage") or {}).get("total_tokens") or 0
+            finished = event.type == "recipe_end" and not event.path
+            if finished:
+                self.current = ""
+            now = time.monotonic()
+            if finished or now - self._last_render >= self.interval:
+                self._last_render = now
+                self._render(final=finished)
+
+    def line(self) -> str:
+        parts = []
+        if self.items_scheduled:
+            filled = int(self.width * self.items_done / self.items_scheduled)
+            bar = "#" * filled + "." * (self.width - filled)
+            failed = f", {self.items_failed} failed" if self.items_failed else ""
+            parts.append(f"[{bar}] {self.items_done}/{self.items_scheduled} items{failed}")
+        parts.append(f"{self.steps_done} steps")
+        if self.llm_calls:
+            parts.append(f"{self.llm_calls} LLM calls, {self.llm_tokens} tokens")
+        if self.current:
+            parts.append(self.current)
+        return " | ".join(parts)
+
+    def _render(self, final: bool = False) -> None:
+        try:
+            if self.stream.isatty():
+                self.stream.write("\r\033[K" + self.line() + ("\n" if final else ""))
+            elif final:
+                self.stream.write(self.line() + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,668 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Job Pool component for the Recipe Executor.
+
+Runs recipe jobs for interactive apps (the Gradio apps) in a pool of persistent worker
+processes instead of in the request handler's event loop. Jobs wait in a bounded queue and
+are served round-robin across sessions, so one user's burst of jobs does not hold up the
+others. Each job logs to its own logger and log directory; the app polls a job's status,
+progress and log lines, and can cancel it.
+
+A running job is cancelled inside its worker (steps see `CancelledError` and clean up); a
+worker that does not stop within `cancel_grace` seconds, or that dies, is replaced.
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from recipe_executor.hooks import ExecutionEvent, ProgressBar
+from recipe_executor.metrics import QUEUE_WAIT
+
+__all__ = ["JobPool", "JobQueueFullError", "PoolJob", "get_job_pool"]
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+DEFAULT_SESSION = "default"
+# Message asking a worker to cancel its current job
+_CANCEL = ("cancel",)
+
+_logger = logging.getLogger("recipe_executor.job_pool")
+
+
+class JobQueueFullError(RuntimeError):
+    """
+    Raised when a job is submitted while the pool's queue is full.
+    """
+
+
+class PoolJob:
+    """
+    A recipe job submitted to a `JobPool`. Its fields are updated by the pool and may be read
+    from any thread.
+    """
+
+    def __init__(
+        self,
+        recipe: Union[str, Dict[str, Any]],
+        artifacts: Dict[str, Any],
+        config: Dict[str, Any],
+        session: str,
+        log_dir: str,
+        log_level: str,
+        timeout: Optional[float],
+        max_log_lines: int,
+        job_id: Optional[str] = None,
+    ) -> None:
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.recipe = recipe
+        self.artifacts = artifacts
+        self.config = config
+        self.session = session
+        self.log_dir = log_dir
+        self.log_level = log_level
+        self.timeout = timeout
+        self.status = "queued"
+        self.error: Optional[str] = None
+        # Final context artifacts once the job succeeded
+        self.result: Optional[Dict[str, Any]] = None
+        self.progress = 0.0
+        self.progress_desc = ""
+        self.logs: Deque[str] = deque(maxlen=max_log_lines)
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._cancel_requested = False
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["PoolJob"], None]] = []
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def log_text(self) -> str:
+        return "\n".join(list(self.logs))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "session": self.session,
+            "recipe": self.recipe if isinstance(self.recipe, str) and len(self.recipe) < 512 else "<inline>",
+            "progress": self.progress,
+            "progress_desc": self.progress_desc,
+            "log_dir": self.log_dir,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+    def add_done_callback(self, callback: Callable[["PoolJob"], None]) -> None:
+        """
+        Call `callback(job)` when the job finishes (right away if it already has). Callbacks run
+        in a pool thread.
+        """
+        if self._done.is_set():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job finishes; returns False if `timeout` passed first.
+        """
+        return self._done.wait(timeout)
+
+    async def wait_async(self, poll_interval: float = 0.1) -> None:
+        """
+        Wait for the job to finish without blocking the event loop.
+        """
+        while not self._done.is_set():
+            await asyncio.sleep(poll_interval)
+
+    def _spec(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "recipe": self.recipe,
+            "artifacts": self.artifacts,
+            "config": self.config,
+            "log_dir": self.log_dir,
+            "log_level": self.log_level,
+            "timeout": self.timeout,
+        }
+
+
+# Worker process side
+
+
+class _PipeLogHandler(logging.Handler):
+    """
+    Sends formatted log lines of the current job to the pool.
+    """
+
+    def __init__(self, send: Callable[[Any], None], level: int) -> None:
+        super().__init__(level)
+        self.send = send
+        self.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.send(("log", self.format(record)))
+        except Exception:
+            pass
+
+
+class _ProgressReporter(ProgressBar):
+    """
+    Progress subscriber reporting the share of top-level steps completed and the progress line
+    to the pool.
+    """
+
+    def __init__(self, send: Callable[[Any], None]) -> None:
+        super().__init__(interval=0.25)
+        self.send = send
+        self.total_steps = 0
+        self.top_steps_done = 0
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        if event.type == "recipe_start" and not event.path:
+            self.total_steps = int(event.data.get("steps") or 0)
+        elif event.type == "step_end" and " > " not in event.path:
+            self.top_steps_done += 1
+        super().__call__(event)
+
+    def _render(self, final: bool = False) -> None:
+        fraction = min(1.0, self.top_steps_done / self.total_steps) if self.total_steps else 0.0
+        try:
+            self.send(("progress", 1.0 if final else fraction, self.line()))
+        except Exception:
+            pass
+
+
+async def _execute_job(spec: Dict[str, Any], logger: logging.Logger, progress: _ProgressReporter, conn: Any) -> Any:
+    from recipe_executor.context import Context
+    from recipe_executor.executor import Executor
+
+    task = asyncio.current_task()
+    assert task is not None
+    loop = asyncio.get_running_loop()
+    stop = threading.Event()
+
+    def watch() -> None:
+        # Cancel requests (or the pool going away) cancel the run
+        while not stop.is_set():
+            try:
+                if conn.poll(0.1) and conn.recv() == _CANCEL:
+                    loop.call_soon_threadsafe(task.cancel)
+            except (EOFError, OSError):
+                loop.call_soon_threadsafe(task.cancel)
+                return
+
+    watcher = threading.Thread(target=watch, name=f"job-{spec['id']}-cancel", daemon=True)
+    watcher.start()
+    try:
+        context = Context(artifacts=spec["artifacts"], config=spec["config"])
+        await Executor(logger, subscribers=[progress]).execute(spec["recipe"], context, timeout=spec["timeout"])
+        return context.dict()
+    finally:
+        stop.set()
+        watcher.join()
+
+
+def _run_job(conn: Any, send: Callable[[Any], None], spec: Dict[str, Any]) -> None:
+    from recipe_executor.logger import close_job_logger, init_job_logger
+    from recipe_executor.utils import serialization
+
+    level = getattr(logging, str(spec["log_level"]).upper(), logging.INFO)
+    level = level if isinstance(level, int) else logging.INFO
+    status, result, error = "failed", None, None
+    # Module loggers of the library log into the job as well (one job per worker at a time)
+    library_logger = logging.getLogger("recipe_executor")
+    saved_level = library_logger.level
+    job_logger: Optional[logging.Logger] = None
+    try:
+        job_logger = init_job_logger(f"recipe_executor.job.{spec['id']}", spec["log_dir"])
+        job_logger.addHandler(_PipeLogHandler(send, level))
+        for handler in job_logger.handlers:
+            library_logger.addHandler(handler)
+        library_logger.setLevel(logging.DEBUG)
+        job_logger.info("Job %s started in worker process %d", spec["id"], os.getpid())
+        result = asyncio.run(_execute_job(spec, job_logger, _ProgressReporter(send), conn))
+        status = "succeeded"
+    except asyncio.CancelledError:
+        status, error = "cancelled", None
+    except Exception as exc:
+        error = str(exc) or type(exc).__name__
+        if job_logger is not None:
+            job_logger.error("Job %s failed: %s", spec["id"], error, exc_info=True)
+    finally:
+        if job_logger is not None:
+            for handler in job_logger.handlers:
+                library_logger.removeHandler(handler)
+            close_job_logger(job_logger)
+        library_logger.setLevel(saved_level)
+
+    try:
+        send(("done", status, result, error))
+    except Exception:
+        # Artifacts that cannot be pickled are returned as plain JSON data
+        send(("done", status, serialization.to_jsonable(result), error))
+
+
+def _worker_main(conn: Any) -> None:
+    """
+    Worker process entry point: run the jobs received from the pool, one at a time.
+    """
+    send_lock = threading.Lock()
+
+    def send(message: Any) -> None:
+        # Log records may be emitted from threads other than the job's event loop
+        with send_lock:
+            conn.send(message)
+
+    # Pay for the executor and step imports before the first job
+    import recipe_executor.executor  # noqa: F401
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            return
+        if request is None:
+            return
+        if request[0] == "run":
+            _run_job(conn, send, request[1])
+        # Anything else is a cancel request that arrived after its job finished
+
+
+# Pool side
+
+
+class _WorkerSlot:
+    """
+    One worker process and the thread feeding it jobs.
+    """
+
+    def __init__(self, pool: "JobPool", index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.process: Optional[Any] = None
+        self.conn: Optional[Any] = None
+        self.thread = threading.Thread(target=self._serve, name=f"recipe-job-slot-{index}", daemon=True)
+
+    def _start_process(self) -> None:
+        parent_conn, child_conn = self.pool._mp.Pipe()
+        process = self.pool._mp.Process(
+            target=_worker_main, args=(child_conn,), name=f"recipe-job-worker-{self.index}", daemon=False
+        )
+        process.start()
+        child_conn.close()
+        self.process, self.conn = process, parent_conn
+        _logger.debug("Started job worker process %d", process.pid)
+
+    def _kill_process(self) -> None:
+        process, conn = self.process, self.conn
+        self.process = self.conn = None
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        if conn is not None:
+            conn.close()
+
+    def stop_process(self, timeout: float = 5.0) -> None:
+        if self.process is None:
+            return
+        try:
+            assert self.conn is not None
+            self.conn.send(None)
+            self.process.join(timeout)
+        except (OSError, ValueError):
+            pass
+        self._kill_process()
+
+    def _serve(self) -> None:
+        while True:
+            job = self.pool._next_job()
+            if job is None:
+                break
+            try:
+                self._run(job)
+            except Exception as exc:
+                _logger.error("Job %s failed in the pool: %s", job.id, exc, exc_info=True)
+                self._kill_process()
+                self.pool._finish(job, "failed", error=str(exc))
+        self.stop_process()
+
+    def _run(self, job: PoolJob) -> None:
+        if self.process is None or not self.process.is_alive():
+            self._kill_process()
+            self._start_process()
+        assert self.conn is not None and self.process is not None
+        try:
+            self.conn.send(("run", job._spec()))
+        except (OSError, ValueError) as exc:
+            self._kill_process()
+            self.pool._finish(job, "failed", error=f"Could not send job to worker: {exc}")
+            return
+        except Exception as exc:
+            # The job itself could not be pickled; nothing reached the worker
+            self.pool._finish(job, "failed", error=f"Job cannot be sent to a worker process: {exc}")
+            return
+
+        cancel_sent: Optional[float] = None
+        while True:
+            if job._cancel_requested and cancel_sent is None:
+                cancel_sent = time.monotonic()
+                try:
+                    self.conn.send(_CANCEL)
+                except (OSError, ValueError):
+                    pass
+            if cancel_sent is not None and time.monotonic() - cancel_sent > self.pool.cancel_grace:
+                _logger.warning(
+                    "Job %s did not stop within %.1f seconds; replacing its worker", job.id, self.pool.cancel_grace
+                )
+                self._kill_process()
+                self.pool._finish(job, "cancelled")
+                return
+            try:
+                if not self.conn.poll(0.1):
+                    if not self.process.is_alive():
+                        raise EOFError
+                    continue
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                exitcode = self.process.exitcode
+                self._kill_process()
+                if cancel_sent is not None:
+                    self.pool._finish(job, "cancelled")
+                else:
+                    self.pool._finish(job, "failed", error=f"Worker process exited unexpectedly (exit code {exitcode})")
+                return
+
+            kind = message[0]
+            if kind == "log":
+                job.logs.append(message[1])
+            elif kind == "progress":
+                job.progress, job.progress_desc = message[1], message[2]
+            elif kind == "done":
+                _, status, result, error = message
+                self.pool._finish(job, status, result=result, error=error)
+                return
+
+
+class JobPool:
+    """
+    Bounded, session-fair job queue served by a pool of worker processes.
+
+    Worker processes are started on the first submitted job and kept for later jobs, so they
+    only pay for imports once.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 32,
+        log_root: str = os.path.join("logs", "jobs"),
+        keep_jobs: int = 100,
+        cancel_grace: float = 5.0,
+        max_log_lines: int = 2000,
+        start_method: str = "spawn",
+    ) -> None:
+        """
+        Args:
+            workers: Number of worker processes (jobs running at once).
+            max_queued: Maximum number of jobs waiting for a worker (0 for no limit).
+            log_root: Directory holding a log directory per job.
+            keep_jobs: Number of finished jobs kept for status queries.
+            cancel_grace: Seconds a cancelled job has to stop before its worker is replaced.
+            max_log_lines: Log lines kept in memory per job (all lines go to its log files).
+            start_method: Multiprocessing start method for worker processes.
+        """
+        if workers < 1:
+            raise ValueError(f"JobPool requires at least one worker, got {workers}")
+        self.workers = workers
+        self.max_queued = max_queued
+        self.log_root = log_root
+        self.keep_jobs = keep_jobs
+        self.cancel_grace = cancel_grace
+        self.max_log_lines = max_log_lines
+        self._mp = multiprocessing.get_context(start_method)
+        self._jobs: Dict[str, PoolJob] = {}
+        self._queues: "OrderedDict[str, Deque[PoolJob]]" = OrderedDict()
+        self._queued = 0
+        self._cond = threading.Condition()
+        self._slots: List[_WorkerSlot] = []
+        self._closed = False
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def submit(
+        self,
+        recipe: Union[str, Dict[str, Any]],
+        artifacts: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        session: Optional[str] = None,
+        log_dir: Optional[str] = None,
+        log_level: str = "INFO",
+        timeout: Optional[float] = None,
+    ) -> PoolJob:
+        """
+        Queue a recipe job.
+
+        Args:
+            recipe: Recipe file path, JSON string or dict.
+            artifacts: Initial context artifacts (must be picklable).
+            config: Context configuration (e.g. from `load_configuration()`).
+            session: Session the job belongs to; sessions are served round-robin.
+            log_dir: Directory for the job's log files (default `<log_root>/<job id>`).
+            log_level: Minimum level of the log lines kept for polling.
+            timeout: Optional run timeout in seconds.
+
+        Raises:
+            JobQueueFullError: If `max_queued` jobs are already waiting.
+            RuntimeError: If the pool has been shut down.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job = PoolJob(
+            recipe,
+            dict(artifacts or {}),
+            dict(config or {}),
+            session or DEFAULT_SESSION,
+            os.path.abspath(log_dir or os.path.join(self.log_root, job_id)),
+            log_level,
+            timeout,
+            self.max_log_lines,
+            job_id=job_id,
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job pool is shut down")
+            if self.max_queued and self._queued >= self.max_queued:
+                raise JobQueueFullError(f"Job queue is full ({self._queued} jobs waiting); try again later")
+            self._ensure_started()
+            self._jobs[job.id] = job
+            self._queues.setdefault(job.session, deque()).append(job)
+            self._queued += 1
+            self._cond.notify()
+        _logger.info("Job %s queued for session %s", job.id, job.session)
+        return job
+
+    async def run(
+        self,
+        recipe: Union[str, Dict[str, Any]],
+        artifacts: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> PoolJob:
+        """
+        Submit a job and wait for it without blocking the event loop. Cancelling the caller
+        cancels the job.
+        """
+        job = self.submit(recipe, artifacts, config, **kwargs)
+        try:
+            await job.wait_async()
+        except asyncio.CancelledError:
+            self.cancel(job.id)
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[PoolJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, session: Optional[str] = None) -> List[PoolJob]:
+        with self._cond:
+            return [job for job in self._jobs.values() if session is None or job.session == session]
+
+    def position(self, job: PoolJob) -> Optional[int]:
+        """
+        Return how many queued jobs will start before `job` (None if it is not queued).
+        """
+        with self._cond:
+            queue = self._queues.get(job.session)
+            if queue is None or job not in queue:
+                return None
+            # Round-robin: round r starts the r-th queued job of each session, in session order
+            rounds = queue.index(job)
+            ahead = 0
+            before = True
+            for session, other in self._queues.items():
+                if session == job.session:
+                    before = False
+                    ahead += rounds
+                else:
+                    ahead += min(len(other), rounds + 1 if before else rounds)
+            return ahead
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job. Returns False if the job is unknown or already finished.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            queue = self._queues.get(job.session)
+            if job.status == "queued" and queue is not None and job in queue:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.session]
+                self._queued -= 1
+                self._finish(job, "cancelled")
+            else:
+                job._cancel_requested = True
+        _logger.info("Job %s cancellation requested", job_id)
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Cancel queued jobs and stop the worker processes (after their current jobs, with `wait`).
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            for queue in self._queues.values():
+                for job in queue:
+                    self._finish(job, "cancelled")
+            self._queues.clear()
+            self._queued = 0
+            if not wait:
+                for job in self._jobs.values():
+                    if job.status == "running":
+                        job._cancel_requested = True
+            self._cond.notify_all()
+        if wait:
+            for slot in self._slots:
+                slot.thread.join()
+        else:
+            for slot in self._slots:
+                slot._kill_process()
+
+    def _ensure_started(self) -> None:
+        # Called with the lock held
+        if self._slots:
+            return
+        self._slots = [_WorkerSlot(self, index) for index in range(self.workers)]
+        for slot in self._slots:
+            slot.thread.start()
+        atexit.register(self.shutdown, wait=False)
+        _logger.info("Job pool started with %d worker processes", self.workers)
+
+    def _next_job(self) -> Optional[PoolJob]:
+        with self._cond:
+            while not self._queues and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            # Round-robin across sessions: the session served goes to the back of the line
+            session, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            self._queued -= 1
+            job.status = "running"
+            job.started = time.time()
+        QUEUE_WAIT.observe(job.started - job.created, queue="job_pool")
+        _logger.info("Job %s started (session %s)", job.id, job.session)
+        return job
+
+    def _finish(
+        self,
+        job: PoolJob,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._cond:
+            job.result = result
+            job.error = error
+            job.finished = time.time()
+            if status == "succeeded":
+                job.progress = 1.0
+            job.status = status
+            callbacks, job._callbacks = job._callbacks, []
+            job._done.set()
+            self._prune()
+        if status == "failed":
+            _logger.error("Job %s failed: %s", job.id, error)
+        else:
+            _logger.info("Job %s %s", job.id, status)
+        for callback in callbacks:
+            try:
+                callback(job)
+            except Exception as exc:
+                _logger.warning("Done callback of job %s failed: %s", job.id, exc)
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[: max(0, len(finished) - self.keep_jobs)]:
+            del self._jobs[job.id]
+
+
+_pool: Optional[JobPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_job_pool(workers: int = 2, max_queued: int = 32, log_root: str = os.path.join("logs", "jobs")) -> JobPool:
+    """
+    Return the process-wide job pool, creating it on first use (later arguments are ignored).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = JobPool(workers=workers, max_queued=max_queued, log_root=log_root)
+        return _pool
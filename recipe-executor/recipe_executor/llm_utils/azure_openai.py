@@ -2,11 +2,11 @@
 import logging
 from typing import Optional
 
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential, get_bearer_token_provider
 from openai import AsyncAzureOpenAI
 from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.models.openai import OpenAIModel
 
+from recipe_executor.llm_utils.azure_tokens import get_token_provider
 from recipe_executor.protocols import ContextProtocol
 
 
@@ -48,6 +48,7 @@ def get_azure_openai_model(
     api_version = config.get("azure_openai_api_version", "2025-03-01-preview")
     use_managed_identity = config.get("azure_use_managed_identity", False)
     client_id = config.get("azure_client_id")
+    token_cache_path = config.get("azure_token_cache_path")
 
     # Determine deployment name
     deployment = deployment_name or config.get("azure_openai_deployment_name") or model_name
@@ -73,17 +74,18 @@ def get_azure_openai_model(
         # Choose authentication method
         if use_managed_identity:
             logger.info("Using Azure Managed Identity for authentication")
-            if client_id:
-                credential = ManagedIdentityCredential(client_id=client_id)
-            else:
-                credential = DefaultAzureCredential()
-            scope = "https://cognitiveservices.azure.com/.default"
-            token_provider = get_bearer_token_provider(credential, scope)
+            # One credential and cached token per identity for the whole process
+            token_provider = get_token_provider(
+                client_id,
+                managed_identity_only=bool(client_id),
+                cache_path=token_cache_path,
+            )
             azure_client = AsyncAzureOpenAI(
                 azure_ad_token_provider=token_provider,
                 azure_endpoint=base_url,
                 api_version=api_version,
                 azure_deployment=deployment,
+                max_retries=0,
             )
             auth_method = "Azure Managed Identity"
         else:
@@ -96,6 +98,7 @@ def get_azure_openai_model(
                 azure_endpoint=base_url,
                 api_version=api_version,
                 azure_deployment=deployment,
+                max_retries=0,
             )
             auth_method = "API Key"
     except Exception as err:
@@ -6,13 +6,14 @@ Provides Azure OpenAI Responses API integration for PydanticAI Agents.
 
 import logging
 import os
-from typing import Optional, Dict
+from typing import Optional
 
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from openai import AsyncAzureOpenAI
 from pydantic_ai.models.openai import OpenAIResponsesModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
+from recipe_executor.llm_utils.azure_tokens import get_token_provider
+
 __all__ = ["get_azure_responses_model"]
 
 
@@ -73,16 +74,13 @@ def get_azure_responses_model(
         # Initialize Azure OpenAI client
         if use_managed:
             logger.info("Authenticating to Azure OpenAI with Managed Identity.")
-            cred_kwargs: Dict[str, str] = {}
-            if client_id:
-                cred_kwargs["managed_identity_client_id"] = client_id
-            credential = DefaultAzureCredential(**cred_kwargs)
-            scope = "https://cognitiveservices.azure.com/.default"
-            token_provider = get_bearer_token_provider(credential, scope)
+            # One credential and cached token per identity for the whole process
+            token_provider = get_token_provider(client_id, cache_path=os.getenv("AZURE_TOKEN_CACHE_PATH"))
             azure_client = AsyncAzureOpenAI(
                 azure_endpoint=azure_endpoint,
                 api_version=azure_api_version,
                 azure_ad_token_provider=token_provider,
+                max_retries=0,
             )
             auth_method = "ManagedIdentity"
         else:
@@ -95,6 +93,7 @@ def get_azure_responses_model(
                 azure_endpoint=azure_endpoint,
                 api_version=azure_api_version,
                 api_key=azure_api_key,
+                max_retries=0,
             )
             auth_method = "ApiKey"
 
@@ -0,0 +1,211 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Azure AD Token Cache Component
+Shares Azure AD credentials and bearer tokens across the LLM calls of a process, and optionally
+across processes through a token cache file.
+
+Creating a credential and acquiring a token (an IMDS round-trip plus credential-chain probing)
+takes hundreds of milliseconds, so the Azure model factories get their token provider from
+`get_token_provider`, which returns one provider per identity and scope for the whole process.
+Tokens are refreshed ahead of their expiry; a worker process or a later run can pick up a token
+another process acquired from the cache file instead of acquiring its own.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache file is still written atomically, only not locked
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from azure.core.credentials import TokenCredential
+
+__all__ = ["COGNITIVE_SERVICES_SCOPE", "CachedTokenProvider", "get_token_provider"]
+
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+# Tokens are refreshed this many seconds before they expire
+REFRESH_MARGIN = 300.0
+
+_logger = logging.getLogger("recipe_executor.azure_tokens")
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    # Serializes token acquisition across processes sharing the cache file
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache(path: str, key: str, token: str, expires_on: float) -> None:
+    data = _read_cache(path)
+    now = time.time()
+    data = {k: v for k, v in data.items() if isinstance(v, dict) and v.get("expires_on", 0) > now}
+    data[key] = {"token": token, "expires_on": expires_on}
+    # Tokens are secrets: readable by the owner only, and replaced atomically for concurrent readers
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class CachedTokenProvider:
+    """
+    Bearer token provider for `AsyncAzureOpenAI(azure_ad_token_provider=...)` that creates its
+    credential once, reuses the token until it is within `refresh_margin` seconds of expiry,
+    and optionally shares tokens with other processes through `cache_path`.
+
+    Calling the provider returns an awaitable, so the client awaits it and token acquisition
+    runs in a thread instead of blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        credential_factory: Callable[[], "TokenCredential"],
+        scope: str = COGNITIVE_SERVICES_SCOPE,
+        cache_path: Optional[str] = None,
+        cache_key: Optional[str] = None,
+        refresh_margin: float = REFRESH_MARGIN,
+    ) -> None:
+        self.credential_factory = credential_factory
+        self.scope = scope
+        self.cache_path = cache_path
+        self.cache_key = cache_key or scope
+        self.refresh_margin = refresh_margin
+        self.acquisitions = 0
+        self._credential: Optional["TokenCredential"] = None
+        self._token: Optional[Tuple[str, float]] = None
+        self._lock = threading.Lock()
+
+    async def __call__(self) -> str:
+        token = self._fresh_token()
+        if token is None:
+            token = await asyncio.to_thread(self.get_token)
+        return token
+
+    def _fresh_token(self) -> Optional[str]:
+        cached = self._token
+        if cached is not None and cached[1] - time.time() > self.refresh_margin:
+            return cached[0]
+        return None
+
+    def get_token(self) -> str:
+        """
+        Return a token valid for at least `refresh_margin` seconds, acquiring one if needed.
+        """
+        with self._lock:
+            token = self._fresh_token()
+            if token is not None:
+                return token
+            if not self.cache_path:
+                return self._acquire()
+            with _locked(self.cache_path):
+                shared = _read_cache(self.cache_path).get(self.cache_key)
+                if (
+                    isinstance(shared, dict)
+                    and shared.get("token")
+                    and shared.get("expires_on", 0) - time.time() > self.refresh_margin
+                ):
+                    self._token = (shared["token"], float(shared["expires_on"]))
+                    _logger.debug("Using Azure AD token for %s from %s", self.scope, self.cache_path)
+                    return shared["token"]
+                token = self._acquire()
+                try:
+                    _write_cache(self.cache_path, self.cache_key, token, self._token[1])  # type: ignore[index]
+                except OSError as err:
+                    _logger.warning("Cannot write Azure AD token cache %s: %s", self.cache_path, err)
+                return token
+
+    def _acquire(self) -> str:
+        if self._credential is None:
+            self._credential = self.credential_factory()
+        start = time.monotonic()
+        try:
+            access = self._credential.get_token(self.scope)
+        except Exception as err:
+            # A failed early refresh keeps using the current token while it is still valid
+            cached = self._token
+            if cached is not None and cached[1] > time.time():
+                _logger.warning("Azure AD token refresh failed, using the current token until it expires: %s", err)
+                return cached[0]
+            raise
+        self.acquisitions += 1
+        self._token = (access.token, float(access.expires_on))
+        _logger.debug(
+            "Acquired Azure AD token for %s in %.3f sec (expires in %d sec)",
+            self.scope,
+            time.monotonic() - start,
+            access.expires_on - time.time(),
+        )
+        return access.token
+
+
+_providers: Dict[Tuple[Any, ...], CachedTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(
+    client_id: Optional[str] = None,
+    managed_identity_only: bool = False,
+    scope: str = COGNITIVE_SERVICES_SCOPE,
+    cache_path: Optional[str] = None,
+) -> CachedTokenProvider:
+    """
+    Return the process-wide token provider for an identity and scope.
+
+    Args:
+        client_id: Client ID of a user-assigned managed identity.
+        managed_identity_only: Use `ManagedIdentityCredential` instead of `DefaultAzureCredential`.
+        scope: Token scope (Azure OpenAI by default).
+        cache_path: Optional token cache file shared with other processes.
+
+    Returns:
+        CachedTokenProvider: Provider to pass as `azure_ad_token_provider`.
+    """
+    kind = "managed_identity" if managed_identity_only else "default"
+    key = (kind, client_id, scope, cache_path)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+
+            def create_credential() -> "TokenCredential":
+                from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+
+                if managed_identity_only:
+                    return ManagedIdentityCredential(client_id=client_id)
+                if client_id:
+                    return DefaultAzureCredential(managed_identity_client_id=client_id)
+                return DefaultAzureCredential()
+
+            provider = CachedTokenProvider(
+                create_credential,
+                scope=scope,
+                cache_path=os.path.abspath(os.path.expanduser(cache_path)) if cache_path else None,
+                cache_key=f"{kind}:{client_id or ''}:{scope}",
+            )
+            _providers[key] = provider
+        return provider
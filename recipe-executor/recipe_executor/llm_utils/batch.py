@@ -0,0 +1,234 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Batch component for the Recipe Executor LLM calls.
+
+Gathers LLM requests made concurrently by the items of a loop into OpenAI/Azure Batch API
+jobs (JSONL), polls the jobs until they finish, and hands each result back to the call that
+requested it. Requests that cannot be served by a batch job raise `BatchUnavailableError`
+so that the caller can fall back to an interactive call.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Type, Union
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+__all__ = ["BatchCollector", "BatchUnavailableError", "current_batch"]
+
+# Batch collector of the loop item being executed (set by LoopStep in batch mode; reset to
+# None by nested loop and parallel steps, whose concurrent calls would skew the flush count)
+current_batch: ContextVar[Optional["BatchCollector"]] = ContextVar("current_batch", default=None)
+
+BATCH_PROVIDERS = ("openai", "azure")
+_ENDPOINTS = {"openai": "/v1/chat/completions", "azure": "/chat/completions"}
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchUnavailableError(Exception):
+    """
+    Raised when a request could not be served by a batch job; callers fall back to an interactive call.
+    """
+
+
+@dataclass
+class _BatchRequest:
+    custom_id: str
+    model_id: str
+    client: "AsyncOpenAI"
+    body: Dict[str, Any]
+    future: "asyncio.Future[str]" = field(repr=False)
+
+
+class BatchCollector:
+    """
+    Collects LLM requests from concurrently running loop items and submits them as batch jobs.
+
+    A batch is flushed once every unfinished item is waiting on a request, so each round
+    of `llm_generate` calls across the loop becomes one job per model.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        config: Dict[str, Any],
+        items: int,
+        poll_interval: float = 10.0,
+        timeout: Optional[float] = 3600.0,
+    ) -> None:
+        """
+        Args:
+            logger: Logger for batch progress.
+            config: Context configuration (used to resolve Azure deployment names).
+            items: Number of loop items that may submit requests.
+            poll_interval: Seconds between batch status polls.
+            timeout: Seconds to wait for a job before cancelling it and falling back to
+                interactive calls (None waits for the whole 24h completion window).
+        """
+        self.logger = logger
+        self.config = config
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._active = items
+        self._waiting = 0
+        self._pending: List[_BatchRequest] = []
+        self._jobs: Set[asyncio.Task] = set()
+        self._next_id = 0
+
+    @staticmethod
+    def supports(model_id: str) -> bool:
+        """
+        Return True if requests for the model can be batched.
+        """
+        return model_id.split("/", 1)[0].lower() in BATCH_PROVIDERS
+
+    @contextmanager
+    def item(self) -> Iterator[None]:
+        """
+        Context manager wrapping one loop item's execution; marks the item finished on exit.
+        """
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._maybe_flush()
+
+    async def generate(
+        self,
+        model_id: str,
+        client: "AsyncOpenAI",
+        prompt: str,
+        output_type: Type[Union[str, BaseModel]] = str,
+        max_tokens: Optional[int] = None,
+    ) -> Union[str, BaseModel]:
+        """
+        Queue a chat completion request for the next batch job and wait for its result.
+
+        Raises:
+            BatchUnavailableError: If the job failed, timed out, or returned no usable result.
+        """
+        body: Dict[str, Any] = {
+            "model": self._request_model_name(model_id),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if max_tokens is not None:
+            body["max_tokens"] = max_tokens
+        if output_type is not str:
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": getattr(output_type, "__name__", "output"),
+                    "schema": output_type.model_json_schema(),  # type: ignore[union-attr]
+                    "strict": False,
+                },
+            }
+
+        self._next_id += 1
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._pending.append(_BatchRequest(f"request-{self._next_id}", model_id, client, body, future))
+        self._waiting += 1
+        try:
+            self._maybe_flush()
+            content = await future
+        finally:
+            self._waiting -= 1
+
+        if output_type is str:
+            return content
+        try:
+            return output_type.model_validate_json(content)  # type: ignore[union-attr]
+        except Exception as err:
+            raise BatchUnavailableError(f"Invalid structured output in batch result: {err}") from err
+
+    def _request_model_name(self, model_id: str) -> str:
+        parts = model_id.split("/")
+        if parts[0].lower() == "azure":
+            if len(parts) == 3:
+                return parts[2]
+            return self.config.get("azure_openai_deployment_name") or parts[1]
+        return parts[1]
+
+    def _maybe_flush(self) -> None:
+        if not self._pending or self._waiting < self._active:
+            return
+        requests, self._pending = self._pending, []
+        by_model: Dict[str, List[_BatchRequest]] = {}
+        for request in requests:
+            by_model.setdefault(request.model_id, []).append(request)
+        for model_id, group in by_model.items():
+            task = asyncio.create_task(self._run_job(model_id, group))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+
+    async def _run_job(self, model_id: str, requests: List[_BatchRequest]) -> None:
+        try:
+            results = await self._submit_and_wait(model_id, requests)
+        except Exception as err:
+            self.logger.warning("Batch job for %s failed (%s); falling back to interactive calls", model_id, err)
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(BatchUnavailableError(str(err)))
+            return
+
+        for request in requests:
+            if request.future.done():
+                continue
+            if request.custom_id in results:
+                request.future.set_result(results[request.custom_id])
+            else:
+                request.future.set_exception(BatchUnavailableError(f"No result for {request.custom_id} in batch job"))
+
+    async def _submit_and_wait(self, model_id: str, requests: List[_BatchRequest]) -> Dict[str, str]:
+        client = requests[0].client
+        endpoint = _ENDPOINTS[model_id.split("/", 1)[0].lower()]
+        lines = [
+            json.dumps({"custom_id": r.custom_id, "method": "POST", "url": endpoint, "body": r.body}) for r in requests
+        ]
+        input_file = await client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+        job = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=endpoint,  # type: ignore[arg-type]
+            completion_window="24h",
+        )
+        self.logger.info("Submitted batch job %s with %d requests for %s", job.id, len(requests), model_id)
+
+        start = time.monotonic()
+        while job.status not in _TERMINAL_STATUSES:
+            if self.timeout is not None and time.monotonic() - start > self.timeout:
+                await client.batches.cancel(job.id)
+                raise BatchUnavailableError(f"Batch job {job.id} did not finish within {self.timeout} sec")
+            await asyncio.sleep(self.poll_interval)
+            job = await client.batches.retrieve(job.id)
+            self.logger.debug("Batch job %s status=%s counts=%s", job.id, job.status, job.request_counts)
+
+        if job.status != "completed" or not job.output_file_id:
+            raise BatchUnavailableError(f"Batch job {job.id} ended with status '{job.status}'")
+
+        output = await client.files.content(job.output_file_id)
+        results: Dict[str, str] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"].get("content")
+            if content is not None:
+                results[record["custom_id"]] = content
+        self.logger.info(
+            "Batch job %s completed in %.1f sec: %d/%d results",
+            job.id,
+            time.monotonic() - start,
+            len(results),
+            len(requests),
+        )
+        return results
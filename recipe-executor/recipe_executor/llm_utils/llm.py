@@ -1,34 +1,49 @@
 # This file was generated by Codebase-Generator, do not edit directly
 import time
 import logging
-from typing import Optional, List, Type, Union, Dict, Any
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional, List, Type, Union, Dict, Any
 
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.settings import ModelSettings
-from pydantic_ai.models.openai import (
-    OpenAIModel,
-    OpenAIResponsesModel,
-    OpenAIResponsesModelSettings,
-)
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.providers.openai import OpenAIProvider
-from pydantic_ai.providers.anthropic import AnthropicProvider
-from pydantic_ai.mcp import MCPServer
-
-from openai.types.responses import WebSearchToolParam, FileSearchToolParam
-
-from recipe_executor.llm_utils.azure_openai import get_azure_openai_model
-from recipe_executor.llm_utils.responses import get_openai_responses_model
-from recipe_executor.llm_utils.azure_responses import get_azure_responses_model
+
+from recipe_executor.cassette import Cassette, current_cassette, replay_model
+from recipe_executor.context import Context
+from recipe_executor.hooks import emit
+from recipe_executor.llm_utils.batch import BatchUnavailableError, current_batch
+from recipe_executor.llm_utils.pool import get_model_pool
+from recipe_executor.llm_utils.prompt_cache import build_user_prompt, get_cached_tokens
+from recipe_executor.llm_utils.retry import RetryPolicy, call_with_retry, is_retryable
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.scheduler import record_token_usage
+from recipe_executor.utils.singleflight import coalescing_enabled, llm_flights, request_key
+from recipe_executor.utils.tokens import estimate_tokens
+
+# Provider SDKs (openai, anthropic, azure-identity, mcp) are imported by get_model and the
+# code paths that need them, so recipes that never call a provider do not pay for them
+if TYPE_CHECKING:
+    from pydantic_ai.mcp import MCPServer
+    from pydantic_ai.models import Model
+    from pydantic_ai.models.anthropic import AnthropicModel
+    from pydantic_ai.models.openai import OpenAIModel, OpenAIResponsesModel
+
+
+# Set while a call is being recorded to a cassette: collects its usage, and keeps the nested
+# calls of a model pool from being recorded a second time
+_recording_usage: ContextVar[Optional[Dict[str, Any]]] = ContextVar("recipe_executor_recording_usage", default=None)
+
+
+def _normalize_prompt(text: str) -> str:
+    # Line endings and surrounding whitespace do not change a request
+    return text.replace("\r\n", "\n").strip()
 
 
 def get_model(
     model_id: str,
     context: ContextProtocol,
     logger: logging.Logger,
-) -> Union[OpenAIModel, AnthropicModel, OpenAIResponsesModel]:
+) -> Union["OpenAIModel", "AnthropicModel", "OpenAIResponsesModel"]:
     """
     Initialize an LLM model based on a standardized model_id string.
     Expected format: 'provider/model_name' or 'provider/model_name/deployment_name'.
@@ -41,6 +56,9 @@ def get_model(
     - openai_responses
     - azure_responses
 
+    Model pools (`pool/<name>`) are routed by `LLM.generate` to one of their backends,
+    whose model ids are then resolved here.
+
     Args:
         model_id (str): Model identifier in format 'provider/model_name'
             or 'provider/model_name/deployment_name'.
@@ -64,9 +82,14 @@ def get_model(
     if provider == "openai":
         if len(parts) != 2:
             raise ValueError(f"Invalid OpenAI model_id: '{model_id}'")
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         model_name = parts[1]
         api_key = config.get("openai_api_key")
-        provider_obj = OpenAIProvider(api_key=api_key)
+        # Retries are governed by the retry policy, so the SDK client must not retry on its own
+        client = OpenAIProvider(api_key=api_key).client.with_options(max_retries=0)
+        provider_obj = OpenAIProvider(openai_client=client)
         return OpenAIModel(model_name=model_name, provider=provider_obj)
 
     # Azure OpenAI
@@ -77,6 +100,8 @@ def get_model(
             model_name, deployment = parts[1], parts[2]
         else:
             raise ValueError(f"Invalid Azure model_id: '{model_id}'")
+        from recipe_executor.llm_utils.azure_openai import get_azure_openai_model
+
         return get_azure_openai_model(
             logger=logger,
             model_name=model_name,
@@ -88,24 +113,31 @@ def get_model(
     if provider == "anthropic":
         if len(parts) != 2:
             raise ValueError(f"Invalid Anthropic model_id: '{model_id}'")
+        from pydantic_ai.providers.anthropic import AnthropicProvider
+
+        from recipe_executor.llm_utils.prompt_cache_anthropic import PromptCachingAnthropicModel
+
         model_name = parts[1]
         api_key = config.get("anthropic_api_key")
-        provider_obj = AnthropicProvider(api_key=api_key)
-        return AnthropicModel(model_name=model_name, provider=provider_obj)
+        # Retries are governed by the retry policy, so the SDK client must not retry on its own
+        client = AnthropicProvider(api_key=api_key).client.with_options(max_retries=0)
+        provider_obj = AnthropicProvider(anthropic_client=client)
+        return PromptCachingAnthropicModel(model_name=model_name, provider=provider_obj)
 
     # Ollama (OpenAI-compatible) provider
     if provider == "ollama":
         if len(parts) != 2:
             raise ValueError(f"Invalid Ollama model_id: '{model_id}'")
-        model_name = parts[1]
-        base_url = config.get("ollama_base_url") or "http://localhost:11434"
-        provider_obj = OpenAIProvider(base_url=f"{base_url}/v1")
-        return OpenAIModel(model_name=model_name, provider=provider_obj)
+        from recipe_executor.llm_utils.ollama import get_ollama_model
+
+        return get_ollama_model(logger, parts[1], context)
 
     # OpenAI Responses API
     if provider == "openai_responses":
         if len(parts) != 2:
             raise ValueError(f"Invalid OpenAI Responses model_id: '{model_id}'")
+        from recipe_executor.llm_utils.responses import get_openai_responses_model
+
         model_name = parts[1]
         return get_openai_responses_model(logger, model_name)
 
@@ -117,6 +149,8 @@ def get_model(
             model_name, deployment = parts[1], parts[2]
         else:
             raise ValueError(f"Invalid Azure Responses model_id: '{model_id}'")
+        from recipe_executor.llm_utils.azure_responses import get_azure_responses_model
+
         return get_azure_responses_model(logger, model_name, deployment)
 
     raise ValueError(f"Unsupported LLM provider: '{provider}' in model_id '{model_id}'")
@@ -134,13 +168,15 @@ class LLM:
         context: ContextProtocol,
         model: str = "openai/gpt-4o",
         max_tokens: Optional[int] = None,
-        mcp_servers: Optional[List[MCPServer]] = None,
+        mcp_servers: Optional[List["MCPServer"]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         self.logger: logging.Logger = logger
         self.context: ContextProtocol = context
         self.default_model_id: str = model
         self.default_max_tokens: Optional[int] = max_tokens
-        self.default_mcp_servers: List[MCPServer] = mcp_servers or []
+        self.default_mcp_servers: List["MCPServer"] = mcp_servers or []
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy.from_config(context.get_config())
 
     async def generate(
         self,
@@ -148,41 +184,171 @@ class LLM:
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         output_type: Type[Union[str, BaseModel]] = str,
-        mcp_servers: Optional[List[MCPServer]] = None,
+        mcp_servers: Optional[List["MCPServer"]] = None,
         openai_builtin_tools: Optional[List[Dict[str, Any]]] = None,
+        prompt_prefix: Optional[str] = None,
     ) -> Union[str, BaseModel]:
         """
         Generate an output from the LLM based on the provided prompt.
 
         Args:
-            prompt: The prompt to send to the model.
+            prompt: The prompt to send to the model (the variable part when a prefix is given).
             model: Optional model identifier to override default.
             max_tokens: Optional max tokens override.
             output_type: Desired return type (str or BaseModel).
             mcp_servers: Optional MCP servers override.
             openai_builtin_tools: Optional built-in tools for Responses API.
+            prompt_prefix: Optional stable prompt prefix, sent ahead of the prompt so that
+                provider prompt caching can reuse it across calls.
 
         Returns:
             The model output as plain text or structured data.
 
         Raises:
             ValueError: Invalid model identifier.
-            Exception: On network, API, or MCP errors.
+            Exception: On network, API, or MCP errors (after retries for transient errors).
         """
         model_id = model or self.default_model_id
         tokens = max_tokens if max_tokens is not None else self.default_max_tokens
         servers = mcp_servers if mcp_servers is not None else self.default_mcp_servers
 
+        cassette = current_cassette.get()
+        if cassette is not None and _recording_usage.get() is None:
+            return await self._generate_with_cassette(
+                cassette, model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix
+            )
+        return await self._generate_shared(
+            model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix
+        )
+
+    async def _generate_with_cassette(
+        self,
+        cassette: Cassette,
+        model_id: str,
+        prompt: str,
+        tokens: Optional[int],
+        output_type: Type[Union[str, BaseModel]],
+        servers: List["MCPServer"],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+        prompt_prefix: Optional[str],
+    ) -> Union[str, BaseModel]:
+        """
+        Record the request and its response to the cassette, or replay the recorded response.
+        """
+        request = {
+            "model": model_id,
+            "prompt_prefix": _normalize_prompt(prompt_prefix or ""),
+            "prompt": _normalize_prompt(prompt),
+            "max_tokens": tokens,
+            "output_type": output_type.__qualname__ if output_type is not str else "str",
+            "openai_builtin_tools": openai_builtin_tools,
+        }
+        if cassette.replaying:
+            interaction = cassette.replay("llm", request)
+            self.logger.info("LLM response replayed from cassette model_id=%s", model_id)
+            # Tool calls made through MCP servers are part of the recorded response
+            return await self._generate(
+                model_id,
+                prompt,
+                tokens,
+                output_type,
+                [],
+                None,
+                prompt_prefix,
+                model_instance=replay_model(interaction, cassette.latency),
+            )
+
+        recording: Dict[str, Any] = {}
+        token = _recording_usage.set(recording)
+        start = time.monotonic()
+        try:
+            output = await self._generate_shared(
+                model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix
+            )
+        finally:
+            _recording_usage.reset(token)
+        cassette.record(
+            "llm",
+            request,
+            {
+                "output": output if isinstance(output, str) else output.model_dump(mode="json"),
+                "usage": recording.get("usage"),
+            },
+            time.monotonic() - start,
+        )
+        return output
+
+    async def _generate_shared(
+        self,
+        model_id: str,
+        prompt: str,
+        tokens: Optional[int],
+        output_type: Type[Union[str, BaseModel]],
+        servers: List["MCPServer"],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+        prompt_prefix: Optional[str],
+    ) -> Union[str, BaseModel]:
+        """
+        Make the request, sharing one provider call between identical concurrent requests.
+        """
+        # Identical concurrent requests share one provider call. Not with MCP tools (side effects)
+        # or in batch mode, where the batch collector expects each item to submit its own request.
+        config = self.context.get_config()
+        if servers or current_batch.get() is not None or not coalescing_enabled(config):
+            return await self._generate(
+                model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix
+            )
+        output_name = (
+            f"{output_type.__module__}.{output_type.__qualname__}:{id(output_type)}"
+            if output_type is not str
+            else "str"
+        )
+        key = request_key(
+            model_id,
+            _normalize_prompt(prompt_prefix or ""),
+            _normalize_prompt(prompt),
+            tokens,
+            output_name,
+            openai_builtin_tools,
+            config,
+        )
+        return await llm_flights.do(
+            key,
+            lambda: self._generate(model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix),
+        )
+
+    async def _generate(
+        self,
+        model_id: str,
+        prompt: str,
+        tokens: Optional[int],
+        output_type: Type[Union[str, BaseModel]],
+        servers: List["MCPServer"],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+        prompt_prefix: Optional[str],
+        model_instance: Optional["Model"] = None,
+    ) -> Union[str, BaseModel]:
+        """
+        Make one LLM request (via a model pool, a batch job or an interactive call). A given
+        `model_instance` (a cassette replay) is used as is instead of resolving `model_id`.
+        """
         provider_name = model_id.split("/", 1)[0]
         self.logger.info(
             "LLM generate using provider=%s model_id=%s",
             provider_name,
             model_id,
         )
+        replaying = model_instance is not None
+
+        if provider_name == "pool" and not replaying:
+            return await self._generate_pooled(
+                model_id, prompt, tokens, output_type, servers, openai_builtin_tools, prompt_prefix
+            )
 
         output_name = getattr(output_type, "__name__", str(output_type))
         self.logger.debug(
-            "LLM request prompt=%r model_id=%s max_tokens=%s output_type=%s mcp_servers=%s",
+            "LLM request prompt_prefix=%r prompt=%r model_id=%s max_tokens=%s output_type=%s mcp_servers=%s",
+            prompt_prefix,
             prompt,
             model_id,
             tokens,
@@ -190,11 +356,37 @@ class LLM:
             [type(s).__name__ for s in servers],
         )
 
-        try:
-            model_instance = get_model(model_id, self.context, self.logger)
-        except ValueError as err:
-            self.logger.error("Invalid model_id '%s': %s", model_id, err)
-            raise
+        if model_instance is None:
+            try:
+                model_instance = get_model(model_id, self.context, self.logger)
+            except ValueError as err:
+                self.logger.error("Invalid model_id '%s': %s", model_id, err)
+                raise
+
+        client = getattr(model_instance, "client", None)
+
+        # Inside a batch-mode loop, queue the request for the loop's Batch API job
+        batch = current_batch.get()
+        if (
+            batch is not None
+            and not replaying
+            and batch.supports(model_id)
+            and not servers
+            and not openai_builtin_tools
+        ):
+            try:
+                output = await batch.generate(
+                    model_id,
+                    client,
+                    build_user_prompt(prompt, prompt_prefix, segmented=False),  # type: ignore[arg-type]
+                    output_type=output_type,
+                    max_tokens=tokens,
+                )
+                self.logger.info("LLM result via batch job model_id=%s", model_id)
+                emit("llm_end", model=model_id, batch=True, status="ok")
+                return output
+            except BatchUnavailableError as err:
+                self.logger.warning("Batch result unavailable (%s), falling back to an interactive call", err)
 
         agent_kwargs: Dict[str, Any] = {
             "model": model_instance,
@@ -204,6 +396,9 @@ class LLM:
 
         # Configure built-in tools for Responses API
         if provider_name in ("openai_responses", "azure_responses") and openai_builtin_tools:
+            from openai.types.responses import FileSearchToolParam, WebSearchToolParam
+            from pydantic_ai.models.openai import OpenAIResponsesModelSettings
+
             typed_tools: List[Union[WebSearchToolParam, FileSearchToolParam]] = []
             for tool in openai_builtin_tools:
                 try:
@@ -218,16 +413,35 @@ class LLM:
 
         agent: Agent = Agent(**agent_kwargs)  # type: ignore
 
+        # Stable prefix first; Anthropic needs separate blocks to place a cache breakpoint
+        user_prompt = build_user_prompt(
+            prompt,
+            prompt_prefix,
+            segmented=provider_name == "anthropic",
+        )
+
+        estimated_tokens = estimate_tokens(prompt_prefix or "", model_id) + estimate_tokens(prompt, model_id)
+        self.logger.debug("LLM request estimated prompt tokens=%d model_id=%s", estimated_tokens, model_id)
+
+        emit("llm_start", model=model_id, estimated_tokens=estimated_tokens)
         start = time.time()
         try:
             async with agent.run_mcp_servers():
-                result = await agent.run(prompt)
+                # Hedged duplicates could repeat side-effecting tool calls, so only hedge tool-free calls
+                result = await call_with_retry(
+                    lambda: agent.run(user_prompt),
+                    self.retry_policy,
+                    self.logger,
+                    key=model_id,
+                    hedge=self.retry_policy.hedge and not servers,
+                )
         except Exception as err:
             self.logger.error(
                 "LLM call failed model_id=%s error=%s",
                 model_id,
                 err,
             )
+            emit("llm_end", model=model_id, duration=round(time.time() - start, 3), status="error", error=str(err))
             raise
         end = time.time()
 
@@ -237,21 +451,118 @@ class LLM:
         except Exception:
             usage = None
 
-        if usage:
+        usage_data = (
+            {
+                "requests": usage.requests,
+                "total_tokens": usage.total_tokens or 0,
+                "request_tokens": usage.request_tokens or 0,
+                "response_tokens": usage.response_tokens or 0,
+                **get_cached_tokens(usage),
+            }
+            if usage
+            else None
+        )
+        recording = _recording_usage.get()
+        if recording is not None:
+            recording["usage"] = usage_data
+
+        if usage and usage_data:
+            # Charge the usage to the tokens-per-minute budget of the enclosing loop/parallel item
+            record_token_usage(usage.total_tokens or 0)
             self.logger.info(
-                "LLM result time=%.3f sec requests=%d tokens_total=%d (req=%d res=%d)",
+                "LLM result time=%.3f sec requests=%d tokens_total=%d "
+                "(req=%d req_estimated=%d res=%d cached_read=%d cached_write=%d)",
                 duration,
                 usage.requests,
-                usage.total_tokens,
-                usage.request_tokens,
-                usage.response_tokens,
+                usage.total_tokens or 0,
+                usage.request_tokens or 0,
+                estimated_tokens,
+                usage.response_tokens or 0,
+                usage_data["cache_read"],
+                usage_data["cache_write"],
             )
         else:
             self.logger.info(
                 "LLM result time=%.3f sec (usage unavailable)",
                 duration,
             )
+        emit(
+            "llm_end",
+            model=model_id,
+            duration=round(duration, 3),
+            status="ok",
+            usage=usage_data,
+        )
 
         self.logger.debug("LLM raw result data=%r", result.data)
 
         return result.output
+
+    async def _generate_pooled(
+        self,
+        model_id: str,
+        prompt: str,
+        max_tokens: Optional[int],
+        output_type: Type[Union[str, BaseModel]],
+        mcp_servers: List["MCPServer"],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+        prompt_prefix: Optional[str],
+    ) -> Union[str, BaseModel]:
+        """
+        Route a request for a model pool to one of its backends, failing over on retryable errors.
+        """
+        config = self.context.get_config()
+        pool = get_model_pool(model_id.split("/", 1)[1], config)
+        tokens = estimate_tokens(prompt_prefix or "", model_id) + estimate_tokens(prompt, model_id) + (max_tokens or 0)
+
+        # Failover across backends replaces per-backend retries
+        backend_policy = self.retry_policy.model_copy(update={"max_attempts": 1})
+        attempts = max(self.retry_policy.max_attempts, len(pool.backends))
+        tried = []
+        for attempt in range(1, attempts + 1):
+            backend = pool.acquire(tokens, exclude=tried)
+            tried.append(backend)
+            if len(tried) >= len(pool.backends):
+                tried = []
+            self.logger.debug("Model pool '%s' routed request to %s", pool.name, backend.model_id)
+
+            backend_llm = LLM(
+                self.logger,
+                Context(config={**config, **backend.config_overrides}),
+                model=backend.model_id,
+                retry_policy=backend_policy,
+            )
+            start = time.monotonic()
+            error: Optional[BaseException] = None
+            retryable = False
+            try:
+                result = await backend_llm.generate(
+                    prompt,
+                    max_tokens=max_tokens,
+                    output_type=output_type,
+                    mcp_servers=mcp_servers,
+                    openai_builtin_tools=openai_builtin_tools,
+                    prompt_prefix=prompt_prefix,
+                )
+            except Exception as err:
+                error, retryable = err, is_retryable(err)
+                if not retryable or attempt >= attempts:
+                    raise
+                self.logger.warning(
+                    "Model pool '%s' backend %s failed (%s), failing over (attempt %d/%d)",
+                    pool.name,
+                    backend.model_id,
+                    err,
+                    attempt,
+                    attempts,
+                )
+                continue
+            except BaseException as err:
+                # Cancelled (timeouts, fail-fast, abandoned singleflight calls): the load is still released
+                error = err
+                raise
+            finally:
+                pool.release(backend, tokens, time.monotonic() - start, error=error, retryable=retryable)
+            return result
+
+        raise RuntimeError(f"Model pool '{pool.name}' exhausted {attempts} attempts")
@@ -0,0 +1,295 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Ollama Component
+Provides Ollama models tuned for local throughput: one OpenAI-compatible client per server,
+optional model pre-warm and `keep_alive` control, and in-flight requests matched to the
+server's parallel slots.
+
+Ollama serves `OLLAMA_NUM_PARALLEL` requests per loaded model at once and queues the rest,
+rejecting requests with 503 once its queue is full. Requests are therefore admitted through
+`ParallelSlots`, a limiter sized to the configured slot count that shrinks when the server
+reports it is busy and grows back after a run of successful requests.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from pydantic_ai.models.openai import OpenAIModel
+
+__all__ = ["ParallelSlots", "get_ollama_model", "get_parallel_slots", "warm_up"]
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+# Status returned by Ollama when its request queue is full
+BUSY_STATUS_CODES = frozenset({503})
+
+_logger = logging.getLogger("recipe_executor.ollama")
+_INT = TypeAdapter(Optional[int])
+_BOOL = TypeAdapter(bool)
+
+
+class ParallelSlots:
+    """
+    Limits the requests in flight to a server, across event loops and threads.
+
+    `limit` is None (unbounded) until the server reports it is busy, or the configured
+    `max_limit`. A busy response lowers the limit to one below the requests then in flight;
+    every `2 * limit` successful requests in a row raise it by one, up to `max_limit`.
+    """
+
+    def __init__(self, max_limit: Optional[int] = None) -> None:
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.active = 0
+        self.peak = 0
+        self.busy = 0
+        self._successes = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self.limit is None or self.active < self.limit:
+                self._admit()
+                return
+            loop = asyncio.get_running_loop()
+            future: "asyncio.Future[None]" = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+                    raise
+            # Granted just as the caller was cancelled: hand the slot on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def _admit(self) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+    def release(self, busy: bool = False) -> None:
+        with self._lock:
+            self.active -= 1
+            if busy:
+                self.busy += 1
+                self._successes = 0
+                in_flight = self.active + 1
+                self.limit = max(1, min(self.limit or in_flight, in_flight) - 1)
+                _logger.info("Ollama server busy, limiting requests in flight to %d", self.limit)
+            elif self.limit is not None and (self.max_limit is None or self.limit < self.max_limit):
+                self._successes += 1
+                if self._successes >= 2 * self.limit:
+                    self._successes = 0
+                    self.limit += 1
+            self._wake()
+
+    def _wake(self) -> None:
+        # Called with the lock held
+        while self._waiters and (self.limit is None or self.active < self.limit):
+            loop, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._admit()
+            loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: "asyncio.Future[None]") -> None:
+        if future.done():
+            # Cancelled after being granted a slot
+            self.release()
+        else:
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        busy = False
+        try:
+            yield
+        except Exception as err:
+            busy = getattr(err, "status_code", None) in BUSY_STATUS_CODES
+            raise
+        finally:
+            self.release(busy=busy)
+
+
+_slots: Dict[Tuple[str, str], ParallelSlots] = {}
+_slots_lock = threading.Lock()
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+_warm: Set[str] = set()
+_warmups = SingleFlight("ollama_warmup")
+
+
+def get_parallel_slots(base_url: str, model_name: str, num_parallel: Optional[int] = None) -> ParallelSlots:
+    """
+    Return the process-wide slot limiter for a model on a server.
+    """
+    key = (base_url.rstrip("/"), model_name)
+    with _slots_lock:
+        slots = _slots.get(key)
+        if slots is None:
+            slots = _slots[key] = ParallelSlots(num_parallel)
+        elif num_parallel is not None and slots.max_limit != num_parallel:
+            slots.max_limit = slots.limit = num_parallel
+        return slots
+
+
+def _get_client(base_url: str) -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
+
+    # HTTP connections belong to an event loop, so clients are shared per loop. Retries are
+    # governed by the retry policy, so the SDK client must not retry on its own.
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return AsyncOpenAI(base_url=f"{base_url}/v1", api_key="ollama", max_retries=0)
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(base_url)
+    if client is None:
+        client = clients[base_url] = AsyncOpenAI(base_url=f"{base_url}/v1", api_key="ollama", max_retries=0)
+    return client
+
+
+async def warm_up(base_url: str, model_name: str, keep_alive: Optional[str] = None) -> None:
+    """
+    Load a model on the server (an empty `/api/generate` request), keeping it loaded for
+    `keep_alive`. Concurrent warm-ups of the same model share one request; failures are
+    logged and left to the first real request to report.
+    """
+    key = f"{base_url.rstrip('/')}|{model_name}"
+    if key in _warm:
+        return
+
+    async def load() -> None:
+        import httpx
+
+        # Attempted once per process, whatever the outcome
+        _warm.add(key)
+
+        payload: Dict[str, Any] = {"model": model_name}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        try:
+            async with httpx.AsyncClient(timeout=None) as client:
+                response = await client.post(f"{base_url.rstrip('/')}/api/generate", json=payload)
+                response.raise_for_status()
+        except Exception as err:
+            _logger.warning("Ollama warm-up of '%s' failed: %s", model_name, err)
+            return
+        _logger.info("Ollama model '%s' loaded (keep_alive=%s)", model_name, keep_alive or "server default")
+
+    await _warmups.do(key, load)
+
+
+def _define_ollama_model() -> type:
+    # Defined on first use so that importing this module does not load the OpenAI SDK
+    from pydantic_ai.messages import ModelMessage, ModelResponse
+    from pydantic_ai.models import ModelRequestParameters
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.settings import ModelSettings
+
+    class OllamaModel(OpenAIModel):
+        """
+        OpenAIModel for an Ollama server that warms the model up before its first request,
+        sends `keep_alive` with every request and waits for a parallel slot.
+        """
+
+        def __init__(
+            self,
+            model_name: str,
+            *,
+            base_url: str,
+            slots: ParallelSlots,
+            keep_alive: Optional[str] = None,
+            prewarm: bool = False,
+            **kwargs: Any,
+        ) -> None:
+            super().__init__(model_name, **kwargs)
+            self.server_url = base_url
+            self.slots = slots
+            self.keep_alive = keep_alive
+            self.prewarm = prewarm
+
+        async def request(
+            self,
+            messages: list[ModelMessage],
+            model_settings: Optional[ModelSettings],
+            model_request_parameters: ModelRequestParameters,
+        ) -> ModelResponse:
+            if self.prewarm:
+                await warm_up(self.server_url, self.model_name, self.keep_alive)
+            if self.keep_alive is not None:
+                settings: Dict[str, Any] = dict(model_settings or {})
+                settings["extra_body"] = {"keep_alive": self.keep_alive, **dict(settings.get("extra_body") or {})}  # type: ignore[arg-type]
+                model_settings = settings  # type: ignore[assignment]
+            async with self.slots.slot():
+                return await super().request(messages, model_settings, model_request_parameters)
+
+    return OllamaModel
+
+
+_ollama_model_cls: Optional[type] = None
+
+
+def get_ollama_model(logger: logging.Logger, model_name: str, context: ContextProtocol) -> "OpenAIModel":
+    """
+    Create a PydanticAI model for an Ollama server.
+
+    Configuration (from context):
+        ollama_base_url: Server URL (default http://localhost:11434).
+        ollama_keep_alive: How long the server keeps the model loaded after a request (e.g. "30m", "-1").
+        ollama_num_parallel: The server's parallel slots per model (its OLLAMA_NUM_PARALLEL).
+        ollama_prewarm: Load the model once before the first request.
+
+    Returns:
+        OpenAIModel: Model sending OpenAI-compatible requests to the server.
+
+    Raises:
+        ValueError: If a setting is invalid.
+    """
+    global _ollama_model_cls
+    config = context.get_config()
+    base_url = (config.get("ollama_base_url") or DEFAULT_BASE_URL).rstrip("/")
+    keep_alive = config.get("ollama_keep_alive") or None
+    try:
+        num_parallel = _INT.validate_python(config.get("ollama_num_parallel") or None)
+        prewarm = _BOOL.validate_python(config.get("ollama_prewarm") or False)
+    except ValidationError as err:
+        raise ValueError(f"Invalid Ollama configuration: {err}") from err
+    if num_parallel is not None and num_parallel < 1:
+        raise ValueError(f"Invalid ollama_num_parallel: {num_parallel} (must be at least 1)")
+
+    logger.debug(
+        "Ollama config: base_url=%s, keep_alive=%s, num_parallel=%s, prewarm=%s",
+        base_url,
+        keep_alive,
+        num_parallel,
+        prewarm,
+    )
+
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    if _ollama_model_cls is None:
+        _ollama_model_cls = _define_ollama_model()
+    return _ollama_model_cls(
+        model_name,
+        provider=OpenAIProvider(openai_client=_get_client(base_url)),
+        base_url=base_url,
+        slots=get_parallel_slots(base_url, model_name, num_parallel),
+        keep_alive=str(keep_alive) if keep_alive is not None else None,
+        prewarm=prewarm,
+    )
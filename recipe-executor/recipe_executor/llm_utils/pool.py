@@ -0,0 +1,224 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Model pool component for the Recipe Executor LLM calls.
+
+Maps one logical model name (`pool/<name>`) to several backends (Azure deployments,
+OpenAI-compatible endpoints, Ollama hosts). Requests are routed by least outstanding
+tokens or smooth weighted round-robin, backends that return 429/5xx are put on a
+cool-down, and per-backend latency and error counts are tracked.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+__all__ = [
+    "ModelBackend",
+    "ModelBackendConfig",
+    "ModelPool",
+    "ModelPoolConfig",
+    "get_model_pool",
+    "get_pool_stats",
+]
+
+PoolStrategy = Literal["least_tokens", "weighted_round_robin"]
+
+
+class ModelBackendConfig(BaseModel):
+    """
+    One backend of a model pool.
+
+    Fields:
+        model: Model identifier of the backend (e.g. 'azure/gpt-4o/eastus-deployment', 'ollama/llama3.1').
+        weight: Relative share of requests for weighted round-robin.
+        config: Configuration overrides for this backend (e.g. `azure_openai_base_url`,
+            `azure_openai_api_key`, `ollama_base_url`, `openai_api_key`).
+    """
+
+    model: str
+    weight: int = Field(default=1, ge=1)
+    config: Dict[str, Any] = {}
+
+
+class ModelPoolConfig(BaseModel):
+    """
+    Configuration of a model pool.
+
+    Fields:
+        backends: The backends serving the logical model.
+        strategy: Routing strategy: "least_tokens" (default) or "weighted_round_robin".
+        cooldown: Seconds a backend is skipped after a retryable failure (doubles per consecutive failure).
+        max_cooldown: Upper bound for the cool-down, in seconds.
+    """
+
+    backends: List[ModelBackendConfig] = Field(min_length=1)
+    strategy: PoolStrategy = "least_tokens"
+    cooldown: float = 10.0
+    max_cooldown: float = 300.0
+
+
+class ModelBackend:
+    """
+    Routing state and statistics for one backend.
+    """
+
+    def __init__(self, config: ModelBackendConfig) -> None:
+        self.model_id = config.model
+        self.weight = config.weight
+        self.config_overrides = dict(config.config)
+        self.outstanding_tokens = 0
+        self.outstanding_requests = 0
+        self.current_weight = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.total_latency = 0.0
+        self.last_latency: Optional[float] = None
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def stats(self) -> Dict[str, Any]:
+        successes = self.requests - self.errors
+        return {
+            "model": self.model_id,
+            "weight": self.weight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "outstanding_requests": self.outstanding_requests,
+            "outstanding_tokens": self.outstanding_tokens,
+            "avg_latency": self.total_latency / successes if successes else None,
+            "last_latency": self.last_latency,
+            "healthy": self.healthy(time.monotonic()),
+        }
+
+
+class ModelPool:
+    """
+    A logical model served by several backends.
+
+    Thread-safe, so a pool can be shared by every executor running in a process.
+    """
+
+    def __init__(self, name: str, config: ModelPoolConfig) -> None:
+        self.name = name
+        self.strategy: PoolStrategy = config.strategy
+        self.cooldown = config.cooldown
+        self.max_cooldown = config.max_cooldown
+        self.backends = [ModelBackend(backend) for backend in config.backends]
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int, exclude: Iterable[ModelBackend] = ()) -> ModelBackend:
+        """
+        Select a backend for a request of about `tokens` tokens and count it as outstanding.
+
+        Healthy backends not in `exclude` are preferred; if there are none, the remaining
+        backend that recovers soonest is used.
+        """
+        excluded = set(id(backend) for backend in exclude)
+        with self._lock:
+            now = time.monotonic()
+            candidates = [b for b in self.backends if id(b) not in excluded] or list(self.backends)
+            healthy = [b for b in candidates if b.healthy(now)]
+            if not healthy:
+                backend = min(candidates, key=lambda b: b.unhealthy_until)
+            elif self.strategy == "weighted_round_robin":
+                backend = self._next_weighted(healthy)
+            else:
+                backend = min(healthy, key=lambda b: (b.outstanding_tokens / b.weight, b.outstanding_requests))
+            backend.outstanding_tokens += tokens
+            backend.outstanding_requests += 1
+            backend.requests += 1
+            return backend
+
+    def release(
+        self,
+        backend: ModelBackend,
+        tokens: int,
+        latency: float,
+        error: Optional[BaseException] = None,
+        retryable: bool = False,
+    ) -> None:
+        """
+        Record the outcome of a request; retryable failures put the backend on a cool-down.
+        Must be called once for every `acquire`, including for cancelled requests.
+        """
+        with self._lock:
+            backend.outstanding_tokens = max(0, backend.outstanding_tokens - tokens)
+            backend.outstanding_requests = max(0, backend.outstanding_requests - 1)
+            if error is not None and not isinstance(error, Exception):
+                # Cancelled or interrupted: says nothing about the backend's health
+                return
+            if error is None:
+                backend.consecutive_failures = 0
+                backend.unhealthy_until = 0.0
+                backend.total_latency += latency
+                backend.last_latency = latency
+                return
+            backend.errors += 1
+            if retryable:
+                backend.consecutive_failures += 1
+                delay = min(self.max_cooldown, self.cooldown * 2 ** (backend.consecutive_failures - 1))
+                backend.unhealthy_until = time.monotonic() + delay
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [backend.stats() for backend in self.backends]
+
+    def _next_weighted(self, backends: List[ModelBackend]) -> ModelBackend:
+        # Smooth weighted round-robin: spreads picks evenly while honoring weights
+        total = sum(b.weight for b in backends)
+        for backend in backends:
+            backend.current_weight += backend.weight
+        chosen = max(backends, key=lambda b: b.current_weight)
+        chosen.current_weight -= total
+        return chosen
+
+
+# Pools are process-wide so routing state and statistics persist across LLM calls
+_pools: Dict[str, ModelPool] = {}
+_pool_configs: Dict[str, str] = {}
+_pools_lock = threading.Lock()
+
+
+def get_model_pool(name: str, config: Dict[str, Any]) -> ModelPool:
+    """
+    Return the pool named `name` from the `model_pools` configuration, creating it on first use.
+
+    Args:
+        name: Logical model name (the part after `pool/` in the model id).
+        config: Context configuration containing `model_pools` (a dict, or a JSON string).
+
+    Raises:
+        ValueError: If the pool is not configured or its configuration is invalid.
+    """
+    pools_config = config.get("model_pools") or {}
+    if isinstance(pools_config, str):
+        pools_config = json.loads(pools_config)
+    if name not in pools_config:
+        raise ValueError(f"Model pool '{name}' is not configured (see MODEL_POOLS)")
+
+    raw = pools_config[name]
+    if isinstance(raw, list):
+        raw = {"backends": raw}
+    fingerprint = json.dumps(raw, sort_keys=True, default=str)
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None or _pool_configs.get(name) != fingerprint:
+            pool = ModelPool(name, ModelPoolConfig.model_validate(raw))
+            _pools[name] = pool
+            _pool_configs[name] = fingerprint
+        return pool
+
+
+def get_pool_stats() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return per-backend statistics (requests, errors, latency, outstanding load, health) for every pool.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
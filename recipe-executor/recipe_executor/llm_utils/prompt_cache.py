@@ -0,0 +1,54 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Prompt caching helpers for the Recipe Executor LLM component.
+
+Provides helpers for building segmented prompts and reading cached-token counts from
+provider usage details. The Anthropic model that places a `cache_control` breakpoint
+after the stable prompt prefix lives in `prompt_cache_anthropic`, so importing these
+helpers does not load the Anthropic SDK.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from pydantic_ai.usage import Usage
+
+__all__ = ["build_user_prompt", "get_cached_tokens"]
+
+# Usage detail keys reported by providers for prompt-cache hits
+_CACHE_READ_KEYS = ("cached_tokens", "cache_read_input_tokens")
+_CACHE_WRITE_KEYS = ("cache_creation_input_tokens",)
+
+
+def build_user_prompt(prompt: str, prompt_prefix: Optional[str], segmented: bool) -> Union[str, Sequence[str]]:
+    """
+    Combine an optional stable prefix with the variable prompt.
+
+    Args:
+        prompt: The variable part of the prompt.
+        prompt_prefix: Optional stable part, placed before the prompt.
+        segmented: If True, return separate content parts (for providers with explicit
+            cache breakpoints); otherwise join them into a single prefix-first string.
+
+    Returns:
+        The user prompt to pass to the agent.
+    """
+    if not prompt_prefix:
+        return prompt
+    if segmented:
+        return [prompt_prefix, prompt]
+    return f"{prompt_prefix}\n\n{prompt}"
+
+
+def get_cached_tokens(usage: Optional["Usage"]) -> Dict[str, int]:
+    """
+    Extract prompt-cache token counts from a usage object.
+
+    Returns:
+        Dict with `cache_read` and `cache_write` token counts (0 when not reported).
+    """
+    details: Dict[str, int] = (usage.details if usage else None) or {}
+    return {
+        "cache_read": sum(details.get(key, 0) for key in _CACHE_READ_KEYS),
+        "cache_write": sum(details.get(key, 0) for key in _CACHE_WRITE_KEYS),
+    }
@@ -0,0 +1,35 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Anthropic model with prompt-prefix caching for the Recipe Executor LLM component.
+
+Kept apart from `prompt_cache` so that only recipes using Anthropic models load the
+Anthropic SDK; import it where an Anthropic model is built.
+"""
+
+from typing import Any, List, Tuple
+
+from pydantic_ai.messages import ModelMessage
+from pydantic_ai.models.anthropic import AnthropicModel
+
+__all__ = ["PromptCachingAnthropicModel"]
+
+
+class PromptCachingAnthropicModel(AnthropicModel):
+    """
+    AnthropicModel that marks the stable prefix of a segmented user prompt as cacheable.
+
+    When the first user message carries more than one content block (prefix + suffix),
+    an ephemeral `cache_control` breakpoint is placed on the first block so that
+    subsequent requests sharing the same prefix are served from the prompt cache.
+    """
+
+    async def _map_message(self, messages: List[ModelMessage]) -> Tuple[Any, List[Any]]:  # type: ignore[override]
+        system_prompt, anthropic_messages = await super()._map_message(messages)
+        for message in anthropic_messages:
+            if message.get("role") != "user":
+                continue
+            content = message.get("content")
+            if isinstance(content, list) and len(content) > 1 and content[0].get("type") == "text":  # type: ignore
+                content[0]["cache_control"] = {"type": "ephemeral"}  # type: ignore
+            break
+        return system_prompt, anthropic_messages
@@ -9,6 +9,7 @@ import os
 from typing import Optional
 
 from pydantic_ai.models.openai import OpenAIResponsesModel
+from pydantic_ai.providers.openai import OpenAIProvider
 
 
 def get_openai_responses_model(
@@ -64,7 +65,9 @@ def get_openai_responses_model(
 
     # Instantiate the model
     try:
-        return OpenAIResponsesModel(chosen_model)
+        # Retries are governed by the retry policy, so the SDK client must not retry on its own
+        client = OpenAIProvider(api_key=api_key).client.with_options(max_retries=0)
+        return OpenAIResponsesModel(chosen_model, provider=OpenAIProvider(openai_client=client))
     except Exception as e:
         logger.error(
             "Failed to create OpenAIResponsesModel for model %s: %s",
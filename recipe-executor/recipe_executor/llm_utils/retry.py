@@ -0,0 +1,277 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Retry component for the Recipe Executor LLM calls.
+
+Provides a retry policy (exponential backoff with jitter, retryable-error classification,
+max attempts and an overall deadline) and optional hedged requests, where a duplicate
+call is started when the first one runs longer than the recent p95 latency.
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple, TypeVar
+
+import httpx
+from pydantic import BaseModel
+
+from recipe_executor.cancellation import remaining_time
+
+__all__ = ["LatencyTracker", "RetryPolicy", "call_with_retry", "is_retryable", "latency_tracker"]
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: timeouts, conflicts, rate limits, server errors and overload
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry and hedging settings for LLM calls.
+
+    Fields:
+        max_attempts: Maximum number of attempts (1 disables retries).
+        initial_delay: Backoff before the first retry, in seconds.
+        max_delay: Upper bound for a single backoff, in seconds.
+        multiplier: Backoff growth factor per attempt.
+        jitter: Use full jitter (a random delay up to the computed backoff).
+        deadline: Optional overall time budget for the call across all attempts, in seconds.
+        hedge: Start a duplicate request when an attempt exceeds the recent latency quantile.
+        hedge_quantile: Latency quantile that triggers a hedged request.
+        hedge_min_samples: Latency samples required before hedging is attempted.
+    """
+
+    max_attempts: int = 3
+    initial_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    deadline: Optional[float] = None
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """
+        Build a policy from context configuration (`llm_max_attempts`, `llm_retry_initial_delay`,
+        `llm_retry_max_delay`, `llm_deadline`, `llm_hedge`); missing keys use the defaults.
+        """
+        values: Dict[str, Any] = {}
+        for key, field in (
+            ("llm_max_attempts", "max_attempts"),
+            ("llm_retry_initial_delay", "initial_delay"),
+            ("llm_retry_max_delay", "max_delay"),
+            ("llm_deadline", "deadline"),
+            ("llm_hedge", "hedge"),
+        ):
+            if config.get(key) is not None:
+                values[field] = config[key]
+        return cls.model_validate(values)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay before retrying after the given (1-based) failed attempt.
+        """
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent successful call latencies, per key (e.g. model id).
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, key: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Return the q-quantile of the recorded latencies, or None if there are fewer than min_samples.
+        """
+        samples = self._samples.get(key)
+        if not samples or len(samples) < max(1, min_samples):
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def clear(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._samples.clear()
+        else:
+            self._samples.pop(key, None)
+
+
+# Shared across LLM instances so that hedging thresholds reflect all calls to a model
+latency_tracker = LatencyTracker()
+
+
+def _iter_causes(err: BaseException):
+    seen: Set[int] = set()
+    current: Optional[BaseException] = err
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def _connection_error_types() -> Tuple[type, ...]:
+    # Provider SDKs are imported lazily; an SDK that is not loaded cannot have raised its errors
+    types = []
+    for module_name in ("openai", "anthropic"):
+        module = sys.modules.get(module_name)
+        error_type = getattr(module, "APIConnectionError", None)
+        if isinstance(error_type, type):
+            types.append(error_type)
+    return tuple(types)
+
+
+def is_retryable(err: BaseException) -> bool:
+    """
+    Classify an error from an LLM call as transient (worth retrying) or not.
+
+    Retryable: timeouts, connection errors and HTTP 408/409/425/429/5xx/529 responses
+    (as raised by pydantic-ai, OpenAI or Anthropic clients).
+    """
+    connection_errors = _connection_error_types()
+    for exc in _iter_causes(err):
+        if isinstance(exc, (asyncio.TimeoutError, TimeoutError, httpx.TransportError)):
+            return True
+        if isinstance(exc, connection_errors):
+            return True
+        status_code = getattr(exc, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def _retry_after(err: BaseException) -> Optional[float]:
+    """
+    Return the server-requested retry delay (Retry-After header, in seconds), if any.
+    """
+    for exc in _iter_causes(err):
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            continue
+        value = headers.get("retry-after")
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    return None
+
+
+async def _hedged(call: Callable[[], Awaitable[T]], hedge_after: float, logger: logging.Logger) -> T:
+    """
+    Run call(); if it has not finished after hedge_after seconds, start a duplicate and
+    return whichever succeeds first, cancelling the other.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result()
+
+        logger.debug("LLM call exceeded %.3f sec, sending hedged request", hedge_after)
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    logger: logging.Logger,
+    key: str,
+    hedge: Optional[bool] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> T:
+    """
+    Await call() under a retry policy.
+
+    Args:
+        call: Factory returning a fresh awaitable for each attempt.
+        policy: The retry policy.
+        logger: Logger for retry messages.
+        key: Latency tracking key (usually the model id).
+        hedge: Override policy.hedge (e.g. disable hedging for calls with side-effecting tools).
+        tracker: Latency tracker (defaults to the shared `latency_tracker`).
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        The last error if it is not retryable, attempts are exhausted, or the deadline passes.
+    """
+    tracker = tracker or latency_tracker
+    use_hedge = policy.hedge if hedge is None else hedge
+    max_attempts = max(1, policy.max_attempts)
+    start = time.monotonic()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = None if policy.deadline is None else policy.deadline - (time.monotonic() - start)
+        hedge_after = tracker.quantile(key, policy.hedge_quantile, policy.hedge_min_samples) if use_hedge else None
+
+        attempt_start = time.monotonic()
+        try:
+            awaitable = _hedged(call, hedge_after, logger) if hedge_after is not None else call()
+            if remaining is not None:
+                result = await asyncio.wait_for(awaitable, timeout=max(0.0, remaining))
+            else:
+                result = await awaitable
+        except Exception as err:
+            timed_out = isinstance(err, asyncio.TimeoutError) and remaining is not None
+            elapsed = time.monotonic() - start
+            if timed_out or attempt >= max_attempts or not is_retryable(err):
+                if timed_out:
+                    logger.error("LLM call deadline of %.1f sec exceeded after %d attempt(s)", policy.deadline, attempt)
+                raise
+
+            delay = _retry_after(err)
+            if delay is None:
+                delay = policy.backoff(attempt)
+            if policy.deadline is not None and elapsed + delay >= policy.deadline:
+                logger.error("LLM call deadline of %.1f sec leaves no time to retry: %s", policy.deadline, err)
+                raise
+            # Do not sleep past the recipe or step deadline
+            time_left = remaining_time()
+            if time_left is not None and delay >= time_left:
+                logger.error("Step deadline leaves no time to retry the LLM call: %s", err)
+                raise
+            logger.warning(
+                "LLM call attempt %d/%d failed (%s: %s), retrying in %.2f sec",
+                attempt,
+                max_attempts,
+                type(err).__name__,
+                err,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        tracker.record(key, time.monotonic() - attempt_start)
+        return result
@@ -9,6 +9,9 @@ import sys
 import logging
 from logging import Logger
 
+LOG_FORMAT = "%(asctime)s.%(msecs)03d [%(levelname)s] (%(filename)s:%(lineno)d) %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
     """
@@ -47,9 +50,7 @@ def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
     logger.debug("Log directory created: %s", log_dir)
 
     # Define log formatters
-    fmt = "%(asctime)s.%(msecs)03d [%(levelname)s] (%(filename)s:%(lineno)d) %(message)s"
-    datefmt = "%Y-%m-%d %H:%M:%S"
-    formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
+    formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
     # Set up file handlers for DEBUG, INFO, and ERROR levels
     level_map = [
@@ -86,3 +87,50 @@ def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
     logger.info("Logger initialized successfully")
 
     return logger
+
+
+def init_job_logger(name: str, log_dir: str) -> Logger:
+    """
+    Creates a standalone logger for one job that writes debug/info/error log files to `log_dir`.
+
+    Unlike `init_logger`, the root logger is left untouched and the logger is not registered
+    with the logging module, so concurrent jobs keep separate logs. Close it with
+    `close_job_logger` when the job ends.
+
+    Args:
+        name (str): Logger name, e.g. "recipe_executor.job.<id>".
+        log_dir (str): Directory for the job's log files (created if missing).
+
+    Returns:
+        logging.Logger: Logger that does not propagate to the root logger.
+
+    Raises:
+        Exception: If log directory cannot be created or log files cannot be opened.
+    """
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+    except Exception as exc:
+        raise Exception(f"Failed to create log directory '{log_dir}': {exc}")
+
+    logger = logging.Logger(name, logging.DEBUG)
+    formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    for level_name, level in (("debug", logging.DEBUG), ("info", logging.INFO), ("error", logging.ERROR)):
+        file_path = os.path.join(log_dir, f"{level_name}.log")
+        try:
+            fh = logging.FileHandler(file_path, mode="w", encoding="utf-8")
+        except Exception as exc:
+            close_job_logger(logger)
+            raise Exception(f"Failed to set up {level_name} log file '{file_path}': {exc}")
+        fh.setLevel(level)
+        fh.setFormatter(formatter)
+        logger.addHandler(fh)
+    return logger
+
+
+def close_job_logger(logger: Logger) -> None:
+    """
+    Closes and removes the handlers of a logger created by `init_job_logger`.
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
@@ -6,14 +6,20 @@ import os
 import sys
 import time
 import traceback
+from contextlib import nullcontext
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
+from recipe_executor.cassette import Cassette, use_cassette
 from recipe_executor.config import load_configuration
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
+from recipe_executor.hooks import JsonlEventLog, ProgressBar, Subscriber
 from recipe_executor.logger import init_logger
 from recipe_executor.models import Recipe
+from recipe_executor.planner import Planner, format_plan
+from recipe_executor.utils.memory import MemoryProfiler, RssMonitor, format_bytes
+from recipe_executor.utils.singleflight import get_coalesce_stats
 
 
 def parse_key_value_pairs(pairs: List[str]) -> Dict[str, str]:
@@ -42,6 +48,39 @@ async def main_async() -> None:
     parser.add_argument("--log-dir", type=str, default="logs", help="Directory for log files")
     parser.add_argument("--context", action="append", default=[], help="Context artifact values as key=value pairs")
     parser.add_argument("--config", action="append", default=[], help="Static configuration values as key=value pairs")
+    parser.add_argument("--timeout", type=float, default=None, help="Cancel the run after this many seconds")
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Validate the recipe and print its expanded plan with LLM call and token estimates, without running it",
+    )
+    parser.add_argument(
+        "--plan-format", choices=["text", "json"], default="text", help="Output format of the --plan report"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Record tracemalloc peak and net allocation per step and write a memory profile to the log directory",
+    )
+    parser.add_argument(
+        "--progress", action="store_true", help="Show a live progress line (loop items, steps, LLM calls) on stderr"
+    )
+    parser.add_argument(
+        "--events", type=str, default=None, help="Append execution lifecycle events as JSON lines to this file"
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record", type=str, default=None, help="Record LLM requests and MCP tool calls to this cassette file"
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        help="Serve LLM requests and MCP tool calls from this cassette file instead of providers and servers",
+    )
+    parser.add_argument(
+        "--replay-latency", action="store_true", help="With --replay, delay each response by its recorded duration"
+    )
     args = parser.parse_args()
 
     # Prepare log directory
@@ -53,7 +92,8 @@ async def main_async() -> None:
 
     # Initialize logger
     try:
-        logger: logging.Logger = init_logger(args.log_dir)
+        # In plan mode stdout carries the report, so only warnings and errors are logged there
+        logger: logging.Logger = init_logger(args.log_dir, stdio_log_level="WARNING" if args.plan else "INFO")
     except Exception as exc:
         sys.stderr.write(f"Logger Initialization Error: {exc}\n")
         raise SystemExit(1)
@@ -99,18 +139,83 @@ async def main_async() -> None:
     # Create execution context
     context = Context(artifacts=artifacts, config=merged_config)
 
+    # Plan mode: report the expanded recipe and exit without executing it
+    if args.plan:
+        report = Planner(logger).plan(args.recipe_path, context)
+        if args.plan_format == "json":
+            sys.stdout.write(report.model_dump_json(indent=2) + "\n")
+        else:
+            sys.stdout.write(format_plan(report) + "\n")
+        raise SystemExit(0 if report.ok else 1)
+
+    # Lifecycle event subscribers
+    subscribers: List[Subscriber] = []
+    if args.progress:
+        subscribers.append(ProgressBar())
+    event_log: Optional[JsonlEventLog] = None
+    if args.events:
+        try:
+            event_log = JsonlEventLog(args.events)
+        except OSError as exc:
+            sys.stderr.write(f"Events Error: cannot open '{args.events}': {exc}\n")
+            raise SystemExit(1)
+        subscribers.append(event_log)
+
+    # Record/replay cassette
+    cassette: Optional[Cassette] = None
+    if args.record or args.replay:
+        try:
+            cassette = Cassette(args.record or args.replay, "record" if args.record else "replay", args.replay_latency)
+        except (OSError, ValueError) as exc:
+            sys.stderr.write(f"Cassette Error: cannot open '{args.record or args.replay}': {exc}\n")
+            raise SystemExit(1)
+
     # Execute the recipe
-    executor = Executor(logger)
+    executor = Executor(logger, subscribers=subscribers)
     logger.info("Executing recipe: %s", args.recipe_path)
     start_time = time.time()
+    monitor = RssMonitor()
+    profiler = MemoryProfiler() if args.profile_memory else None
     try:
-        await executor.execute(recipe, context)
+        with monitor, profiler if profiler is not None else nullcontext(), use_cassette(cassette):
+            await executor.execute(recipe, context, timeout=args.timeout)
     except Exception as exec_err:
         logger.error("An error occurred during recipe execution: %s", exec_err, exc_info=True)
         raise SystemExit(1)
+    finally:
+        if event_log is not None:
+            event_log.close()
+        if cassette is not None:
+            cassette.close()
+            logger.info(
+                "Cassette %s: %d interactions %s",
+                cassette.path,
+                cassette.recorded if args.record else cassette.replayed,
+                "recorded" if args.record else "replayed",
+            )
+        if profiler is not None:
+            # Written for failed runs too, which are often the ones being investigated
+            json_path, html_path = profiler.write_report(args.log_dir)
+            logger.info(
+                "Memory profile (tracemalloc peak %s) written to %s and %s",
+                format_bytes(profiler.peak),
+                json_path,
+                html_path,
+            )
     duration = time.time() - start_time
 
-    logger.info("Recipe execution completed successfully in %.2f seconds", duration)
+    logger.info(
+        "Recipe execution completed successfully in %.2f seconds (peak RSS %s)", duration, format_bytes(monitor.peak)
+    )
+    coalesce_stats = get_coalesce_stats()
+    if any(stats["calls"] for stats in coalesce_stats.values()):
+        logger.info(
+            "Requests: %d LLM calls (%d coalesced), %d MCP tool calls (%d coalesced)",
+            coalesce_stats["llm"]["calls"],
+            coalesce_stats["llm"]["coalesced"],
+            coalesce_stats["mcp"]["calls"],
+            coalesce_stats["mcp"]["coalesced"],
+        )
 
 
 def main() -> None:
@@ -0,0 +1,444 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Runtime metrics in the Prometheus text format.
+
+A process-wide registry of counters, gauges and histograms covering recipe runs, step
+durations, LLM latency and tokens, queue waits, cache hits, MCP tool calls and active
+sessions. Recipe, step and LLM metrics are recorded from the execution hooks once
+`enable_metrics()` (or `start_metrics_server()`) has been called; the others are recorded
+where they happen. `start_metrics_server(port)` serves the registry on a local `/metrics`
+endpoint for scraping. No third-party dependencies.
+"""
+
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from recipe_executor.hooks import ExecutionEvent, subscribe
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+__all__ = [
+    "ACTIVE_SESSIONS",
+    "CACHE_REQUESTS",
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LLM_DURATION",
+    "LLM_TOKENS",
+    "MCP_ACTIVE_CALLS",
+    "MCP_CALL_DURATION",
+    "MCP_TOOL_DURATION",
+    "MetricsRegistry",
+    "QUEUE_WAIT",
+    "RECIPE_DURATION",
+    "RECIPE_RUNS",
+    "REGISTRY",
+    "STEP_DURATION",
+    "enable_metrics",
+    "instrument_tool",
+    "record_event",
+    "start_metrics_server",
+    "timed",
+    "track_sessions",
+]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+F = TypeVar("F", bound=Callable[..., Any])
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Metric '{self.name}' expects labels {list(self.labels)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """
+        Return (sample name, formatted labels, value) for every labelled series.
+        """
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class _Value(_Metric):
+    # One value per label combination
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def _add(self, amount: float, labels: Dict[str, Any]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labels, key), value) for key, value in values]
+
+
+class Counter(_Value):
+    """
+    A monotonically increasing count, e.g. `RECIPE_RUNS.inc(status="ok")`.
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter '{self.name}' cannot decrease (got {amount})")
+        self._add(amount, labels)
+
+
+class Gauge(_Value):
+    """
+    A value that goes up and down, e.g. the number of open sessions.
+    """
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class _Buckets:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        # Non-cumulative count per bucket, and the sum of the observations
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class Histogram(_Metric):
+    """
+    Observations counted into cumulative buckets, with their sum and count, e.g. durations.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        if "le" in labels:
+            raise ValueError(f"Histogram '{name}' cannot use the reserved label 'le'")
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound))) + (math.inf,)
+        self._series: Dict[LabelKey, _Buckets] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Buckets(len(self.buckets))
+            series.counts[index] += 1
+            series.total += value
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series.counts) if series else 0
+
+    def sum(self, **labels: Any) -> float:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series.total if series else 0.0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            series = sorted((key, (list(buckets.counts), buckets.total)) for key, buckets in self._series.items())
+        samples: List[Tuple[str, str, float]] = []
+        names = self.labels + ("le",)
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((
+                    f"{self.name}_bucket",
+                    _format_labels(names, key + (_format_value(bound),)),
+                    cumulative,
+                ))
+            labels = _format_labels(self.labels, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    A set of named metrics rendered together in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, documentation: str, labels: Sequence[str], **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labels, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labels != tuple(labels):
+                raise ValueError(
+                    f"Metric '{name}' is already registered as a {metric.type} with labels {metric.labels}"
+                )
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labels)
+
+    def histogram(
+        self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labels, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Register a callable run before each render, e.g. to set gauges from current state.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector()
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+
+REGISTRY = MetricsRegistry()
+
+RECIPE_RUNS = REGISTRY.counter("recipe_runs_total", "Top-level recipe runs by outcome.", ("status",))
+RECIPE_DURATION = REGISTRY.histogram(
+    "recipe_run_duration_seconds",
+    "Duration of top-level recipe runs.",
+    buckets=DEFAULT_BUCKETS + (600.0, 1800.0, 3600.0),
+)
+STEP_DURATION = REGISTRY.histogram(
+    "recipe_step_duration_seconds", "Duration of recipe steps by step type and outcome.", ("step_type", "status")
+)
+LLM_DURATION = REGISTRY.histogram(
+    "recipe_llm_request_duration_seconds", "Latency of LLM calls by model and outcome.", ("model", "status")
+)
+LLM_TOKENS = REGISTRY.counter(
+    "recipe_llm_tokens_total",
+    "LLM tokens by model and kind (request, response, cache_read, cache_write).",
+    ("model", "kind"),
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "recipe_queue_wait_seconds",
+    "Time spent waiting to start: rate-limited loop/parallel items (scheduler) and daemon jobs (daemon).",
+    ("queue",),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "recipe_cache_requests_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")
+)
+MCP_CALL_DURATION = REGISTRY.histogram(
+    "recipe_mcp_call_duration_seconds", "Latency of MCP tool calls made by recipes.", ("tool", "status")
+)
+MCP_TOOL_DURATION = REGISTRY.histogram(
+    "mcp_tool_duration_seconds", "Latency of MCP tool calls served by this process.", ("server", "tool", "status")
+)
+MCP_ACTIVE_CALLS = REGISTRY.gauge("mcp_active_calls", "MCP tool calls currently being served.", ("server",))
+ACTIVE_SESSIONS = REGISTRY.gauge("active_sessions", "Open app sessions (browser pages) by app.", ("app",))
+
+
+def record_event(event: ExecutionEvent) -> None:
+    """
+    Hooks subscriber recording recipe, step and LLM metrics.
+    """
+    data = event.data
+    if event.type == "step_end":
+        STEP_DURATION.observe(data["duration"], step_type=data["step_type"], status=data["status"])
+    elif event.type == "recipe_end" and not event.path:
+        RECIPE_RUNS.inc(status=data["status"])
+        RECIPE_DURATION.observe(data["duration"])
+    elif event.type == "llm_end" and "duration" in data:
+        model = data["model"]
+        LLM_DURATION.observe(data["duration"], model=model, status=data["status"])
+        for kind, count in (data.get("usage") or {}).items():
+            if kind != "requests" and kind != "total_tokens" and count:
+                LLM_TOKENS.inc(count, model=model, kind=kind.replace("_tokens", ""))
+
+
+_enabled = False
+_enabled_lock = threading.Lock()
+
+
+def enable_metrics() -> None:
+    """
+    Start recording recipe, step and LLM metrics from the execution hooks (idempotent).
+    """
+    global _enabled
+    with _enabled_lock:
+        if not _enabled:
+            subscribe(record_event)
+            _enabled = True
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: Any) -> Iterator[None]:
+    """
+    Observe the duration of a block in `histogram`, with a `status` label of ok or error.
+    """
+    start = time.monotonic()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        histogram.observe(time.monotonic() - start, status=status, **labels)
+
+
+def instrument_tool(server: str) -> Callable[[F], F]:
+    """
+    Decorator recording latency and in-flight count of an MCP server's tool. Apply it below
+    `@mcp.tool()`; the wrapped function keeps its name, docstring and signature.
+    """
+
+    def decorator(fn: F) -> F:
+        tool = fn.__name__
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                MCP_ACTIVE_CALLS.inc(server=server)
+                try:
+                    with timed(MCP_TOOL_DURATION, server=server, tool=tool):
+                        return await fn(*args, **kwargs)
+                finally:
+                    MCP_ACTIVE_CALLS.dec(server=server)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            MCP_ACTIVE_CALLS.inc(server=server)
+            try:
+                with timed(MCP_TOOL_DURATION, server=server, tool=tool):
+                    return fn(*args, **kwargs)
+            finally:
+                MCP_ACTIVE_CALLS.dec(server=server)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def track_sessions(blocks: Any, app: str) -> None:
+    """
+    Count the open sessions of a Gradio `Blocks` app in ACTIVE_SESSIONS. Call inside the
+    `with gr.Blocks() as blocks:` block.
+    """
+    blocks.load(lambda: ACTIVE_SESSIONS.inc(app=app))
+    blocks.unload(lambda: ACTIVE_SESSIONS.dec(app=app))
+
+
+def start_metrics_server(
+    port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None
+) -> "ThreadingHTTPServer":
+    """
+    Enable metrics and serve `registry` (default REGISTRY) on http://host:port/metrics from a
+    daemon thread. Port 0 picks a free port (see `server.server_address`); call `shutdown()`
+    to stop it.
+    """
+    # Imported here, so processes that never serve metrics do not pay for http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    served = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = served.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    enable_metrics()
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -90,6 +90,7 @@ class RecipeStep(BaseModel):
     Attributes:
         type: The type of the recipe step (e.g., 'read_files', 'llm_generate', 'write_files').
         config: Step-specific configuration as a dict or Pydantic model.
+        timeout: Optional time limit for the step in seconds.
     """
 
     type: str = Field(..., description="Type of the recipe step to execute")
@@ -100,6 +101,11 @@ class RecipeStep(BaseModel):
             "unknown types remain a raw dict."
         ),
     )
+    timeout: Optional[float] = Field(
+        None,
+        ge=0,
+        description="Optional time limit in seconds; the step is cancelled and fails with a TimeoutError when exceeded",
+    )
 
 
 class Recipe(BaseModel):
@@ -108,6 +114,7 @@ class Recipe(BaseModel):
     Attributes:
         steps: Ordered list of steps to run.
         env_vars: Optional list of environment variable names required by the recipe.
+        timeout: Optional time limit for the whole recipe in seconds.
     """
 
     steps: List[RecipeStep] = Field(..., description="Ordered list of recipe steps")
@@ -115,6 +122,11 @@ class Recipe(BaseModel):
         None,
         description="Optional list of environment variable names required for the recipe",
     )
+    timeout: Optional[float] = Field(
+        None,
+        ge=0,
+        description="Optional time limit in seconds for the whole recipe, including nested recipes and substeps",
+    )
 
 
 __all__ = [
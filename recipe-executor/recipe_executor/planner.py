@@ -0,0 +1,389 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Static recipe planner.
+
+`Planner.plan` loads a recipe graph without running it: every step type is looked up and
+its config validated, `execute_recipe` paths that resolve from the initial context are
+followed, and loops are expanded by the size of their collections. The resulting
+`PlanReport` estimates how many steps, sub-recipe runs and LLM calls a run will make and
+how many prompt tokens it will send, so problems and costs surface before paid work starts.
+
+Estimates are static: artifacts produced by earlier steps are unknown, so prompts are
+measured with only the initial context filled in, loops over produced collections count as
+one iteration, and both branches of conditionals are counted.
+"""
+
+import glob
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from recipe_executor.models import Recipe
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.utils.templates import render_template, render_value, resolve_path
+from recipe_executor.utils.tokens import estimate_tokens
+
+__all__ = ["PlanReport", "PlannedStep", "Planner", "format_plan"]
+
+# Nesting depth at which sub-recipe expansion stops
+_MAX_DEPTH = 25
+
+
+class PlannedStep(BaseModel):
+    """
+    One step of the expanded recipe graph.
+
+    Attributes:
+        path: Location of the step, e.g. "recipe.json#2/loop/0".
+        type: Step type.
+        depth: Nesting depth (0 for top-level steps).
+        runs: Expected number of executions (loop sizes multiplied along the path).
+        exact: False if a loop size along the path was unknown and counted as 1.
+        llm_calls: Expected LLM calls made by this step.
+        prompt_tokens: Estimated prompt tokens per execution (LLM steps only).
+        note: Extra detail, e.g. the sub-recipe path or loop size.
+    """
+
+    path: str
+    type: str
+    depth: int
+    runs: int
+    exact: bool = True
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    note: Optional[str] = None
+
+
+class PlanReport(BaseModel):
+    """
+    Result of statically planning a recipe.
+
+    Attributes:
+        recipe: The planned recipe (path or "<inline>").
+        steps: The expanded steps, in execution order.
+        step_runs: Expected executions per step type.
+        sub_recipes: Sub-recipe files that will be executed.
+        llm_calls: Expected number of LLM calls.
+        prompt_tokens: Estimated prompt tokens over all LLM calls.
+        max_output_tokens: Sum of the configured `max_tokens` over all LLM calls (calls without a limit excluded).
+        tokens_by_model: Expected calls and prompt tokens per model.
+        exact: False if any count is a lower bound because a loop size was unknown.
+        errors: Problems that will make the run fail (unknown step types, invalid configs, missing sub-recipes).
+        warnings: Things the planner could not resolve statically.
+    """
+
+    recipe: str
+    steps: List[PlannedStep] = []
+    step_runs: Dict[str, int] = {}
+    sub_recipes: List[str] = []
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    max_output_tokens: int = 0
+    tokens_by_model: Dict[str, Dict[str, int]] = {}
+    exact: bool = True
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class Planner:
+    """
+    Statically expands and validates recipes.
+
+    Usage:
+        report = Planner(logger).plan("recipes/generate.json", Context(artifacts=..., config=...))
+        print(format_plan(report))
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger = logger
+
+    def plan(self, recipe: Union[str, Path, Dict[str, Any], Recipe], context: ContextProtocol) -> PlanReport:
+        """
+        Plan a recipe (file path, dict or Recipe model) against the initial context.
+        """
+        name = str(recipe) if isinstance(recipe, (str, Path)) else "<inline>"
+        report = PlanReport(recipe=name)
+        steps = self._load(recipe, report)
+        if steps is not None:
+            label = os.path.basename(name) if isinstance(recipe, (str, Path)) else "recipe"
+            stack = [os.path.abspath(name)] if isinstance(recipe, (str, Path)) else []
+            self._plan_steps(steps, context.clone(), report, label, 0, 1, True, stack)
+        return report
+
+    def _load(
+        self, recipe: Union[str, Path, Dict[str, Any], Recipe], report: PlanReport
+    ) -> Optional[List[Dict[str, Any]]]:
+        if isinstance(recipe, Recipe):
+            return recipe.model_dump()["steps"]
+        try:
+            if isinstance(recipe, dict):
+                data = recipe
+            else:
+                with open(recipe, encoding="utf-8") as f:
+                    data = json.load(f)
+            Recipe.model_validate(data)
+        except Exception as exc:
+            report.errors.append(f"{recipe}: cannot load recipe: {_one_line(exc)}")
+            return None
+        return data["steps"]
+
+    def _plan_steps(
+        self,
+        steps: List[Dict[str, Any]],
+        context: ContextProtocol,
+        report: PlanReport,
+        prefix: str,
+        depth: int,
+        runs: int,
+        exact: bool,
+        stack: List[str],
+    ) -> None:
+        for index, step in enumerate(steps):
+            self._plan_step(step, context, report, f"{prefix}#{index}", depth, runs, exact, stack)
+
+    def _plan_step(
+        self,
+        step: Dict[str, Any],
+        context: ContextProtocol,
+        report: PlanReport,
+        path: str,
+        depth: int,
+        runs: int,
+        exact: bool,
+        stack: List[str],
+    ) -> None:
+        step_type = str(step.get("type"))
+        config: Dict[str, Any] = step.get("config") or {}
+        planned = PlannedStep(path=path, type=step_type, depth=depth, runs=runs, exact=exact)
+        report.steps.append(planned)
+        report.step_runs[step_type] = report.step_runs.get(step_type, 0) + runs
+        report.exact = report.exact and exact
+
+        # Look up the step and validate its config the same way the executor will
+        if step_type not in STEP_REGISTRY:
+            report.errors.append(f"{path}: unknown step type '{step_type}'")
+            return
+        try:
+            STEP_REGISTRY[step_type](self.logger, config)
+        except Exception as exc:
+            report.errors.append(f"{path} ('{step_type}'): invalid config: {_one_line(exc)}")
+            return
+
+        if step_type == "llm_generate":
+            self._plan_llm(config, context, report, planned)
+        elif step_type == "set_context":
+            self._plan_set_context(config, context, report, path)
+        elif step_type == "execute_recipe":
+            self._plan_sub_recipe(config, context, report, planned, stack)
+        elif step_type == "loop":
+            self._plan_loop(config, context, report, planned, stack)
+        elif step_type == "parallel":
+            for index, substep in enumerate(config.get("substeps") or []):
+                self._plan_step(substep, context, report, f"{path}/{index}", depth + 1, runs, exact, stack)
+        elif step_type == "conditional":
+            planned.note = "both branches counted"
+            for branch in ("if_true", "if_false"):
+                branch_steps = (config.get(branch) or {}).get("steps") or []
+                self._plan_steps(branch_steps, context, report, f"{path}/{branch}", depth + 1, runs, exact, stack)
+
+    def _render(self, text: str, context: ContextProtocol, report: PlanReport, path: str) -> str:
+        try:
+            return render_template(text, context)
+        except Exception as exc:
+            report.warnings.append(f"{path}: cannot render '{text[:60]}': {exc}")
+            return text
+
+    def _plan_llm(
+        self, config: Dict[str, Any], context: ContextProtocol, report: PlanReport, planned: PlannedStep
+    ) -> None:
+        model = self._render(str(config.get("model", "openai/gpt-4o")), context, report, planned.path) or "unknown"
+        prompt = self._render(str(config.get("prompt", "")), context, report, planned.path)
+        prefix = self._render(str(config.get("prompt_prefix") or ""), context, report, planned.path)
+        tokens = estimate_tokens(prefix, model) + estimate_tokens(prompt, model)
+
+        planned.llm_calls = planned.runs
+        planned.prompt_tokens = tokens
+        planned.note = model
+        report.llm_calls += planned.runs
+        report.prompt_tokens += tokens * planned.runs
+        by_model = report.tokens_by_model.setdefault(model, {"calls": 0, "prompt_tokens": 0})
+        by_model["calls"] += planned.runs
+        by_model["prompt_tokens"] += tokens * planned.runs
+
+        max_tokens = config.get("max_tokens")
+        if isinstance(max_tokens, str):
+            max_tokens = self._render(max_tokens, context, report, planned.path)
+        try:
+            report.max_output_tokens += int(max_tokens) * planned.runs if max_tokens not in (None, "") else 0
+        except (TypeError, ValueError):
+            pass
+
+    def _plan_set_context(
+        self, config: Dict[str, Any], context: ContextProtocol, report: PlanReport, path: str
+    ) -> None:
+        # Literal and template values are known statically; make them visible to later steps
+        value = config.get("value")
+        key = self._render(str(config.get("key", "")), context, report, path)
+        if key and key not in context:
+            context[key] = self._render(value, context, report, path) if isinstance(value, str) else value
+
+    def _plan_sub_recipe(
+        self,
+        config: Dict[str, Any],
+        context: ContextProtocol,
+        report: PlanReport,
+        planned: PlannedStep,
+        stack: List[str],
+    ) -> None:
+        recipe_path = self._render(str(config.get("recipe_path", "")), context, report, planned.path)
+        planned.note = recipe_path
+        if not recipe_path or not os.path.isfile(recipe_path):
+            if "{{" in str(config.get("recipe_path", "")):
+                report.warnings.append(f"{planned.path}: sub-recipe path resolved to '{recipe_path}', not found")
+            else:
+                report.errors.append(f"{planned.path}: sub-recipe not found: {recipe_path}")
+            return
+
+        absolute = os.path.abspath(recipe_path)
+        if absolute in stack or len(stack) >= _MAX_DEPTH:
+            report.warnings.append(f"{planned.path}: recursive sub-recipe '{recipe_path}' not expanded")
+            return
+        if recipe_path not in report.sub_recipes:
+            report.sub_recipes.append(recipe_path)
+        steps = self._load(recipe_path, report)
+        if steps is None:
+            return
+
+        # The sub-recipe shares the context, with overrides applied
+        sub_context = context.clone()
+        for key, value in (config.get("context_overrides") or {}).items():
+            try:
+                sub_context[key] = render_value(value, sub_context)
+            except Exception as exc:
+                report.warnings.append(f"{planned.path}: cannot render override '{key}': {exc}")
+        self._plan_steps(
+            steps,
+            sub_context,
+            report,
+            f"{planned.path}/{os.path.basename(recipe_path)}",
+            planned.depth + 1,
+            planned.runs,
+            planned.exact,
+            stack + [absolute],
+        )
+
+    def _plan_loop(
+        self,
+        config: Dict[str, Any],
+        context: ContextProtocol,
+        report: PlanReport,
+        planned: PlannedStep,
+        stack: List[str],
+    ) -> None:
+        count, sample, source = self._loop_items(config, context, report, planned.path)
+        exact = planned.exact and count is not None
+        planned.note = f"{count} items from {source}" if count is not None else f"unknown number of items from {source}"
+        if count is None:
+            report.warnings.append(f"{planned.path}: items '{source}' not available before execution, counted once")
+        if count == 0:
+            return
+
+        # Render substeps against the first item as a representative sample
+        item_context = context.clone()
+        item_key = str(config.get("item_key", "item"))
+        if isinstance(sample, tuple):
+            item_context["__key"], item_context[item_key] = sample
+        else:
+            item_context[item_key] = sample
+            item_context["__index"] = 0
+        self._plan_steps(
+            config.get("substeps") or [],
+            item_context,
+            report,
+            f"{planned.path}/loop",
+            planned.depth + 1,
+            planned.runs * (count or 1),
+            exact,
+            stack,
+        )
+
+    def _loop_items(
+        self, config: Dict[str, Any], context: ContextProtocol, report: PlanReport, path: str
+    ) -> Tuple[Optional[int], Any, str]:
+        """
+        Return the loop's item count (None if unknown), a sample item and a description of the source.
+        """
+        if config.get("items_file"):
+            items_file = self._render(str(config["items_file"]), context, report, path)
+            if not os.path.isfile(items_file):
+                return None, None, items_file
+            count, sample = 0, None
+            with open(items_file, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        if sample is None:
+                            sample = json.loads(line)
+                        count += 1
+            return count, sample, items_file
+        if config.get("items_glob"):
+            pattern = self._render(str(config["items_glob"]), context, report, path)
+            matches = glob.iglob(pattern, recursive=True)
+            sample = next(matches, None)
+            return (0 if sample is None else 1 + sum(1 for _ in matches)), sample, pattern
+
+        items = config.get("items")
+        if isinstance(items, list):
+            return len(items), items[0] if items else None, "inline list"
+        if isinstance(items, dict):
+            return len(items), next(iter(items.items()), None), "inline dict"
+        source = self._render(str(items), context, report, path)
+        value = resolve_path(source, context)
+        if isinstance(value, list):
+            return len(value), value[0] if value else None, source
+        if isinstance(value, dict):
+            return len(value), next(iter(value.items()), None), source
+        return None, None, source
+
+
+def _one_line(exc: Exception) -> str:
+    # Pydantic errors span several lines and end with a documentation link
+    lines = [line.strip() for line in str(exc).splitlines() if line.strip()]
+    return " ".join(line for line in lines if not line.startswith("For further information"))
+
+
+def format_plan(report: PlanReport) -> str:
+    """
+    Render a plan report as a human-readable tree with totals.
+    """
+    lines = [f"Plan for {report.recipe}", ""]
+    for step in report.steps:
+        runs = f"x{step.runs}" + ("" if step.exact else "+")
+        detail = f"  {step.note}" if step.note else ""
+        tokens = f"  ~{step.prompt_tokens} prompt tokens/call" if step.llm_calls else ""
+        lines.append(f"{'  ' * step.depth}{step.path.rsplit('/', 1)[-1]} {step.type} {runs}{tokens}{detail}")
+
+    bound = "" if report.exact else " (lower bound)"
+    lines += [
+        "",
+        f"Steps: {sum(report.step_runs.values())}{bound}  "
+        + ", ".join(f"{name}={count}" for name, count in sorted(report.step_runs.items())),
+        f"Sub-recipes: {len(report.sub_recipes)} files, {report.step_runs.get('execute_recipe', 0)} executions",
+        f"LLM calls: {report.llm_calls}{bound}",
+        f"Prompt tokens: ~{report.prompt_tokens}{bound}",
+        f"Max output tokens: {report.max_output_tokens} (calls with max_tokens only)",
+    ]
+    for model, totals in sorted(report.tokens_by_model.items()):
+        lines.append(f"  {model}: {totals['calls']} calls, ~{totals['prompt_tokens']} prompt tokens")
+    for warning in report.warnings:
+        lines.append(f"WARNING: {warning}")
+    for error in report.errors:
+        lines.append(f"ERROR: {error}")
+    return "\n".join(lines)
@@ -8,7 +8,7 @@ This module provides structural interfaces (Protocols) for core components:
 - ExecutorProtocol
 """
 
-from typing import Protocol, runtime_checkable, Any, Dict, Iterator, Union
+from typing import Protocol, runtime_checkable, Any, Dict, Iterator, Optional, Union
 from pathlib import Path
 from logging import Logger
 
@@ -75,4 +75,5 @@ class ExecutorProtocol(Protocol):
         self,
         recipe: Union[str, Path, Recipe],
         context: ContextProtocol,
+        timeout: Optional[float] = None,
     ) -> None: ...
@@ -0,0 +1,241 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Rate-based launch scheduling for loop and parallel steps.
+
+A `RateScheduler` combines two token buckets: one limiting item launches per second
+(with an optional burst), and one limiting LLM tokens per minute. Launches reserve their
+slot up front, so waiting launches start in order and completions arriving together do
+not cause a burst. Token usage reported by LLM calls made inside a launched item is
+debited from the tokens-per-minute budget, so later launches wait while it is spent.
+
+Steps that configure the same `key` share one scheduler (and so one budget) across the
+process, e.g. several loops calling the same deployment.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from recipe_executor.metrics import QUEUE_WAIT
+
+__all__ = [
+    "LaunchStats",
+    "RateConfig",
+    "RateScheduler",
+    "TokenBucket",
+    "get_scheduler",
+    "record_token_usage",
+]
+
+
+class RateConfig(BaseModel):
+    """
+    Rate limits for launching loop items or parallel substeps.
+
+    Fields:
+        per_second: Maximum launches per second (token bucket refill rate).
+        burst: Launches allowed back to back before the rate applies.
+        tokens_per_minute: LLM token budget per minute, debited with the usage reported by LLM calls.
+        tokens_per_item: Estimated tokens reserved when an item launches (replaced by actual usage).
+        key: Share one scheduler between all steps with this key.
+    """
+
+    per_second: Optional[float] = Field(default=None, gt=0)
+    burst: int = Field(default=1, ge=1)
+    tokens_per_minute: Optional[int] = Field(default=None, gt=0)
+    tokens_per_item: int = Field(default=0, ge=0)
+    key: Optional[str] = None
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations: taking more than is available drives the
+    balance negative, and the taker waits until it has been refilled.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take `amount` tokens and return the seconds until the reservation is covered.
+        """
+        self._refill(now)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LaunchStats:
+    """
+    Launch timing of one step: how long launches waited for the scheduler and how regular
+    the intervals between launches were (jitter is the standard deviation of the intervals).
+    """
+
+    def __init__(self) -> None:
+        self.launches = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self._interval_mean = 0.0
+        self._interval_m2 = 0.0
+
+    def record(self, launched_at: float, wait: float) -> None:
+        self.launches += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if self.last is not None:
+            # Welford's online mean and variance of the launch intervals
+            interval = launched_at - self.last
+            count = self.launches - 1
+            delta = interval - self._interval_mean
+            self._interval_mean += delta / count
+            self._interval_m2 += delta * (interval - self._interval_mean)
+        else:
+            self.first = launched_at
+        self.last = launched_at
+
+    def summary(self) -> Dict[str, Any]:
+        intervals = self.launches - 1
+        elapsed = (self.last - self.first) if self.first is not None and self.last is not None else 0.0
+        return {
+            "launches": self.launches,
+            "rate": round(intervals / elapsed, 3) if elapsed > 0 else None,
+            "interval_mean": round(self._interval_mean, 4) if intervals > 0 else None,
+            "interval_jitter": round(math.sqrt(self._interval_m2 / intervals), 4) if intervals > 1 else None,
+            "wait_total": round(self.wait_total, 3),
+            "wait_max": round(self.wait_max, 3),
+        }
+
+
+class _ItemBudget:
+    # Tokens reserved for one launched item; reported usage consumes the reservation first
+    def __init__(self, scheduler: "RateScheduler", reserved: int) -> None:
+        self.scheduler = scheduler
+        self.reserved = reserved
+
+    def consume(self, tokens: int) -> None:
+        covered = min(self.reserved, tokens)
+        self.reserved -= covered
+        self.scheduler.record_tokens(tokens - covered)
+
+    def release(self) -> None:
+        # Return the unused part of the estimate
+        if self.reserved and self.scheduler.token_bucket is not None:
+            with self.scheduler.lock:
+                self.scheduler.token_bucket.give(self.reserved)
+        self.reserved = 0
+
+
+_current_budget: ContextVar[Optional[_ItemBudget]] = ContextVar("recipe_executor_item_budget", default=None)
+
+
+class RateScheduler:
+    """
+    Launch scheduler enforcing a `RateConfig`.
+
+    Usage:
+        scheduler = get_scheduler(rate)
+        async with scheduler.slot(stats):
+            await executor.execute(plan, item_context)
+    """
+
+    def __init__(self, config: RateConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.launch_bucket: Optional[TokenBucket] = None
+        self.token_bucket: Optional[TokenBucket] = None
+        if config.per_second is not None:
+            self.launch_bucket = TokenBucket(config.per_second, config.burst)
+        if config.tokens_per_minute is not None:
+            self.token_bucket = TokenBucket(config.tokens_per_minute / 60.0, config.tokens_per_minute)
+        self.tokens_used = 0
+
+    def reserve(self) -> float:
+        """
+        Reserve a launch and return the seconds to wait before it may start.
+        """
+        with self.lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.launch_bucket is not None:
+                wait = self.launch_bucket.reserve(1, now)
+            if self.token_bucket is not None:
+                # Launch once the budget is no longer overspent, reserving the item's estimate
+                wait = max(wait, self.token_bucket.reserve(self.config.tokens_per_item, now))
+            return wait
+
+    def record_tokens(self, tokens: int) -> None:
+        with self.lock:
+            self.tokens_used += tokens
+            if self.token_bucket is not None and tokens:
+                self.token_bucket.take(tokens)
+
+    @asynccontextmanager
+    async def slot(self, stats: Optional[LaunchStats] = None) -> AsyncIterator[float]:
+        """
+        Wait for a launch slot, then run the block with LLM token usage charged to this
+        scheduler. Yields the seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        QUEUE_WAIT.observe(wait, queue="scheduler")
+        if stats is not None:
+            stats.record(time.monotonic(), wait)
+        budget = _ItemBudget(self, self.config.tokens_per_item if self.token_bucket is not None else 0)
+        token = _current_budget.set(budget)
+        try:
+            yield wait
+        finally:
+            _current_budget.reset(token)
+            budget.release()
+
+
+def record_token_usage(tokens: int) -> None:
+    """
+    Charge tokens used by an LLM call to the scheduler of the item it runs in, if any.
+    """
+    budget = _current_budget.get()
+    if budget is not None and tokens > 0:
+        budget.consume(tokens)
+
+
+_SCHEDULERS: Dict[str, RateScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(config: RateConfig) -> RateScheduler:
+    """
+    Return the scheduler for a rate configuration: shared by `key` (the first configuration
+    registered for a key wins), or a new one when no key is set.
+    """
+    if config.key is None:
+        return RateScheduler(config)
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(config.key)
+        if scheduler is None:
+            scheduler = RateScheduler(config)
+            _SCHEDULERS[config.key] = scheduler
+        return scheduler
@@ -1,20 +1,13 @@
 # This file was generated by Codebase-Generator, do not edit directly
 
+import importlib
+from typing import Any, Dict
+
 from recipe_executor.steps.registry import STEP_REGISTRY
-from recipe_executor.steps.conditional import ConditionalStep
-from recipe_executor.steps.docpack_create import DocpackCreateStep
-from recipe_executor.steps.docpack_extract import DocpackExtractStep
-from recipe_executor.steps.execute_recipe import ExecuteRecipeStep
-from recipe_executor.steps.llm_generate import LLMGenerateStep
-from recipe_executor.steps.loop import LoopStep
-from recipe_executor.steps.mcp import MCPStep
-from recipe_executor.steps.parallel import ParallelStep
-from recipe_executor.steps.read_files import ReadFilesStep
-from recipe_executor.steps.set_context import SetContextStep
-from recipe_executor.steps.write_files import WriteFilesStep
 
 __all__ = [
     "STEP_REGISTRY",
+    "BuildIndexStep",
     "ConditionalStep",
     "DocpackCreateStep",
     "DocpackExtractStep",
@@ -28,17 +21,33 @@ __all__ = [
     "WriteFilesStep",
 ]
 
+# Step type name -> "module:ClassName"; modules are imported the first time a step is used
+_BUILTIN_STEPS: Dict[str, str] = {
+    "build_index": "recipe_executor.steps.build_index:BuildIndexStep",
+    "conditional": "recipe_executor.steps.conditional:ConditionalStep",
+    "docpack_create": "recipe_executor.steps.docpack_create:DocpackCreateStep",
+    "docpack_extract": "recipe_executor.steps.docpack_extract:DocpackExtractStep",
+    "execute_recipe": "recipe_executor.steps.execute_recipe:ExecuteRecipeStep",
+    "llm_generate": "recipe_executor.steps.llm_generate:LLMGenerateStep",
+    "loop": "recipe_executor.steps.loop:LoopStep",
+    "mcp": "recipe_executor.steps.mcp:MCPStep",
+    "parallel": "recipe_executor.steps.parallel:ParallelStep",
+    "read_files": "recipe_executor.steps.read_files:ReadFilesStep",
+    "set_context": "recipe_executor.steps.set_context:SetContextStep",
+    "write_files": "recipe_executor.steps.write_files:WriteFilesStep",
+}
+
 # Register steps by updating the registry
-STEP_REGISTRY.update({
-    "conditional": ConditionalStep,
-    "docpack_create": DocpackCreateStep,
-    "docpack_extract": DocpackExtractStep,
-    "execute_recipe": ExecuteRecipeStep,
-    "llm_generate": LLMGenerateStep,
-    "loop": LoopStep,
-    "mcp": MCPStep,
-    "parallel": ParallelStep,
-    "read_files": ReadFilesStep,
-    "set_context": SetContextStep,
-    "write_files": WriteFilesStep,
-})
+for _name, _reference in _BUILTIN_STEPS.items():
+    STEP_REGISTRY.register_lazy(_name, _reference)
+
+_CLASS_REFERENCES = {reference.rsplit(":", 1)[1]: reference for reference in _BUILTIN_STEPS.values()}
+
+
+def __getattr__(name: str) -> Any:
+    # Step classes are importable from this package, but only loaded on access
+    reference = _CLASS_REFERENCES.get(name)
+    if reference is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, _, class_name = reference.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
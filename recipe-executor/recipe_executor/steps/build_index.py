@@ -0,0 +1,85 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+BuildIndexStep: chunk a list of resources and build a local BM25 retrieval index.
+
+The index is stored in the context as plain data (so contexts stay serializable) and
+queried from templates with the `retrieve` filter, so prompts can include only the
+chunks relevant to them.
+"""
+
+import logging
+from typing import Any, Dict, List, Union
+
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.utils.retrieval import RetrievalIndex, load_index
+from recipe_executor.utils.templates import render_template
+
+__all__ = ["BuildIndexConfig", "BuildIndexStep"]
+
+
+class BuildIndexConfig(StepConfig):
+    """
+    Configuration for BuildIndexStep.
+
+    Fields:
+        items: Context key (dot notation, may be templated) or literal list of resource dicts.
+        key_field: Field holding each resource's identifier.
+        content_field: Field holding each resource's text content.
+        description_field: Field holding each resource's description.
+        chunk_size: Maximum number of words per chunk.
+        index_key: Context key under which to store the index.
+    """
+
+    items: Union[str, List[Dict[str, Any]]]
+    key_field: str = "key"
+    content_field: str = "content"
+    description_field: str = "description"
+    chunk_size: int = 200
+    index_key: str = "resource_index"
+
+
+class BuildIndexStep(BaseStep[BuildIndexConfig]):
+    """
+    Step that chunks resources and stores a RetrievalIndex, exported with `to_dict`, in the context.
+    """
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, BuildIndexConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        cfg = self.config
+        index_key: str = render_template(cfg.index_key, context)
+
+        raw_items = cfg.items
+        if isinstance(raw_items, str):
+            path = render_template(raw_items, context).strip()
+            items: Any = context
+            for part in path.split("."):
+                items = items.get(part) if isinstance(items, (dict, ContextProtocol)) else None
+                if items is None:
+                    raise ValueError(f"BuildIndexStep: Items '{path}' not found in context.")
+        else:
+            items = raw_items
+
+        if not isinstance(items, list):
+            raise ValueError(f"BuildIndexStep: Items must be a list, got {type(items).__name__}.")
+
+        documents: List[Dict[str, Any]] = []
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError(f"BuildIndexStep: Each item must be a dict, got {type(item).__name__}.")
+            documents.append({
+                "key": item.get(cfg.key_field),
+                "description": item.get(cfg.description_field, ""),
+                "content": item.get(cfg.content_field, ""),
+            })
+
+        index = RetrievalIndex(documents, chunk_size=cfg.chunk_size)
+        data = index.to_dict()
+        # Warm the compiled-index cache so the first `retrieve` does not rebuild it
+        load_index(data)
+        context[index_key] = data
+        self.logger.info(
+            f"BuildIndexStep: Indexed {len(documents)} resources into {len(index)} chunks under '{index_key}'."
+        )
@@ -1,47 +1,15 @@
 # This file was generated by Codebase-Generator, do not edit directly
 import os
-import ast
 import logging
 from typing import Any, Dict
 
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.protocols import ContextProtocol
-from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.templates import render_template, render_value
 
 __all__ = ["ExecuteRecipeConfig", "ExecuteRecipeStep"]
 
 
-def _render_override(value: Any, context: ContextProtocol) -> Any:
-    """
-    Recursively render and parse override values:
-    - Strings are template-rendered, then if the result is a valid Python literal
-      (dict or list), parsed into Python objects using ast.literal_eval.
-    - Lists and dicts are processed recursively.
-    - Other types are returned unchanged.
-    """
-    if isinstance(value, str):
-        # Render the string template against the context
-        rendered = render_template(value, context)
-        # Attempt to parse Python literal for dict or list
-        try:
-            parsed = ast.literal_eval(rendered)
-            if isinstance(parsed, (dict, list)):
-                return parsed
-        except (ValueError, SyntaxError):
-            # Not a literal or invalid syntax; fall back to rendered string
-            pass
-        return rendered
-
-    if isinstance(value, list):  # type: ignore[type-arg]
-        return [_render_override(item, context) for item in value]
-
-    if isinstance(value, dict):  # type: ignore[type-arg]
-        return {key: _render_override(val, context) for key, val in value.items()}
-
-    # Non-string, non-container types are returned as-is
-    return value
-
-
 class ExecuteRecipeConfig(StepConfig):
     """Config for ExecuteRecipeStep.
 
@@ -79,7 +47,7 @@ class ExecuteRecipeStep(BaseStep[ExecuteRecipeConfig]):
 
         # Apply context overrides
         for key, override_value in self.config.context_overrides.items():
-            new_value = _render_override(override_value, context)
+            new_value = render_value(override_value, context)
             context[key] = new_value  # type: ignore[index]
 
         # Execute the sub-recipe using the Executor
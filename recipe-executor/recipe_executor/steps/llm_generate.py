@@ -1,16 +1,16 @@
 # This file was generated by Codebase-Generator, do not edit directly
 import logging
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel
 
 from recipe_executor.llm_utils.llm import LLM
-from recipe_executor.llm_utils.mcp import get_mcp_server
 from recipe_executor.models import FileSpec
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.steps.base import BaseStep, StepConfig
-from recipe_executor.utils.models import json_object_to_pydantic_model
+from recipe_executor.utils.models import get_schema_model
 from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.tokens import estimate_tokens, fit_prompt, get_context_window, load_encoder
 
 
 class LLMGenerateConfig(StepConfig):
@@ -19,8 +19,15 @@ class LLMGenerateConfig(StepConfig):
 
     Fields:
         prompt: The prompt to send to the LLM (templated beforehand).
+        prompt_prefix: Optional stable prompt content sent ahead of the prompt, to benefit from
+            provider prompt caching (e.g. reference docs, outline).
         model: The model identifier to use (provider/model_name format).
         max_tokens: The maximum number of tokens for the LLM response.
+        max_prompt_tokens: Optional token budget for the prompt (prefix included). Defaults to the
+            model's context window minus max_tokens when a fit_policy is set.
+        fit_policy: What to do when the prompt exceeds the budget: "fail" (before calling the model),
+            "truncate" (cut the middle of fit_blocks) or "drop" (drop trailing child elements of fit_blocks).
+        fit_blocks: Names of `<NAME>...</NAME>` prompt blocks that may be shrunk, lowest priority first.
         mcp_servers: List of MCP server configurations for access to tools.
         openai_builtin_tools: Built-in OpenAI tools for Responses API models.
         output_format: The format of the LLM output (text, files, or JSON/list schemas).
@@ -28,8 +35,12 @@ class LLMGenerateConfig(StepConfig):
     """
 
     prompt: str
+    prompt_prefix: Optional[str] = None
     model: str = "openai/gpt-4o"
     max_tokens: Optional[Union[str, int]] = None
+    max_prompt_tokens: Optional[Union[str, int]] = None
+    fit_policy: Optional[str] = None
+    fit_blocks: List[str] = []
     mcp_servers: Optional[List[Dict[str, Any]]] = None  # type: ignore
     openai_builtin_tools: Optional[List[Dict[str, Any]]] = None
     output_format: Union[str, Dict[str, Any], List[Any]]
@@ -74,6 +85,9 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
     async def execute(self, context: ContextProtocol) -> None:
         # Render templated fields
         prompt: str = render_template(self.config.prompt, context)
+        prompt_prefix: Optional[str] = (
+            render_template(self.config.prompt_prefix, context) if self.config.prompt_prefix else None
+        )
         model_id: str = render_template(self.config.model, context)
         output_key: str = render_template(self.config.output_key, context)
 
@@ -87,6 +101,10 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
             except ValueError:
                 raise ValueError(f"Invalid max_tokens value: {raw_max!r}")
 
+        # Load the model's tokenizer (if any) in a thread, so the estimate below is exact
+        await load_encoder(model_id)
+        prompt, prompt_prefix = self._fit_prompt(prompt, prompt_prefix, model_id, max_tokens, context)
+
         # Collect MCP server configs: from step config and context config
         mcp_cfgs: List[Dict[str, Any]] = []
         if self.config.mcp_servers:
@@ -98,6 +116,9 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
         # Instantiate MCP servers
         mcp_servers: List[Any] = []
         for cfg in mcp_cfgs:
+            # The MCP client is only loaded for steps that use MCP servers
+            from recipe_executor.llm_utils.mcp import get_mcp_server
+
             rendered_cfg = _render_config(cfg, context)
             server = get_mcp_server(logger=self.logger, config=rendered_cfg)
             mcp_servers.append(server)
@@ -143,6 +164,7 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     output_type=str,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    prompt_prefix=prompt_prefix,
                 )
                 context[output_key] = result
 
@@ -152,18 +174,20 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     output_type=FileSpecCollection,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    prompt_prefix=prompt_prefix,
                 )
                 # Ensure correct type
                 assert isinstance(result, FileSpecCollection), f"Expected FileSpecCollection, got {type(result)}"
                 context[output_key] = result.files
 
             elif isinstance(output_format, dict):  # JSON object schema
-                schema_model: Type[BaseModel] = json_object_to_pydantic_model(output_format, model_name="LLMObject")
+                schema_model: Type[BaseModel] = get_schema_model(output_format, model_name="LLMObject")
                 result = await llm.generate(
                     prompt,
                     output_type=schema_model,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    prompt_prefix=prompt_prefix,
                 )
                 if not isinstance(result, BaseModel):
                     raise ValueError(f"Expected BaseModel for object output, got {type(result)}")
@@ -178,12 +202,13 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     "properties": {"items": {"type": "array", "items": item_schema}},
                     "required": ["items"],
                 }
-                schema_model = json_object_to_pydantic_model(wrapper_schema, model_name="LLMListWrapper")
+                schema_model = get_schema_model(wrapper_schema, model_name="LLMListWrapper")
                 result = await llm.generate(
                     prompt,
                     output_type=schema_model,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    prompt_prefix=prompt_prefix,
                 )
                 if not isinstance(result, BaseModel):
                     raise ValueError(f"Expected BaseModel for list output, got {type(result)}")
@@ -196,3 +221,54 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
         except Exception as exc:
             self.logger.error("LLM generate failed: %r", exc, exc_info=True)
             raise
+
+    def _fit_prompt(
+        self,
+        prompt: str,
+        prompt_prefix: Optional[str],
+        model_id: str,
+        max_tokens: Optional[int],
+        context: ContextProtocol,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Check the estimated prompt size against the budget and apply the fit policy.
+        """
+        policy = render_template(self.config.fit_policy, context).strip() if self.config.fit_policy else ""
+        if policy and policy not in ("fail", "truncate", "drop"):
+            raise ValueError(f"Invalid fit_policy value: {policy!r}. Supported: fail, truncate, drop")
+
+        limit: Optional[int] = None
+        if self.config.max_prompt_tokens is not None:
+            rendered = render_template(str(self.config.max_prompt_tokens), context).strip()
+            if rendered:
+                try:
+                    limit = int(rendered)
+                except ValueError:
+                    raise ValueError(f"Invalid max_prompt_tokens value: {self.config.max_prompt_tokens!r}")
+        if limit is None:
+            window = get_context_window(model_id)
+            if window is not None:
+                limit = window - (max_tokens or 0)
+
+        segments = [prompt_prefix or "", prompt]
+        estimated = sum(estimate_tokens(segment, model_id) for segment in segments)
+        if limit is None or estimated <= limit:
+            return prompt, prompt_prefix
+        if not policy:
+            self.logger.warning(
+                "Estimated prompt size ~%d tokens exceeds the limit of %d tokens for model %s",
+                estimated,
+                limit,
+                model_id,
+            )
+            return prompt, prompt_prefix
+
+        fitted_prefix, fitted_prompt = fit_prompt(segments, limit, policy, self.config.fit_blocks, model_id)  # type: ignore[arg-type]
+        self.logger.info(
+            "Fitted prompt with policy '%s': ~%d -> ~%d tokens (limit %d)",
+            policy,
+            estimated,
+            estimate_tokens(fitted_prefix, model_id) + estimate_tokens(fitted_prompt, model_id),
+            limit,
+        )
+        return fitted_prompt, (fitted_prefix if prompt_prefix is not None else None)
@@ -1,41 +1,100 @@
 # This file was generated by Codebase-Generator, do not edit directly
 """
 LoopStep: iterate over a collection of items and execute substeps for each item.
-Supports template rendering, context isolation, error handling, and configurable concurrency.
+Supports template rendering, context isolation, error handling, configurable concurrency,
+a batch mode that sends the items' LLM requests as OpenAI/Azure Batch API jobs,
+worker backends that run items in separate processes, and a streaming mode that pulls
+items lazily from a JSONL file, a glob or a generator with a bounded in-flight window.
 """
 
 import asyncio
+import glob
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
-
+import os
+import time
+from contextlib import nullcontext
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from recipe_executor.cancellation import cancel_and_wait, remaining_time
+from recipe_executor.hooks import emit, event_scope
+from recipe_executor.llm_utils.batch import BatchCollector, current_batch
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.scheduler import LaunchStats, RateConfig, RateScheduler, get_scheduler
 from recipe_executor.steps.base import BaseStep, StepConfig
-from recipe_executor.utils.templates import render_template
+from recipe_executor.utils import serialization
+from recipe_executor.utils.memory import profile_step
+from recipe_executor.utils.templates import render_template, resolve_path
 
 __all__ = ["LoopStep", "LoopStepConfig"]
 
+# Streaming sources yield to the event loop this often while pulling items
+_YIELD_EVERY = 256
+# In-flight window for streaming loops with unlimited concurrency
+_DEFAULT_WINDOW = 64
+
 
 class LoopStepConfig(StepConfig):
     """
     Configuration for LoopStep.
 
     Fields:
-        items: Union[str, List[Any], Dict[Any, Any]]
+        items: Optional[Union[str, List[Any], Dict[Any, Any]]] = None
+        items_file: Optional[str] = None
+        items_glob: Optional[str] = None
         item_key: str
         max_concurrency: int = 1
         delay: float = 0.0
         substeps: List[Dict[str, Any]]
         result_key: str
         fail_fast: bool = True
+        batch: bool = False
+        batch_poll_interval: float = 10.0
+        batch_timeout: Optional[float] = 3600.0
+        worker_backend: Optional[str] = None
+        workers: int = 0
+        worker_retries: int = 1
+        worker_queue: Optional[str] = None
+        window: int = 0
+        output_file: Optional[str] = None
+        rate: Optional[RateConfig] = None
+
+    Exactly one of `items`, `items_file` (a JSONL file, one item per line) or `items_glob`
+    (a glob pattern; each item is a matching path) must be set. `items_file`, `items_glob`
+    and an `items` path that resolves to an iterator or async generator select streaming
+    mode: items are pulled lazily and at most `window` of them are in flight (0 = use
+    max_concurrency, or 64 when it is unlimited). With `output_file`, each item's result is
+    appended to that JSONL file instead of being collected in the context, and the history
+    records only each item's key, status and duration.
+
+    `rate` limits item launches per second (token bucket with burst) and/or LLM tokens per
+    minute. Each history entry then records the seconds the item waited to launch, and the
+    launch timing summary is stored under `<result_key>__schedule`.
+
+    With `worker_backend` ("process" or "sqlite"), items run in `workers` worker processes
+    (0 = one per CPU) and failed items are retried `worker_retries` times. `worker_queue`
+    is the SQLite queue file for the "sqlite" backend. Items and their results must be
+    picklable.
     """
 
-    items: Union[str, List[Any], Dict[Any, Any]]
+    items: Optional[Union[str, List[Any], Dict[Any, Any]]] = None
+    items_file: Optional[str] = None
+    items_glob: Optional[str] = None
     item_key: str
     max_concurrency: int = 1
     delay: float = 0.0
     substeps: List[Dict[str, Any]]
     result_key: str
     fail_fast: bool = True
+    batch: bool = False
+    batch_poll_interval: float = 10.0
+    batch_timeout: Optional[float] = 3600.0
+    worker_backend: Optional[str] = None
+    workers: int = 0
+    worker_retries: int = 1
+    worker_queue: Optional[str] = None
+    window: int = 0
+    output_file: Optional[str] = None
+    rate: Optional[RateConfig] = None
 
 
 class LoopStep(BaseStep[LoopStepConfig]):
@@ -59,16 +118,36 @@ class LoopStep(BaseStep[LoopStepConfig]):
         cfg: LoopStepConfig = self.config
         raw_items = cfg.items
 
+        sources = [name for name in ("items", "items_file", "items_glob") if getattr(cfg, name) is not None]
+        if len(sources) != 1:
+            raise ValueError("LoopStep: Exactly one of 'items', 'items_file' or 'items_glob' must be set.")
+
+        # Streaming sources: a JSONL file or a glob pattern
+        if cfg.items_file is not None:
+            await self._execute_stream(context, _iter_jsonl(render_template(cfg.items_file, context)))
+            return
+        if cfg.items_glob is not None:
+            await self._execute_stream(context, _iter_glob(render_template(cfg.items_glob, context)))
+            return
+
         # Resolve items: template rendering if string, then path lookup
         if isinstance(raw_items, str):  # type: ignore
             rendered: str = render_template(raw_items, context)
-            items_obj: Any = _resolve_path(rendered, context)
+            items_obj: Any = resolve_path(rendered, context)
         else:
             items_obj = raw_items  # type: ignore
 
         # Validate resolved collection
         if items_obj is None:
             raise ValueError(f"LoopStep: Items '{raw_items}' not found in context.")
+        if _is_stream(items_obj):
+            # A generator cannot be copied into item contexts, so the loop takes it out of the context
+            if isinstance(raw_items, str) and "." not in rendered and rendered in context:
+                del context[rendered]
+            else:
+                raise ValueError("LoopStep: Generator items must be a top-level context artifact.")
+            await self._execute_stream(context, _iter_items(items_obj))
+            return
         if not isinstance(items_obj, (list, dict)):
             raise ValueError(f"LoopStep: Items must be a list or dict, got {type(items_obj).__name__}.")
 
@@ -96,8 +175,25 @@ class LoopStep(BaseStep[LoopStepConfig]):
         errors: List[Dict[str, Any]] = []
         history: List[Dict[str, Any]] = []
 
-        # Concurrency control: semaphore if max_concurrency > 0
-        semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_conc) if max_conc > 0 else None
+        if cfg.batch and cfg.worker_backend:
+            raise ValueError("LoopStep: batch mode cannot be combined with a worker backend.")
+        scheduler, launch_stats = self._rate_scheduler()
+        launch_waits: Dict[Any, float] = {}
+
+        # Batch mode: all items run concurrently and their LLM requests are gathered into batch jobs
+        batch: Optional[BatchCollector] = None
+        if cfg.batch:
+            batch = BatchCollector(
+                self.logger,
+                context.get_config(),
+                items=total,
+                poll_interval=cfg.batch_poll_interval,
+                timeout=cfg.batch_timeout,
+            )
+            self.logger.info("LoopStep: Batch mode enabled; LLM requests will be sent as batch jobs.")
+
+        # Concurrency control: semaphore if max_concurrency > 0 (not applied in batch mode)
+        semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_conc) if max_conc > 0 and batch is None else None
 
         executor = Executor(self.logger)
         plan: Dict[str, Any] = {"steps": cfg.substeps}
@@ -107,7 +203,7 @@ class LoopStep(BaseStep[LoopStepConfig]):
         completed: int = 0
         tasks: List[asyncio.Task] = []
 
-        async def process_item(key: Any, value: Any) -> Tuple[Any, Any, Optional[str]]:
+        def item_context(key: Any, value: Any) -> ContextProtocol:
             # Clone context for isolation
             item_ctx = context.clone()
             item_ctx[cfg.item_key] = value
@@ -116,9 +212,37 @@ class LoopStep(BaseStep[LoopStepConfig]):
                 item_ctx["__index"] = key  # type: ignore
             else:
                 item_ctx["__key"] = key  # type: ignore
+            return item_ctx
+
+        def record(k: Any, out: Any, err: Optional[str]) -> None:
+            nonlocal fail_fast_triggered, completed
+            entry: Dict[str, Any] = {"key": k, "result": out, "error": err}
+            if scheduler is not None:
+                entry["wait"] = round(launch_waits.pop(k, 0.0), 3)
+            history.append(entry)
+            if err:
+                errors.append({"key": k, "error": err})
+                if fail_fast:
+                    fail_fast_triggered = True
+            else:
+                if isinstance(results, list):
+                    results.append(out)
+                else:
+                    results[k] = out  # type: ignore
+                completed += 1
+
+        async def process_item(key: Any, value: Any) -> Tuple[Any, Any, Optional[str]]:
+            # Items of a nested loop must not join an enclosing loop's batch: the collector
+            # counts one waiting request per outer item
+            batch_token = current_batch.set(batch)
             try:
                 self.logger.debug(f"LoopStep: Processing item {key}.")
-                await executor.execute(plan, item_ctx)
+                with profile_step(f"item {key}", "loop_item"), event_scope(f"item {key}", "loop_item", key=key):
+                    item_ctx = item_context(key, value)
+                    with batch.item() if batch is not None else nullcontext():
+                        async with scheduler.slot(launch_stats) if scheduler is not None else nullcontext(0.0) as wait:
+                            launch_waits[key] = wait
+                            await executor.execute(plan, item_ctx)
                 out_val = item_ctx.get(cfg.item_key)
                 self.logger.debug(f"LoopStep: Item {key} completed.")
                 return key, out_val, None
@@ -126,73 +250,91 @@ class LoopStep(BaseStep[LoopStepConfig]):
                 err_msg = str(exc)
                 self.logger.error(f"LoopStep: Error on item {key}: {err_msg}")
                 return key, None, err_msg
+            finally:
+                current_batch.reset(batch_token)
 
         async def run_sequential() -> None:
-            nonlocal fail_fast_triggered, completed
             for key, val in items_list:
                 if fail_fast_triggered:
                     break
-                k, out, err = await process_item(key, val)
-                history.append({"key": k, "result": out, "error": err})
-                if err:
-                    errors.append({"key": k, "error": err})
-                    if fail_fast:
-                        fail_fast_triggered = True
-                        break
-                else:
-                    if isinstance(results, list):
-                        results.append(out)
-                    else:
-                        results[k] = out  # type: ignore
-                    completed += 1
+                emit("loop_item_scheduled", key=key, total=total)
+                record(*await process_item(key, val))
 
         async def run_parallel() -> None:
-            nonlocal fail_fast_triggered, completed
-
             async def schedule(k: Any, v: Any) -> Tuple[Any, Any, Optional[str]]:
                 if semaphore:
                     async with semaphore:
                         return await process_item(k, v)
                 return await process_item(k, v)
 
-            # Schedule tasks with optional delay
-            for idx, (k, v) in enumerate(items_list):
-                if fail_fast_triggered:
-                    break
-                task = asyncio.create_task(schedule(k, v))
-                tasks.append(task)
-                if cfg.delay and idx < total - 1:
-                    await asyncio.sleep(cfg.delay)
-
-            # Collect results as they complete
-            for t in asyncio.as_completed(tasks):
-                if fail_fast_triggered:
-                    break
-                try:
-                    k, out, err = await t
-                except Exception as exc:
-                    k, out, err = None, None, str(exc)
-                    self.logger.error(f"LoopStep: Unexpected error: {err}")
-                history.append({"key": k, "result": out, "error": err})
-                if err:
-                    errors.append({"key": k, "error": err})
-                    if fail_fast:
-                        fail_fast_triggered = True
+            try:
+                # Schedule tasks with optional delay
+                for idx, (k, v) in enumerate(items_list):
+                    if fail_fast_triggered:
                         break
+                    task = asyncio.create_task(schedule(k, v))
+                    emit("loop_item_scheduled", key=k, total=total)
+                    tasks.append(task)
+                    if cfg.delay and idx < total - 1:
+                        await asyncio.sleep(cfg.delay)
+
+                # Collect results as they complete
+                for t in asyncio.as_completed(tasks):
+                    if fail_fast_triggered:
+                        break
+                    try:
+                        k, out, err = await t
+                    except Exception as exc:
+                        k, out, err = None, None, str(exc)
+                        self.logger.error(f"LoopStep: Unexpected error: {err}")
+                    record(k, out, err)
+                    if fail_fast_triggered:
+                        break
+            finally:
+                # On fail-fast, timeout or cancellation, stop the remaining items and wait for them
+                # to release their semaphore slots and resources
+                await cancel_and_wait(tasks)
+
+        async def run_workers() -> None:
+            # Deferred import: worker backends are only needed when configured
+            from recipe_executor.workers import WorkItem, get_worker_backend
+
+            backend = get_worker_backend(
+                cfg.worker_backend,  # type: ignore[arg-type]
+                self.logger,
+                workers=cfg.workers,
+                retries=cfg.worker_retries,
+                queue_path=cfg.worker_queue,
+            )
+            config = context.get_config()
+            # Worker processes do not share this event loop, so pass on the time left as the plan's timeout
+            time_left = remaining_time()
+            worker_plan = plan if time_left is None else {**plan, "timeout": time_left}
+            work = [WorkItem(k, worker_plan, item_context(k, v).dict(), config) for k, v in items_list]
+            for item in work:
+                emit("loop_item_scheduled", key=item.key, total=total)
+            for result in await backend.run(work, stop_on_error=fail_fast):
+                if result is None:
+                    continue
+                # Items run in other processes, so only their outcome is reported
+                emit(
+                    "loop_item_end",
+                    key=result.key,
+                    status="error" if result.error is not None else "ok",
+                    **({"error": result.error} if result.error is not None else {}),
+                )
+                if result.error is not None:
+                    self.logger.error(f"LoopStep: Error on item {result.key}: {result.error}")
+                    record(result.key, None, result.error)
                 else:
-                    if isinstance(results, list):
-                        results.append(out)
-                    else:
-                        results[k] = out  # type: ignore
-                    completed += 1
-            # Cancel remaining tasks if aborting
-            if fail_fast_triggered:
-                for t in tasks:
-                    if not t.done():
-                        t.cancel()
+                    record(result.key, (result.artifacts or {}).get(cfg.item_key), None)
+                if fail_fast_triggered:
+                    break
 
         # Choose execution mode
-        if max_conc == 1:
+        if cfg.worker_backend:
+            await run_workers()
+        elif max_conc == 1 and batch is None:
             await run_sequential()
         else:
             await run_parallel()
@@ -201,22 +343,185 @@ class LoopStep(BaseStep[LoopStepConfig]):
         context[cfg.result_key] = results
         context[f"{cfg.result_key}__errors"] = errors
         context[f"{cfg.result_key}__history"] = history
+        self._store_schedule(context, launch_stats)
 
         self.logger.info(f"LoopStep: Completed {completed}/{total} items. Errors: {len(errors)}.")
 
+    async def _execute_stream(self, context: ContextProtocol, source: AsyncIterator[Tuple[int, Any]]) -> None:
+        """
+        Run the substeps for items pulled lazily from `source`, keeping at most `window` in
+        flight. Results stream to `output_file` when set; history is compact.
+        """
+        # Deferred import to avoid circular dependency
+        from recipe_executor.executor import Executor
 
-def _resolve_path(path: str, context: ContextProtocol) -> Any:
+        cfg: LoopStepConfig = self.config
+        if cfg.batch or cfg.worker_backend:
+            raise ValueError("LoopStep: Streaming item sources cannot be combined with batch mode or worker backends.")
+
+        window = cfg.window or cfg.max_concurrency or _DEFAULT_WINDOW
+        scheduler, launch_stats = self._rate_scheduler()
+        output_path = render_template(cfg.output_file, context) if cfg.output_file else None
+        self.logger.info(
+            f"LoopStep: Streaming items (window={window})"
+            + (f", writing results to {output_path}." if output_path else ".")
+        )
+
+        executor = Executor(self.logger)
+        plan: Dict[str, Any] = {"steps": cfg.substeps}
+        results: List[Any] = []
+        errors: List[Dict[str, Any]] = []
+        history: List[Dict[str, Any]] = []
+        completed = 0
+        failed = False
+        in_flight: Set[asyncio.Task] = set()
+        sink: Optional[IO[bytes]] = None
+
+        async def process_item(key: int, value: Any) -> Tuple[int, Any, Optional[str], float, float]:
+            wait = 0.0
+            start = time.monotonic()
+            try:
+                with profile_step(f"item {key}", "loop_item"), event_scope(f"item {key}", "loop_item", key=key):
+                    item_ctx = context.clone()
+                    item_ctx[cfg.item_key] = value
+                    item_ctx["__index"] = key
+                    async with scheduler.slot(launch_stats) if scheduler is not None else nullcontext(0.0) as wait:
+                        start = time.monotonic()
+                        self.logger.debug(f"LoopStep: Processing item {key}.")
+                        await executor.execute(plan, item_ctx)
+                return key, item_ctx.get(cfg.item_key), None, time.monotonic() - start, wait
+            except Exception as exc:
+                self.logger.error(f"LoopStep: Error on item {key}: {exc}")
+                return key, None, str(exc), time.monotonic() - start, wait
+
+        def record(task: asyncio.Task) -> None:
+            nonlocal completed, failed
+            key, out, err, duration, wait = task.result()
+            entry: Dict[str, Any] = {"key": key, "status": "error" if err else "ok", "duration": round(duration, 3)}
+            if scheduler is not None:
+                entry["wait"] = round(wait, 3)
+            history.append(entry)
+            if err:
+                errors.append({"key": key, "error": err})
+                failed = failed or cfg.fail_fast
+            else:
+                completed += 1
+            if sink is not None:
+                line = {"key": key, "error": err} if err else {"key": key, "result": out}
+                sink.write(serialization.dumps(line) + b"\n")
+            elif not err:
+                results.append(out)
+
+        async def drain(limit: int) -> None:
+            # Wait until fewer than `limit` items are in flight, recording finished ones
+            while len(in_flight) >= limit and in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.discard(task)
+                    record(task)
+
+        try:
+            if output_path:
+                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                sink = open(output_path, "wb")
+            async for key, value in source:
+                if failed:
+                    break
+                await drain(window)
+                if failed:
+                    break
+                in_flight.add(asyncio.create_task(process_item(key, value)))
+                emit("loop_item_scheduled", key=key)
+                if cfg.delay:
+                    await asyncio.sleep(cfg.delay)
+            if not failed:
+                await drain(1)
+        finally:
+            await cancel_and_wait(in_flight)
+            await source.aclose()  # type: ignore[attr-defined]
+            if sink is not None:
+                sink.close()
+
+        context[cfg.result_key] = output_path if output_path else results
+        context[f"{cfg.result_key}__errors"] = errors
+        context[f"{cfg.result_key}__history"] = history
+        self._store_schedule(context, launch_stats)
+
+        self.logger.info(f"LoopStep: Completed {completed}/{len(history)} streamed items. Errors: {len(errors)}.")
+
+    def _rate_scheduler(self) -> Tuple[Optional[RateScheduler], Optional[LaunchStats]]:
+        """
+        Return the shared launch scheduler and a launch-timing recorder when `rate` is configured.
+        """
+        cfg: LoopStepConfig = self.config
+        if cfg.rate is None:
+            return None, None
+        if cfg.batch or cfg.worker_backend:
+            raise ValueError("LoopStep: rate cannot be combined with batch mode or worker backends.")
+        return get_scheduler(cfg.rate), LaunchStats()
+
+    def _store_schedule(self, context: ContextProtocol, launch_stats: Optional[LaunchStats]) -> None:
+        if launch_stats is None:
+            return
+        summary = launch_stats.summary()
+        context[f"{self.config.result_key}__schedule"] = summary
+        self.logger.info(f"LoopStep: Launch schedule: {summary}")
+
+
+def _is_stream(obj: Any) -> bool:
+    return hasattr(obj, "__anext__") or isinstance(obj, Iterator)
+
+
+async def _iter_items(items: Any) -> AsyncIterator[Tuple[int, Any]]:
     """
-    Resolve a dot-notated path against the context or nested dicts.
+    Enumerate the items of an iterator or async iterator, closing it when the loop stops early.
     """
-    current: Any = context
-    for part in path.split("."):
-        if isinstance(current, ContextProtocol):
-            current = current.get(part)
-        elif isinstance(current, dict):
-            current = current.get(part)
-        else:
-            return None
-        if current is None:
-            return None
-    return current
+    index = 0
+    try:
+        if hasattr(items, "__anext__"):
+            async for item in items:
+                yield index, item
+                index += 1
+            return
+        for item in items:
+            yield index, item
+            index += 1
+            if index % _YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+    finally:
+        # `async for`/`for` do not close the source, so its own cleanup would wait for garbage collection
+        if hasattr(items, "aclose"):
+            await items.aclose()
+        elif hasattr(items, "close"):
+            items.close()
+
+
+async def _iter_jsonl(path: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield the JSON value on each non-empty line of a JSONL file, reading it line by line.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"LoopStep: Items file '{path}' not found.")
+    index = 0
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = serialization.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"LoopStep: Invalid JSON on line {line_number} of '{path}': {exc}") from exc
+            yield index, item
+            index += 1
+            if index % _YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+
+async def _iter_glob(pattern: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield the paths matching a glob pattern as they are found.
+    """
+    for index, path in enumerate(glob.iglob(pattern, recursive=True)):
+        yield index, path
+        if (index + 1) % _YIELD_EVERY == 0:
+            await asyncio.sleep(0)
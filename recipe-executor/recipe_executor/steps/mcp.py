@@ -5,6 +5,7 @@ MCPStep component for invoking tools on remote MCP servers and storing results i
 
 import logging
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
@@ -14,7 +15,11 @@ from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.types import CallToolResult
 
+from recipe_executor.cassette import current_cassette, replay_transport
+from recipe_executor.metrics import MCP_CALL_DURATION, timed
 from recipe_executor.steps.base import BaseStep, ContextProtocol, StepConfig
+from recipe_executor.utils.serialization import to_jsonable
+from recipe_executor.utils.singleflight import coalescing_enabled, mcp_flights, request_key
 from recipe_executor.utils.templates import render_template
 
 
@@ -110,6 +115,9 @@ class MCPStep(BaseStep[MCPConfig]):  # type: ignore
             )
             client_cm = stdio_client(server_params)
             service_desc = f"stdio command '{cmd}'"
+            server_identity: Any = ["stdio", cmd, args_list, env_conf, cwd]
+            # Environment values (often credentials) are left out of recordings
+            recorded_server: Any = ["stdio", cmd, args_list, cwd]
         else:
             # SSE transport
             url: str = render_template(server_conf.get("url", ""), context)  # type: ignore
@@ -125,34 +133,56 @@ class MCPStep(BaseStep[MCPConfig]):  # type: ignore
 
             client_cm = sse_client(url, headers=headers_conf)
             service_desc = f"SSE server '{url}'"
+            server_identity = ["sse", url, headers_conf]
+            recorded_server = ["sse", url]
+
+        # With a cassette, record the call, or replay it through an in-memory transport
+        cassette = current_cassette.get()
+        cassette_request = {"server": recorded_server, "tool": tool_name, "arguments": arguments}
+        if cassette is not None and cassette.replaying:
+            interaction = cassette.replay("mcp", cassette_request)
+            client_cm = replay_transport(interaction, cassette.latency)
+            service_desc = f"cassette replay of {service_desc}"
+
+        async def call_tool() -> CallToolResult:
+            # Connect and invoke tool
+            self.logger.debug(f"Connecting to MCP server: {service_desc}")
+            try:
+                with timed(MCP_CALL_DURATION, tool=tool_name):
+                    async with client_cm as (read_stream, write_stream):  # type: ignore
+                        async with ClientSession(read_stream, write_stream) as session:
+                            await session.initialize()
+                            self.logger.debug(f"Invoking tool '{tool_name}' with arguments {arguments}")
+                            try:
+                                return await session.call_tool(name=tool_name, arguments=arguments)
+                            except Exception as exc:
+                                msg = f"Tool invocation failed for '{tool_name}' on {service_desc}: {exc}"
+                                raise ValueError(msg) from exc
+            except ValueError:
+                # Propagate our ValueError
+                raise
+            except Exception as exc:
+                msg = f"Failed to call tool '{tool_name}' on {service_desc}: {exc}"
+                raise ValueError(msg) from exc
+
+        # Identical concurrent tool calls (same server, tool and arguments) share one invocation
+        start = time.monotonic()
+        if cassette is not None and cassette.replaying:
+            result: CallToolResult = await call_tool()
+        elif coalescing_enabled(context.get_config()):
+            key = request_key(server_identity, tool_name, arguments)
+            result = await mcp_flights.do(key, call_tool)
+        else:
+            result = await call_tool()
 
-        # Connect and invoke tool
-        self.logger.debug(f"Connecting to MCP server: {service_desc}")
-        try:
-            async with client_cm as (read_stream, write_stream):  # type: ignore
-                async with ClientSession(read_stream, write_stream) as session:
-                    await session.initialize()
-                    self.logger.debug(f"Invoking tool '{tool_name}' with arguments {arguments}")
-                    try:
-                        result: CallToolResult = await session.call_tool(name=tool_name, arguments=arguments)
-                    except Exception as exc:
-                        msg = f"Tool invocation failed for '{tool_name}' on {service_desc}: {exc}"
-                        raise ValueError(msg) from exc
-        except ValueError:
-            # Propagate our ValueError
-            raise
-        except Exception as exc:
-            msg = f"Failed to call tool '{tool_name}' on {service_desc}: {exc}"
-            raise ValueError(msg) from exc
-
-        # Convert CallToolResult to dict
+        # Convert CallToolResult to plain JSON-compatible data
         try:
-            if hasattr(result, "dict"):
-                result_dict: Dict[str, Any] = result.dict()  # type: ignore
-            else:
-                result_dict = result.__dict__  # type: ignore
+            result_dict: Dict[str, Any] = to_jsonable(result)
         except Exception:
             result_dict = {k: getattr(result, k) for k in dir(result) if not k.startswith("_")}
 
+        if cassette is not None and not cassette.replaying:
+            cassette.record("mcp", cassette_request, result_dict, time.monotonic() - start)
+
         # Store result in context
         context[self.config.result_key] = result_dict
@@ -5,8 +5,12 @@ ParallelStep allows concurrent execution of multiple sub-steps (execute_recipe s
 
 import asyncio
 import logging
+from contextlib import nullcontext
 from typing import Any, Dict, List, Optional, Awaitable, Set
 
+from recipe_executor.cancellation import CancelScope, cancel_and_wait, remaining_time
+from recipe_executor.llm_utils.batch import current_batch
+from recipe_executor.scheduler import LaunchStats, RateConfig, get_scheduler
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.steps.registry import STEP_REGISTRY
 from recipe_executor.protocols import ContextProtocol, StepProtocol
@@ -16,16 +20,26 @@ class ParallelConfig(StepConfig):
     """Config for ParallelStep.
 
     Fields:
-        substeps: List of sub-step definitions, each a dict with 'type' and 'config'.
+        substeps: List of sub-step definitions, each a dict with 'type', 'config' and an optional 'timeout'.
         max_concurrency: Maximum number of substeps to run concurrently. 0 means unlimited.
         delay: Optional delay (in seconds) between launching each substep.
         timeout: Optional timeout (in seconds) for the entire parallel execution.
+        worker_backend: Optional worker backend ("process" or "sqlite") to run substeps in worker processes.
+        workers: Number of worker processes (0 = one per CPU).
+        worker_retries: Extra attempts for a substep that fails in a worker.
+        worker_queue: SQLite queue file for the "sqlite" backend.
+        rate: Optional launch rate limits (launches per second with burst, LLM tokens per minute).
     """
 
     substeps: List[Dict[str, Any]]
     max_concurrency: int = 0
     delay: float = 0.0
     timeout: Optional[float] = None
+    worker_backend: Optional[str] = None
+    workers: int = 0
+    worker_retries: int = 1
+    worker_queue: Optional[str] = None
+    rate: Optional[RateConfig] = None
 
 
 class ParallelStep(BaseStep[ParallelConfig]):
@@ -55,6 +69,16 @@ class ParallelStep(BaseStep[ParallelConfig]):
             self.logger.info("No substeps to execute; skipping ParallelStep.")
             return
 
+        if self.config.worker_backend:
+            if self.config.rate is not None:
+                raise ValueError("ParallelStep: rate cannot be combined with a worker backend")
+            await self._execute_in_workers(context, substeps, timeout_seconds)
+            return
+
+        # Rate limits are enforced by a scheduler shared with other steps using the same key
+        scheduler = get_scheduler(self.config.rate) if self.config.rate is not None else None
+        launch_stats = LaunchStats()
+
         # Determine concurrency limit: 0 or negative => unlimited
         concurrency_limit: int = total_steps if max_concurrency <= 0 else min(max_concurrency, total_steps)
         semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency_limit)
@@ -67,6 +91,9 @@ class ParallelStep(BaseStep[ParallelConfig]):
         async def run_substep(index: int, spec: Dict[str, Any]) -> None:
             nonlocal failure_exception, failure_index
             sub_logger: logging.Logger = self.logger.getChild(f"substep_{index}")
+            # Concurrent substeps must not join an enclosing batch-mode loop item's batch: the
+            # collector counts one waiting request per item (this runs in its own task)
+            current_batch.set(None)
             try:
                 sub_logger.debug(
                     "Preparing substep %d: cloning context; spec=%s",
@@ -84,9 +111,18 @@ class ParallelStep(BaseStep[ParallelConfig]):
                 step_instance: StepProtocol = StepClass(sub_logger, step_config_dict)
 
                 sub_logger.info("Launching substep %d of type '%s'", index, step_type)
-                result = step_instance.execute(sub_context)
-                if isinstance(result, Awaitable):  # type: ignore
-                    await result  # type: ignore
+                step_timeout: Optional[float] = spec.get("timeout")
+                scope = CancelScope(step_timeout)
+                try:
+                    async with scope:
+                        async with scheduler.slot(launch_stats) if scheduler is not None else nullcontext():
+                            result = step_instance.execute(sub_context)
+                            if isinstance(result, Awaitable):  # type: ignore
+                                await result  # type: ignore
+                except TimeoutError as exc:
+                    if scope.own_deadline_expired():
+                        raise TimeoutError(f"Substep {index} timed out after {step_timeout} seconds") from exc
+                    raise
                 sub_logger.info("Substep %d completed successfully", index)
 
             except Exception as exc:
@@ -99,72 +135,116 @@ class ParallelStep(BaseStep[ParallelConfig]):
             finally:
                 semaphore.release()
 
-        # Launch substeps with concurrency control and optional delay
-        for idx, spec in enumerate(substeps):
-            if failure_exception:
-                self.logger.debug("Fail-fast: abort launching remaining substeps at index %d", idx)
-                break
+        try:
+            # Launch substeps with concurrency control and optional delay
+            for idx, spec in enumerate(substeps):
+                if failure_exception:
+                    self.logger.debug("Fail-fast: abort launching remaining substeps at index %d", idx)
+                    break
 
-            await semaphore.acquire()
-            if delay_between > 0:
-                await asyncio.sleep(delay_between)
+                await semaphore.acquire()
+                if delay_between > 0:
+                    await asyncio.sleep(delay_between)
 
-            task = asyncio.create_task(run_substep(idx, spec))
-            tasks.append(task)
+                task = asyncio.create_task(run_substep(idx, spec))
+                tasks.append(task)
 
-        if not tasks:
-            self.logger.info("No substeps launched; nothing to wait for.")
-            return
+            if not tasks:
+                self.logger.info("No substeps launched; nothing to wait for.")
+                return
 
-        done: Set[asyncio.Task]
-        pending: Set[asyncio.Task]
+            done: Set[asyncio.Task]
+            pending: Set[asyncio.Task]
 
-        # Wait for substeps with first-exception or timeout handling
-        try:
-            if timeout_seconds is not None:
-                done, pending = await asyncio.wait(
-                    tasks,
-                    timeout=timeout_seconds,
-                    return_when=asyncio.FIRST_EXCEPTION,
+            # Wait for substeps with first-exception or timeout handling
+            try:
+                if timeout_seconds is not None:
+                    done, pending = await asyncio.wait(
+                        tasks,
+                        timeout=timeout_seconds,
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
+                else:
+                    done, pending = await asyncio.wait(
+                        tasks,
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
+            except Exception:
+                done, pending = set(tasks), set()
+
+            # Handle failure
+            if failure_exception is not None:
+                pending_count = len(pending)
+                self.logger.error(
+                    "Substep %s failed; cancelling %d pending tasks",
+                    failure_index,
+                    pending_count,
                 )
-            else:
-                done, pending = await asyncio.wait(
-                    tasks,
-                    return_when=asyncio.FIRST_EXCEPTION,
+                await cancel_and_wait(pending)
+                raise RuntimeError(
+                    f"ParallelStep aborted due to failure in substep {failure_index}"
+                ) from failure_exception
+
+            # Handle timeout without failure
+            if pending:
+                pending_count = len(pending)
+                self.logger.error(
+                    "ParallelStep timed out after %.3f seconds; cancelling %d pending tasks",
+                    timeout_seconds,
+                    pending_count,
                 )
-        except Exception:
-            done, pending = set(tasks), set()
-
-        # Handle failure
-        if failure_exception is not None:
-            pending_count = len(pending)
-            self.logger.error(
-                "Substep %s failed; cancelling %d pending tasks",
-                failure_index,
-                pending_count,
-            )
-            for t in pending:
-                t.cancel()
-            await asyncio.gather(*pending, return_exceptions=True)
-            raise RuntimeError(f"ParallelStep aborted due to failure in substep {failure_index}") from failure_exception
-
-        # Handle timeout without failure
-        if pending:
-            pending_count = len(pending)
-            self.logger.error(
-                "ParallelStep timed out after %.3f seconds; cancelling %d pending tasks",
-                timeout_seconds,
-                pending_count,
-            )
-            for t in pending:
-                t.cancel()
-            await asyncio.gather(*pending, return_exceptions=True)
-            raise asyncio.TimeoutError(f"ParallelStep timed out after {timeout_seconds} seconds")
+                await cancel_and_wait(pending)
+                raise asyncio.TimeoutError(f"ParallelStep timed out after {timeout_seconds} seconds")
+
+            # All successful: gather to propagate exceptions
+            await asyncio.gather(*done)
+        finally:
+            # Also on cancellation (e.g. an enclosing deadline): stop and wait for launched substeps
+            await cancel_and_wait(tasks)
 
-        # All successful: gather to propagate exceptions
-        await asyncio.gather(*done)
         self.logger.info(
             "Completed ParallelStep: %d/%d substeps succeeded",
             len(done),
             total_steps,
         )
+        if scheduler is not None:
+            self.logger.info("ParallelStep launch schedule: %s", launch_stats.summary())
+
+    async def _execute_in_workers(
+        self, context: ContextProtocol, substeps: List[Dict[str, Any]], timeout_seconds: Optional[float]
+    ) -> None:
+        """
+        Run each substep in a worker process on a copy of the context; fail on the first substep error.
+        """
+        from recipe_executor.workers import WorkItem, get_worker_backend
+
+        backend = get_worker_backend(
+            self.config.worker_backend,  # type: ignore[arg-type]
+            self.logger,
+            workers=self.config.workers or (self.config.max_concurrency if self.config.max_concurrency > 0 else 0),
+            retries=self.config.worker_retries,
+            queue_path=self.config.worker_queue,
+        )
+        artifacts = context.dict()
+        config = context.get_config()
+        time_left = remaining_time()
+        plans = [
+            {"steps": [spec]} if time_left is None else {"steps": [spec], "timeout": time_left} for spec in substeps
+        ]
+        work = [WorkItem(index, plan, artifacts, config) for index, plan in enumerate(plans)]
+
+        try:
+            results = await asyncio.wait_for(backend.run(work, stop_on_error=True), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            self.logger.error("ParallelStep timed out after %.3f seconds", timeout_seconds)
+            raise asyncio.TimeoutError(f"ParallelStep timed out after {timeout_seconds} seconds")
+
+        for result in results:
+            if result is not None and result.error is not None:
+                self.logger.error("Substep %s failed: %s", result.key, result.error)
+                raise RuntimeError(f"ParallelStep aborted due to failure in substep {result.key}: {result.error}")
+        self.logger.info(
+            "Completed ParallelStep: %d/%d substeps succeeded",
+            sum(1 for result in results if result is not None),
+            len(substeps),
+        )
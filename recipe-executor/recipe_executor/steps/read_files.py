@@ -1,4 +1,5 @@
 # This file was generated by Codebase-Generator, do not edit directly
+import asyncio
 import os
 import glob
 import json
@@ -11,6 +12,9 @@ from recipe_executor.protocols import ContextProtocol
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.utils.templates import render_template
 
+# Glob matches collected between yields to the event loop
+_YIELD_EVERY = 256
+
 
 class ReadFilesConfig(StepConfig):
     """
@@ -47,8 +51,13 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
         raw_path = cfg.path
         paths: List[str] = []
 
-        def expand_pattern(pattern: str) -> List[str]:
-            matches = glob.glob(pattern)
+        async def expand_pattern(pattern: str) -> List[str]:
+            # Expand lazily and yield to the event loop, so a huge glob can be cancelled by a timeout
+            matches: List[str] = []
+            for match in glob.iglob(pattern):
+                matches.append(match)
+                if len(matches) % _YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
             return sorted(matches) if matches else [pattern]
 
         # Handle string path (with comma split) or list of paths
@@ -56,7 +65,7 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
             rendered = render_template(raw_path, context)
             candidates = [p.strip() for p in rendered.split(",") if p.strip()]
             for candidate in candidates:
-                paths.extend(expand_pattern(candidate))
+                paths.extend(await expand_pattern(candidate))
         elif isinstance(raw_path, list):  # type: ignore
             for entry in raw_path:
                 if not isinstance(entry, str):
@@ -64,7 +73,7 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
                 rendered = render_template(entry, context)
                 if not rendered:
                     continue
-                paths.extend(expand_pattern(rendered))
+                paths.extend(await expand_pattern(rendered))
         else:
             raise ValueError(f"Invalid type for path: {type(raw_path)}")
 
@@ -72,6 +81,8 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
         result_map: Dict[str, Any] = {}
 
         for path in paths:
+            # Let timeouts and cancellation interrupt long runs of reads
+            await asyncio.sleep(0)
             self.logger.debug(f"Reading file at path: {path}")
             if not os.path.exists(path):
                 msg = f"File not found: {path}"
@@ -2,13 +2,85 @@
 """
 Registry for mapping step type names to their implementation classes.
 
-This registry is a simple global dictionary. Steps register themselves by
-updating this mapping, allowing dynamic lookup based on the step type name.
+Steps are registered either as classes or as lazy "module:ClassName" references, so a
+step's module (and its dependencies, e.g. the LLM provider SDKs) is only imported the
+first time a recipe uses that step. Steps published by other packages under the
+`recipe_executor.steps` entry-point group are discovered when a name is not registered.
 """
 
-from typing import Dict, Type
+import importlib
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, MutableMapping, Type
 
 from recipe_executor.steps.base import BaseStep
 
+ENTRY_POINT_GROUP = "recipe_executor.steps"
+
+
+class StepRegistry(MutableMapping[str, Type[BaseStep]]):
+    """
+    Mapping of step type names to step classes that imports step modules on first lookup.
+    """
+
+    def __init__(self, entry_point_group: str = ENTRY_POINT_GROUP) -> None:
+        self._classes: Dict[str, Type[BaseStep]] = {}
+        self._references: Dict[str, str] = {}
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = False
+
+    def register_lazy(self, name: str, reference: str) -> None:
+        """
+        Register a step by reference ("package.module:ClassName") without importing it.
+        """
+        if ":" not in reference:
+            raise ValueError(f"Invalid step reference '{reference}', expected 'module:ClassName'")
+        self._classes.pop(name, None)
+        self._references[name] = reference
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=self._entry_point_group):
+            self._references.setdefault(entry_point.name, entry_point.value)
+
+    def __getitem__(self, name: str) -> Type[BaseStep]:
+        step_cls = self._classes.get(name)
+        if step_cls is not None:
+            return step_cls
+        if name not in self._references:
+            self._load_entry_points()
+            if name not in self._references:
+                raise KeyError(name)
+        module_name, _, class_name = self._references[name].partition(":")
+        step_cls = getattr(importlib.import_module(module_name), class_name)
+        self._classes[name] = step_cls
+        return step_cls
+
+    def __setitem__(self, name: str, step_cls: Type[BaseStep]) -> None:
+        self._references.pop(name, None)
+        self._classes[name] = step_cls
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._classes and name not in self._references:
+            raise KeyError(name)
+        self._classes.pop(name, None)
+        self._references.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._classes or name in self._references:
+            return True
+        self._load_entry_points()
+        return name in self._references
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter({**self._references, **self._classes})
+
+    def __len__(self) -> int:
+        self._load_entry_points()
+        return len({**self._references, **self._classes})
+
+
 # Global registry mapping step type names to their implementation classes.
-STEP_REGISTRY: Dict[str, Type[BaseStep]] = {}
+STEP_REGISTRY: StepRegistry = StepRegistry()
@@ -0,0 +1,183 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Disk-backed storage for large context artifacts.
+
+When `artifact_spill_threshold` or `artifact_memory_cap` is configured, the Context keeps
+large artifact values in content-addressed files and holds lightweight `SpilledArtifact`
+handles in their place. Handles are loaded transparently on access, so steps and
+templates see ordinary values, while cloned contexts (loop items, parallel branches,
+sub-recipes) share the spilled data instead of deep-copying it.
+"""
+
+import atexit
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ["ArtifactStore", "SpilledArtifact", "estimate_size", "get_artifact_store"]
+
+# Containers are walked to this depth; below it, objects count with their shallow size
+_MAX_SIZE_DEPTH = 6
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the in-memory size of an artifact value in bytes.
+
+    Strings and bytes count their length; lists, tuples and dicts are walked recursively.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if _depth >= _MAX_SIZE_DEPTH:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item, _depth + 1) for item in value)
+    return sys.getsizeof(value)
+
+
+class SpilledArtifact:
+    """
+    Handle to an artifact value stored on disk. Copying a handle is free; `load()`
+    returns a fresh copy of the value each time.
+    """
+
+    __slots__ = ("path", "digest", "kind", "size")
+
+    def __init__(self, path: str, digest: str, kind: str, size: int) -> None:
+        self.path = path
+        self.digest = digest
+        self.kind = kind
+        self.size = size
+
+    def load(self) -> Any:
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if self.kind == "text":
+            return data.decode("utf-8")
+        if self.kind == "bytes":
+            return data
+        return pickle.loads(data)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SpilledArtifact":
+        return self
+
+    def __getstate__(self) -> Tuple[str, str, str, int]:
+        return (self.path, self.digest, self.kind, self.size)
+
+    def __setstate__(self, state: Tuple[str, str, str, int]) -> None:
+        self.path, self.digest, self.kind, self.size = state
+
+    def __repr__(self) -> str:
+        return f"SpilledArtifact({self.kind}, {self.size} bytes, {self.digest[:12]})"
+
+
+class ArtifactStore:
+    """
+    Content-addressed file store for spilled artifacts. Identical values are written once.
+
+    Args:
+        directory: Where spilled files are written; a temporary directory (removed at exit)
+            is used when omitted.
+        threshold: Values estimated above this many bytes are spilled when stored.
+        memory_cap: When the artifacts held in memory by all Contexts using this store
+            (a context and its clones, or every context with the same settings) exceed this
+            many bytes, the largest artifacts of the context being written are spilled.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        threshold: Optional[int] = None,
+        memory_cap: Optional[int] = None,
+    ) -> None:
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="recipe-executor-artifacts-")
+            atexit.register(shutil.rmtree, directory, True)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.threshold = threshold
+        self.memory_cap = memory_cap
+        # Estimated bytes of artifacts held in memory by the contexts using this store
+        self.in_memory = 0
+        self._lock = threading.Lock()
+
+    def should_spill(self, size: int) -> bool:
+        return self.threshold is not None and size > self.threshold
+
+    def adjust(self, delta: int) -> None:
+        """
+        Add `delta` bytes (negative to release) to the in-memory total checked against `memory_cap`.
+        """
+        with self._lock:
+            self.in_memory += delta
+
+    def over_cap(self) -> bool:
+        return self.memory_cap is not None and self.in_memory > self.memory_cap
+
+    def spill(self, value: Any) -> Optional[SpilledArtifact]:
+        """
+        Write a value to the store and return its handle, or None if it cannot be serialized.
+        """
+        if isinstance(value, SpilledArtifact):
+            return value
+        if isinstance(value, str):
+            kind, data = "text", value.encode("utf-8")
+        elif isinstance(value, bytes):
+            kind, data = "bytes", value
+        else:
+            try:
+                kind, data = "pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # Live objects (clients, servers, locks) stay in memory
+                return None
+
+        digest = hashlib.sha256(kind.encode() + b"\0" + data).hexdigest()
+        path = os.path.join(self.directory, digest[:2], digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+        return SpilledArtifact(path, digest, kind, len(data))
+
+
+_STORES: Dict[Tuple[Optional[str], Optional[int], Optional[int]], ArtifactStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _as_bytes(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def get_artifact_store(config: Dict[str, Any]) -> Optional[ArtifactStore]:
+    """
+    Return the shared ArtifactStore configured by `artifact_spill_threshold`,
+    `artifact_memory_cap` and `artifact_store_dir`, or None when spilling is disabled.
+    """
+    threshold = _as_bytes(config.get("artifact_spill_threshold"))
+    memory_cap = _as_bytes(config.get("artifact_memory_cap"))
+    if threshold is None and memory_cap is None:
+        return None
+    directory = config.get("artifact_store_dir") or None
+    key = (directory, threshold, memory_cap)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = ArtifactStore(directory, threshold, memory_cap)
+            _STORES[key] = store
+        return store
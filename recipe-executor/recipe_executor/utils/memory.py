@@ -0,0 +1,399 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Process memory measurement for recipe runs.
+
+`RssMonitor` samples the resident set size (RSS) from a background thread while a run is in
+progress and reports the peak, so runs can be compared with and without artifact spilling.
+
+`MemoryProfiler` attributes Python allocations to recipe steps with tracemalloc: the peak and
+net allocation of every step (including steps of sub-recipes and loop items) and the top
+allocation sites of the worst steps.
+"""
+
+import html
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Set, Tuple
+
+__all__ = [
+    "MemoryProfiler",
+    "RssMonitor",
+    "current_rss",
+    "format_bytes",
+    "get_memory_profiler",
+    "profile_step",
+]
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX platforms
+    _PAGE_SIZE = 4096
+
+
+def current_rss() -> Optional[int]:
+    """
+    Return the current resident set size of this process in bytes, or None if unavailable.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _max_rss() -> Optional[int]:
+    # Peak RSS over the whole process lifetime, where /proc is not available (macOS, BSD)
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return "unknown"
+    if size < 1024:
+        return f"{size} B"
+    value = float(size)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1024
+        if value < 1024:
+            break
+    return f"{value:.1f} {unit}"
+
+
+class RssMonitor:
+    """
+    Context manager that tracks the peak RSS of the process while it is active.
+
+    Usage:
+        with RssMonitor() as monitor:
+            await executor.execute(recipe, context)
+        print(monitor.peak)
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.start: Optional[int] = None
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssMonitor":
+        self.start = current_rss()
+        self.peak = self.start
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._watch, name="rss-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+        else:
+            self.peak = _max_rss()
+
+
+class StepMemory:
+    """
+    Memory measured for one step. `peak` is the highest traced memory of the process while the
+    step ran, so steps running concurrently (e.g. loop items) see each other's allocations.
+    """
+
+    __slots__ = ("path", "step_type", "start", "end", "peak", "duration", "status", "sites", "_snapshots", "_overhead")
+
+    def __init__(self, path: str, step_type: str, start: int) -> None:
+        self.path = path
+        self.step_type = step_type
+        self.start = start
+        self.end = start
+        self.peak = start
+        self.duration = 0.0
+        self.status = "running"
+        self.sites: Optional[List[Dict[str, Any]]] = None
+        # Snapshots taken when the step started and ended, until its allocation sites are known
+        self._snapshots: List[tracemalloc.Snapshot] = []
+        self._overhead = 0
+
+    @property
+    def peak_increase(self) -> int:
+        return self.peak - self.start
+
+    @property
+    def net(self) -> int:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "path": self.path,
+            "type": self.step_type,
+            "peak_increase": self.peak_increase,
+            "net": self.net,
+            "start": self.start,
+            "peak": self.peak,
+            "duration": round(self.duration, 3),
+            "status": self.status,
+        }
+        if self.sites is not None:
+            data["sites"] = self.sites
+        return data
+
+
+_OWN_FILES = (tracemalloc.__file__, __file__)
+_step_path: ContextVar[Tuple[str, ...]] = ContextVar("recipe_executor_step_path", default=())
+_active_profiler: Optional["MemoryProfiler"] = None
+
+
+class MemoryProfiler:
+    """
+    Per-step tracemalloc profiler. While started, `profile_step` scopes entered by the executor
+    and loop steps are measured; `report()` returns the results.
+
+    Usage:
+        profiler = MemoryProfiler()
+        with profiler:
+            await executor.execute(recipe, context)
+        profiler.write_report(log_dir)
+
+    Allocation sites are found by comparing tracemalloc snapshots taken when a step starts and
+    ends. Snapshots are kept only for the `worst` steps with the largest peak increase so far
+    and compared when the profiler stops, since processing them while tracing is very slow.
+    Snapshots make every step slower; pass `sites=0` to record only peaks and net allocations.
+    """
+
+    def __init__(self, worst: int = 5, sites: int = 10, frames: int = 16) -> None:
+        self.worst = worst
+        self.sites = sites
+        self.frames = frames
+        self.steps: List[StepMemory] = []
+        self.peak = 0
+        self.duration = 0.0
+        self._active: Set[StepMemory] = set()
+        self._with_sites: List[StepMemory] = []
+        # Traced memory held by the profiler's own snapshots, excluded from measurements
+        self._held = 0
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        global _active_profiler
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        tracemalloc.reset_peak()
+        self._started = time.monotonic()
+        _active_profiler = self
+
+    def stop(self) -> None:
+        global _active_profiler
+        with self._lock:
+            self._sync()
+        self.duration = time.monotonic() - self._started
+        _active_profiler = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        for record in self._with_sites:
+            start, end = record._snapshots
+            record.sites = self._top_sites(end, start)
+            record._snapshots = []
+
+    def __enter__(self) -> "MemoryProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _sync(self) -> int:
+        # Fold the peak since the last boundary into every running step, then start a new
+        # measurement period; returns the current traced memory. Call with the lock held.
+        current, peak = tracemalloc.get_traced_memory()
+        current -= self._held
+        peak -= self._held
+        for record in self._active:
+            if peak > record.peak:
+                record.peak = peak
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _snapshot(self) -> Tuple[tracemalloc.Snapshot, int]:
+        # Take a snapshot and return it with the traced memory it holds. Call with the lock held.
+        before = tracemalloc.get_traced_memory()[0]
+        snapshot = tracemalloc.take_snapshot()
+        overhead = max(0, tracemalloc.get_traced_memory()[0] - before)
+        # Drop the peak caused by taking the snapshot
+        tracemalloc.reset_peak()
+        return snapshot, overhead
+
+    def _begin(self, label: str, step_type: str) -> StepMemory:
+        path = " > ".join(_step_path.get() + (label,))
+        with self._lock:
+            record = StepMemory(path, step_type, self._sync())
+            if self.sites > 0 and self.worst > 0:
+                self._keep_snapshot(record)
+            self._active.add(record)
+            self.steps.append(record)
+        return record
+
+    def _end(self, record: StepMemory) -> None:
+        with self._lock:
+            record.end = self._sync()
+            self._active.discard(record)
+            if record._snapshots:
+                if self._ranks_worst(record):
+                    self._keep_snapshot(record)
+                    self._with_sites.append(record)
+                    self._with_sites.sort(key=lambda r: r.peak_increase, reverse=True)
+                    for dropped in self._with_sites[self.worst :]:
+                        self._drop_snapshots(dropped)
+                    del self._with_sites[self.worst :]
+                else:
+                    self._drop_snapshots(record)
+
+    def _keep_snapshot(self, record: StepMemory) -> None:
+        # Call with the lock held
+        snapshot, overhead = self._snapshot()
+        record._snapshots.append(snapshot)
+        record._overhead += overhead
+        self._held += overhead
+
+    def _drop_snapshots(self, record: StepMemory) -> None:
+        # Call with the lock held
+        record._snapshots = []
+        self._held -= record._overhead
+        record._overhead = 0
+        tracemalloc.reset_peak()
+
+    def _ranks_worst(self, record: StepMemory) -> bool:
+        if len(self._with_sites) < self.worst:
+            return True
+        return record.peak_increase > self._with_sites[-1].peak_increase
+
+    def _top_sites(self, end: tracemalloc.Snapshot, start: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        sites: List[Dict[str, Any]] = []
+        for diff in end.compare_to(start, "traceback"):
+            if len(sites) >= self.sites:
+                break
+            # Skip the profiler's own snapshots (filtering the snapshots up front is much slower)
+            if diff.size_diff <= 0 or diff.traceback[-1].filename in _OWN_FILES:
+                continue
+            frames = [f"{frame.filename}:{frame.lineno}" for frame in reversed(diff.traceback)]
+            sites.append({"size": diff.size_diff, "count": diff.count_diff, "site": frames[0], "traceback": frames[:8]})
+        sites.sort(key=lambda site: site["size"], reverse=True)
+        return sites
+
+    @contextmanager
+    def step(self, label: str, step_type: str = "") -> Iterator[StepMemory]:
+        """
+        Measure a step; steps entered inside it are recorded under its path.
+        """
+        record = self._begin(label, step_type)
+        token = _step_path.set(_step_path.get() + (label,))
+        started = time.monotonic()
+        try:
+            yield record
+            record.status = "ok"
+        except BaseException:
+            record.status = "error"
+            raise
+        finally:
+            record.duration = time.monotonic() - started
+            _step_path.reset(token)
+            self._end(record)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return the profile: every step in start order and the worst steps by peak increase.
+        """
+        worst = sorted(self.steps, key=lambda record: record.peak_increase, reverse=True)[: max(self.worst, 0)]
+        return {
+            "tracemalloc_peak": self.peak,
+            "duration": round(self.duration, 3),
+            "steps": [record.to_dict() for record in self.steps],
+            "worst": [record.to_dict() for record in worst],
+        }
+
+    def write_report(self, directory: str) -> Tuple[Path, Path]:
+        """
+        Write the profile as `memory_profile.json` and `memory_profile.html` to a directory.
+        """
+        report = self.report()
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        json_path = target / "memory_profile.json"
+        html_path = target / "memory_profile.html"
+        json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        html_path.write_text(_render_html(report), encoding="utf-8")
+        return json_path, html_path
+
+
+def _render_html(report: Dict[str, Any]) -> str:
+    def row(step: Dict[str, Any]) -> str:
+        return (
+            f"<tr><td>{html.escape(step['path'])}</td><td>{html.escape(step['type'])}</td>"
+            f"<td>{format_bytes(step['peak_increase'])}</td><td>{format_bytes(step['net'])}</td>"
+            f"<td>{step['duration']:.3f}s</td><td>{step['status']}</td></tr>"
+        )
+
+    header = "<tr><th>Step</th><th>Type</th><th>Peak increase</th><th>Net</th><th>Duration</th><th>Status</th></tr>"
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Recipe memory profile</title>",
+        "<style>body{font-family:sans-serif}table{border-collapse:collapse}td,th{border:1px solid #ccc;"
+        "padding:2px 6px;text-align:left}pre{background:#f6f6f6;padding:4px}</style></head><body>",
+        "<h1>Recipe memory profile</h1>",
+        f"<p>tracemalloc peak {format_bytes(report['tracemalloc_peak'])}, "
+        f"{len(report['steps'])} steps in {report['duration']:.2f}s</p>",
+        "<h2>Worst steps</h2>",
+    ]
+    for step in report["worst"]:
+        parts.append(f"<h3>{html.escape(step['path'])}</h3><table>{header}{row(step)}</table>")
+        for site in step.get("sites") or []:
+            parts.append(
+                f"<p>{format_bytes(site['size'])} in {site['count']} blocks at {html.escape(site['site'])}</p>"
+                f"<pre>{html.escape(chr(10).join(site['traceback']))}</pre>"
+            )
+    parts.append("<h2>All steps</h2><table>" + header)
+    parts.extend(row(step) for step in report["steps"])
+    parts.append("</table></body></html>")
+    return "\n".join(parts)
+
+
+def get_memory_profiler() -> Optional[MemoryProfiler]:
+    """
+    Return the running memory profiler, if any.
+    """
+    return _active_profiler
+
+
+def profile_step(label: str, step_type: str = "") -> ContextManager[Any]:
+    """
+    Measure a step with the running memory profiler; does nothing when profiling is off.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return nullcontext()
+    return profiler.step(label, step_type)
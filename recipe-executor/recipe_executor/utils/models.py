@@ -1,14 +1,38 @@
 # This file was generated by Codebase-Generator, do not edit directly
 """
 Utility functions for generating Pydantic models from JSON-Schema object definitions.
+
+`get_schema_model` caches generated model classes by a canonical hash of the schema, so
+steps that run the same structured output schema many times (e.g. llm_generate inside a
+loop) build the nested models and validators only once.
 """
 
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Type, Tuple
+import hashlib
 import itertools
+import json
+import threading
 
 from pydantic import BaseModel, create_model
 
-__all__ = ["json_object_to_pydantic_model"]
+from recipe_executor.metrics import CACHE_REQUESTS
+
+__all__ = [
+    "clear_schema_model_cache",
+    "get_schema_model",
+    "json_object_to_pydantic_model",
+    "schema_hash",
+    "schema_model_cache_info",
+]
+
+# Maximum number of generated model classes kept; least recently used are evicted first
+MAX_CACHED_MODELS = 256
+
+_MODEL_CACHE: "OrderedDict[Tuple[str, str], Type[BaseModel]]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
 
 
 def json_object_to_pydantic_model(object_schema: Dict[str, Any], model_name: str = "SchemaModel") -> Type[BaseModel]:
@@ -124,3 +148,58 @@ def json_object_to_pydantic_model(object_schema: Dict[str, Any], model_name: str
         {"type": "object", "properties": properties, "required": required_fields},
         model_name,
     )
+
+
+def schema_hash(object_schema: Dict[str, Any]) -> str:
+    """
+    Return a canonical hash of a JSON schema: equal schemas hash equally regardless of key order.
+    """
+    canonical = json.dumps(object_schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_schema_model(object_schema: Dict[str, Any], model_name: str = "SchemaModel") -> Type[BaseModel]:
+    """
+    Return the Pydantic model for a JSON-Schema object, generating it on first use and
+    reusing it for equal schemas afterwards. Safe to call from threads and coroutines.
+
+    Raises:
+        ValueError: If the schema is invalid or unsupported (invalid schemas are not cached).
+    """
+    global _cache_hits, _cache_misses
+    key = (schema_hash(object_schema), model_name)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+            _cache_hits += 1
+            CACHE_REQUESTS.inc(cache="schema_model", result="hit")
+            return model
+        _cache_misses += 1
+        CACHE_REQUESTS.inc(cache="schema_model", result="miss")
+
+    # Build outside the lock; if another thread built the same schema meanwhile, keep its model
+    model = json_object_to_pydantic_model(object_schema, model_name=model_name)
+    with _MODEL_CACHE_LOCK:
+        existing = _MODEL_CACHE.get(key)
+        if existing is not None:
+            return existing
+        _MODEL_CACHE[key] = model
+        while len(_MODEL_CACHE) > MAX_CACHED_MODELS:
+            _MODEL_CACHE.popitem(last=False)
+    return model
+
+
+def clear_schema_model_cache() -> None:
+    global _cache_hits, _cache_misses
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+        _cache_hits = _cache_misses = 0
+
+
+def schema_model_cache_info() -> Dict[str, int]:
+    """
+    Return the cache's hits, misses, current size and maximum size.
+    """
+    with _MODEL_CACHE_LOCK:
+        return {"hits": _cache_hits, "misses": _cache_misses, "size": len(_MODEL_CACHE), "max_size": MAX_CACHED_MODELS}
@@ -0,0 +1,300 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Local retrieval utilities for selecting relevant resource chunks.
+
+Provides text chunking and an in-process BM25 index (vectorized with NumPy) that
+returns the top-k chunks for a query under an optional token budget. No network
+access or external services are required.
+
+Indexes are kept in contexts as plain data (`RetrievalIndex.to_dict`), so contexts stay
+serializable; `load_index` turns that data back into an index, compiling each distinct
+index once per process.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from recipe_executor.utils.tokens import estimate_tokens
+
+__all__ = ["INDEX_FORMAT", "RetrievalIndex", "chunk_text", "is_index_data", "load_index"]
+
+INDEX_FORMAT = "bm25_index"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+# Compiled indexes by fingerprint, so loop items and repeated renders do not rebuild them
+_INDEX_CACHE_SIZE = 8
+_index_cache: "OrderedDict[str, RetrievalIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for indexing and querying."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def chunk_text(text: str, chunk_size: int = 200) -> List[str]:
+    """
+    Split text into chunks of at most `chunk_size` words, keeping paragraphs together.
+
+    Paragraphs are packed greedily into chunks; paragraphs longer than `chunk_size`
+    words are split into word windows.
+
+    Args:
+        text: The text to split.
+        chunk_size: Maximum number of words per chunk.
+
+    Returns:
+        List of chunk strings (empty if the text is blank).
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_words = 0
+
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        words = paragraph.split()
+        if len(words) > chunk_size:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_words = [], 0
+            for start in range(0, len(words), chunk_size):
+                chunks.append(" ".join(words[start : start + chunk_size]))
+            continue
+        if current_words + len(words) > chunk_size and current:
+            chunks.append("\n\n".join(current))
+            current, current_words = [], 0
+        current.append(paragraph)
+        current_words += len(words)
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class RetrievalIndex:
+    """
+    Immutable BM25 index over chunks of a set of documents.
+
+    Postings are stored term-major in flat NumPy arrays so that scoring a query
+    touches only the postings of the query terms. The index is immutable once
+    built, so copies (e.g. from context cloning) share the same instance.
+
+    The chunks and BM25 parameters fully determine the index: `to_dict` exports
+    them as JSON-compatible data and `from_dict` rebuilds the arrays from it.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        chunk_size: int = 200,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            documents: Dicts with `key`, `content` and optional `description`.
+            chunk_size: Maximum number of words per chunk.
+            k1: BM25 term-frequency saturation.
+            b: BM25 length normalization.
+        """
+        chunks: List[Dict[str, Any]] = []
+        for document in documents:
+            content = document.get("content", "")
+            if not isinstance(content, str):
+                content = json.dumps(content)
+            for position, chunk in enumerate(chunk_text(content, chunk_size)):
+                chunks.append({
+                    "key": document.get("key"),
+                    "description": document.get("description", ""),
+                    "chunk": position,
+                    "content": chunk,
+                    "tokens": estimate_tokens(chunk),
+                })
+        self._build(chunks, k1, b)
+        self.fingerprint = _fingerprint(self.chunks, k1, b)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetrievalIndex":
+        """
+        Rebuild an index from the data returned by `to_dict`.
+
+        Raises:
+            ValueError: If the data is not an exported index.
+        """
+        if not is_index_data(data):
+            raise ValueError("Not a retrieval index: expected the data returned by RetrievalIndex.to_dict()")
+        index = cls.__new__(cls)
+        index._build([dict(chunk) for chunk in data["chunks"]], float(data["k1"]), float(data["b"]))
+        index.fingerprint = data.get("fingerprint") or _fingerprint(index.chunks, index.k1, index.b)
+        return index
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Export the index as JSON-compatible data, suitable for storing in a context.
+        """
+        return {
+            "format": INDEX_FORMAT,
+            "fingerprint": self.fingerprint,
+            "k1": self.k1,
+            "b": self.b,
+            "chunks": [dict(chunk) for chunk in self.chunks],
+        }
+
+    def _build(self, chunks: List[Dict[str, Any]], k1: float, b: float) -> None:
+        self.k1 = k1
+        self.b = b
+        self.chunks = chunks
+
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        freqs: List[int] = []
+        lengths: List[int] = []
+
+        for chunk_id, chunk in enumerate(chunks):
+            tokens = _tokenize(chunk["content"])
+            lengths.append(len(tokens))
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                term_id = vocab.setdefault(token, len(vocab))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            for term_id, count in counts.items():
+                term_ids.append(term_id)
+                doc_ids.append(chunk_id)
+                freqs.append(count)
+
+        self._vocab = vocab
+        terms = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        self._post_docs = np.asarray(doc_ids, dtype=np.int64)[order]
+        self._post_tfs = np.asarray(freqs, dtype=np.float64)[order]
+        doc_freq = np.bincount(terms, minlength=len(vocab))
+        self._offsets = np.concatenate(([0], np.cumsum(doc_freq)))
+
+        total = len(self.chunks)
+        self._lengths = np.asarray(lengths, dtype=np.float64)
+        avg_length = float(self._lengths.mean()) if total and self._lengths.sum() else 1.0
+        self._norm = k1 * (1.0 - b + b * self._lengths / avg_length)
+        self._idf = np.log1p((total - doc_freq + 0.5) / (doc_freq + 0.5))
+        self._keys = np.asarray([str(chunk["key"]) for chunk in self.chunks], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "RetrievalIndex":
+        # Immutable: share the instance instead of copying the arrays
+        return self
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Return the BM25 score of every chunk for the query.
+        """
+        scores = np.zeros(len(self.chunks), dtype=np.float64)
+        for token in set(_tokenize(query)):
+            term_id = self._vocab.get(token)
+            if term_id is None:
+                continue
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            docs = self._post_docs[start:end]
+            tfs = self._post_tfs[start:end]
+            scores[docs] += self._idf[term_id] * tfs * (self.k1 + 1.0) / (tfs + self._norm[docs])
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        max_tokens: Optional[int] = None,
+        keys: Optional[Iterable[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select the most relevant chunks for a query.
+
+        Chunks are taken in descending score order while they fit the token budget,
+        then returned in document order so the selection reads coherently.
+
+        Args:
+            query: Free text to match against chunk contents.
+            top_k: Maximum number of chunks to return.
+            max_tokens: Optional estimated-token budget for the selected chunks.
+            keys: Optional document keys to restrict the search to.
+
+        Returns:
+            List of chunk dicts with `key`, `description`, `chunk`, `content`, `tokens` and `score`.
+        """
+        if not self.chunks or top_k <= 0:
+            return []
+
+        scores = self.scores(query)
+        allowed = np.ones(len(self.chunks), dtype=bool)
+        if keys is not None:
+            allowed = np.isin(self._keys, [str(key) for key in keys])
+
+        candidates = np.flatnonzero(allowed & (scores > 0))
+        if candidates.size == 0:
+            # Nothing matched: fall back to the leading chunks of the allowed documents
+            candidates = np.flatnonzero(allowed)
+        else:
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        selected: List[int] = []
+        used = 0
+        for idx in candidates.tolist():
+            tokens = self.chunks[idx]["tokens"]
+            if max_tokens is not None and used + tokens > max_tokens:
+                continue
+            selected.append(idx)
+            used += tokens
+            if len(selected) >= top_k:
+                break
+
+        return [{**self.chunks[idx], "score": float(scores[idx])} for idx in sorted(selected)]
+
+
+def _fingerprint(chunks: List[Dict[str, Any]], k1: float, b: float) -> str:
+    payload = json.dumps({"k1": k1, "b": b, "chunks": chunks}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_index_data(value: Any) -> bool:
+    """
+    Return True if the value is an index exported with `RetrievalIndex.to_dict`.
+    """
+    return isinstance(value, dict) and value.get("format") == INDEX_FORMAT and isinstance(value.get("chunks"), list)
+
+
+def load_index(data: Dict[str, Any]) -> RetrievalIndex:
+    """
+    Return the index for exported index data, compiling it at most once per fingerprint.
+
+    Raises:
+        ValueError: If the data is not an exported index.
+    """
+    fingerprint = data.get("fingerprint") if isinstance(data, dict) else None
+    if fingerprint:
+        with _index_cache_lock:
+            index = _index_cache.get(fingerprint)
+            if index is not None:
+                _index_cache.move_to_end(fingerprint)
+                return index
+    index = RetrievalIndex.from_dict(data)
+    with _index_cache_lock:
+        _index_cache[index.fingerprint] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,185 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Serialization of context artifacts to JSON and MessagePack.
+
+JSON is encoded with orjson when it is installed (stdlib json otherwise); MessagePack
+requires msgpack. Both formats handle Pydantic models, bytes and spilled artifacts:
+
+- By default, models become plain dicts and bytes base64 strings, for logs, APIs and display.
+- With `lossless=True`, models and bytes are tagged so `loads` restores them exactly, for
+  checkpoints and hand-off between processes. Tagged models are imported by name on
+  load, so only load lossless data from trusted sources.
+
+`iter_dumps`/`dump` encode a mapping one artifact at a time, so serializing a large context
+never holds more than one artifact's encoding in memory.
+"""
+
+import base64
+import importlib
+import json
+from pathlib import PurePath
+from typing import IO, Any, Callable, Dict, Iterator, Mapping
+
+from pydantic import BaseModel
+
+from recipe_executor.utils.artifacts import SpilledArtifact
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["FORMATS", "dump", "dumps", "iter_dumps", "load", "loads", "to_jsonable"]
+
+FORMATS = ("json", "msgpack")
+
+_MODEL_TAG = "__model__"
+_BYTES_TAG = "__bytes__"
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise RuntimeError("MessagePack serialization requires the 'msgpack' package") from exc
+    return msgpack
+
+
+def _encoder(fmt: str, lossless: bool) -> Callable[[Any], Any]:
+    """
+    Build the `default` hook for values the encoders do not support natively.
+    """
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, SpilledArtifact):
+            return value.load()
+        if isinstance(value, BaseModel):
+            data = value.model_dump(mode="json")
+            if lossless:
+                cls = type(value)
+                return {_MODEL_TAG: f"{cls.__module__}:{cls.__qualname__}", "data": data}
+            return data
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            if fmt == "msgpack":
+                return bytes(value)
+            encoded = base64.b64encode(value).decode("ascii")
+            return {_BYTES_TAG: encoded} if lossless else encoded
+        if isinstance(value, (set, frozenset, tuple)):
+            return list(value)
+        if isinstance(value, PurePath):
+            return str(value)
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if lossless:
+            raise TypeError(f"Cannot serialize value of type {type(value).__name__}")
+        return str(value)
+
+    return encode
+
+
+def dumps(value: Any, format: str = "json", lossless: bool = False, indent: bool = False) -> bytes:
+    """
+    Serialize a value (typically a dict of artifacts) to JSON or MessagePack bytes.
+
+    Raises:
+        ValueError: For an unknown format.
+        RuntimeError: If MessagePack is requested but msgpack is not installed.
+        TypeError: In lossless mode, for values that cannot be represented.
+    """
+    if format == "json":
+        default = _encoder("json", lossless)
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(value, default=default, option=option)
+        # Compact separators match orjson, so `iter_dumps` chunks join to the same bytes
+        separators = None if indent else (",", ":")
+        return json.dumps(
+            value, default=default, indent=2 if indent else None, separators=separators, ensure_ascii=False
+        ).encode("utf-8")
+    if format == "msgpack":
+        return _msgpack().packb(value, default=_encoder("msgpack", lossless), use_bin_type=True, strict_types=False)
+    raise ValueError(f"Unknown serialization format '{format}', expected one of {FORMATS}")
+
+
+def _restore(value: Any) -> Any:
+    # Undo lossless tagging: rebuild Pydantic models and bytes
+    if isinstance(value, dict):
+        if len(value) == 1 and _BYTES_TAG in value:
+            return base64.b64decode(value[_BYTES_TAG])
+        if len(value) == 2 and _MODEL_TAG in value and "data" in value:
+            module_name, _, qualname = str(value[_MODEL_TAG]).partition(":")
+            cls: Any = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                cls = getattr(cls, part)
+            if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+                raise ValueError(f"Serialized model '{value[_MODEL_TAG]}' is not a Pydantic model")
+            return cls.model_validate(value["data"])
+        return {key: _restore(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore(item) for item in value]
+    return value
+
+
+def loads(data: bytes, format: str = "json", lossless: bool = False) -> Any:
+    """
+    Deserialize JSON or MessagePack bytes; with `lossless=True`, restore tagged models and bytes.
+    """
+    if format == "json":
+        value = orjson.loads(data) if orjson is not None else json.loads(data)
+    elif format == "msgpack":
+        value = _msgpack().unpackb(data, raw=False, strict_map_key=False)
+    else:
+        raise ValueError(f"Unknown serialization format '{format}', expected one of {FORMATS}")
+    return _restore(value) if lossless else value
+
+
+def iter_dumps(artifacts: Mapping[str, Any], format: str = "json", lossless: bool = False) -> Iterator[bytes]:
+    """
+    Encode a mapping as chunks, one artifact at a time. Joined, the chunks equal `dumps(dict(artifacts))`
+    (without indentation).
+    """
+    if format == "json":
+        yield b"{"
+        for index, (key, value) in enumerate(artifacts.items()):
+            prefix = b"," if index else b""
+            yield prefix + dumps(str(key), "json") + b":" + dumps(value, "json", lossless)
+        yield b"}"
+    elif format == "msgpack":
+        packer = _msgpack().Packer(default=_encoder("msgpack", lossless), use_bin_type=True)
+        yield packer.pack_map_header(len(artifacts))
+        for key, value in artifacts.items():
+            yield packer.pack(key) + packer.pack(value)
+    else:
+        raise ValueError(f"Unknown serialization format '{format}', expected one of {FORMATS}")
+
+
+def dump(artifacts: Mapping[str, Any], fp: IO[bytes], format: str = "json", lossless: bool = False) -> None:
+    """
+    Stream a mapping of artifacts to a binary file object.
+    """
+    for chunk in iter_dumps(artifacts, format, lossless):
+        fp.write(chunk)
+
+
+def load(fp: IO[bytes], format: str = "json", lossless: bool = False) -> Dict[str, Any]:
+    """
+    Read artifacts written by `dump`. MessagePack input is decoded incrementally.
+    """
+    if format != "msgpack":
+        return loads(fp.read(), format, lossless)
+    unpacker = _msgpack().Unpacker(fp, raw=False, strict_map_key=False)
+    artifacts: Dict[str, Any] = {}
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        value = unpacker.unpack()
+        artifacts[key] = _restore(value) if lossless else value
+    return artifacts
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert a value to plain JSON-compatible data (models to dicts, bytes to base64 strings).
+    """
+    return loads(dumps(value))
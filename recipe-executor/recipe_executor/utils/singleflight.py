@@ -0,0 +1,142 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+In-flight request coalescing ("singleflight").
+
+When several coroutines issue an identical request at the same time (e.g. loop items
+sending the same prompt, or calling the same MCP tool with the same arguments), only the
+first one is executed; the others wait for its result, which is fanned out to all of
+them. Requests are identified by a hash of their normalized inputs.
+
+The shared request runs in its own task, so cancelling one caller does not cancel it for
+the others; it is cancelled only when every caller waiting on it has gone away.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+from recipe_executor.metrics import CACHE_REQUESTS
+
+__all__ = ["SingleFlight", "coalescing_enabled", "get_coalesce_stats", "llm_flights", "mcp_flights", "request_key"]
+
+T = TypeVar("T")
+
+_BOOL = TypeAdapter(bool)
+
+
+def request_key(*parts: Any) -> str:
+    """
+    Hash request inputs into a key. Dicts are serialized with sorted keys, so equal inputs
+    in a different key order produce the same key.
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def coalescing_enabled(config: Dict[str, Any]) -> bool:
+    """
+    Return the `request_coalescing` setting (enabled unless set to a false value).
+    """
+    value = config.get("request_coalescing")
+    if value is None or value == "":
+        return True
+    try:
+        return _BOOL.validate_python(value)
+    except ValidationError:
+        return True
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    Usage:
+        flights = SingleFlight("llm")
+        result = await flights.do(key, lambda: call_provider(...))
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: Dict[Tuple[int, str], _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `call`, or wait for the identical call already in flight. Callers that joined
+        an in-flight call receive a deep copy of its result (or its exception).
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight(loop.create_task(call()))  # type: ignore[arg-type]
+                self._flights[flight_key] = flight
+                flight.task.add_done_callback(lambda _task: self._finish(flight_key, flight))  # type: ignore[arg-type]
+                self.executed += 1
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+        # A coalesced request is served from the in-flight one, like a cache hit
+        CACHE_REQUESTS.inc(cache=f"{self.name}_in_flight", result="miss" if leader else "hit")
+
+        try:
+            # Shielded, so a cancelled caller leaves the shared task running for the others
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0
+            if abandoned and not flight.task.done():
+                flight.task.cancel()
+            raise
+        with self._lock:
+            flight.waiters -= 1
+        return result if leader else copy.deepcopy(result)
+
+    def _finish(self, flight_key: Tuple[int, str], flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+        if flight.task.cancelled():
+            return
+        # Mark the exception as retrieved in case every waiter was cancelled meanwhile
+        flight.task.exception()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "executed": self.executed, "coalesced": self.coalesced}
+
+
+# Process-wide coalescing groups for LLM requests and MCP tool calls
+llm_flights = SingleFlight("llm")
+mcp_flights = SingleFlight("mcp")
+
+
+def get_coalesce_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return call, execution and coalesced counts for LLM requests and MCP tool calls.
+    """
+    return {"llm": llm_flights.stats(), "mcp": mcp_flights.stats()}
@@ -3,20 +3,24 @@
 Utility functions for rendering Liquid templates using context data.
 
 Provides a `render_template` function that renders strings with variables sourced from
-an object implementing ContextProtocol. Includes a custom `snakecase` filter and enables
-extra filters via the environment.
+an object implementing ContextProtocol. Includes custom `snakecase`, `retrieve` and `tokens` filters
+and enables extra filters via the environment, plus `render_value` and `resolve_path` helpers
+shared by the steps and the planner.
 """
 
+import ast
 import re
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from liquid import Environment
+from liquid import BoundTemplate, Environment
 from liquid.exceptions import LiquidError
 
 # Import ContextProtocol inside the module to avoid circular dependencies
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils.tokens import estimate_tokens
 
-__all__ = ["render_template"]
+__all__ = ["render_template", "render_value", "resolve_path"]
 
 # Create a module-level Liquid environment with extra filters enabled
 _env = Environment(autoescape=False, extra=True)
@@ -44,8 +48,74 @@ def _snakecase(value: Any) -> str:
     return s.strip("_")
 
 
-# Register custom filter
+def _retrieve(
+    index: Any,
+    query: Any,
+    top_k: int = 5,
+    max_tokens: Optional[int] = None,
+    keys: Any = None,
+) -> List[Dict[str, Any]]:
+    """
+    Select the chunks of a retrieval index (see the `build_index` step) most relevant to a query.
+
+    Usage: `{% assign chunks = resource_index | retrieve: query, 5, 2000, section.refs %}`
+    """
+    # Imported here so rendering templates does not load NumPy unless retrieval is used
+    from recipe_executor.utils.retrieval import is_index_data, load_index
+
+    if is_index_data(index):
+        index = load_index(index)
+    if not hasattr(index, "search"):
+        return []
+    return index.search(
+        str(query or ""),
+        top_k=int(top_k),
+        max_tokens=int(max_tokens) if max_tokens else None,
+        keys=keys if isinstance(keys, (list, tuple)) else None,
+    )
+
+
+def _tokens(value: Any, model_id: Any = None) -> int:
+    """
+    Estimate the number of tokens in a value for a model (see `estimate_tokens`).
+
+    Usage: `{{ document | tokens: model }}`
+    """
+    return estimate_tokens("" if value is None else str(value), str(model_id) if model_id else None)
+
+
+# Register custom filters
 _env.filters["snakecase"] = _snakecase
+_env.filters["retrieve"] = _retrieve
+_env.filters["tokens"] = _tokens
+
+
+@lru_cache(maxsize=2048)
+def _parse_template(text: str) -> BoundTemplate:
+    """
+    Parse a template once; recipes render the same templates for every step, item and job.
+    """
+    return _env.from_string(text)
+
+
+@lru_cache(maxsize=2048)
+def _template_variables(text: str) -> Optional[Tuple[str, ...]]:
+    """
+    Names of the context artifacts a template references, or None if they cannot be determined.
+    """
+    try:
+        return tuple(_parse_template(text).global_variables(include_partials=False))
+    except Exception:
+        return None
+
+
+def _template_data(text: str, context: ContextProtocol) -> Dict[str, Any]:
+    # Only the referenced artifacts are loaded, so spilled values a template does not use
+    # stay on disk and large contexts are not copied on every render
+    names = _template_variables(text)
+    if names is None:
+        return context.dict()
+    return {name: context[name] for name in names if name in context}
 
 
 def render_template(text: str, context: ContextProtocol) -> str:
@@ -62,9 +132,10 @@ def render_template(text: str, context: ContextProtocol) -> str:
     Raises:
         ValueError: If there is an error during template parsing or rendering.
     """
-    data = context.dict()
+    data: Dict[str, Any] = {}
     try:
-        template = _env.from_string(text)
+        template = _parse_template(text)
+        data = _template_data(text, context)
         result = template.render(**data)
         return result
     except LiquidError as e:
@@ -73,3 +144,52 @@ def render_template(text: str, context: ContextProtocol) -> str:
     except Exception as e:
         message = f"Error rendering template: {e}. Template: {text!r}. Context: {data!r}"
         raise ValueError(message) from e
+
+
+def render_value(value: Any, context: ContextProtocol) -> Any:
+    """
+    Recursively render and parse a configuration value:
+    - Strings are template-rendered, then if the result is a valid Python literal
+      (dict or list), parsed into Python objects using ast.literal_eval.
+    - Lists and dicts are processed recursively.
+    - Other types are returned unchanged.
+    """
+    if isinstance(value, str):
+        # Render the string template against the context
+        rendered = render_template(value, context)
+        # Attempt to parse Python literal for dict or list
+        try:
+            parsed = ast.literal_eval(rendered)
+            if isinstance(parsed, (dict, list)):
+                return parsed
+        except (ValueError, SyntaxError):
+            # Not a literal or invalid syntax; fall back to rendered string
+            pass
+        return rendered
+
+    if isinstance(value, list):  # type: ignore[type-arg]
+        return [render_value(item, context) for item in value]
+
+    if isinstance(value, dict):  # type: ignore[type-arg]
+        return {key: render_value(val, context) for key, val in value.items()}
+
+    return value
+
+
+def resolve_path(path: str, context: ContextProtocol) -> Any:
+    """
+    Resolve a dot-notated path against the context or nested dicts.
+
+    Returns None if any part of the path is missing.
+    """
+    current: Any = context
+    for part in path.split("."):
+        if isinstance(current, ContextProtocol):
+            current = current.get(part)
+        elif isinstance(current, dict):
+            current = current.get(part)
+        else:
+            return None
+        if current is None:
+            return None
+    return current
@@ -0,0 +1,280 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Token estimation and prompt fitting utilities.
+
+Provides a local, per-provider token estimator (tiktoken when available, otherwise a
+character-based heuristic), a per-model context-window table, and `fit_prompt` for
+shrinking named prompt blocks to fit a token budget before calling a model.
+
+tiktoken is optional (the `tokens` extra). Its encodings may be downloaded on first use,
+so they are loaded in a background thread: `estimate_tokens` uses the heuristic until
+the encoding is ready, and `load_encoder` waits for it (with a timeout) without blocking
+the event loop.
+"""
+
+import asyncio
+import importlib.util
+import math
+import re
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple
+
+__all__ = [
+    "FitPolicy",
+    "MODEL_CONTEXT_WINDOWS",
+    "estimate_tokens",
+    "fit_prompt",
+    "get_context_window",
+    "load_encoder",
+]
+
+FitPolicy = Literal["fail", "truncate", "drop"]
+
+# Context window sizes (tokens) by model name prefix; the longest matching prefix wins.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16_385,
+    "gpt-4": 8_192,
+    "gpt-4-turbo": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4.5": 128_000,
+    "gpt-5": 400_000,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+    "claude-2": 100_000,
+    "claude-3": 200_000,
+    "claude-opus-4": 200_000,
+    "claude-sonnet-4": 200_000,
+    "llama3": 8_192,
+    "llama3.1": 128_000,
+    "llama3.2": 128_000,
+    "llama3.3": 128_000,
+    "phi4": 16_384,
+    "qwen2.5": 32_768,
+    "qwen2.5-coder": 32_768,
+    "mistral": 32_768,
+    "gemma3": 128_000,
+}
+
+# Average characters per token used when no tokenizer is available
+_CHARS_PER_TOKEN = {
+    "anthropic": 3.5,
+}
+_DEFAULT_CHARS_PER_TOKEN = 4.0
+_OPENAI_PROVIDERS = ("openai", "azure", "openai_responses", "azure_responses")
+# Seconds `load_encoder` waits for an encoding (e.g. a download) before using the heuristic
+_ENCODER_LOAD_TIMEOUT = 10.0
+
+Encoder = Callable[[str], List[int]]
+_encoders: Dict[str, "Future[Optional[Encoder]]"] = {}
+_encoders_lock = threading.Lock()
+
+
+def _split_model_id(model_id: Optional[str]) -> Tuple[str, str]:
+    if not model_id:
+        return "", ""
+    parts = model_id.split("/")
+    provider = parts[0].lower() if len(parts) > 1 else ""
+    model_name = parts[1] if len(parts) > 1 else parts[0]
+    return provider, model_name
+
+
+def _load_encoder(model_name: str) -> Optional[Encoder]:
+    """
+    Load the tiktoken encode function for an OpenAI model, or None if unavailable.
+
+    Blocking: tiktoken downloads its encoding files on first use. Any failure (no
+    network, unknown encoding) falls back to the heuristic.
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return encoding.encode_ordinary
+    except Exception:
+        return None
+
+
+def _encoder_future(model_name: str) -> "Future[Optional[Encoder]]":
+    # Start loading the encoder in a background thread, once per model name
+    with _encoders_lock:
+        future = _encoders.get(model_name)
+        if future is None:
+            future = Future()
+            _encoders[model_name] = future
+            if importlib.util.find_spec("tiktoken") is None:
+                future.set_result(None)
+            else:
+
+                def load() -> None:
+                    future.set_result(_load_encoder(model_name))  # type: ignore[union-attr]
+
+                threading.Thread(target=load, name=f"tiktoken-{model_name}", daemon=True).start()
+        return future
+
+
+def _get_encoder(model_name: str) -> Optional[Encoder]:
+    """
+    Return the encoder if it is loaded; otherwise start loading it and return None.
+    """
+    future = _encoder_future(model_name)
+    return future.result() if future.done() else None
+
+
+async def load_encoder(model_id: Optional[str], timeout: float = _ENCODER_LOAD_TIMEOUT) -> bool:
+    """
+    Wait, without blocking the event loop, until the tokenizer for a model is loaded.
+
+    Returns:
+        True if `estimate_tokens` will use an exact tokenizer for the model; False if it
+        uses the heuristic (no tokenizer for the provider, tiktoken not installed, or
+        the encoding could not be loaded within `timeout` seconds).
+    """
+    provider, model_name = _split_model_id(model_id)
+    if provider not in _OPENAI_PROVIDERS:
+        return False
+    future = _encoder_future(model_name)
+    try:
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout) is not None
+    except asyncio.TimeoutError:
+        return False
+
+
+def estimate_tokens(text: str, model_id: Optional[str] = None) -> int:
+    """
+    Estimate the number of tokens in a text for a model.
+
+    Args:
+        text: The text to measure.
+        model_id: Optional model identifier ('provider/model_name[/deployment]'); selects
+            the tokenizer or heuristic ratio to use.
+
+    Returns:
+        Estimated token count.
+    """
+    if not text:
+        return 0
+    provider, model_name = _split_model_id(model_id)
+    if provider in _OPENAI_PROVIDERS:
+        encode = _get_encoder(model_name)
+        if encode is not None:
+            return len(encode(text))
+    ratio = _CHARS_PER_TOKEN.get(provider, _DEFAULT_CHARS_PER_TOKEN)
+    return max(1, math.ceil(len(text) / ratio))
+
+
+def get_context_window(model_id: str) -> Optional[int]:
+    """
+    Look up the context window of a model by the longest matching name prefix.
+
+    Returns:
+        The context window in tokens, or None if the model is unknown.
+    """
+    _, model_name = _split_model_id(model_id)
+    name = model_name.lower()
+    best: Optional[str] = None
+    for prefix in MODEL_CONTEXT_WINDOWS:
+        if name.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return MODEL_CONTEXT_WINDOWS[best] if best else None
+
+
+def _truncate_middle(text: str, keep_tokens: int, total_tokens: int) -> str:
+    """Keep the head and tail of a text, dropping the middle to fit keep_tokens."""
+    if keep_tokens <= 0 or total_tokens <= 0:
+        return "\n[...truncated...]\n"
+    keep_chars = int(len(text) * keep_tokens / total_tokens)
+    head = keep_chars // 2
+    tail = keep_chars - head
+    return f"{text[:head]}\n[...truncated...]\n{text[len(text) - tail :] if tail else ''}"
+
+
+def _drop_children(inner: str, excess: int, model_id: Optional[str]) -> Optional[str]:
+    """
+    Drop trailing child elements (`<NAME>...</NAME>`) of a block until `excess` tokens are freed.
+    Returns None for blocks without child elements.
+    """
+    children = list(re.finditer(r"<([A-Za-z0-9_\-]+)>.*?</\1>", inner, flags=re.DOTALL))
+    if not children:
+        return None
+    freed = 0
+    for child in reversed(children):
+        freed += estimate_tokens(child.group(0), model_id)
+        inner = inner[: child.start()] + inner[child.end() :]
+        if freed >= excess:
+            break
+    return inner
+
+
+def fit_prompt(
+    segments: Sequence[str],
+    max_tokens: int,
+    policy: FitPolicy,
+    blocks: Sequence[str] = (),
+    model_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Shrink prompt segments so their estimated size fits within max_tokens.
+
+    Named blocks are `<NAME>...</NAME>` sections of the segments, listed from lowest to
+    highest priority; they are shrunk in that order until the prompt fits.
+
+    Policies:
+        - fail: raise immediately if the prompt does not fit.
+        - truncate: cut the middle out of each named block as needed.
+        - drop: remove trailing child elements of each named block (e.g. the last
+          references in a REFERENCE_DOCS block); blocks without child elements (e.g. a
+          single DOCUMENT) are truncated instead.
+
+    Args:
+        segments: Prompt segments (e.g. [prompt_prefix, prompt]).
+        max_tokens: Token budget for all segments together.
+        policy: Fit policy.
+        blocks: Names of blocks that may be shrunk, lowest priority first.
+        model_id: Optional model identifier used for estimation.
+
+    Returns:
+        The fitted segments.
+
+    Raises:
+        ValueError: If the prompt does not fit and cannot be shrunk enough.
+    """
+    fitted = list(segments)
+
+    def total() -> int:
+        return sum(estimate_tokens(segment, model_id) for segment in fitted)
+
+    current = total()
+    if current <= max_tokens:
+        return fitted
+    if policy == "fail":
+        raise ValueError(f"Prompt is ~{current} tokens, exceeding the limit of {max_tokens} tokens")
+
+    for name in blocks:
+        pattern = re.compile(rf"<{re.escape(name)}>(.*?)</{re.escape(name)}>", flags=re.DOTALL)
+        for idx, segment in enumerate(fitted):
+            match = pattern.search(segment)
+            if not match:
+                continue
+            inner = match.group(1)
+            excess = current - max_tokens
+            new_inner = _drop_children(inner, excess, model_id) if policy == "drop" else None
+            if new_inner is None:
+                inner_tokens = estimate_tokens(inner, model_id)
+                # Small margin since the character-based cut is approximate
+                keep = inner_tokens - excess - max(16, excess // 50)
+                new_inner = _truncate_middle(inner, keep, inner_tokens)
+            fitted[idx] = segment[: match.start(1)] + new_inner + segment[match.end(1) :]
+            current = total()
+            if current <= max_tokens:
+                return fitted
+
+    raise ValueError(
+        f"Prompt is ~{current} tokens after applying fit policy '{policy}' to blocks {list(blocks)}, "
+        f"still exceeding the limit of {max_tokens} tokens"
+    )
@@ -0,0 +1,685 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Worker backends for the Recipe Executor.
+
+Run loop items and parallel substeps in worker processes instead of as coroutines in the
+current event loop, so CPU-bound substeps can use more cores (or, with a shared queue
+file, more machines). Each work item ships a plan (recipe dict), a copy of the context
+artifacts and the config to a worker, which runs it with its own Executor and sends back
+the resulting artifacts. Results are returned in item order; failed items are retried
+(at-least-once) up to the configured number of attempts.
+
+Backends:
+    process: a local pool of spawned worker processes (multiprocessing).
+    sqlite:  a durable SQLite work queue served by `recipe-executor-worker` processes,
+             started locally by the coordinator and/or run separately against the same file.
+             Secrets (API keys, tokens, passwords) are not written to the queue; workers take
+             them from their own environment.
+"""
+
+import argparse
+import asyncio
+import copy
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import pickle
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+__all__ = [
+    "ProcessPoolBackend",
+    "SQLiteQueueBackend",
+    "WORKER_BACKENDS",
+    "WorkItem",
+    "WorkQueue",
+    "WorkResult",
+    "WorkerBackend",
+    "get_worker_backend",
+    "main",
+    "run_work_item",
+]
+
+WORKER_LOGGER_NAME = "recipe_executor.worker"
+# Config keys holding secrets, which are kept out of queue files
+_SECRET_MARKERS = ("api_key", "apikey", "secret", "password", "passwd")
+_SECRET_SUFFIXES = ("_key", "_token", "_credential", "_credentials")
+
+ConfigPath = Tuple[Any, ...]
+
+
+def _is_secret_key(key: Any) -> bool:
+    name = str(key).lower()
+    return any(marker in name for marker in _SECRET_MARKERS) or name.endswith(_SECRET_SUFFIXES)
+
+
+def _strip_secrets(value: Any, path: ConfigPath = ()) -> Tuple[Any, List[ConfigPath]]:
+    """
+    Return a copy of a config value without secret entries, and the paths of the removed entries.
+    """
+    removed: List[ConfigPath] = []
+    if isinstance(value, dict):
+        clean: Dict[Any, Any] = {}
+        for key, item in value.items():
+            if _is_secret_key(key):
+                if item is not None:
+                    removed.append(path + (key,))
+                continue
+            clean[key], nested = _strip_secrets(item, path + (key,))
+            removed.extend(nested)
+        return clean, removed
+    if isinstance(value, list):
+        items: List[Any] = []
+        for index, item in enumerate(value):
+            clean_item, nested = _strip_secrets(item, path + (index,))
+            items.append(clean_item)
+            removed.extend(nested)
+        return items, removed
+    return value, removed
+
+
+def _lookup(value: Any, path: ConfigPath) -> Any:
+    for part in path:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and isinstance(part, int) and part < len(value):
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def _restore_secrets(config: Dict[str, Any], paths: List[ConfigPath], logger: logging.Logger) -> Dict[str, Any]:
+    """
+    Put back the secrets removed by `_strip_secrets`, taken from this process's configuration
+    (the same path in `load_configuration()`, or the environment variable of a top-level key).
+    """
+    if not paths:
+        return config
+    from recipe_executor.config import load_configuration
+
+    local = load_configuration()
+    config = copy.deepcopy(config)
+    for path in paths:
+        value = _lookup(local, path)
+        if value is None and len(path) == 1:
+            value = os.getenv(str(path[0]).upper())
+        parent = _lookup(config, path[:-1]) if len(path) > 1 else config
+        if value is None or not isinstance(parent, (dict, list)):
+            logger.warning("Config secret '%s' is not set in this worker's environment", ".".join(map(str, path)))
+            continue
+        parent[path[-1]] = value  # type: ignore[index]
+    return config
+
+
+@dataclass
+class WorkItem:
+    """
+    A unit of work: run `plan` against a context built from `artifacts` and `config`.
+    """
+
+    key: Any
+    plan: Dict[str, Any]
+    artifacts: Dict[str, Any]
+    config: Dict[str, Any]
+
+
+@dataclass
+class WorkResult:
+    """
+    Outcome of a work item: the resulting artifacts, or the error of its last attempt.
+    """
+
+    key: Any
+    artifacts: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+def run_work_item(
+    plan: Dict[str, Any], artifacts: Dict[str, Any], config: Dict[str, Any], label: str = ""
+) -> Dict[str, Any]:
+    """
+    Execute a plan in the current process and return the resulting context artifacts.
+
+    This is the entry point used inside worker processes.
+    """
+    from recipe_executor.context import Context
+    from recipe_executor.executor import Executor
+
+    logger = logging.getLogger(WORKER_LOGGER_NAME)
+    logger.debug("Worker %d running item %s", os.getpid(), label)
+    context = Context(artifacts=artifacts, config=config)
+    asyncio.run(Executor(logger).execute(plan, context))
+    return context.dict()
+
+
+class WorkerBackend(ABC):
+    """
+    Runs work items in worker processes.
+    """
+
+    name: str = ""
+
+    def __init__(self, logger: logging.Logger, workers: int = 0, retries: int = 1, **options: Any) -> None:
+        """
+        Args:
+            logger: Logger for progress; worker logs are forwarded to it where the backend supports it.
+            workers: Number of worker processes (0 = one per CPU).
+            retries: Extra attempts for a failed item (at-least-once delivery).
+        """
+        self.logger = logger
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_attempts = max(1, retries + 1)
+        self.options = options
+
+    @abstractmethod
+    async def run(self, items: List[WorkItem], stop_on_error: bool = False) -> List[Optional[WorkResult]]:
+        """
+        Run the items and return their results in item order.
+
+        With `stop_on_error`, remaining items are abandoned after the first item that fails
+        all its attempts; their entries are None.
+        """
+
+
+class _ForwardHandler(logging.Handler):
+    """
+    Hands log records received from worker processes to a logger in this process.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__()
+        self.logger = logger
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.logger.handle(record)
+
+
+def _init_process_worker(log_queue: Any, pid_queue: Any, level: int) -> None:
+    # Report this worker's PID so a cancelled run can stop it
+    pid_queue.put(os.getpid())
+    logger = logging.getLogger(WORKER_LOGGER_NAME)
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+class ProcessPoolBackend(WorkerBackend):
+    """
+    Runs items in a pool of spawned worker processes.
+
+    A worker that dies breaks the pool; the pool is then rebuilt and the affected items
+    are retried.
+    """
+
+    name = "process"
+
+    def __init__(self, logger: logging.Logger, workers: int = 0, retries: int = 1, **options: Any) -> None:
+        super().__init__(logger, workers, retries, **options)
+        self._mp = multiprocessing.get_context(options.get("start_method") or "spawn")
+        self._log_queue: Any = None
+        self._pid_queue: Any = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._mp,
+            initializer=_init_process_worker,
+            initargs=(self._log_queue, self._pid_queue, self.logger.getEffectiveLevel()),
+        )
+
+    def _worker_pids(self) -> List[int]:
+        """
+        PIDs reported by the workers started since the last call.
+        """
+        pids: List[int] = []
+        while not self._pid_queue.empty():
+            pids.append(self._pid_queue.get())
+        return pids
+
+    def _terminate_workers(self) -> None:
+        """
+        Stop the current pool's workers without waiting for their items.
+        """
+        for pid in self._worker_pids():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                # The worker has already exited
+                pass
+
+    async def _run_item(self, item: WorkItem) -> WorkResult:
+        loop = asyncio.get_running_loop()
+        error = ""
+        for attempt in range(1, self.max_attempts + 1):
+            pool = self._pool
+            assert pool is not None
+            try:
+                artifacts = await loop.run_in_executor(
+                    pool, run_work_item, item.plan, item.artifacts, item.config, str(item.key)
+                )
+                return WorkResult(item.key, artifacts=artifacts, attempts=attempt)
+            except BrokenProcessPool:
+                error = "worker process terminated abruptly"
+                if self._pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    # The broken pool's workers are gone; forget their PIDs
+                    self._worker_pids()
+                    self._pool = self._new_pool()
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+            if attempt < self.max_attempts:
+                self.logger.warning(
+                    "Work item %s failed (%s), retrying (attempt %d/%d)",
+                    item.key,
+                    error,
+                    attempt + 1,
+                    self.max_attempts,
+                )
+        return WorkResult(item.key, error=error, attempts=self.max_attempts)
+
+    async def run(self, items: List[WorkItem], stop_on_error: bool = False) -> List[Optional[WorkResult]]:
+        results: List[Optional[WorkResult]] = [None] * len(items)
+        if not items:
+            return results
+
+        self._log_queue = self._mp.Queue()
+        self._pid_queue = self._mp.SimpleQueue()
+        listener = logging.handlers.QueueListener(self._log_queue, _ForwardHandler(self.logger))
+        listener.start()
+        self._pool = self._new_pool()
+        self.logger.info("Running %d work items on %d worker processes", len(items), self.workers)
+        tasks = {asyncio.create_task(self._run_item(item)): index for index, item in enumerate(items)}
+        finished = False
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    results[tasks[task]] = result
+                    if result.error is not None and stop_on_error:
+                        for other in pending:
+                            other.cancel()
+                        await asyncio.gather(*pending, return_exceptions=True)
+                        pending = set()
+                        break
+            finished = True
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._pool is not None:
+                if not finished:
+                    # Cancelled (e.g. step timeout): stop items that are still running
+                    self._terminate_workers()
+                self._pool.shutdown(wait=finished, cancel_futures=True)
+                self._pool = None
+            listener.stop()
+            self._log_queue.close()
+            self._pid_queue.close()
+        return results
+
+
+class WorkQueue:
+    """
+    SQLite-backed work queue shared by a coordinator and worker processes.
+
+    Items are claimed with a lease; a worker renews the lease while it runs an item, and
+    items whose lease expires (the worker died) are handed to another worker. Payloads
+    and results are pickled, so only share queue files between trusted processes.
+
+    Methods block (on the file lock for up to 30 seconds); call them from a thread, not the
+    event loop. A queue may be used from several threads, one call at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_items ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " run_id TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL DEFAULT 1,"
+            " worker TEXT,"
+            " lease_until REAL,"
+            " result BLOB,"
+            " error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS work_items_status ON work_items (status, run_id, idx)")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, run_id: str, payloads: List[bytes], max_attempts: int) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany(
+            "INSERT INTO work_items (run_id, idx, payload, max_attempts) VALUES (?, ?, ?, ?)",
+            [(run_id, idx, payload, max_attempts) for idx, payload in enumerate(payloads)],
+        )
+        self._conn.execute("COMMIT")
+
+    def claim(self, worker: str, lease: float, run_id: Optional[str] = None) -> Optional[Tuple[int, bytes, int]]:
+        """
+        Claim the next pending item; returns (item id, payload, attempt) or None.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            query = "SELECT id, payload, attempts FROM work_items WHERE status = 'pending'"
+            params: Tuple[Any, ...] = ()
+            if run_id is not None:
+                query += " AND run_id = ?"
+                params = (run_id,)
+            row = self._conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE work_items SET status = 'running', attempts = attempts + 1, worker = ?, lease_until = ?"
+                " WHERE id = ?",
+                (worker, time.time() + lease, row[0]),
+            )
+            return row[0], row[1], row[2] + 1
+        finally:
+            self._conn.execute("COMMIT")
+
+    def renew(self, item_id: int, worker: str, lease: float) -> None:
+        self._conn.execute(
+            "UPDATE work_items SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + lease, item_id, worker),
+        )
+
+    def complete(self, item_id: int, worker: str, result: bytes) -> None:
+        self._conn.execute(
+            "UPDATE work_items SET status = 'done', result = ?, error = NULL, lease_until = NULL"
+            " WHERE id = ? AND worker = ? AND status = 'running'",
+            (result, item_id, worker),
+        )
+
+    def fail(self, item_id: int, worker: str, error: str) -> None:
+        """
+        Record a failed attempt; the item goes back to pending until it runs out of attempts.
+        """
+        self._conn.execute(
+            "UPDATE work_items SET status = CASE WHEN attempts < max_attempts THEN 'pending' ELSE 'failed' END,"
+            " error = ?, worker = NULL, lease_until = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+            (error, item_id, worker),
+        )
+
+    def requeue_expired(self, run_id: Optional[str] = None) -> int:
+        """
+        Return items whose lease expired to the queue (or fail them when out of attempts).
+        """
+        query = (
+            "UPDATE work_items SET status = CASE WHEN attempts < max_attempts THEN 'pending' ELSE 'failed' END,"
+            " error = 'worker lease expired', worker = NULL, lease_until = NULL"
+            " WHERE status = 'running' AND lease_until < ?"
+        )
+        params: Tuple[Any, ...] = (time.time(),)
+        if run_id is not None:
+            query += " AND run_id = ?"
+            params += (run_id,)
+        return self._conn.execute(query, params).rowcount
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*) FROM work_items WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    def results(self, run_id: str) -> List[Tuple[int, str, Optional[bytes], Optional[str], int]]:
+        return self._conn.execute(
+            "SELECT idx, status, result, error, attempts FROM work_items WHERE run_id = ? ORDER BY idx", (run_id,)
+        ).fetchall()
+
+    def cancel(self, run_id: str) -> None:
+        self._conn.execute(
+            "UPDATE work_items SET status = 'cancelled' WHERE run_id = ? AND status IN ('pending', 'running')",
+            (run_id,),
+        )
+
+    def delete_run(self, run_id: str) -> None:
+        self._conn.execute("DELETE FROM work_items WHERE run_id = ?", (run_id,))
+
+
+class SQLiteQueueBackend(WorkerBackend):
+    """
+    Runs items through a SQLite work queue served by `recipe-executor-worker` processes.
+
+    Options:
+        queue_path: Queue file; defaults to a temporary file (local workers only).
+        lease: Seconds a claimed item stays reserved without a lease renewal.
+        poll_interval: Seconds between coordinator status polls.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, logger: logging.Logger, workers: int = 0, retries: int = 1, **options: Any) -> None:
+        super().__init__(logger, workers, retries, **options)
+        self.queue_path: Optional[str] = options.get("queue_path")
+        self.lease = float(options.get("lease") or 300.0)
+        self.poll_interval = float(options.get("poll_interval") or 0.2)
+
+    def _spawn_worker(self, queue_path: str, run_id: str) -> subprocess.Popen:
+        command = [sys.executable, "-m", "recipe_executor.workers", "--queue", queue_path, "--run-id", run_id]
+        command += ["--lease", str(self.lease), "--log-level", logging.getLevelName(self.logger.getEffectiveLevel())]
+        return subprocess.Popen(command)
+
+    def _open(self, items: List[WorkItem]) -> Tuple[WorkQueue, str, Optional[str]]:
+        temp_dir = None
+        queue_path = self.queue_path
+        if not queue_path:
+            temp_dir = tempfile.mkdtemp(prefix="recipe-executor-queue-")
+            queue_path = os.path.join(temp_dir, "queue.db")
+        queue = WorkQueue(queue_path)
+        run_id = uuid.uuid4().hex
+        payloads = []
+        for item in items:
+            # Workers fill the secrets in from their own environment
+            config, secret_paths = _strip_secrets(item.config)
+            payloads.append(pickle.dumps((item.plan, item.artifacts, config, str(item.key), secret_paths)))
+        queue.enqueue(run_id, payloads, self.max_attempts)
+        return queue, run_id, temp_dir
+
+    def _poll(self, queue: WorkQueue, run_id: str, stop_on_error: bool, processes: List[subprocess.Popen]) -> bool:
+        """
+        Check the run's progress and replace dead local workers; returns True when the run is over.
+        """
+        queue.requeue_expired(run_id)
+        counts = queue.counts(run_id)
+        if stop_on_error and counts.get("failed"):
+            queue.cancel(run_id)
+            return True
+        if not counts.get("pending", 0) + counts.get("running", 0):
+            return True
+        # Replace local workers that died while work remains (their items are requeued on lease expiry)
+        for index, process in enumerate(processes):
+            if process.poll() is not None:
+                self.logger.warning(
+                    "Worker process %d exited with code %s; restarting", process.pid, process.returncode
+                )
+                processes[index] = self._spawn_worker(queue.path, run_id)
+        return False
+
+    def _collect(self, queue: WorkQueue, run_id: str, items: List[WorkItem]) -> List[Optional[WorkResult]]:
+        results: List[Optional[WorkResult]] = [None] * len(items)
+        for idx, status, result, error, attempts in queue.results(run_id):
+            key = items[idx].key
+            if status == "done" and result is not None:
+                results[idx] = WorkResult(key, artifacts=pickle.loads(result), attempts=attempts)
+            elif status == "failed":
+                results[idx] = WorkResult(key, error=error or "failed", attempts=attempts)
+        return results
+
+    def _close(self, queue: WorkQueue, run_id: str, processes: List[subprocess.Popen], temp_dir: Optional[str]) -> None:
+        queue.cancel(run_id)
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        queue.delete_run(run_id)
+        queue.close()
+        if temp_dir is not None:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+    async def run(self, items: List[WorkItem], stop_on_error: bool = False) -> List[Optional[WorkResult]]:
+        if not items:
+            return []
+
+        # Queue calls wait on the file lock and worker shutdown waits on processes, so both run
+        # in threads; the lock keeps a cancelled poll from overlapping the cleanup.
+        lock = threading.Lock()
+
+        def locked(func: Any, *args: Any) -> Any:
+            with lock:
+                return func(*args)
+
+        queue, run_id, temp_dir = await asyncio.to_thread(self._open, items)
+        self.logger.info("Queued %d work items in %s (run %s)", len(items), queue.path, run_id)
+        processes: List[subprocess.Popen] = []
+        try:
+            processes.extend(
+                await asyncio.to_thread(
+                    lambda: [self._spawn_worker(queue.path, run_id) for _ in range(min(self.workers, len(items)))]
+                )
+            )
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                if await asyncio.to_thread(locked, self._poll, queue, run_id, stop_on_error, processes):
+                    break
+            return await asyncio.to_thread(locked, self._collect, queue, run_id, items)
+        finally:
+            await asyncio.to_thread(locked, self._close, queue, run_id, processes, temp_dir)
+
+
+WORKER_BACKENDS: Dict[str, Type[WorkerBackend]] = {
+    ProcessPoolBackend.name: ProcessPoolBackend,
+    SQLiteQueueBackend.name: SQLiteQueueBackend,
+}
+
+
+def get_worker_backend(name: str, logger: logging.Logger, **kwargs: Any) -> WorkerBackend:
+    """
+    Create a worker backend by name ("process" or "sqlite").
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend_cls = WORKER_BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown worker backend '{name}'. Available: {', '.join(sorted(WORKER_BACKENDS))}")
+    return backend_cls(logger, **kwargs)
+
+
+def serve_queue(
+    queue_path: str,
+    run_id: Optional[str] = None,
+    lease: float = 300.0,
+    idle_timeout: Optional[float] = None,
+    poll_interval: float = 0.2,
+) -> int:
+    """
+    Claim and run items from a SQLite work queue until it is drained (for `run_id`) or idle
+    for `idle_timeout` seconds. Returns the number of items processed.
+    """
+    logger = logging.getLogger(WORKER_LOGGER_NAME)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_path)
+    processed = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            claimed = queue.claim(worker, lease, run_id)
+            if claimed is None:
+                if run_id is not None:
+                    counts = queue.counts(run_id)
+                    if not counts.get("pending") and not counts.get("running"):
+                        break
+                    queue.requeue_expired(run_id)
+                elif idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            item_id, payload, attempt = claimed
+            plan, artifacts, config, label, *rest = pickle.loads(payload)
+            logger.info("Worker %s running item %s (attempt %d)", worker, label, attempt)
+
+            # Keep the lease alive while the item runs
+            done = threading.Event()
+
+            def renew_lease() -> None:
+                renewer = WorkQueue(queue_path)
+                try:
+                    while not done.wait(lease / 3):
+                        renewer.renew(item_id, worker, lease)
+                finally:
+                    renewer.close()
+
+            renewer_thread = threading.Thread(target=renew_lease, daemon=True)
+            renewer_thread.start()
+            try:
+                config = _restore_secrets(config, rest[0] if rest else [], logger)
+                result = run_work_item(plan, artifacts, config, label)
+                queue.complete(item_id, worker, pickle.dumps(result))
+            except Exception as exc:
+                logger.error("Worker %s item %s failed: %s", worker, label, exc)
+                queue.fail(item_id, worker, str(exc) or type(exc).__name__)
+            finally:
+                done.set()
+                renewer_thread.join()
+            processed += 1
+            idle_since = time.monotonic()
+    finally:
+        queue.close()
+    return processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recipe Executor queue worker")
+    parser.add_argument("--queue", type=str, required=True, help="Path to the SQLite work queue file")
+    parser.add_argument("--run-id", type=str, default=None, help="Only serve this run, and exit when it is drained")
+    parser.add_argument(
+        "--lease", type=float, default=300.0, help="Seconds a claimed item is reserved between renewals"
+    )
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Exit after this many idle seconds")
+    parser.add_argument("--log-level", type=str, default="INFO", help="Log level")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s [%(levelname)s] (worker %(process)d) %(message)s",
+    )
+    try:
+        serve_queue(args.queue, run_id=args.run_id, lease=args.lease, idle_timeout=args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
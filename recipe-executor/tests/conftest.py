@@ -0,0 +1,157 @@
+"""Shared local stand-ins for the HTTP services the tests talk to."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+import pytest
+
+
+class RecordedRequest(NamedTuple):
+    """A request received by a `FakeServer`."""
+
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+class FakeServer:
+    """
+    Local HTTP server that records every request and answers it through `handle`.
+
+    `handle` returns (status, payload); dict and list payloads are sent as JSON, bytes as is.
+    Subclasses override it to stand in for a specific service.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[RecordedRequest] = []
+        self.received = threading.Event()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                stub.dispatch(self, "GET")
+
+            def do_POST(self) -> None:
+                stub.dispatch(self, "POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        body = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+        request = RecordedRequest(method, handler.path, dict(handler.headers), body)
+        with self.lock:
+            self.requests.append(request)
+        self.received.set()
+        status, payload = self.handle(request)
+        if isinstance(payload, bytes):
+            data, content_type = payload, "application/octet-stream"
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json"
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        except OSError:
+            # The client gave up on the request (timeout, hedging or cancellation)
+            pass
+
+    def handle(self, request: RecordedRequest) -> Tuple[int, Any]:
+        return 404, {"error": {"message": "not found"}}
+
+    def count(self, path: str) -> int:
+        """Number of requests received for `path`, ignoring any query string."""
+        with self.lock:
+            return sum(1 for request in self.requests if request.path.split("?")[0] == path)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def chat_completion(content: str, model: str = "stub-model") -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+    }
+
+
+class FakeChatServer(FakeServer):
+    """
+    OpenAI-compatible chat completions endpoint.
+
+    Each `script` entry is (status, delay_seconds) for one request; once the script is
+    exhausted every request is answered with `status` after `delay` seconds. Successful
+    requests get `reply`, or `reply(body)` when it is a function of the request body.
+    """
+
+    def __init__(
+        self,
+        script: Iterable[Tuple[int, float]] = (),
+        status: int = 200,
+        delay: float = 0.0,
+        reply: Union[str, Callable[[Dict[str, Any]], str]] = "ok",
+    ) -> None:
+        super().__init__()
+        self.script = list(script)
+        self.status = status
+        self.delay = delay
+        self.reply = reply
+
+    def handle(self, request: RecordedRequest) -> Tuple[int, Any]:
+        if not request.path.endswith("/chat/completions"):
+            return super().handle(request)
+        with self.lock:
+            status, delay = self.script.pop(0) if self.script else (self.status, self.delay)
+        time.sleep(delay)
+        if status != 200:
+            return status, {"error": {"message": f"injected {status}", "type": "server_error"}}
+        body = request.json()
+        content = self.reply(body) if callable(self.reply) else self.reply
+        return 200, chat_completion(content, body.get("model", "stub-model"))
+
+
+@pytest.fixture
+def chat_server() -> Iterator[Callable[..., FakeChatServer]]:
+    """Factory for started `FakeChatServer`s, closed at the end of the test."""
+    servers: List[FakeChatServer] = []
+
+    def start(*args: Any, **kwargs: Any) -> FakeChatServer:
+        server = FakeChatServer(*args, **kwargs)
+        server.thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,107 @@
+"""Tests for the shared Azure AD token cache against a local stand-in for the managed identity endpoint."""
+
+import asyncio
+import logging
+import os
+import stat
+import time
+from typing import Any, Iterator, Tuple
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.llm_utils.azure_openai import get_azure_openai_model
+from recipe_executor.llm_utils.azure_tokens import CachedTokenProvider, get_token_provider
+
+from .conftest import FakeServer, RecordedRequest
+
+LOGGER = logging.getLogger("tests.azure_tokens")
+
+
+class TokenEndpoint(FakeServer):
+    """
+    Minimal App Service managed identity endpoint issuing numbered tokens valid for `lifetime` seconds.
+    """
+
+    def __init__(self, lifetime: int = 3600) -> None:
+        super().__init__()
+        self.lifetime = lifetime
+
+    def handle(self, request: RecordedRequest) -> Tuple[int, Any]:
+        return 200, {
+            "access_token": f"token-{self.count('/msi/token')}",
+            "expires_on": str(int(time.time()) + self.lifetime),
+            "resource": "https://cognitiveservices.azure.com",
+            "token_type": "Bearer",
+        }
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/msi/token"
+
+
+@pytest.fixture
+def endpoint(monkeypatch: pytest.MonkeyPatch) -> Iterator[TokenEndpoint]:
+    with TokenEndpoint() as stub:
+        monkeypatch.setenv("IDENTITY_ENDPOINT", stub.url)
+        monkeypatch.setenv("IDENTITY_HEADER", "test-header")
+        yield stub
+
+
+@pytest.mark.asyncio
+async def test_provider_is_shared_and_acquires_once(endpoint: TokenEndpoint):
+    provider = get_token_provider("client-shared", managed_identity_only=True)
+    assert get_token_provider("client-shared", managed_identity_only=True) is provider
+
+    tokens = await asyncio.gather(*(provider() for _ in range(10)))
+    assert tokens == ["token-1"] * 10
+    assert len(endpoint.requests) == 1
+    assert "client_id=client-shared" in endpoint.requests[0].path
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_before_expiry(endpoint: TokenEndpoint):
+    endpoint.lifetime = 120
+    provider = get_token_provider("client-refresh", managed_identity_only=True)
+    assert await provider() == "token-1"
+
+    # Within the refresh margin of its expiry, the token is replaced while still valid
+    endpoint.lifetime = 3600
+    assert await provider() == "token-2"
+    assert await provider() == "token-2"
+    assert provider.acquisitions == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_file_shares_tokens_between_processes(endpoint: TokenEndpoint, tmp_path: Any):
+    cache_path = str(tmp_path / "azure_tokens.json")
+    provider = get_token_provider("client-file", managed_identity_only=True, cache_path=cache_path)
+    assert await provider() == "token-1"
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+    def no_credential() -> Any:
+        raise AssertionError("the cached token must be used")
+
+    # A provider in another process starts with an empty in-memory cache
+    other_process = CachedTokenProvider(no_credential, cache_path=cache_path, cache_key=provider.cache_key)
+    assert await other_process() == "token-1"
+    assert len(endpoint.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_azure_models_share_one_token_provider(endpoint: TokenEndpoint):
+    context = Context(
+        config={
+            "azure_openai_base_url": "https://example.openai.azure.com",
+            "azure_use_managed_identity": True,
+            "azure_client_id": "client-model",
+        }
+    )
+    first = get_azure_openai_model(LOGGER, "gpt-4o", None, context)
+    second = get_azure_openai_model(LOGGER, "gpt-4o", None, context)
+    first_provider = first.client._azure_ad_token_provider  # type: ignore[attr-defined]
+    assert first_provider is second.client._azure_ad_token_provider  # type: ignore[attr-defined]
+
+    assert await first.client._get_azure_ad_token() == "token-1"  # type: ignore[attr-defined]
+    assert await second.client._get_azure_ad_token() == "token-1"  # type: ignore[attr-defined]
+    assert len(endpoint.requests) == 1
@@ -0,0 +1,314 @@
+"""Tests for executor deadlines, per-step timeouts and cancellation cleanup, using stub slow steps."""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from recipe_executor.cancellation import CancelScope, remaining_time
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.registry import STEP_REGISTRY
+
+LOGGER = logging.getLogger("tests.cancellation")
+
+
+class Tracker:
+    """Records what the stub steps started, finished and cleaned up."""
+
+    def __init__(self) -> None:
+        self.started: List[str] = []
+        self.cleaned_up: List[str] = []
+        self.completed: List[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.pids: List[int] = []
+
+
+TRACKER = Tracker()
+
+
+class SleepConfig(StepConfig):
+    name: str = "sleep"
+    seconds: float = 10.0
+    fail: bool = False
+
+
+class SleepStep(BaseStep[SleepConfig]):
+    """Sleeps, or fails immediately, recording cleanup when cancelled."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, SleepConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        name = str(context.get("item", self.config.name))
+        TRACKER.started.append(name)
+        TRACKER.active += 1
+        TRACKER.max_active = max(TRACKER.max_active, TRACKER.active)
+        try:
+            if self.config.fail or name.startswith("fail"):
+                raise RuntimeError(f"{name} failed")
+            await asyncio.sleep(self.config.seconds)
+            TRACKER.completed.append(name)
+        finally:
+            TRACKER.active -= 1
+            TRACKER.cleaned_up.append(name)
+
+
+class SubprocessStep(BaseStep[SleepConfig]):
+    """Runs a long-lived child process and terminates it when cancelled."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, SleepConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", f"import time; time.sleep({self.config.seconds})"
+        )
+        TRACKER.pids.append(process.pid)
+        try:
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            TRACKER.cleaned_up.append("subprocess")
+
+
+class HttpConfig(StepConfig):
+    url: str
+
+
+class HttpStep(BaseStep[HttpConfig]):
+    """Requests a URL that never answers."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, HttpConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        async with httpx.AsyncClient(timeout=None) as client:
+            await client.get(self.config.url)
+
+
+@pytest.fixture(autouse=True)
+def stub_steps():
+    global TRACKER
+    TRACKER = Tracker()
+    STEP_REGISTRY["sleep"] = SleepStep
+    STEP_REGISTRY["subprocess"] = SubprocessStep
+    STEP_REGISTRY["http"] = HttpStep
+    yield
+    for name in ("sleep", "subprocess", "http"):
+        del STEP_REGISTRY[name]
+
+
+def sleep_step(seconds: float = 10.0, timeout: Any = None, **config: Any) -> Dict[str, Any]:
+    step: Dict[str, Any] = {"type": "sleep", "config": {"seconds": seconds, **config}}
+    if timeout is not None:
+        step["timeout"] = timeout
+    return step
+
+
+async def run(recipe: Dict[str, Any], timeout: Any = None, artifacts: Any = None) -> float:
+    start = time.monotonic()
+    await Executor(LOGGER).execute(recipe, Context(artifacts=artifacts), timeout=timeout)
+    return time.monotonic() - start
+
+
+def assert_no_stray_tasks() -> None:
+    current = asyncio.current_task()
+    stray = [task for task in asyncio.all_tasks() if task is not current and not task.done()]
+    assert not stray, f"tasks left running after cancellation: {stray}"
+
+
+@pytest.mark.asyncio
+async def test_step_timeout_cancels_step():
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match=r"Step 1 \('sleep'\) timed out after 0.1 seconds"):
+        await run({"steps": [sleep_step(0), sleep_step(10, timeout=0.1, name="slow")]})
+    assert time.monotonic() - start < 2
+    assert TRACKER.cleaned_up == ["sleep", "slow"]
+    assert TRACKER.completed == ["sleep"]
+
+
+@pytest.mark.asyncio
+async def test_step_within_timeout_succeeds():
+    await run({"steps": [sleep_step(0.01, timeout=5)]})
+    assert TRACKER.completed == ["sleep"]
+
+
+@pytest.mark.asyncio
+async def test_recipe_timeout_propagates_through_execute_recipe(tmp_path):
+    inner = tmp_path / "inner.json"
+    inner.write_text('{"steps": [{"type": "sleep", "config": {"seconds": 10, "name": "inner"}}]}')
+    recipe = {"steps": [{"type": "execute_recipe", "config": {"recipe_path": str(inner)}}]}
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="Recipe execution timed out after 0.2 seconds"):
+        await run(recipe, timeout=0.2)
+    assert time.monotonic() - start < 2
+    assert TRACKER.cleaned_up == ["inner"]
+
+
+@pytest.mark.asyncio
+async def test_recipe_model_timeout_and_tighter_step_timeout():
+    # The step's own timeout is longer than the recipe's, so the recipe deadline applies
+    with pytest.raises(TimeoutError, match="Recipe execution timed out after 0.2 seconds"):
+        await run({"timeout": 0.2, "steps": [sleep_step(10, timeout=30)]})
+
+
+@pytest.mark.asyncio
+async def test_deadline_visible_to_nested_steps():
+    seen: List[Any] = []
+
+    class ProbeStep(BaseStep[StepConfig]):
+        def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+            super().__init__(logger, StepConfig())
+
+        async def execute(self, context: ContextProtocol) -> None:
+            seen.append(remaining_time())
+
+    STEP_REGISTRY["probe"] = ProbeStep
+    try:
+        recipe = {
+            "steps": [
+                {
+                    "type": "conditional",
+                    "config": {"condition": "true", "if_true": {"steps": [{"type": "probe", "config": {}}]}},
+                    "timeout": 5,
+                }
+            ]
+        }
+        await run(recipe, timeout=30)
+    finally:
+        del STEP_REGISTRY["probe"]
+    assert seen and seen[0] is not None and 0 < seen[0] <= 5
+
+
+@pytest.mark.asyncio
+async def test_loop_deadline_cancels_items_and_releases_semaphore():
+    loop_step = {
+        "type": "loop",
+        "config": {
+            "items": "names",
+            "item_key": "item",
+            "max_concurrency": 2,
+            "substeps": [sleep_step(10)],
+            "result_key": "results",
+        },
+        "timeout": 0.2,
+    }
+    with pytest.raises(TimeoutError, match=r"Step 0 \('loop'\) timed out"):
+        await run({"steps": [loop_step]}, artifacts={"names": ["a", "b", "c", "d"]})
+    # Only two items ever held the semaphore; both were cancelled and cleaned up before execute returned
+    assert TRACKER.max_active == 2
+    assert TRACKER.active == 0
+    assert sorted(TRACKER.cleaned_up) == ["a", "b"]
+    assert TRACKER.completed == []
+    assert_no_stray_tasks()
+
+
+@pytest.mark.asyncio
+async def test_loop_fail_fast_awaits_cancelled_items():
+    loop_step = {
+        "type": "loop",
+        "config": {
+            "items": "names",
+            "item_key": "item",
+            "max_concurrency": 0,
+            "substeps": [sleep_step(10)],
+            "result_key": "results",
+            "fail_fast": True,
+        },
+    }
+    context = Context(artifacts={"names": ["slow-1", "fail-2", "slow-3"]})
+    await Executor(LOGGER).execute({"steps": [loop_step]}, context)
+
+    assert context["results__errors"] == [{"key": 1, "error": "Error executing step 0 ('sleep'): fail-2 failed"}]
+    assert sorted(TRACKER.cleaned_up) == ["fail-2", "slow-1", "slow-3"]
+    assert TRACKER.active == 0
+    assert_no_stray_tasks()
+
+
+@pytest.mark.asyncio
+async def test_parallel_enclosing_deadline_cancels_substeps():
+    parallel_step = {
+        "type": "parallel",
+        "config": {"substeps": [sleep_step(10, name="p1"), sleep_step(10, name="p2")], "max_concurrency": 0},
+    }
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="Recipe execution timed out"):
+        await run({"steps": [parallel_step]}, timeout=0.2)
+    assert time.monotonic() - start < 2
+    assert sorted(TRACKER.cleaned_up) == ["p1", "p2"]
+    assert_no_stray_tasks()
+
+
+@pytest.mark.asyncio
+async def test_parallel_substep_timeout():
+    parallel_step = {
+        "type": "parallel",
+        "config": {"substeps": [sleep_step(0.01, name="fast"), sleep_step(10, timeout=0.1, name="slow")]},
+    }
+    with pytest.raises(ValueError, match="aborted due to failure in substep 1") as excinfo:
+        await run({"steps": [parallel_step]})
+    assert "Substep 1 timed out after 0.1 seconds" in str(excinfo.value.__cause__.__cause__)
+    assert sorted(TRACKER.cleaned_up) == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_terminates_subprocess():
+    with pytest.raises(TimeoutError):
+        await run({"steps": [{"type": "subprocess", "config": {"seconds": 30}, "timeout": 0.5}]})
+    assert TRACKER.cleaned_up == ["subprocess"]
+    with pytest.raises(ProcessLookupError):
+        os.kill(TRACKER.pids[0], 0)
+
+
+@pytest.mark.asyncio
+async def test_timeout_closes_http_connection():
+    closed = asyncio.Event()
+
+    async def never_respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Read until the client goes away, without ever answering
+        while await reader.read(1024):
+            pass
+        closed.set()
+        writer.close()
+
+    server = await asyncio.start_server(never_respond, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        with pytest.raises(TimeoutError):
+            await run({"steps": [{"type": "http", "config": {"url": f"http://127.0.0.1:{port}/"}, "timeout": 0.3}]})
+        await asyncio.wait_for(closed.wait(), timeout=2)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_read_files_glob_is_cancellable(tmp_path):
+    for index in range(600):
+        (tmp_path / f"file_{index}.txt").write_text("x")
+    step = {"type": "read_files", "config": {"path": str(tmp_path / "*.txt"), "content_key": "files"}, "timeout": 0}
+    with pytest.raises(TimeoutError, match="timed out after 0"):
+        await run({"steps": [step]})
+
+
+@pytest.mark.asyncio
+async def test_cancel_scope_inherits_tighter_deadline():
+    async with CancelScope(0.5):
+        outer = remaining_time()
+        async with CancelScope(30) as inner:
+            assert inner.deadline is not None
+            inner_remaining = remaining_time()
+        assert outer is not None and inner_remaining is not None and inner_remaining <= outer
+    assert remaining_time() is None
@@ -0,0 +1,101 @@
+"""Tests for recording LLM and MCP interactions to a cassette and replaying them offline."""
+
+import logging
+from typing import Any, List
+
+import pytest
+from pydantic import BaseModel
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import Usage
+
+from recipe_executor.cassette import Cassette, CassetteMissError, use_cassette
+from recipe_executor.context import Context
+from recipe_executor.hooks import ExecutionEvent, subscribed
+from recipe_executor.llm_utils import llm as llm_module
+from recipe_executor.llm_utils.llm import LLM
+from recipe_executor.steps.mcp import MCPStep
+
+LOGGER = logging.getLogger("tests.cassette")
+
+
+class Summary(BaseModel):
+    title: str
+    words: int
+
+
+def provider_model(calls: List[str]) -> FunctionModel:
+    async def respond(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompt = str(messages[-1].parts[-1].content)  # type: ignore[union-attr]
+        calls.append(prompt)
+        usage = Usage(requests=1, request_tokens=10, response_tokens=5, total_tokens=15)
+        if info.output_tools:
+            args = {"title": prompt.upper(), "words": len(prompt.split())}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)], usage=usage)
+        return ModelResponse(parts=[TextPart(f"answer to {prompt}")], usage=usage)
+
+    return FunctionModel(respond)
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_replay_recorded_outputs_and_usage(tmp_path: Any, monkeypatch: pytest.MonkeyPatch):
+    path = str(tmp_path / "run.cassette.jsonl")
+    calls: List[str] = []
+    monkeypatch.setattr(llm_module, "get_model", lambda *args: provider_model(calls))
+
+    llm = LLM(LOGGER, Context(), model="openai/gpt-4o")
+    with Cassette(path, "record") as cassette, use_cassette(cassette):
+        text = await llm.generate("hello world")
+        summary = await llm.generate("a short doc", output_type=Summary)
+    assert cassette.recorded == 2
+    assert calls == ["hello world", "a short doc"]
+
+    def offline(*args: Any) -> Any:
+        raise AssertionError("replay must not resolve a provider model")
+
+    monkeypatch.setattr(llm_module, "get_model", offline)
+    events: List[ExecutionEvent] = []
+    with Cassette(path, "replay") as cassette, use_cassette(cassette), subscribed(events.append):
+        assert await llm.generate("hello world") == text == "answer to hello world"
+        replayed = await llm.generate("a short doc", output_type=Summary)
+        assert isinstance(replayed, Summary)
+        assert replayed == summary == Summary(title="A SHORT DOC", words=3)
+
+        with pytest.raises(CassetteMissError, match="No recorded llm interaction"):
+            await llm.generate("never recorded")
+
+    ends = [event.data for event in events if event.type == "llm_end"]
+    assert [end["usage"]["total_tokens"] for end in ends] == [15, 15]
+    assert cassette.replayed == 2
+    assert calls == ["hello world", "a short doc"]
+
+
+@pytest.mark.asyncio
+async def test_mcp_tool_call_replays_through_stub_transport(tmp_path: Any):
+    path = str(tmp_path / "tools.cassette.jsonl")
+    step_config = {
+        "server": {"command": "missing-mcp-server", "args": ["--stdio"]},
+        "tool_name": "lookup",
+        "arguments": {"query": "{{ topic }}"},
+        "result_key": "found",
+    }
+    with Cassette(path, "record") as cassette:
+        cassette.record(
+            "mcp",
+            {
+                "server": ["stdio", "missing-mcp-server", ["--stdio"], None],
+                "tool": "lookup",
+                "arguments": {"query": "x"},
+            },
+            {"content": [{"type": "text", "text": "recorded result"}], "isError": False},
+            0.01,
+        )
+
+    context = Context(artifacts={"topic": "x"})
+    with Cassette(path, "replay") as cassette, use_cassette(cassette):
+        await MCPStep(LOGGER, step_config).execute(context)
+        assert context["found"]["content"][0]["text"] == "recorded result"
+        assert context["found"]["isError"] is False
+
+        with pytest.raises(CassetteMissError, match="No recorded mcp interaction"):
+            await MCPStep(LOGGER, step_config).execute(Context(artifacts={"topic": "y"}))
@@ -0,0 +1,68 @@
+"""Tests for spilling large context artifacts to disk."""
+
+import gc
+from typing import Any, Dict
+
+from recipe_executor.context import Context
+from recipe_executor.utils.artifacts import SpilledArtifact, estimate_size, get_artifact_store
+
+
+def spill_config(tmp_path: Any, **settings: int) -> Dict[str, Any]:
+    return {"artifact_store_dir": str(tmp_path), **{f"artifact_{k}": v for k, v in settings.items()}}
+
+
+def test_in_place_changes_to_spilled_values_are_kept(tmp_path: Any):
+    context = Context(config=spill_config(tmp_path, spill_threshold=1000))
+    context["rows"] = [{"id": i, "text": "x" * 50} for i in range(100)]
+    context["doc"] = "y" * 5000
+    assert isinstance(context._artifacts["rows"], SpilledArtifact)
+
+    context["rows"].append({"id": 100})
+    context.get("rows")[0]["text"] = "changed"
+
+    rows = context["rows"]
+    assert len(rows) == 101 and rows[0]["text"] == "changed"
+    assert context.dict()["rows"] == rows
+    # Strings are immutable, so they stay on disk and are loaded on each read
+    assert context["doc"] == "y" * 5000
+    assert isinstance(context._artifacts["doc"], SpilledArtifact)
+
+
+def test_memory_cap_is_shared_with_clones(tmp_path: Any):
+    config = spill_config(tmp_path, memory_cap=30_000)
+    store = get_artifact_store(config)
+    assert store is not None
+    context = Context(artifacts={"a": "a" * 20_000, "small": "s"}, config=config)
+    size = estimate_size("a" * 20_000)
+    assert store.in_memory == size + estimate_size("s")
+
+    clones = [context.clone() for _ in range(3)]
+
+    # Each clone's copy would exceed the cap, so the clones spill theirs
+    assert store.in_memory <= 30_000
+    assert all(isinstance(clone._artifacts["a"], SpilledArtifact) for clone in clones)
+    assert all(clone["a"] == "a" * 20_000 for clone in clones)
+    assert context._artifacts["a"] == "a" * 20_000
+
+    # Discarded contexts return their share
+    del clones
+    gc.collect()
+    assert store.in_memory == size + estimate_size("s")
+    del context["a"]
+    assert store.in_memory == estimate_size("s")
+
+
+def test_writes_spill_the_largest_artifacts_over_the_cap(tmp_path: Any):
+    config = spill_config(tmp_path, memory_cap=25_000)
+    context = Context(config=config)
+    context["first"] = "1" * 10_000
+    context["second"] = "2" * 12_000
+    context["third"] = "3" * 8_000
+
+    assert isinstance(context._artifacts["second"], SpilledArtifact)
+    assert not isinstance(context._artifacts["first"], SpilledArtifact)
+    assert {key: context[key][0] for key in context} == {"first": "1", "second": "2", "third": "3"}
+
+    # A new context with the same settings shares the budget
+    other = Context(artifacts={"big": "b" * 20_000}, config=config)
+    assert isinstance(other._artifacts["big"], SpilledArtifact)
@@ -0,0 +1,171 @@
+"""Tests for the daemon's HTTP job API and its access checks."""
+
+import asyncio
+import http.client
+import json
+import logging
+import os
+import socket
+import stat
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import pytest
+import pytest_asyncio
+
+from recipe_executor.daemon import MAX_BODY_BYTES, RecipeDaemon, load_token
+from recipe_executor.daemon_client import DaemonClient
+
+LOGGER = logging.getLogger("tests.daemon")
+TOKEN = "test-token"
+
+
+def write_recipe(directory: Any, steps: int = 1) -> str:
+    recipe = {"steps": [{"type": "set_context", "config": {"key": "greeting", "value": "hello {{ name }}"}}] * steps}
+    path = os.path.join(str(directory), "recipe.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recipe, f)
+    return path
+
+
+def raw_request(
+    port: int, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, Dict[str, Any]]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        conn.close()
+
+
+@pytest_asyncio.fixture
+async def tcp_daemon() -> AsyncIterator[Tuple[RecipeDaemon, int]]:
+    daemon = RecipeDaemon(LOGGER, token=TOKEN)
+    server = await daemon.start(port=0)
+    yield daemon, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_job_with_relative_recipe_path(tmp_path: Any):
+    write_recipe(tmp_path)
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = RecipeDaemon(LOGGER)
+    server = await daemon.start(socket_path=socket_path)
+    try:
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        client = DaemonClient(socket_path=socket_path)
+        # Relative to the client's working directory, not the daemon's
+        job = await asyncio.to_thread(
+            client.submit,
+            {"recipe": "recipe.json", "cwd": str(tmp_path), "context": {"name": "ada"}, "outputs": ["greeting"]},
+        )
+        events: List[Dict[str, Any]] = await asyncio.to_thread(lambda: list(client.events(job["id"])))
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert events[-1]["type"] == "status" and events[-1]["status"] == "succeeded"
+    assert events[-1]["outputs"] == {"greeting": "hello ada"}
+    assert any(event["type"] == "step_end" for event in events)
+    assert any("daemon's directory" in event.get("message", "") for event in events)
+
+
+@pytest.mark.asyncio
+async def test_tcp_requires_token_local_host_and_json(tcp_daemon: Tuple[RecipeDaemon, int], tmp_path: Any):
+    _, port = tcp_daemon
+    recipe = write_recipe(tmp_path)
+    body = json.dumps({"recipe": recipe}).encode()
+    auth = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
+
+    def call(headers: Dict[str, str], method: str = "POST") -> int:
+        return raw_request(port, method, "/jobs", body if method == "POST" else None, headers)[0]
+
+    statuses = await asyncio.to_thread(
+        lambda: [
+            call({"Content-Type": "application/json"}),
+            call({"Authorization": "Bearer wrong", "Content-Type": "application/json"}),
+            call({**auth, "Host": "attacker.example:80"}),
+            call({**auth, "Origin": "https://attacker.example"}),
+            call({**auth, "Origin": "null"}),
+            # A page's no-cors POST can only send text/plain or form bodies
+            call({**auth, "Content-Type": "text/plain"}),
+            call({"Authorization": f"Bearer {TOKEN}"}, method="GET"),
+            call(auth),
+        ]
+    )
+    assert statuses == [401, 401, 403, 403, 403, 415, 200, 202]
+
+    client = DaemonClient(f"http://127.0.0.1:{port}", token=TOKEN)
+    health = await asyncio.to_thread(client.request, "GET", "/health")
+    assert health["status"] == "ok" and sum(health["jobs"].values()) == 1
+
+
+def send_headers_only(port: int, headers: Dict[str, str]) -> int:
+    """
+    Send a POST whose headers announce a body that never comes; return the response status.
+    """
+    lines = ["POST /jobs HTTP/1.1", f"Host: 127.0.0.1:{port}", "Content-Type: application/json"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode())
+        # Times out (failing the test) if the daemon waits for the body before answering
+        return int(sock.makefile("rb").readline().split()[1])
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_rejected_before_they_are_read(tcp_daemon: Tuple[RecipeDaemon, int]):
+    daemon, port = tcp_daemon
+    huge = str(10**12)
+    statuses = await asyncio.to_thread(
+        lambda: [
+            send_headers_only(port, {"Content-Length": huge}),
+            send_headers_only(port, {"Content-Length": huge, "Authorization": f"Bearer {TOKEN}"}),
+            send_headers_only(port, {"Content-Length": str(MAX_BODY_BYTES + 1), "Authorization": f"Bearer {TOKEN}"}),
+            send_headers_only(port, {"Content-Length": "lots", "Authorization": f"Bearer {TOKEN}"}),
+        ]
+    )
+    assert statuses == [401, 413, 413, 400]
+    assert daemon.jobs == {}
+
+
+@pytest.mark.asyncio
+async def test_inline_recipes_and_config_overrides_are_opt_in(tcp_daemon: Tuple[RecipeDaemon, int], tmp_path: Any):
+    daemon, port = tcp_daemon
+    client = DaemonClient(f"http://127.0.0.1:{port}", token=TOKEN)
+    inline = {"steps": [{"type": "set_context", "config": {"key": "x", "value": "1"}}]}
+    mcp_config = {"mcp_servers": [{"command": "touch", "args": [str(tmp_path / "pwned")]}]}
+
+    with pytest.raises(RuntimeError, match="Inline recipes are disabled"):
+        await asyncio.to_thread(client.submit, {"recipe": inline})
+    with pytest.raises(RuntimeError, match="Config overrides are disabled"):
+        await asyncio.to_thread(client.submit, {"recipe": write_recipe(tmp_path), "config": mcp_config})
+    assert daemon.jobs == {}
+
+    daemon.allow_inline_recipes = True
+    job = await asyncio.to_thread(client.submit, {"recipe": inline, "outputs": ["x"]})
+    await daemon.jobs[job["id"]].task  # type: ignore[misc]
+    assert daemon.jobs[job["id"]].summary()["outputs"] == {"x": "1"}
+
+
+@pytest.mark.asyncio
+async def test_job_events_are_bounded(tmp_path: Any):
+    daemon = RecipeDaemon(LOGGER, max_events=5)
+    job = daemon.submit({"recipe": write_recipe(tmp_path, steps=20), "context": {"name": "bob"}})
+    assert job.task is not None
+    await job.task
+
+    assert len(job.events) == 5
+    assert job.event_count > 40
+    assert job.events[-1]["type"] == "status" and job.events[-1]["status"] == "succeeded"
+
+
+def test_token_file_is_private(tmp_path: Any, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("RECIPE_EXECUTOR_DAEMON_TOKEN", raising=False)
+    token_file = str(tmp_path / "state" / "daemon.token")
+    assert load_token(token_file) is None
+    token = load_token(token_file, create=True)
+    assert token and load_token(token_file) == token
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
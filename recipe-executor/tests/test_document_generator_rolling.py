@@ -0,0 +1,137 @@
+"""Tests for the document generator's rolling-summary mode, run with a stub model."""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.llm_generate import LLMGenerateStep
+from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.tokens import estimate_tokens
+
+LOGGER = logging.getLogger("tests.document_generator_rolling")
+RECIPE_ROOT = Path(__file__).resolve().parents[2] / "recipes" / "document_generator"
+TITLES = ["Alpha", "Beta", "Gamma", "Delta"]
+
+# (kind, prompt) of every model call, in order: "section" for section writes, "summary" for summary updates
+CALLS: List[Tuple[str, str]] = []
+
+
+class StubModelStep(LLMGenerateStep):
+    """
+    Stands in for llm_generate: records the rendered prompt and answers without a model.
+
+    Sections are written as "## <title>" followed by a body naming the title; summary
+    updates append "summary of <heading>" for the section being folded in.
+    """
+
+    async def execute(self, context: ContextProtocol) -> None:
+        prompt = render_template(self.config.prompt, context)
+        output_key = render_template(self.config.output_key, context)
+        if self.config.output_format == "text":
+            CALLS.append(("summary", prompt))
+            heading = re.search(r"<SECTION>\n(.*)\n", prompt).group(1)  # type: ignore[union-attr]
+            previous = context.get("rolling_summary") or ""
+            context[output_key] = f"{previous} | summary of {heading}".lstrip(" |")
+        else:
+            CALLS.append(("section", prompt))
+            title = context["section"]["title"]
+            context[output_key] = {"content": f"## {title}\n\nThe {title} body."}
+
+
+@pytest.fixture(autouse=True)
+def stub_model():
+    original = STEP_REGISTRY["llm_generate"]
+    STEP_REGISTRY["llm_generate"] = StubModelStep
+    yield
+    STEP_REGISTRY["llm_generate"] = original
+    CALLS.clear()
+
+
+async def generate(tmp_path: Path, **inputs: Any) -> Path:
+    outline = {
+        "title": "Rolling Test",
+        "general_instruction": "Be brief.",
+        "resources": [],
+        "sections": [{"title": title, "prompt": f"Write about {title}.", "refs": []} for title in TITLES],
+    }
+    outline_file = tmp_path / "outline.json"
+    outline_file.write_text(json.dumps(outline))
+    output_root = tmp_path / "output"
+    artifacts: Dict[str, Any] = {
+        "outline_file": str(outline_file),
+        "output_root": str(output_root),
+        "recipe_root": str(RECIPE_ROOT),
+        **inputs,
+    }
+    await Executor(LOGGER).execute(str(RECIPE_ROOT / "document_generator_recipe.json"), Context(artifacts=artifacts))
+    return output_root
+
+
+def section_prompts() -> List[str]:
+    return [prompt for kind, prompt in CALLS if kind == "section"]
+
+
+def document_block(prompt: str) -> str:
+    return prompt.split("<DOCUMENT>\n", 1)[1].split("\n</DOCUMENT>", 1)[0]
+
+
+@pytest.mark.asyncio
+async def test_sections_see_the_summary_and_recent_sections(tmp_path: Path):
+    output_root = await generate(tmp_path, recent_sections=1)
+
+    # Every section after the first folds the section that left the verbatim window into the summary
+    assert [kind for kind, _ in CALLS] == ["section", "section", "summary", "section", "summary", "section", "summary"]
+    prompts = section_prompts()
+    assert document_block(prompts[0]) == ""
+    assert document_block(prompts[1]) == "## Alpha\n\nThe Alpha body."
+    assert document_block(prompts[3]) == (
+        "<SUMMARY>\nsummary of ## Alpha | summary of ## Beta\n</SUMMARY>\n\n## Gamma\n\nThe Gamma body."
+    )
+    assert all("The Alpha body." not in prompt for prompt in prompts[2:])
+    assert "Here is a <SUMMARY> of the earlier sections" in prompts[3]
+
+    # The whole document is still written out
+    document = (output_root / "OUTLINE.md").read_text()
+    assert all(f"The {title} body." in document for title in TITLES)
+
+    rolling = json.loads((output_root / "OUTLINE.rolling.json").read_text())
+    assert rolling["summary"] == "summary of ## Alpha | summary of ## Beta | summary of ## Gamma"
+    assert rolling["folded"] == 3
+    assert rolling["sections"] == [f"## {title}\n\nThe {title} body." for title in TITLES]
+
+    report = json.loads((output_root / "OUTLINE.prompt_tokens.json").read_text())
+    assert report["recent_sections"] == 1
+    assert [entry["title"] for entry in report["sections"]] == TITLES
+    assert report["document_tokens"] == sum(entry["document_tokens"] for entry in report["sections"])
+    assert report["rolling_tokens"] == sum(entry["rolling_tokens"] for entry in report["sections"])
+    last = report["sections"][-1]
+    assert last["rolling_tokens"] == estimate_tokens(document_block(prompts[3]), "openai/gpt-4o")
+    assert last["rolling_tokens"] < last["document_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_without_recent_sections_prompts_include_the_whole_document(tmp_path: Path):
+    output_root = await generate(tmp_path)
+
+    assert [kind for kind, _ in CALLS] == ["section"] * 4
+    last = section_prompts()[-1]
+    assert "<SUMMARY>" not in last and "Here is the content of the <DOCUMENT> so far" in last
+    assert all(f"The {title} body." in document_block(last) for title in TITLES[:3])
+    assert not (output_root / "OUTLINE.rolling.json").exists()
+    assert not (output_root / "OUTLINE.prompt_tokens.json").exists()
+
+
+def test_tokens_filter_estimates_with_the_model_encoding():
+    text = "The quick brown fox jumps over the lazy dog. " * 20
+    context = Context(artifacts={"text": text, "model": "openai/gpt-4o", "missing": None})
+    assert render_template("{{ text | tokens: model }}", context) == str(estimate_tokens(text, "openai/gpt-4o"))
+    assert render_template("{{ text | tokens }}", context) == str(estimate_tokens(text, None))
+    assert render_template("{{ missing | tokens: model }}", context) == "0"
@@ -0,0 +1,119 @@
+"""Tests for execution lifecycle events delivered to subscribers."""
+
+import asyncio
+import io
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.hooks import ExecutionEvent, JsonlEventLog, ProgressBar, subscribed
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.registry import STEP_REGISTRY
+
+LOGGER = logging.getLogger("tests.hooks")
+
+RECIPE: Dict[str, Any] = {
+    "steps": [
+        {"type": "set_context", "config": {"key": "greeting", "value": "hello"}},
+        {
+            "type": "loop",
+            "config": {
+                "items": ["ok", "bad"],
+                "item_key": "item",
+                "result_key": "checked",
+                "substeps": [{"type": "check", "config": {}}],
+            },
+        },
+    ]
+}
+
+
+class CheckStep(BaseStep[StepConfig]):
+    """Fails for the item "bad"."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, StepConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        if context["item"] == "bad":
+            raise RuntimeError("bad item")
+
+
+@pytest.fixture(autouse=True)
+def check_step():
+    STEP_REGISTRY["check"] = CheckStep
+    yield
+    del STEP_REGISTRY["check"]
+
+
+def summarize(events: List[ExecutionEvent]) -> List[Tuple[str, str, Any]]:
+    return [(event.type, event.path, event.data.get("status")) for event in events]
+
+
+@pytest.mark.asyncio
+async def test_events_of_a_small_recipe():
+    events: List[ExecutionEvent] = []
+    with subscribed(events.append):
+        await Executor(LOGGER).execute(RECIPE, Context())
+
+    item0, item1 = "1:loop > item 0", "1:loop > item 1"
+    assert summarize(events) == [
+        ("recipe_start", "", None),
+        ("step_start", "0:set_context", None),
+        ("step_end", "0:set_context", "ok"),
+        ("step_start", "1:loop", None),
+        ("loop_item_scheduled", "1:loop", None),
+        ("loop_item_start", item0, None),
+        ("recipe_start", item0, None),
+        ("step_start", f"{item0} > 0:check", None),
+        ("step_end", f"{item0} > 0:check", "ok"),
+        ("recipe_end", item0, "ok"),
+        ("loop_item_end", item0, "ok"),
+        ("loop_item_scheduled", "1:loop", None),
+        ("loop_item_start", item1, None),
+        ("recipe_start", item1, None),
+        ("step_start", f"{item1} > 0:check", None),
+        ("step_end", f"{item1} > 0:check", "error"),
+        # Reported once, by the innermost step, although every enclosing scope sees the error
+        ("error", f"{item1} > 0:check", None),
+        ("recipe_end", item1, "error"),
+        ("loop_item_end", item1, "error"),
+        # The loop records the failed item and succeeds
+        ("step_end", "1:loop", "ok"),
+        ("recipe_end", "", "ok"),
+    ]
+    error = events[16]
+    assert error.data["error"] == "bad item" and error.data["error_type"] == "RuntimeError"
+    assert error.data["step_type"] == "check" and error.data["index"] == 0
+    assert events[4].data == {"key": 0, "total": 2}
+    assert all(event.data["duration"] >= 0 for event in events if event.type.endswith("_end"))
+
+
+@pytest.mark.asyncio
+async def test_subscribers_only_see_their_own_runs_and_cannot_fail_them(tmp_path: Any):
+    seen: List[ExecutionEvent] = []
+
+    def broken(event: ExecutionEvent) -> None:
+        raise RuntimeError("subscriber bug")
+
+    async def observed() -> None:
+        with subscribed(seen.append, broken):
+            await Executor(LOGGER).execute(RECIPE, Context(artifacts={"run": "observed"}))
+
+    # The other run executes concurrently but outside the `subscribed` block
+    await asyncio.gather(observed(), Executor(LOGGER).execute(RECIPE, Context()))
+    assert [event.type for event in seen].count("recipe_start") == 3
+
+    log_path = tmp_path / "events.jsonl"
+    progress = ProgressBar(stream=io.StringIO())
+    with JsonlEventLog(str(log_path)) as log, subscribed(log, progress):
+        await Executor(LOGGER).execute(RECIPE, Context())
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(lines) == 21 and lines[-1]["type"] == "recipe_end" and lines[-1]["status"] == "ok"
+    assert progress.line() == "[########################] 2/2 items, 1 failed | 4 steps"
@@ -0,0 +1,95 @@
+"""Tests for the app job pool: worker processes, per-job logs, session fairness and cancellation."""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+import pytest
+
+from recipe_executor.job_pool import JobPool, JobQueueFullError
+
+from .conftest import FakeChatServer
+
+
+def set_recipe(key: str, value: str) -> Dict[str, Any]:
+    return {"steps": [{"type": "set_context", "config": {"key": key, "value": value}}]}
+
+
+def llm_recipe() -> Dict[str, Any]:
+    step = {"prompt": "hello", "model": "ollama/slow-model", "output_format": "text", "output_key": "answer"}
+    return {"steps": [{"type": "llm_generate", "config": step}]}
+
+
+@pytest.fixture
+def pool(tmp_path: Any) -> Iterator[JobPool]:
+    job_pool = JobPool(workers=1, max_queued=4, log_root=str(tmp_path / "jobs"), cancel_grace=10.0)
+    yield job_pool
+    job_pool.shutdown(wait=False)
+
+
+@pytest.fixture
+def slow_server(chat_server: Callable[..., FakeChatServer]) -> FakeChatServer:
+    return chat_server(delay=1.0)
+
+
+def test_jobs_run_in_worker_processes_with_their_own_logs(pool: JobPool):
+    root_handlers = list(logging.getLogger().handlers)
+    first = pool.submit(set_recipe("greeting", "hello {{ name }}"), {"name": "ada"}, session="a")
+    second = pool.submit(set_recipe("greeting", "hi {{ name }}"), {"name": "bob"}, session="b")
+    assert first.wait(60) and second.wait(60)
+
+    assert (first.status, second.status) == ("succeeded", "succeeded")
+    assert first.result is not None and first.result["greeting"] == "hello ada"
+    assert second.result is not None and second.result["greeting"] == "hi bob"
+    assert first.progress == 1.0
+    assert logging.getLogger().handlers == root_handlers
+
+    # Each job has its own log directory, and its log lines can be polled
+    assert first.log_dir != second.log_dir
+    with open(os.path.join(first.log_dir, "info.log"), encoding="utf-8") as f:
+        first_log = f.read()
+    assert f"Job {first.id} started in worker process" in first_log
+    assert second.id not in first_log
+    assert f"Job {first.id} started in worker process" in first.log_text()
+    worker_pid = int(first.log_text().split("worker process ")[1].split()[0])
+    assert worker_pid != os.getpid()
+
+
+def test_queue_is_bounded_and_fair_across_sessions(pool: JobPool, slow_server: FakeChatServer):
+    config = {"ollama_base_url": slow_server.base_url}
+    blocker = pool.submit(llm_recipe(), config=config, session="busy")
+    assert slow_server.received.wait(60)
+
+    busy = [pool.submit(set_recipe("n", str(i)), session="busy") for i in range(3)]
+    other = pool.submit(set_recipe("n", "other"), session="other")
+    with pytest.raises(JobQueueFullError):
+        pool.submit(set_recipe("n", "overflow"), session="other")
+    assert pool.position(busy[0]) == 0
+    assert pool.position(other) == 1
+    assert pool.position(busy[2]) == 3
+
+    jobs: List[Any] = [blocker, *busy, other]
+    assert all(job.wait(60) for job in jobs)
+    assert all(job.status == "succeeded" for job in jobs)
+    started = sorted(jobs, key=lambda job: job.started)
+    # The other session's job runs after one job of the busy session, not after all of them
+    assert started[:3] == [blocker, busy[0], other]
+
+
+def test_running_job_can_be_cancelled(pool: JobPool, slow_server: FakeChatServer):
+    slow_server.delay = 30.0
+    job = pool.submit(llm_recipe(), config={"ollama_base_url": slow_server.base_url})
+    assert slow_server.received.wait(60)
+    assert job.status == "running"
+
+    start = time.monotonic()
+    assert pool.cancel(job.id)
+    assert job.wait(20)
+    assert job.status == "cancelled"
+    # Cancelled inside the worker, well before the grace period would replace it
+    assert time.monotonic() - start < pool.cancel_grace
+    assert not pool.cancel(job.id)
+
+    after = pool.submit(set_recipe("n", "after"))
+    assert after.wait(60) and after.status == "succeeded"
@@ -0,0 +1,105 @@
+"""Tests for LLM retry, backoff and hedged requests against a local fault-injecting chat server."""
+
+import logging
+import time
+from typing import Any, Callable
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.llm_utils.llm import LLM, get_model
+from recipe_executor.llm_utils.retry import LatencyTracker, RetryPolicy, is_retryable, latency_tracker
+
+from .conftest import FakeChatServer
+
+MODEL_ID = "ollama/stub-model"
+
+
+def make_llm(server: FakeChatServer, **policy: Any) -> LLM:
+    context = Context(config={"ollama_base_url": server.base_url})
+    retry_policy = RetryPolicy(initial_delay=0.01, max_delay=0.05, **policy)
+    return LLM(logging.getLogger("test_llm_retry"), context, model=MODEL_ID, retry_policy=retry_policy)
+
+
+@pytest.fixture(autouse=True)
+def reset_latency_tracker():
+    latency_tracker.clear()
+    yield
+    latency_tracker.clear()
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors(chat_server: Callable[..., FakeChatServer]):
+    server = chat_server([(429, 0.0), (503, 0.0)])
+    result = await make_llm(server, max_attempts=3).generate("hello")
+
+    assert result == "ok"
+    assert len(server.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts(chat_server: Callable[..., FakeChatServer]):
+    server = chat_server([(503, 0.0)] * 5)
+    with pytest.raises(Exception) as exc_info:
+        await make_llm(server, max_attempts=2).generate("hello")
+
+    assert is_retryable(exc_info.value)
+    assert len(server.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors(chat_server: Callable[..., FakeChatServer]):
+    server = chat_server([(400, 0.0)])
+    with pytest.raises(Exception) as exc_info:
+        await make_llm(server, max_attempts=3).generate("hello")
+
+    assert not is_retryable(exc_info.value)
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_total_time(chat_server: Callable[..., FakeChatServer]):
+    server = chat_server([(200, 2.0)])
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        await make_llm(server, max_attempts=3, deadline=0.3).generate("hello")
+
+    assert time.monotonic() - start < 1.5
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_cuts_tail_latency(chat_server: Callable[..., FakeChatServer]):
+    for _ in range(20):
+        latency_tracker.record(MODEL_ID, 0.05)
+
+    server = chat_server([(200, 3.0)])
+    start = time.monotonic()
+    result = await make_llm(server, hedge=True).generate("hello")
+
+    assert result == "ok"
+    assert time.monotonic() - start < 1.5
+    assert len(server.requests) == 2
+
+
+def test_latency_tracker_quantile():
+    tracker = LatencyTracker(window=100)
+    assert tracker.quantile("m", 0.95) is None
+    for value in range(1, 101):
+        tracker.record("m", value / 100)
+    assert tracker.quantile("m", 0.95) == pytest.approx(0.96)
+    assert tracker.quantile("m", 0.95, min_samples=200) is None
+
+
+def test_retry_policy_from_config():
+    policy = RetryPolicy.from_config({"llm_max_attempts": "5", "llm_deadline": 60, "llm_hedge": True})
+    assert policy.max_attempts == 5
+    assert policy.deadline == 60
+    assert policy.hedge is True
+    assert RetryPolicy(jitter=False, initial_delay=1, max_delay=3).backoff(4) == 3
+
+
+@pytest.mark.parametrize("model_id", ["openai/gpt-4o", "anthropic/claude-3-5-haiku-latest", MODEL_ID])
+def test_sdk_clients_do_not_retry_on_their_own(model_id: str):
+    context = Context(config={"openai_api_key": "sk-test", "anthropic_api_key": "sk-ant-test"})
+    model = get_model(model_id, context, logging.getLogger("test_llm_retry"))
+    assert model.client.max_retries == 0  # type: ignore[union-attr]
@@ -0,0 +1,232 @@
+"""Tests for LoopStep batch mode against a local stand-in for the OpenAI Batch API."""
+
+import json
+import logging
+import time
+from email import policy
+from email.parser import BytesParser
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.steps.loop import LoopStep
+
+from .conftest import FakeChatServer, RecordedRequest, chat_completion
+
+
+def answer(body: Dict[str, Any]) -> str:
+    prompt = body["messages"][-1]["content"]
+    if "response_format" in body:
+        return json.dumps({"label": prompt.upper()})
+    return f"echo: {prompt}"
+
+
+class BatchServer(FakeChatServer):
+    """
+    Minimal OpenAI-compatible server: files, batches and chat completions.
+
+    Batch jobs complete on the first status poll, unless `fail_batches` is set, in which
+    case they end with status "failed", or `stall_batches` is set, in which case they stay
+    "in_progress" until cancelled.
+    """
+
+    def __init__(self, fail_batches: bool = False, stall_batches: bool = False) -> None:
+        super().__init__(reply=answer)
+        self.fail_batches = fail_batches
+        self.stall_batches = stall_batches
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.batch_sizes: List[int] = []
+
+    def handle(self, request: RecordedRequest) -> Tuple[int, Any]:
+        parts = request.path.split("/")
+        with self.lock:
+            if request.method == "POST" and request.path == "/v1/files":
+                header = f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode()
+                message = BytesParser(policy=policy.default).parsebytes(header + request.body)
+                content = next(
+                    part.get_payload(decode=True)
+                    for part in message.iter_parts()
+                    if part.get_param("name", header="content-disposition") == "file"
+                )
+                file_id = f"file-{len(self.files) + 1}"
+                self.files[file_id] = content
+                return 200, self.file_object(file_id)
+            if request.method == "POST" and request.path == "/v1/batches":
+                batch_id = f"batch-{len(self.batches) + 1}"
+                self.batches[batch_id] = {"input_file_id": request.json()["input_file_id"], "status": "validating"}
+                return 200, self.batch_object(batch_id)
+            if (
+                request.method == "POST"
+                and request.path.startswith("/v1/batches/")
+                and request.path.endswith("/cancel")
+            ):
+                self.batches[parts[3]]["status"] = "cancelled"
+                return 200, self.batch_object(parts[3])
+            if request.method == "GET" and request.path.startswith("/v1/batches/"):
+                self.run_batch(parts[3])
+                return 200, self.batch_object(parts[3])
+            if request.method == "GET" and request.path.startswith("/v1/files/") and request.path.endswith("/content"):
+                return 200, self.files[parts[3]]
+        return super().handle(request)
+
+    def file_object(self, file_id: str) -> Dict[str, Any]:
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(self.files[file_id]),
+            "created_at": int(time.time()),
+            "filename": "batch.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    def batch_object(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.batches[batch_id]
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": batch["input_file_id"],
+            "completion_window": "24h",
+            "status": batch["status"],
+            "output_file_id": batch.get("output_file_id"),
+            "created_at": int(time.time()),
+        }
+
+    def run_batch(self, batch_id: str) -> None:
+        batch = self.batches[batch_id]
+        if batch["status"] not in ("validating", "in_progress"):
+            return
+        if self.fail_batches:
+            batch["status"] = "failed"
+            return
+        if self.stall_batches:
+            batch["status"] = "in_progress"
+            return
+        lines = self.files[batch["input_file_id"]].decode().splitlines()
+        self.batch_sizes.append(len(lines))
+        output = []
+        for line in lines:
+            request = json.loads(line)
+            body = chat_completion(answer(request["body"]), request["body"]["model"])
+            response = {"status_code": 200, "request_id": "req", "body": body}
+            output.append(json.dumps({"id": "out", "custom_id": request["custom_id"], "response": response}))
+        output_id = f"file-{len(self.files) + 1}"
+        self.files[output_id] = "\n".join(output).encode()
+        batch.update(status="completed", output_file_id=output_id)
+
+    @property
+    def interactive_calls(self) -> int:
+        return self.count("/v1/chat/completions")
+
+
+def make_loop(**extra: Any) -> LoopStep:
+    config: Dict[str, Any] = {
+        "items": "words",
+        "item_key": "word",
+        "batch": True,
+        "batch_poll_interval": 0.01,
+        "substeps": [
+            {
+                "type": "llm_generate",
+                "config": {
+                    "model": "openai/gpt-4o-mini",
+                    "prompt": "{{ word }}",
+                    "output_format": "text",
+                    "output_key": "word",
+                },
+            }
+        ],
+        "result_key": "answers",
+    }
+    config.update(extra)
+    return LoopStep(logging.getLogger("test_loop_batch"), config)
+
+
+@pytest.fixture
+def openai_env(monkeypatch):
+    def configure(server: BatchServer) -> None:
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{server.base_url}/v1")
+
+    return configure
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_gathers_requests_into_one_job(openai_env):
+    words = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    with BatchServer() as server:
+        openai_env(server)
+        context = Context(artifacts={"words": words}, config={"openai_api_key": "test"})
+        await make_loop().execute(context)
+
+    assert server.batch_sizes == [5]
+    assert server.interactive_calls == 0
+    assert sorted(context["answers"]) == sorted(f"echo: {word}" for word in words)
+    assert context["answers__errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_structured_output(openai_env):
+    step = make_loop()
+    step.config.substeps[0]["config"]["output_format"] = {
+        "type": "object",
+        "properties": {"label": {"type": "string"}},
+        "required": ["label"],
+    }
+    with BatchServer() as server:
+        openai_env(server)
+        context = Context(artifacts={"words": ["one", "two"]}, config={"openai_api_key": "test"})
+        await step.execute(context)
+
+    assert server.batch_sizes == [2]
+    assert sorted(item["label"] for item in context["answers"]) == ["ONE", "TWO"]
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_falls_back_to_interactive_calls(openai_env):
+    words = ["one", "two", "three"]
+    with BatchServer(fail_batches=True) as server:
+        openai_env(server)
+        context = Context(artifacts={"words": words}, config={"openai_api_key": "test"})
+        await make_loop().execute(context)
+
+    assert server.interactive_calls == 3
+    assert sorted(context["answers"]) == sorted(f"echo: {word}" for word in words)
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_gives_up_on_stalled_jobs(openai_env):
+    assert make_loop().config.batch_timeout == 3600.0
+    with BatchServer(stall_batches=True) as server:
+        openai_env(server)
+        context = Context(artifacts={"words": ["one", "two"]}, config={"openai_api_key": "test"})
+        await make_loop(batch_timeout=0.05).execute(context)
+
+    assert [batch["status"] for batch in server.batches.values()] == ["cancelled"]
+    assert server.interactive_calls == 2
+    assert sorted(context["answers"]) == ["echo: one", "echo: two"]
+
+
+@pytest.mark.asyncio
+async def test_nested_parallel_calls_do_not_join_the_batch(openai_env):
+    def generate(prompt: str, key: str) -> Dict[str, Any]:
+        config = {"model": "openai/gpt-4o-mini", "prompt": prompt, "output_format": "text", "output_key": key}
+        return {"type": "llm_generate", "config": config}
+
+    step = make_loop()
+    step.config.substeps = [
+        {"type": "parallel", "config": {"substeps": [generate("a {{ word }}", "a"), generate("b {{ word }}", "b")]}},
+        generate("{{ word }}", "word"),
+    ]
+    words = ["one", "two", "three"]
+    with BatchServer() as server:
+        openai_env(server)
+        context = Context(artifacts={"words": words}, config={"openai_api_key": "test"})
+        await step.execute(context)
+
+    # One job for the loop items' own requests; the nested parallel substeps call interactively
+    assert server.batch_sizes == [3]
+    assert server.interactive_calls == 6
+    assert sorted(context["answers"]) == ["echo: one", "echo: three", "echo: two"]
@@ -0,0 +1,149 @@
+"""Tests for LoopStep streaming mode: the in-flight window, the result sink and fail-fast cleanup."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.loop import LoopStep
+from recipe_executor.steps.registry import STEP_REGISTRY
+
+LOGGER = logging.getLogger("tests.loop_stream")
+
+
+class Tracker:
+    """Records what the stub step started, finished and cleaned up."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.max_active = 0
+        self.finished = 0
+        self.cleaned_up: List[int] = []
+
+
+TRACKER = Tracker()
+
+
+class WorkConfig(StepConfig):
+    seconds: float = 0.01
+    fail_on: List[int] = []
+
+
+class WorkStep(BaseStep[WorkConfig]):
+    """Doubles `item.n`, failing on the configured values and recording cleanup."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, WorkConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        item = context["item"]
+        TRACKER.active += 1
+        TRACKER.max_active = max(TRACKER.max_active, TRACKER.active)
+        try:
+            if item["n"] in self.config.fail_on:
+                raise RuntimeError(f"item {item['n']} failed")
+            await asyncio.sleep(self.config.seconds)
+            context["item"] = {**item, "double": item["n"] * 2}
+            TRACKER.finished += 1
+        finally:
+            TRACKER.active -= 1
+            TRACKER.cleaned_up.append(item["n"])
+
+
+@pytest.fixture(autouse=True)
+def work_step():
+    global TRACKER
+    TRACKER = Tracker()
+    STEP_REGISTRY["stream_work"] = WorkStep
+    yield
+    del STEP_REGISTRY["stream_work"]
+
+
+def make_loop(**config: Any) -> LoopStep:
+    work = {"type": "stream_work", "config": config.pop("work", {})}
+    return LoopStep(LOGGER, {"item_key": "item", "result_key": "out", "substeps": [work], **config})
+
+
+@pytest.mark.asyncio
+async def test_generator_items_are_pulled_within_the_window():
+    ahead: List[int] = []
+
+    async def items() -> AsyncIterator[Dict[str, int]]:
+        for n in range(30):
+            # Items started but not finished when the loop pulls the next one
+            ahead.append(n - TRACKER.finished)
+            yield {"n": n}
+
+    context = Context()
+    context["items"] = items()
+    await make_loop(items="items", window=3, max_concurrency=0).execute(context)
+
+    assert TRACKER.max_active == 3
+    assert max(ahead) <= 3
+    assert sorted(r["double"] for r in context["out"]) == [n * 2 for n in range(30)]
+    assert len(context["out__history"]) == 30 and context["out__errors"] == []
+    # The generator is consumed by the loop rather than copied into item contexts
+    assert "items" not in context
+
+
+@pytest.mark.asyncio
+async def test_results_stream_to_the_output_file(tmp_path: Any):
+    items_file = tmp_path / "items.jsonl"
+    items_file.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(5)) + "\n")
+    output_file = tmp_path / "results" / "{{ name }}.jsonl"
+
+    context = Context(artifacts={"name": "run"})
+    loop = make_loop(
+        items_file=str(items_file),
+        output_file=str(output_file),
+        max_concurrency=2,
+        fail_fast=False,
+        work={"fail_on": [3]},
+    )
+    await loop.execute(context)
+
+    path = tmp_path / "results" / "run.jsonl"
+    assert context["out"] == str(path)
+    lines = sorted((json.loads(line) for line in path.read_text().splitlines()), key=lambda line: line["key"])
+    assert [line.get("result", {}).get("double") for line in lines] == [0, 2, 4, None, 8]
+    assert lines[3]["error"].endswith("item 3 failed")
+    assert [e["key"] for e in context["out__errors"]] == [3]
+    # History stays compact: statuses and durations, no results
+    assert {entry["key"]: entry["status"] for entry in context["out__history"]}[3] == "error"
+    assert all("result" not in entry for entry in context["out__history"])
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_cancels_in_flight_items_and_closes_the_source(tmp_path: Any):
+    closed = asyncio.Event()
+    pulled: List[int] = []
+
+    async def items() -> AsyncIterator[Dict[str, int]]:
+        try:
+            for n in range(1000):
+                pulled.append(n)
+                yield {"n": n}
+        finally:
+            closed.set()
+
+    context = Context()
+    context["items"] = items()
+    output_file = tmp_path / "out.jsonl"
+    loop = make_loop(
+        items="items", output_file=str(output_file), window=4, max_concurrency=0, work={"seconds": 10.0, "fail_on": [2]}
+    )
+    start = time.monotonic()
+    await loop.execute(context)
+
+    assert time.monotonic() - start < 5
+    assert closed.is_set() and len(pulled) <= 6
+    # Every started item ran its cleanup before the step returned
+    assert TRACKER.active == 0 and sorted(TRACKER.cleaned_up) == sorted(pulled[: len(TRACKER.cleaned_up)])
+    assert [e["key"] for e in context["out__errors"]] == [2]
+    assert [json.loads(line)["key"] for line in output_file.read_text().splitlines()] == [2]
@@ -0,0 +1,106 @@
+"""Tests for per-step memory profiling of recipe runs."""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.utils.memory import MemoryProfiler, profile_step
+
+LOGGER = logging.getLogger("tests.memory_profile")
+MB = 1024 * 1024
+
+# Buffers the stub step keeps alive, so they count towards its net allocation
+KEPT: List[bytearray] = []
+
+
+class AllocateConfig(StepConfig):
+    size: int
+    keep: bool = False
+
+
+class AllocateStep(BaseStep[AllocateConfig]):
+    """Allocates a buffer of `size` bytes, keeping it only when `keep` is set."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, AllocateConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        buffer = bytearray(self.config.size)
+        if self.config.keep:
+            KEPT.append(buffer)
+
+
+@pytest.fixture(autouse=True)
+def allocate_step():
+    STEP_REGISTRY["allocate"] = AllocateStep
+    yield
+    del STEP_REGISTRY["allocate"]
+    KEPT.clear()
+
+
+@pytest.mark.asyncio
+async def test_profile_attributes_nested_steps(tmp_path: Any):
+    recipe = {
+        "steps": [
+            {"type": "set_context", "config": {"key": "greeting", "value": "hello"}},
+            {
+                "type": "loop",
+                "config": {
+                    "items": [1, 2],
+                    "item_key": "n",
+                    "result_key": "out",
+                    "substeps": [
+                        {"type": "allocate", "config": {"size": 4 * MB}},
+                        {"type": "allocate", "config": {"size": MB, "keep": True}},
+                    ],
+                },
+            },
+        ]
+    }
+    profiler = MemoryProfiler(worst=3, frames=4)
+    with profiler:
+        await Executor(LOGGER).execute(recipe, Context())
+    report = profiler.report()
+
+    steps = {step["path"]: step for step in report["steps"]}
+    assert list(steps) == [
+        "0:set_context",
+        "1:loop",
+        "1:loop > item 0",
+        "1:loop > item 0 > 0:allocate",
+        "1:loop > item 0 > 1:allocate",
+        "1:loop > item 1",
+        "1:loop > item 1 > 0:allocate",
+        "1:loop > item 1 > 1:allocate",
+    ]
+    assert all(step["status"] == "ok" for step in report["steps"])
+
+    # A temporary buffer shows in the peak but not in the net allocation; a kept one in both
+    temporary, kept = steps["1:loop > item 1 > 0:allocate"], steps["1:loop > item 1 > 1:allocate"]
+    assert temporary["type"] == "allocate" and temporary["peak_increase"] >= 4 * MB and temporary["net"] < MB
+    assert kept["net"] >= MB
+    # Parents include the allocations of their nested steps
+    assert steps["1:loop > item 1"]["peak_increase"] >= 4 * MB and steps["1:loop"]["net"] > MB
+    assert steps["0:set_context"]["peak_increase"] < MB
+
+    # The worst steps name the line that allocated the memory they kept
+    assert report["worst"][0]["path"] == "1:loop"
+    assert {step["path"] for step in report["worst"][1:]} == {"1:loop > item 0", "1:loop > item 1"}
+    top_site = report["worst"][0]["sites"][0]
+    assert top_site["site"].startswith(f"{__file__}:") and top_site["size"] >= 2 * MB
+
+    json_path, html_path = profiler.write_report(str(tmp_path))
+    assert json.loads(json_path.read_text())["steps"][3]["path"] == "1:loop > item 0 > 0:allocate"
+    assert "1:loop &gt; item 1 &gt; 0:allocate" in html_path.read_text()
+
+
+def test_profile_step_is_a_no_op_without_a_profiler():
+    with profile_step("idle", "test") as record:
+        assert record is None
@@ -0,0 +1,164 @@
+"""Tests for the metrics registry, its Prometheus text rendering, hook recording and the /metrics endpoint."""
+
+import asyncio
+import logging
+import urllib.error
+import urllib.request
+from typing import Any, Dict
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.executor import Executor
+from recipe_executor.metrics import (
+    CONTENT_TYPE,
+    MCP_ACTIVE_CALLS,
+    MCP_TOOL_DURATION,
+    RECIPE_RUNS,
+    STEP_DURATION,
+    MetricsRegistry,
+    enable_metrics,
+    instrument_tool,
+    start_metrics_server,
+)
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.registry import STEP_REGISTRY
+
+LOGGER = logging.getLogger("tests.metrics")
+
+
+class NoopConfig(StepConfig):
+    fail: bool = False
+
+
+class NoopStep(BaseStep[NoopConfig]):
+    """Returns immediately, or fails."""
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        super().__init__(logger, NoopConfig.model_validate(config))
+
+    async def execute(self, context: ContextProtocol) -> None:
+        if self.config.fail:
+            raise RuntimeError("noop failed")
+
+
+@pytest.fixture(autouse=True)
+def stub_steps():
+    STEP_REGISTRY["noop"] = NoopStep
+    yield
+    del STEP_REGISTRY["noop"]
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs.\nBy status.", ("status",))
+    sessions = registry.gauge("sessions", "Open sessions.")
+    latency = registry.histogram("latency_seconds", "Latency.", ("model",), buckets=(0.1, 1.0))
+
+    runs.inc(status="ok")
+    runs.inc(2, status='say "hi"')
+    sessions.inc()
+    sessions.inc()
+    sessions.dec()
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, model="openai/gpt-4o")
+
+    text = registry.render()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# HELP runs_total Runs.\\nBy status." in lines
+    assert "# TYPE runs_total counter" in lines
+    assert 'runs_total{status="ok"} 1' in lines
+    assert 'runs_total{status="say \\"hi\\""} 2' in lines
+    assert "# TYPE sessions gauge" in lines
+    assert "sessions 1" in lines
+    assert "# TYPE latency_seconds histogram" in lines
+    # Buckets are cumulative and end with +Inf, which equals the count
+    assert 'latency_seconds_bucket{model="openai/gpt-4o",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{model="openai/gpt-4o",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{model="openai/gpt-4o",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{model="openai/gpt-4o"} 4.05' in lines
+    assert 'latency_seconds_count{model="openai/gpt-4o"} 4' in lines
+
+
+def test_invalid_usage_is_rejected():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs.", ("status",))
+    assert registry.counter("runs_total", "Runs.", ("status",)) is runs
+
+    with pytest.raises(ValueError, match="expects labels"):
+        runs.inc(model="x")
+    with pytest.raises(ValueError, match="cannot decrease"):
+        runs.inc(-1, status="ok")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("runs_total", "Runs.", ("status",))
+    with pytest.raises(ValueError, match="reserved label"):
+        registry.histogram("latency_seconds", "Latency.", ("le",))
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_record_recipe_and_step_metrics():
+    enable_metrics()
+    runs_ok, runs_error = RECIPE_RUNS.value(status="ok"), RECIPE_RUNS.value(status="error")
+    steps_ok = STEP_DURATION.count(step_type="noop", status="ok")
+    steps_error = STEP_DURATION.count(step_type="noop", status="error")
+
+    recipe = {"steps": [{"type": "noop", "config": {}}, {"type": "noop", "config": {}}]}
+    await Executor(LOGGER).execute(recipe, Context())
+    with pytest.raises(ValueError):
+        await Executor(LOGGER).execute({"steps": [{"type": "noop", "config": {"fail": True}}]}, Context())
+
+    assert RECIPE_RUNS.value(status="ok") == runs_ok + 1
+    assert RECIPE_RUNS.value(status="error") == runs_error + 1
+    assert STEP_DURATION.count(step_type="noop", status="ok") == steps_ok + 2
+    assert STEP_DURATION.count(step_type="noop", status="error") == steps_error + 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tool_records_latency_and_active_calls():
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    @instrument_tool("test-server")
+    async def slow_tool(text: str) -> str:
+        """Echo after a while."""
+        started.set()
+        await release.wait()
+        return text
+
+    assert slow_tool.__name__ == "slow_tool"
+    assert slow_tool.__doc__ == "Echo after a while."
+    before = MCP_TOOL_DURATION.count(server="test-server", tool="slow_tool", status="ok")
+
+    task = asyncio.create_task(slow_tool("hi"))
+    await started.wait()
+    assert MCP_ACTIVE_CALLS.value(server="test-server") == 1
+    release.set()
+    assert await task == "hi"
+
+    assert MCP_ACTIVE_CALLS.value(server="test-server") == 0
+    assert MCP_TOOL_DURATION.count(server="test-server", tool="slow_tool", status="ok") == before + 1
+
+
+def test_local_scrape():
+    registry = MetricsRegistry()
+    registry.counter("scrapes_total", "Scrapes.").inc()
+    registry.add_collector(lambda: registry.gauge("collected", "Set at scrape time.").set(42))
+
+    server = start_metrics_server(0, registry=registry)
+    try:
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode("utf-8")
+        assert "scrapes_total 1" in body.splitlines()
+        assert "collected 42" in body.splitlines()
+
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"http://{host}:{port}/other", timeout=5)
+        assert excinfo.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
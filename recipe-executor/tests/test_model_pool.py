@@ -0,0 +1,95 @@
+"""Tests for model pool routing, failover and outstanding-load accounting."""
+
+import asyncio
+import logging
+import time
+from typing import Callable, List
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.llm_utils.llm import LLM
+from recipe_executor.llm_utils.pool import ModelPool, ModelPoolConfig, get_model_pool
+from recipe_executor.llm_utils.retry import RetryPolicy
+
+from .conftest import FakeChatServer
+
+LOGGER = logging.getLogger("tests.model_pool")
+
+
+def pool_llm(name: str, backends: List[FakeChatServer]) -> LLM:
+    pools = {
+        name: {
+            "backends": [{"model": "ollama/stub-model", "config": {"ollama_base_url": b.base_url}} for b in backends],
+            "cooldown": 60.0,
+        }
+    }
+    context = Context(config={"model_pools": pools})
+    retry_policy = RetryPolicy(max_attempts=2, initial_delay=0.01, max_delay=0.05)
+    return LLM(LOGGER, context, model=f"pool/{name}", retry_policy=retry_policy)
+
+
+def make_pool(strategy: str, weights: List[int]) -> ModelPool:
+    backends = [{"model": f"ollama/m{i}", "weight": weight} for i, weight in enumerate(weights)]
+    return ModelPool("test", ModelPoolConfig.model_validate({"backends": backends, "strategy": strategy}))
+
+
+def test_least_tokens_routes_to_least_loaded_backend():
+    pool = make_pool("least_tokens", [1, 1])
+    first, second = pool.backends
+    assert pool.acquire(1000) is first
+    assert pool.acquire(10) is second
+    assert pool.acquire(50) is second
+    pool.release(first, 1000, 0.1)
+    assert pool.acquire(10) is first
+    assert (first.outstanding_tokens, second.outstanding_tokens) == (10, 60)
+
+
+def test_weighted_round_robin_honours_weights():
+    pool = make_pool("weighted_round_robin", [2, 1])
+    picks = [pool.acquire(1).model_id for _ in range(6)]
+    assert picks.count("ollama/m0") == 4 and picks.count("ollama/m1") == 2
+    # Smooth: the heavier backend is never picked three times in a row
+    assert "ollama/m0," * 3 not in ",".join(picks) + ","
+
+
+def test_retryable_failure_puts_backend_on_cooldown():
+    pool = make_pool("least_tokens", [1, 1])
+    first, second = pool.backends
+    backend = pool.acquire(10)
+    pool.release(backend, 10, 0.1, error=RuntimeError("busy"), retryable=True)
+    assert not backend.healthy(time.monotonic())
+    assert pool.acquire(10) is (second if backend is first else first)
+    assert backend.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_fails_over_to_healthy_backend(chat_server: Callable[..., FakeChatServer]):
+    failing, healthy = chat_server(status=503), chat_server()
+    llm = pool_llm("failover", [failing, healthy])
+    assert await llm.generate("hello") == "ok"
+
+    pool = get_model_pool("failover", llm.context.get_config())
+    down, up = pool.backends
+    assert len(failing.requests) == 1 and len(healthy.requests) == 1
+    assert (down.errors, up.errors) == (1, 0)
+    assert not down.healthy(time.monotonic()) and up.healthy(time.monotonic())
+    assert all(b.outstanding_requests == 0 and b.outstanding_tokens == 0 for b in pool.backends)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_releases_outstanding_load(chat_server: Callable[..., FakeChatServer]):
+    slow = chat_server(delay=10.0)
+    llm = pool_llm("cancelled", [slow])
+    task = asyncio.create_task(llm.generate("hello"))
+    assert await asyncio.to_thread(slow.received.wait, 10)
+    (backend,) = get_model_pool("cancelled", llm.context.get_config()).backends
+    assert backend.outstanding_requests == 1 and backend.outstanding_tokens > 0
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert (backend.outstanding_requests, backend.outstanding_tokens) == (0, 0)
+    # A cancellation is not a backend failure
+    assert backend.errors == 0 and backend.healthy(time.monotonic())
@@ -0,0 +1,149 @@
+"""Tests for the Ollama throughput mode against a local stand-in for the Ollama API."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.llm_utils.llm import LLM
+from recipe_executor.llm_utils.ollama import get_parallel_slots
+from recipe_executor.llm_utils.retry import RetryPolicy
+
+from .conftest import FakeChatServer, RecordedRequest
+
+LOGGER = logging.getLogger("tests.ollama")
+
+
+def keep_alive_seconds(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    text = str(value)
+    if text.startswith("-"):
+        return float("inf")
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+class OllamaStub(FakeChatServer):
+    """
+    Ollama-like server: `/api/generate` loads a model, `/v1/chat/completions` answers after
+    `generate_time` using one of `num_parallel` slots, queues up to `max_queue` more requests
+    and rejects the rest with 503. A model stays loaded for the request's `keep_alive`
+    (`default_keep_alive` seconds without one) and costs `load_time` to load again.
+    """
+
+    def __init__(
+        self,
+        num_parallel: int = 4,
+        max_queue: int = 512,
+        load_time: float = 0.2,
+        generate_time: float = 0.05,
+        default_keep_alive: float = 0.05,
+    ) -> None:
+        super().__init__(delay=generate_time)
+        self.load_time = load_time
+        self.default_keep_alive = default_keep_alive
+        self.capacity = num_parallel + max_queue
+        self.slots = threading.Semaphore(num_parallel)
+        self.loaded_until: Dict[str, float] = {}
+        self.loads = 0
+        self.warmups = 0
+        self.rejected = 0
+        self.admitted = 0
+        self.running = 0
+        self.peak_running = 0
+
+    def handle(self, request: RecordedRequest) -> Tuple[int, Any]:
+        body = request.json()
+        if request.path == "/api/generate":
+            with self.lock:
+                self.warmups += 1
+            self.ensure_loaded(body["model"], body.get("keep_alive"))
+            return 200, {"model": body["model"], "response": "", "done": True}
+        with self.lock:
+            if self.admitted >= self.capacity:
+                self.rejected += 1
+                return 503, {"error": {"message": "server busy, please try again"}}
+            self.admitted += 1
+        with self.slots:
+            with self.lock:
+                self.running += 1
+                self.peak_running = max(self.peak_running, self.running)
+            self.ensure_loaded(body["model"], body.get("keep_alive"))
+            try:
+                return super().handle(request)
+            finally:
+                with self.lock:
+                    self.running -= 1
+                    self.admitted -= 1
+
+    def ensure_loaded(self, model: str, keep_alive: Optional[str]) -> None:
+        with self.lock:
+            cold = self.loaded_until.get(model, 0.0) < time.monotonic()
+            if cold:
+                self.loads += 1
+        if cold:
+            time.sleep(self.load_time)
+        with self.lock:
+            self.loaded_until[model] = time.monotonic() + keep_alive_seconds(keep_alive, self.default_keep_alive)
+
+
+def make_llm(server: OllamaStub, model: str, max_attempts: int = 3, **config: Any) -> LLM:
+    context = Context(config={"ollama_base_url": server.base_url, **config})
+    retry_policy = RetryPolicy(max_attempts=max_attempts, initial_delay=0.01, max_delay=0.05)
+    return LLM(LOGGER, context, model=f"ollama/{model}", retry_policy=retry_policy)
+
+
+async def sequential_calls(llm: LLM, calls: int) -> None:
+    for i in range(calls):
+        assert await llm.generate(f"prompt {i}") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_and_prewarm_load_the_model_once():
+    calls = 5
+    # Without a keep-alive the stub unloads the model as soon as a request is done
+    with OllamaStub(load_time=0.0, default_keep_alive=0.0) as server:
+        await sequential_calls(make_llm(server, "cold-model"), calls)
+        default_loads = server.loads
+
+        await sequential_calls(make_llm(server, "warm-model", ollama_keep_alive="10m", ollama_prewarm="true"), calls)
+
+    assert default_loads == calls
+    assert server.loads - default_loads == 1
+    assert server.warmups == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_wait_for_configured_parallel_slots():
+    with OllamaStub(num_parallel=2, max_queue=0, load_time=0.0) as server:
+        llm = make_llm(server, "slotted-model", ollama_num_parallel="2")
+        results = await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(8)))
+
+    assert results == ["ok"] * 8
+    assert server.rejected == 0
+    assert server.peak_running == 2
+    assert get_parallel_slots(server.base_url, "slotted-model").peak == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_adapts_to_busy_server():
+    with OllamaStub(num_parallel=2, max_queue=1, load_time=0.0) as server:
+        llm = make_llm(server, "adaptive-model", max_attempts=10)
+        first = await asyncio.gather(*(llm.generate(f"first {i}") for i in range(8)))
+        rejected = server.rejected
+
+        second = await asyncio.gather(*(llm.generate(f"second {i}") for i in range(8)))
+
+    assert first == second == ["ok"] * 8
+    assert rejected > 0
+    slots = get_parallel_slots(server.base_url, "adaptive-model")
+    assert slots.limit is not None and slots.limit <= 4
+    # Once the limit has adapted, only the occasional probe beyond it is rejected
+    assert server.rejected - rejected <= 2 < rejected
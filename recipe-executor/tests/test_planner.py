@@ -0,0 +1,107 @@
+"""Tests for the static recipe planner."""
+
+import json
+import logging
+import os
+from typing import Any, Dict
+
+from recipe_executor.context import Context
+from recipe_executor.planner import Planner, format_plan
+
+LOGGER = logging.getLogger("tests.planner")
+
+
+def write(directory: Any, name: str, recipe: Dict[str, Any]) -> str:
+    path = os.path.join(str(directory), name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recipe, f)
+    return path
+
+
+def llm_step(prompt: str, **config: Any) -> Dict[str, Any]:
+    return {
+        "type": "llm_generate",
+        "config": {"prompt": prompt, "model": "openai/gpt-4o", "output_format": "text", "output_key": "out", **config},
+    }
+
+
+def test_plan_expands_loops_and_sub_recipes(tmp_path: Any):
+    summarize = write(
+        tmp_path, "summarize.json", {"steps": [llm_step("Summarize {{ doc }} for {{ audience }}", max_tokens=100)]}
+    )
+    main = write(
+        tmp_path,
+        "main.json",
+        {
+            "steps": [
+                {"type": "set_context", "config": {"key": "audience", "value": "engineers"}},
+                {
+                    "type": "loop",
+                    "config": {
+                        "items": "docs",
+                        "item_key": "doc",
+                        "result_key": "summaries",
+                        "substeps": [
+                            {
+                                "type": "execute_recipe",
+                                "config": {
+                                    "recipe_path": summarize,
+                                    "context_overrides": {"doc": "{{ doc | upcase }}"},
+                                },
+                            }
+                        ],
+                    },
+                },
+                llm_step("Combine {{ summaries }}", model="anthropic/claude-3-5-haiku-latest"),
+            ]
+        },
+    )
+
+    report = Planner(LOGGER).plan(main, Context(artifacts={"docs": ["alpha", "beta", "gamma"]}))
+
+    assert report.ok and report.exact and report.warnings == []
+    assert [(step.path, step.runs) for step in report.steps] == [
+        ("main.json#0", 1),
+        ("main.json#1", 1),
+        ("main.json#1/loop#0", 3),
+        ("main.json#1/loop#0/summarize.json#0", 3),
+        ("main.json#2", 1),
+    ]
+    assert report.step_runs == {"set_context": 1, "loop": 1, "execute_recipe": 3, "llm_generate": 4}
+    assert report.sub_recipes == [summarize]
+    assert report.steps[1].note == "3 items from docs"
+
+    # The sub-recipe's prompt is rendered with the loop item, the override and the set_context value
+    per_call = report.steps[3].prompt_tokens
+    assert per_call > 0 and report.tokens_by_model["openai/gpt-4o"] == {"calls": 3, "prompt_tokens": 3 * per_call}
+    assert report.tokens_by_model["anthropic/claude-3-5-haiku-latest"]["calls"] == 1
+    assert report.llm_calls == 4 and report.max_output_tokens == 300
+
+    text = format_plan(report)
+    assert "Sub-recipes: 1 files, 3 executions" in text and "LLM calls: 4" in text
+
+
+def test_plan_reports_errors_and_unknown_sizes(tmp_path: Any):
+    recursive = write(tmp_path, "recursive.json", {"steps": []})
+    write(tmp_path, "recursive.json", {"steps": [{"type": "execute_recipe", "config": {"recipe_path": recursive}}]})
+    recipe = {
+        "steps": [
+            {"type": "no_such_step", "config": {}},
+            {"type": "execute_recipe", "config": {"recipe_path": str(tmp_path / "missing.json")}},
+            {"type": "execute_recipe", "config": {"recipe_path": recursive}},
+            {
+                "type": "loop",
+                "config": {"items": "produced", "item_key": "x", "result_key": "r", "substeps": [llm_step("{{ x }}")]},
+            },
+        ]
+    }
+
+    report = Planner(LOGGER).plan(recipe, Context())
+
+    assert not report.ok and not report.exact
+    assert report.errors[0] == "recipe#0: unknown step type 'no_such_step'"
+    assert report.errors[1].startswith("recipe#1: sub-recipe not found")
+    assert any("recursive sub-recipe" in warning for warning in report.warnings)
+    assert any("items 'produced' not available before execution" in warning for warning in report.warnings)
+    # A loop of unknown size counts once, as a lower bound
+    assert report.llm_calls == 1 and "LLM calls: 1 (lower bound)" in format_plan(report)
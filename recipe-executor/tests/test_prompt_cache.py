@@ -0,0 +1,58 @@
+"""Tests for prompt-prefix caching: the Anthropic cache breakpoint and prompt helpers."""
+
+from typing import Any, List
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, SystemPromptPart, TextPart, UserPromptPart
+from pydantic_ai.providers.anthropic import AnthropicProvider
+from pydantic_ai.usage import Usage
+
+from recipe_executor.llm_utils.prompt_cache import build_user_prompt, get_cached_tokens
+from recipe_executor.llm_utils.prompt_cache_anthropic import PromptCachingAnthropicModel
+
+
+async def map_messages(messages: List[ModelMessage]) -> List[Any]:
+    # Exercises the private AnthropicModel._map_message hook the model overrides, so this
+    # fails if a pydantic-ai release within the pinned range changes it
+    model = PromptCachingAnthropicModel(model_name="claude-3-5-haiku-latest", provider=AnthropicProvider(api_key="x"))
+    system_prompt, anthropic_messages = await model._map_message(messages)
+    assert system_prompt == "Be brief."
+    return anthropic_messages
+
+
+@pytest.mark.asyncio
+async def test_segmented_prompt_gets_cache_breakpoint_on_prefix():
+    prompt = build_user_prompt("Write section 3.", prompt_prefix="REFERENCE DOCS", segmented=True)
+    messages: List[ModelMessage] = [
+        ModelRequest(parts=[SystemPromptPart(content="Be brief."), UserPromptPart(content=prompt)]),
+        ModelResponse(parts=[TextPart(content="Done.")]),
+        ModelRequest(parts=[UserPromptPart(content=["Another", "segmented prompt"])]),
+    ]
+
+    first, reply, second = await map_messages(messages)
+
+    assert first["role"] == "user" and reply["role"] == "assistant"
+    prefix, suffix = first["content"]
+    assert prefix == {"type": "text", "text": "REFERENCE DOCS", "cache_control": {"type": "ephemeral"}}
+    assert suffix == {"type": "text", "text": "Write section 3."}
+    # Only the first user message carries the breakpoint
+    assert all("cache_control" not in block for block in second["content"])
+
+
+@pytest.mark.asyncio
+async def test_unsegmented_prompt_is_unchanged():
+    prompt = build_user_prompt("Write section 3.", prompt_prefix="REFERENCE DOCS", segmented=False)
+    assert prompt == "REFERENCE DOCS\n\nWrite section 3."
+    messages: List[ModelMessage] = [
+        ModelRequest(parts=[SystemPromptPart(content="Be brief."), UserPromptPart(content=prompt)])
+    ]
+
+    (message,) = await map_messages(messages)
+
+    assert all("cache_control" not in block for block in message["content"])
+
+
+def test_get_cached_tokens_reads_provider_details():
+    assert get_cached_tokens(None) == {"cache_read": 0, "cache_write": 0}
+    usage = Usage(details={"cache_read_input_tokens": 1200, "cache_creation_input_tokens": 300, "cached_tokens": 5})
+    assert get_cached_tokens(usage) == {"cache_read": 1205, "cache_write": 300}
@@ -0,0 +1,94 @@
+"""Tests for the build_index step, the BM25 retrieval index and the retrieve template filter."""
+
+import json
+import logging
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.steps.build_index import BuildIndexStep
+from recipe_executor.utils import retrieval
+from recipe_executor.utils.retrieval import RetrievalIndex, chunk_text, load_index
+from recipe_executor.utils.serialization import dumps
+from recipe_executor.utils.templates import render_template
+
+LOGGER = logging.getLogger("tests.retrieval")
+
+RESOURCES = [
+    {"key": "pricing", "description": "Pricing notes", "content": "Enterprise tiers cost more.\n\nStarter is free."},
+    {"key": "spec", "description": "Product spec", "content": "The API exposes a search endpoint.\n\nIt is fast."},
+    {
+        "key": "faq",
+        "description": "FAQ",
+        "content": {"question": "Is search billed?", "answer": "Per enterprise seat."},
+    },
+]
+
+
+def test_chunk_text_packs_paragraphs_and_splits_long_ones():
+    text = "one two three\n\nfour five\n\n" + " ".join(f"w{i}" for i in range(7))
+    assert chunk_text(text, chunk_size=5) == ["one two three\n\nfour five", "w0 w1 w2 w3 w4", "w5 w6"]
+    assert chunk_text("  \n\n ", chunk_size=5) == []
+    with pytest.raises(ValueError):
+        chunk_text("text", chunk_size=0)
+
+
+def test_search_ranks_filters_and_respects_the_budget():
+    index = RetrievalIndex(RESOURCES, chunk_size=4)
+    # Non-string content is indexed as JSON
+    assert [(c["key"], c["chunk"]) for c in index.chunks] == [
+        ("pricing", 0),
+        ("pricing", 1),
+        ("spec", 0),
+        ("spec", 1),
+        ("spec", 2),
+        ("faq", 0),
+        ("faq", 1),
+    ]
+
+    top = index.search("enterprise pricing", top_k=2)
+    assert [c["key"] for c in top] == ["pricing", "faq"]
+    assert all(c["score"] > 0 for c in top)
+
+    assert [c["key"] for c in index.search("enterprise", keys=["faq"])] == ["faq"]
+    # Nothing matches: the leading chunks of the allowed documents are used
+    assert [(c["key"], c["score"]) for c in index.search("zebra", top_k=1, keys=["spec"])] == [("spec", 0.0)]
+    # The best chunk uses part of the budget, so the next one no longer fits and is skipped
+    budget = index.chunks[0]["tokens"]
+    assert [c["chunk"] for c in index.search("enterprise starter", keys=["pricing"])] == [0, 1]
+    assert [c["chunk"] for c in index.search("enterprise starter", max_tokens=budget, keys=["pricing"])] == [1]
+
+
+def test_exported_index_round_trips_and_is_compiled_once():
+    index = RetrievalIndex(RESOURCES, chunk_size=4)
+    data = json.loads(json.dumps(index.to_dict()))
+    retrieval._index_cache.clear()
+
+    loaded = load_index(data)
+    assert load_index(json.loads(json.dumps(data))) is loaded
+    assert loaded.fingerprint == index.fingerprint
+    assert loaded.scores("search endpoint").tolist() == index.scores("search endpoint").tolist()
+    with pytest.raises(ValueError):
+        RetrievalIndex.from_dict({"chunks": []})
+
+
+@pytest.mark.asyncio
+async def test_build_index_stores_serializable_data_for_the_retrieve_filter():
+    context = Context(artifacts={"loaded": {"resources": RESOURCES}})
+    step = BuildIndexStep(LOGGER, {"items": "loaded.resources", "chunk_size": 4, "index_key": "idx"})
+    await step.execute(context)
+
+    assert json.loads(dumps(context.dict()))["idx"]["format"] == "bm25_index"
+    template = (
+        "{% assign chunks = idx | retrieve: query, 2, 1000, refs %}"
+        "{% for chunk in chunks %}[{{ chunk.key }}:{{ chunk.chunk }}]{% endfor %}"
+    )
+    clone = context.clone()
+    clone["query"] = "search endpoint"
+    assert render_template(template, clone) == "[spec:1][faq:0]"
+    clone["refs"] = ["spec"]
+    assert render_template(template, clone) == "[spec:1]"
+    assert render_template("{{ missing | retrieve: query | size }}", clone) == "0"
+
+    with pytest.raises(ValueError, match="must be a list"):
+        await BuildIndexStep(LOGGER, {"items": "query"}).execute(clone)
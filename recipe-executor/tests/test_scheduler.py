@@ -0,0 +1,117 @@
+"""Tests for rate-based launch scheduling, driven by a fake clock."""
+
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from recipe_executor import scheduler as scheduler_module
+from recipe_executor.scheduler import LaunchStats, RateConfig, RateScheduler, get_scheduler, record_token_usage
+
+
+class FakeClock:
+    """
+    Monotonic clock that only moves when the scheduler sleeps.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(scheduler_module, "asyncio", SimpleNamespace(sleep=fake.sleep))
+    return fake
+
+
+def test_burst_then_rate(clock: FakeClock):
+    scheduler = RateScheduler(RateConfig(per_second=2, burst=3))
+    # Launches requested together are reserved in order, one every 1/rate seconds after the burst
+    assert [scheduler.reserve() for _ in range(5)] == [0.0, 0.0, 0.0, 0.5, 1.0]
+
+    clock.now = 10.0
+    # An idle bucket refills up to the burst, not beyond
+    assert [scheduler.reserve() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+@pytest.mark.asyncio
+async def test_slots_record_launch_stats(clock: FakeClock):
+    scheduler = RateScheduler(RateConfig(per_second=2, burst=3))
+    stats = LaunchStats()
+    for _ in range(5):
+        async with scheduler.slot(stats):
+            pass
+
+    assert clock.sleeps == [0.5, 0.5]
+    assert stats.summary() == {
+        "launches": 5,
+        "rate": 4.0,
+        "interval_mean": 0.25,
+        # Standard deviation of the intervals 0, 0, 0.5, 0.5
+        "interval_jitter": 0.25,
+        "wait_total": 1.0,
+        "wait_max": 0.5,
+    }
+
+
+def test_interval_jitter_needs_two_intervals():
+    stats = LaunchStats()
+    stats.record(1.0, 0.0)
+    stats.record(1.5, 0.0)
+    assert stats.summary()["interval_jitter"] is None and stats.summary()["rate"] == 2.0
+    stats.record(2.0, 0.0)
+    # Perfectly regular launches have no jitter
+    assert stats.summary()["interval_jitter"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_is_debited_with_reported_usage(clock: FakeClock):
+    scheduler = RateScheduler(RateConfig(tokens_per_minute=600, tokens_per_item=100))
+    bucket = scheduler.token_bucket
+    assert bucket is not None
+
+    async with scheduler.slot():
+        # Usage beyond the item's estimate is debited on top of the reservation
+        record_token_usage(250)
+    assert bucket.tokens == 600 - 250
+
+    async with scheduler.slot():
+        record_token_usage(40)
+    # The unused part of the estimate is given back when the item finishes
+    assert bucket.tokens == 350 - 40
+
+    # Usage outside a launched item is not charged to any scheduler
+    record_token_usage(1000)
+    assert bucket.tokens == 310 and scheduler.tokens_used == 150
+
+    async with scheduler.slot():
+        record_token_usage(700)
+    assert bucket.tokens == -390
+
+    # Overspent: the next launch waits until the budget covers the overspend and its estimate
+    async with scheduler.slot() as wait:
+        pass
+    assert wait == pytest.approx(49.0) and clock.now == pytest.approx(49.0)
+
+
+def test_rate_and_token_budget_combine(clock: FakeClock):
+    scheduler = RateScheduler(RateConfig(per_second=10, burst=5, tokens_per_minute=120, tokens_per_item=60))
+    # The token budget (2 tokens/s) is the tighter limit after two launches
+    assert [scheduler.reserve() for _ in range(3)] == [0.0, 0.0, 30.0]
+
+
+def test_schedulers_are_shared_by_key():
+    first = get_scheduler(RateConfig(per_second=1, key="test-scheduler-shared"))
+    second = get_scheduler(RateConfig(per_second=100, key="test-scheduler-shared"))
+    assert first is second and second.config.per_second == 1
+    assert get_scheduler(RateConfig(per_second=1)) is not get_scheduler(RateConfig(per_second=1))
@@ -0,0 +1,152 @@
+"""Tests for the schema-to-model cache used by structured llm_generate outputs."""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Type
+
+import pytest
+from pydantic import BaseModel
+
+from recipe_executor.utils import models
+from recipe_executor.utils.models import (
+    clear_schema_model_cache,
+    get_schema_model,
+    json_object_to_pydantic_model,
+    schema_hash,
+    schema_model_cache_info,
+)
+
+NESTED_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "heading": {"type": "string"},
+                    "level": {"type": "integer"},
+                    "paragraphs": {"type": "array", "items": {"type": "string"}},
+                    "meta": {
+                        "type": "object",
+                        "properties": {
+                            "author": {"type": "string"},
+                            "score": {"type": "number"},
+                            "tags": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": ["author"],
+                    },
+                },
+                "required": ["heading", "paragraphs"],
+            },
+        },
+        "summary": {
+            "type": "object",
+            "properties": {"text": {"type": "string"}, "approved": {"type": "boolean"}},
+            "required": ["text"],
+        },
+    },
+    "required": ["title", "sections"],
+}
+
+SAMPLE_OUTPUT: Dict[str, Any] = {
+    "title": "Design",
+    "sections": [
+        {"heading": "Intro", "level": 1, "paragraphs": ["a", "b"], "meta": {"author": "x", "tags": ["t"]}},
+        {"heading": "Body", "paragraphs": ["c"]},
+    ],
+    "summary": {"text": "done", "approved": True},
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_schema_model_cache()
+    yield
+    clear_schema_model_cache()
+
+
+def reordered(schema: Any) -> Any:
+    # Same schema with every dict's keys in reverse order
+    if isinstance(schema, dict):
+        return {key: reordered(schema[key]) for key in reversed(list(schema))}
+    if isinstance(schema, list):
+        return [reordered(item) for item in schema]
+    return schema
+
+
+def test_equal_schemas_share_one_model():
+    first = get_schema_model(NESTED_SCHEMA, "LLMObject")
+    second = get_schema_model(reordered(NESTED_SCHEMA), "LLMObject")
+    assert first is second
+    assert schema_hash(NESTED_SCHEMA) == schema_hash(reordered(NESTED_SCHEMA))
+    assert schema_model_cache_info() == {"hits": 1, "misses": 1, "size": 1, "max_size": models.MAX_CACHED_MODELS}
+    assert first.model_validate(SAMPLE_OUTPUT).model_dump()["sections"][0]["meta"]["author"] == "x"
+
+
+def test_different_schemas_and_names_get_different_models():
+    other = {**NESTED_SCHEMA, "required": ["title"]}
+    assert get_schema_model(NESTED_SCHEMA) is not get_schema_model(other)
+    assert get_schema_model(NESTED_SCHEMA, "A") is not get_schema_model(NESTED_SCHEMA, "B")
+
+
+def test_invalid_schema_is_not_cached():
+    with pytest.raises(ValueError, match="Root schema type must be 'object'"):
+        get_schema_model({"type": "array", "items": {"type": "string"}})
+    assert schema_model_cache_info()["size"] == 0
+
+
+def test_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(models, "MAX_CACHED_MODELS", 2)
+    schemas = [{"type": "object", "properties": {f"field_{i}": {"type": "string"}}} for i in range(3)]
+    first = get_schema_model(schemas[0])
+    get_schema_model(schemas[1])
+    assert get_schema_model(schemas[0]) is first  # refreshes schemas[0]
+    get_schema_model(schemas[2])  # evicts schemas[1]
+    assert schema_model_cache_info()["size"] == 2
+    assert get_schema_model(schemas[0]) is first
+    misses = schema_model_cache_info()["misses"]
+    get_schema_model(schemas[1])
+    assert schema_model_cache_info()["misses"] == misses + 1
+
+
+def test_threads_get_the_same_model():
+    results: List[Type[BaseModel]] = []
+    barrier = threading.Barrier(8)
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(get_schema_model(NESTED_SCHEMA, "LLMObject"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and all(model is results[0] for model in results)
+    assert schema_model_cache_info()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_coroutines_get_the_same_model():
+    async def item() -> Type[BaseModel]:
+        await asyncio.sleep(0)
+        return get_schema_model(reordered(NESTED_SCHEMA), "LLMObject")
+
+    results = await asyncio.gather(*(item() for _ in range(20)))
+    assert all(model is results[0] for model in results)
+
+
+def test_repeated_calls_reuse_the_cached_model():
+    calls = 200
+    first = get_schema_model(NESTED_SCHEMA, "LLMObject")
+    for _ in range(calls):
+        model = get_schema_model(NESTED_SCHEMA, "LLMObject")
+        assert model is first
+        assert model.model_validate(SAMPLE_OUTPUT).model_dump(exclude_none=True) == SAMPLE_OUTPUT
+
+    # Built once; every later call is a cache hit rather than a fresh compile
+    info = schema_model_cache_info()
+    assert (info["misses"], info["hits"], info["size"]) == (1, calls, 1)
+    assert json_object_to_pydantic_model(NESTED_SCHEMA, "LLMObject") is not first
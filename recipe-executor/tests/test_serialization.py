@@ -0,0 +1,111 @@
+"""Tests for context serialization: lossless round-trips and the optional encoder fallbacks."""
+
+import io
+import sys
+from pathlib import PurePosixPath
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from recipe_executor.utils import serialization
+from recipe_executor.utils.artifacts import ArtifactStore
+from recipe_executor.utils.serialization import dump, dumps, iter_dumps, load, loads, to_jsonable
+
+
+class Section(BaseModel):
+    title: str
+    tags: List[str] = []
+
+
+class Document(BaseModel):
+    name: str
+    sections: List[Section]
+
+
+def sample_artifacts() -> Dict[str, Any]:
+    return {
+        "doc": Document(name="spec", sections=[Section(title="Intro", tags=["a"]), Section(title="Usage")]),
+        "blob": b"\x00\x01binary\xff",
+        "nested": {"items": [Section(title="x"), {"raw": b"abc"}], "count": 3, "unicode": "héllo"},
+        "plain": None,
+    }
+
+
+@pytest.mark.parametrize("fmt", ["json", "msgpack"])
+def test_lossless_round_trip_restores_models_and_bytes(fmt: str):
+    artifacts = sample_artifacts()
+    restored = loads(dumps(artifacts, fmt, lossless=True), fmt, lossless=True)
+    assert restored == artifacts
+    assert isinstance(restored["doc"], Document) and isinstance(restored["doc"].sections[0], Section)
+    assert isinstance(restored["nested"]["items"][0], Section)
+    assert restored["nested"]["items"][1]["raw"] == b"abc"
+
+    stream = io.BytesIO()
+    dump(artifacts, stream, fmt, lossless=True)
+    assert stream.getvalue() == b"".join(iter_dumps(artifacts, fmt, lossless=True))
+    stream.seek(0)
+    assert load(stream, fmt, lossless=True) == artifacts
+
+
+def test_default_mode_produces_plain_data():
+    value = to_jsonable({**sample_artifacts(), "path": PurePosixPath("/tmp/x"), "ids": (1, 2)})
+    assert value["doc"] == {
+        "name": "spec",
+        "sections": [{"title": "Intro", "tags": ["a"]}, {"title": "Usage", "tags": []}],
+    }
+    assert value["blob"] == "AAFiaW5hcnn/"
+    assert value["path"] == "/tmp/x" and value["ids"] == [1, 2]
+    # Untagged data is not turned back into models
+    assert loads(dumps(sample_artifacts()), lossless=True)["doc"] == value["doc"]
+
+
+def test_lossless_rejects_unrepresentable_values():
+    with pytest.raises(TypeError):
+        dumps({"lock": object()}, lossless=True)
+    assert isinstance(loads(dumps({"lock": object()}))["lock"], str)
+
+
+def test_lossless_refuses_non_model_tags():
+    data = b'{"x": {"__model__": "os:getcwd", "data": {}}}'
+    with pytest.raises(ValueError, match="not a Pydantic model"):
+        loads(data, lossless=True)
+
+
+def test_spilled_artifacts_are_serialized_by_value(tmp_path: Any):
+    handle = ArtifactStore(str(tmp_path)).spill({"big": "x" * 100})
+    assert handle is not None
+    assert loads(dumps({"a": handle})) == {"a": {"big": "x" * 100}}
+    assert loads(dumps({"a": handle}, "msgpack"), "msgpack") == {"a": {"big": "x" * 100}}
+
+
+@pytest.mark.parametrize("lossless", [False, True])
+def test_stdlib_json_fallback_matches_orjson(monkeypatch: pytest.MonkeyPatch, lossless: bool):
+    if serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    artifacts = sample_artifacts()
+    fast = dumps(artifacts, lossless=lossless)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    slow = dumps(artifacts, lossless=lossless)
+
+    assert loads(slow, lossless=lossless) == loads(fast, lossless=lossless)
+    assert b"".join(iter_dumps(artifacts, lossless=lossless)) == slow
+    assert loads(dumps(artifacts, lossless=lossless, indent=True)) == loads(slow)
+
+
+def test_msgpack_requires_the_package(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "msgpack", None)
+    with pytest.raises(RuntimeError, match="requires the 'msgpack' package"):
+        dumps({"a": 1}, "msgpack")
+    with pytest.raises(RuntimeError, match="requires the 'msgpack' package"):
+        load(io.BytesIO(b"\x80"), "msgpack")
+    # JSON keeps working without it
+    assert loads(dumps({"a": 1})) == {"a": 1}
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError, match="Unknown serialization format"):
+        dumps({}, "yaml")
+    with pytest.raises(ValueError, match="Unknown serialization format"):
+        loads(b"", "yaml")
@@ -0,0 +1,110 @@
+"""Tests for in-flight request coalescing: result fan-out, copies and cancellation."""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from recipe_executor.utils.singleflight import SingleFlight, coalescing_enabled, request_key
+
+
+class SharedCall:
+    """A call that blocks until released, counting executions and cancellations."""
+
+    def __init__(self, result: Any = None) -> None:
+        self.result = result
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.executions = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> Any:
+        self.executions += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.result
+
+
+async def join(flights: SingleFlight, call: SharedCall, count: int) -> List["asyncio.Task[Any]"]:
+    tasks = [asyncio.create_task(flights.do("key", call)) for _ in range(count)]
+    await call.started.wait()
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_call_running_for_the_others():
+    flights = SingleFlight("test")
+    call = SharedCall({"answer": 42})
+    leader, cancelled, joiner = await join(flights, call, 3)
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    call.release.set()
+
+    assert await leader == {"answer": 42} and await joiner == {"answer": 42}
+    assert call.executions == 1 and call.cancelled == 0
+    assert flights.stats() == {"calls": 3, "executed": 1, "coalesced": 2}
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_every_waiter_is_gone():
+    flights = SingleFlight("test")
+    call = SharedCall()
+    tasks = await join(flights, call, 3)
+
+    for task in tasks:
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Let the cancelled call unwind
+    await asyncio.sleep(0)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert call.cancelled == 1 and flights.in_flight() == 0
+
+    # A later identical request runs again instead of joining the cancelled one
+    call = SharedCall("fresh")
+    call.release.set()
+    assert await flights.do("key", call) == "fresh" and call.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_joiners_receive_deep_copies():
+    flights = SingleFlight("test")
+    result: Dict[str, Any] = {"items": [1, 2]}
+    call = SharedCall(result)
+    tasks = await join(flights, call, 3)
+    call.release.set()
+    leader, first, second = await asyncio.gather(*tasks)
+
+    # The leader gets the call's own result; joiners get copies they can mutate freely
+    assert leader is result
+    assert first == second == result and first is not result and second is not first
+    first["items"].append(3)
+    assert result["items"] == [1, 2] and second["items"] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_to_every_waiter():
+    flights = SingleFlight("test")
+
+    async def failing() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+    assert [str(result) for result in results] == ["provider down"] * 3
+    assert flights.stats()["executed"] == 1
+
+
+def test_request_key_and_setting():
+    assert request_key({"a": 1, "b": [2]}) == request_key({"b": [2], "a": 1})
+    assert request_key("x", 1) != request_key("x", 2)
+    assert coalescing_enabled({}) and coalescing_enabled({"request_coalescing": "bogus"})
+    assert not coalescing_enabled({"request_coalescing": "false"})
@@ -0,0 +1,72 @@
+"""Start-up tests for the recipe-executor CLI, inspected with `python -X importtime`.
+
+Fails when `recipe-executor --help` or a trivial recipe imports a provider SDK or another
+module that only some steps need.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Set
+
+import pytest
+
+# Modules that only recipes using LLM, MCP, retrieval or docpack steps should load
+HEAVY_MODULES = ["openai", "anthropic", "azure.identity", "mcp", "pydantic_ai", "docpack_file", "numpy"]
+
+
+def imported_modules(args: List[str], cwd: Path) -> Set[str]:
+    """
+    Run the CLI under `-X importtime` and return the names of the modules it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "recipe_executor.main", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+def assert_light(modules: Set[str]) -> None:
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"heavy modules imported at start-up: {loaded}"
+
+
+def test_help_imports_no_heavy_modules(tmp_path):
+    assert_light(imported_modules(["--help"], tmp_path))
+
+
+def test_trivial_recipe_imports_no_heavy_modules(tmp_path):
+    (tmp_path / "input.txt").write_text("hello")
+    recipe = {
+        "steps": [
+            {"type": "read_files", "config": {"path": "input.txt", "content_key": "text"}},
+            {"type": "set_context", "config": {"key": "greeting", "value": "{{ text }} world"}},
+        ]
+    }
+    (tmp_path / "recipe.json").write_text(json.dumps(recipe))
+
+    modules = imported_modules(["recipe.json", "--log-dir", str(tmp_path / "logs")], tmp_path)
+    # Lazily registered step modules are imported via importlib, which -X importtime does not
+    # report, so check their dependencies instead: read_files uses yaml, llm_generate the LLM stack
+    assert "yaml" in modules
+    assert "recipe_executor.llm_utils.llm" not in modules
+    assert_light(modules)
+
+
+@pytest.mark.parametrize("step_type", ["llm_generate", "loop", "mcp", "conditional", "parallel"])
+def test_registry_resolves_steps_lazily(step_type):
+    from recipe_executor.steps.base import BaseStep
+    from recipe_executor.steps.registry import STEP_REGISTRY
+
+    assert step_type in STEP_REGISTRY
+    assert issubclass(STEP_REGISTRY[step_type], BaseStep)
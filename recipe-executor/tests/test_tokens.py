@@ -0,0 +1,84 @@
+"""Tests for token estimation, encoder loading and the prompt fit policies."""
+
+import threading
+from typing import List, Optional
+
+import pytest
+
+from recipe_executor.utils import tokens
+from recipe_executor.utils.tokens import estimate_tokens, fit_prompt, load_encoder
+
+# A model without a tokenizer, estimated at 4 characters per token
+MODEL = "ollama/llama3"
+
+
+def references(count: int, size: int) -> str:
+    return "".join(f"<DOC{i}>{chr(65 + i) * size}</DOC{i}>" for i in range(count))
+
+
+def test_fail_policy_raises_when_over_budget():
+    prompt = f"<DOCUMENT>{'x' * 400}</DOCUMENT>"
+    assert fit_prompt([prompt], 200, "fail", ["DOCUMENT"], MODEL) == [prompt]
+    with pytest.raises(ValueError, match="exceeding the limit of 50 tokens"):
+        fit_prompt([prompt], 50, "fail", ["DOCUMENT"], MODEL)
+
+
+def test_truncate_policy_keeps_head_and_tail():
+    document = "H" * 200 + "M" * 400 + "T" * 200
+    (fitted,) = fit_prompt([f"Summarize:<DOCUMENT>{document}</DOCUMENT>"], 120, "truncate", ["DOCUMENT"], MODEL)
+
+    assert estimate_tokens(fitted, MODEL) <= 120
+    assert fitted.startswith("Summarize:<DOCUMENT>HHH") and fitted.endswith("TTT</DOCUMENT>")
+    assert "[...truncated...]" in fitted and fitted.count("M") < 400
+
+
+def test_drop_policy_drops_trailing_children_first():
+    prefix = f"<REFERENCE_DOCS>{references(4, 200)}</REFERENCE_DOCS>"
+    prompt = f"Write the section.<DOCUMENT>{'d' * 200}</DOCUMENT>"
+    fitted_prefix, fitted_prompt = fit_prompt([prefix, prompt], 200, "drop", ["REFERENCE_DOCS", "DOCUMENT"], MODEL)
+
+    assert fitted_prefix == f"<REFERENCE_DOCS>{references(2, 200)}</REFERENCE_DOCS>"
+    assert fitted_prompt == prompt
+
+
+def test_drop_policy_truncates_blocks_without_children():
+    document = "H" * 300 + "T" * 300
+    (fitted,) = fit_prompt([f"<DOCUMENT>{document}</DOCUMENT>"], 100, "drop", ["DOCUMENT"], MODEL)
+
+    # The document is cut down, not removed
+    assert estimate_tokens(fitted, MODEL) <= 100
+    assert fitted.startswith("<DOCUMENT>HHH") and fitted.endswith("TTT</DOCUMENT>")
+
+
+def test_unfittable_prompt_raises():
+    prompt = "x" * 1000 + f"<DOCUMENT>{'d' * 100}</DOCUMENT>"
+    with pytest.raises(ValueError, match="after applying fit policy 'truncate'"):
+        fit_prompt([prompt], 100, "truncate", ["DOCUMENT"], MODEL)
+
+
+@pytest.mark.asyncio
+async def test_encoder_loads_in_background(monkeypatch: pytest.MonkeyPatch):
+    release = threading.Event()
+    loaded_on: List[str] = []
+
+    def slow_load(model_name: str) -> Optional[tokens.Encoder]:
+        # Stands in for tiktoken downloading its encoding files
+        loaded_on.append(threading.current_thread().name)
+        release.wait(10)
+        return lambda text: [0] * len(text.split())
+
+    monkeypatch.setattr(tokens, "_encoders", {})
+    monkeypatch.setattr(tokens, "_load_encoder", slow_load)
+    monkeypatch.setattr(tokens.importlib.util, "find_spec", lambda name: object())
+    text = "one two three four five six seven eight"
+
+    # Until the encoder is ready, estimates use the heuristic and do not wait
+    assert estimate_tokens(text, "openai/gpt-4o") == 10
+    assert await load_encoder("openai/gpt-4o", timeout=0.05) is False
+
+    release.set()
+    assert await load_encoder("openai/gpt-4o") is True
+    assert estimate_tokens(text, "openai/gpt-4o") == 8
+    assert loaded_on == ["tiktoken-gpt-4o"]
+    # Providers without a tokenizer never load one
+    assert await load_encoder(MODEL) is False
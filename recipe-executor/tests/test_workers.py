@@ -0,0 +1,180 @@
+"""Tests for the worker backends: retries, lease expiry, secret handling and cancellation."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from typing import Any, Dict
+
+import pytest
+
+from recipe_executor.workers import (
+    ProcessPoolBackend,
+    SQLiteQueueBackend,
+    WorkItem,
+    WorkQueue,
+    _strip_secrets,
+    serve_queue,
+)
+
+LOGGER = logging.getLogger("tests.workers")
+SECRET = "sk-queue-secret-0123456789"
+
+STUB_STEPS = '''
+import os
+import time
+from typing import Any, Dict
+
+from recipe_executor.steps.base import BaseStep, StepConfig
+
+
+class FlakyConfig(StepConfig):
+    marker_dir: str
+
+
+class FlakyStep(BaseStep[FlakyConfig]):
+    """Fails the first attempt of each item, then records the API key the worker sees."""
+
+    def __init__(self, logger: Any, config: Dict[str, Any]) -> None:
+        super().__init__(logger, FlakyConfig.model_validate(config))
+
+    async def execute(self, context: Any) -> None:
+        marker = os.path.join(self.config.marker_dir, str(context.get("item")))
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            raise RuntimeError("first attempt fails")
+        context["api_key"] = context.get_config().get("openai_api_key")
+        context["max_tokens"] = context.get_config().get("max_tokens")
+
+
+class HangConfig(StepConfig):
+    pid_file: str
+
+
+class HangStep(BaseStep[HangConfig]):
+    """Records the worker's PID, then blocks the worker."""
+
+    def __init__(self, logger: Any, config: Dict[str, Any]) -> None:
+        super().__init__(logger, HangConfig.model_validate(config))
+
+    async def execute(self, context: Any) -> None:
+        with open(self.config.pid_file, "w") as f:
+            f.write(str(os.getpid()))
+        time.sleep(600)
+'''
+
+
+@pytest.fixture
+def stub_step(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    """
+    Install a `flaky` step, registered through an entry point, for spawned workers.
+    """
+    package_dir = tmp_path / "site"
+    dist_info = package_dir / "stub_steps-0.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (package_dir / "stub_steps.py").write_text(STUB_STEPS)
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: stub-steps\nVersion: 0.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[recipe_executor.steps]\nflaky = stub_steps:FlakyStep\nhang = stub_steps:HangStep\n"
+    )
+    markers = tmp_path / "markers"
+    markers.mkdir()
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(package_dir), os.getenv("PYTHONPATH")])))
+    return {"steps": [{"type": "flaky", "config": {"marker_dir": str(markers)}}]}
+
+
+def test_strip_secrets_keeps_settings():
+    config = {
+        "openai_api_key": SECRET,
+        "azure_client_id": "client",
+        "azure_token_cache_path": "/tmp/tokens",
+        "max_tokens": 10,
+        "model_pools": {"p": {"backends": [{"model": "m", "config": {"api_key": SECRET, "base_url": "u"}}]}},
+    }
+    clean, paths = _strip_secrets(config)
+    assert SECRET not in repr(clean)
+    assert paths == [("openai_api_key",), ("model_pools", "p", "backends", 0, "config", "api_key")]
+    assert clean["max_tokens"] == 10 and clean["azure_token_cache_path"] == "/tmp/tokens"
+    assert clean["model_pools"]["p"]["backends"][0]["config"] == {"base_url": "u"}
+    assert config["openai_api_key"] == SECRET
+
+
+@pytest.mark.asyncio
+async def test_failed_items_are_retried_without_writing_secrets(
+    stub_step: Dict[str, Any], tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-worker-env")
+    queue_path = str(tmp_path / "queue.db")
+    backend = SQLiteQueueBackend(LOGGER, workers=2, retries=1, queue_path=queue_path, poll_interval=0.05)
+    config = {"openai_api_key": SECRET, "max_tokens": 7}
+    items = [WorkItem(key, stub_step, {"item": key}, config) for key in ("a", "b", "c")]
+
+    results = await backend.run(items)
+
+    assert [r.key for r in results if r] == ["a", "b", "c"]
+    for result in results:
+        assert result is not None and result.error is None and result.attempts == 2
+        assert result.artifacts is not None
+        # Workers take the key from their own environment
+        assert result.artifacts["api_key"] == "sk-worker-env"
+        assert result.artifacts["max_tokens"] == 7
+
+    for name in os.listdir(tmp_path):
+        if name.startswith("queue.db"):
+            assert SECRET.encode() not in (tmp_path / name).read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_items_fail_after_their_last_attempt(stub_step: Dict[str, Any], tmp_path: Any):
+    backend = SQLiteQueueBackend(LOGGER, workers=1, retries=0, poll_interval=0.05)
+    results = await backend.run([WorkItem("x", stub_step, {"item": "x"}, {})])
+    assert results[0] is not None and results[0].attempts == 1
+    assert results[0].error is not None and results[0].error.endswith("first attempt fails")
+
+
+def test_expired_lease_is_requeued(tmp_path: Any):
+    queue_path = str(tmp_path / "queue.db")
+    plan = {"steps": [{"type": "set_context", "config": {"key": "out", "value": "done {{ item }}"}}]}
+    queue = WorkQueue(queue_path)
+    try:
+        queue.enqueue("run", [pickle.dumps((plan, {"item": i}, {}, str(i), [])) for i in (1, 2)], max_attempts=2)
+        queue.enqueue("single", [pickle.dumps((plan, {"item": 3}, {}, "3", []))], max_attempts=1)
+        # Workers that claim an item and die without renewing its lease
+        assert queue.claim("dead-worker", lease=0.05, run_id="run") is not None
+        assert queue.claim("dead-worker", lease=0.05, run_id="single") is not None
+        time.sleep(0.1)
+
+        assert serve_queue(queue_path, run_id="run", lease=5.0, poll_interval=0.01) == 2
+        rows = queue.results("run")
+        assert [(status, attempts) for _, status, _, _, attempts in rows] == [("done", 2), ("done", 1)]
+        assert pickle.loads(rows[0][2])["out"] == "done 1"
+
+        assert queue.requeue_expired("single") == 1
+        assert [row[1:] for row in queue.results("single")] == [("failed", None, "worker lease expired", 1)]
+    finally:
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_process_run_terminates_its_workers(
+    stub_step: Dict[str, Any], tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+):
+    # Spawned pool workers take their import path from this process rather than PYTHONPATH
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    pid_file = tmp_path / "worker.pid"
+    plan = {"steps": [{"type": "hang", "config": {"pid_file": str(pid_file)}}]}
+    backend = ProcessPoolBackend(LOGGER, workers=1, retries=0)
+    run = asyncio.create_task(backend.run([WorkItem("x", plan, {}, {})]))
+    while not pid_file.exists() or not pid_file.read_text():
+        assert not run.done(), run.result()
+        await asyncio.sleep(0.05)
+
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    pid = int(pid_file.read_text())
+    while pid in [process.pid for process in multiprocessing.active_children()]:
+        await asyncio.sleep(0.05)